@@ -0,0 +1,72 @@
+"""
+Bulk upsert benchmark for the character tools.
+
+Loads 10,000 characters once with one "Set Character" call per entity and
+once with a single "Set Characters" call, and reports throughput for each.
+
+Usage:
+    python benchmarks/bench_bulk_upsert.py
+"""
+
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_character import tools
+
+
+ENTITIES = 10_000
+
+
+def make_characters(count: int) -> list[dict]:
+    """Build Set Character arguments for a campaign-sized roster."""
+    return [
+        {
+            "characterId": f"char-{index}",
+            "name": f"Hero {index}",
+            "currentHp": 20,
+            "maxHp": 20,
+            "currentMagicPoints": 5,
+            "maxMagicPoints": 10,
+            "properties": {"strength": 10 + index % 8, "class": "Fighter"},
+        }
+        for index in range(count)
+    ]
+
+
+def reset_manager() -> None:
+    """Start each scenario from an empty global manager."""
+    manager = tools.get_character_manager()
+    for character in manager.list_characters():
+        manager.delete_character(character.character_id)
+
+
+def main() -> None:
+    """Print per-call vs. batch upsert throughput."""
+    characters = make_characters(ENTITIES)
+
+    reset_manager()
+    start = time.perf_counter()
+    for character in characters:
+        tools.execute_set_character(character)
+    single = time.perf_counter() - start
+
+    reset_manager()
+    start = time.perf_counter()
+    _, result = tools.execute_set_characters({"characters": characters})
+    batch = time.perf_counter() - start
+    assert result["applied"] == ENTITIES
+
+    print(f"{'mode':<22} {'seconds':>9} {'entities/s':>12}")
+    print(f"{'Set Character x10k':<22} {single:>9.3f} {ENTITIES / single:>12.0f}")
+    print(f"{'Set Characters (1)':<22} {batch:>9.3f} {ENTITIES / batch:>12.0f}")
+    print(f"speedup: {single / batch:.1f}x (excluding the per-call JSON-RPC round trips)")
+
+
+if __name__ == "__main__":
+    main()
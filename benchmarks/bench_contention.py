@@ -0,0 +1,77 @@
+"""
+Contention benchmark for optimistic concurrency on the character manager.
+
+Many concurrent asyncio writers read a character, yield to the event loop
+(standing in for a client round trip) and write back with expectedVersion,
+retrying on conflict. Reports committed writes per second and conflict rate.
+
+Usage:
+    python benchmarks/bench_contention.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_character.character_manager import CharacterManager
+from src.servers.DnD_common.versioning import VersionConflictError
+
+
+WRITES_PER_WRITER = 200
+
+
+async def writer(manager: CharacterManager, character_id: str, stats: dict) -> None:
+    """Decrement a character's magic points with compare-and-set retries."""
+    done = 0
+    while done < WRITES_PER_WRITER:
+        character = manager.get_character(character_id)
+        version = character.version
+        magic_points = character.current_magic_points
+        await asyncio.sleep(0)
+        try:
+            manager.update_character(
+                character_id,
+                current_magic_points=(magic_points - 1) % character.max_magic_points,
+                expected_version=version,
+            )
+        except VersionConflictError:
+            stats["conflicts"] += 1
+            continue
+        stats["commits"] += 1
+        done += 1
+
+
+async def run(writers: int, entities: int) -> tuple[float, dict]:
+    """Run one contention scenario and return (elapsed seconds, stats)."""
+    manager = CharacterManager()
+    for index in range(entities):
+        manager.set_character(f"char-{index}", f"Hero {index}", 10, 10, 1000, 1000)
+    stats = {"commits": 0, "conflicts": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        writer(manager, f"char-{index % entities}", stats) for index in range(writers)
+    ))
+    return time.perf_counter() - start, stats
+
+
+def main() -> None:
+    """Print throughput for a grid of writer and entity counts."""
+    print(f"{'writers':>8} {'entities':>9} {'commits/s':>12} {'conflict %':>11}")
+    for entities in (1, 16, 256):
+        for writers in (1, 8, 64, 256):
+            elapsed, stats = asyncio.run(run(writers, entities))
+            attempts = stats["commits"] + stats["conflicts"]
+            print(
+                f"{writers:>8} {entities:>9} {stats['commits'] / elapsed:>12.0f} "
+                f"{100.0 * stats['conflicts'] / attempts:>10.1f}%"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Derived stats benchmark for memoized formulas.
+
+Reads every derived stat of a 20,000-character party each round while one
+character in a hundred takes damage, once recomputing all formulas on every
+read and once reusing the memoized values. Damage only changes currentHp,
+so no default stat has to be recomputed.
+
+Usage:
+    python benchmarks/bench_derived.py
+"""
+
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_character.character_manager import CharacterManager
+
+
+ENTITIES = 20_000
+ROUNDS = 5
+
+
+def load_party(manager: CharacterManager) -> None:
+    """Fill a manager with characters carrying ability scores."""
+    manager.set_characters([
+        {
+            "character_id": f"char-{index}",
+            "name": f"Adventurer {index}",
+            "current_hp": 30,
+            "max_hp": 30,
+            "current_magic_points": 10,
+            "max_magic_points": 10,
+            "properties": {
+                "strength": 8, "dexterity": 14, "constitution": 12,
+                "intelligence": 18, "wisdom": 12, "charisma": 10, "level": index % 20 + 1,
+            },
+        }
+        for index in range(ENTITIES)
+    ])
+
+
+def run(manager: CharacterManager, characters: list, memoized: bool) -> float:
+    """Return seconds per round of damaging 1% of the party and reading everyone's stats."""
+    values = manager.derived.values
+    start = time.perf_counter()
+    for round_index in range(ROUNDS):
+        for character in characters[round_index::100]:
+            manager.update_character(character.character_id, hp_delta=-1)
+        for character in characters:
+            if not memoized:
+                character.__dict__.pop("_derived", None)
+            values(character)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main() -> None:
+    """Print recomputed vs. memoized derived stat reads."""
+    manager = CharacterManager()
+    load_party(manager)
+    characters = manager.list_characters()
+    for character in characters:
+        manager.derived.values(character)
+
+    recomputed = run(manager, characters, memoized=False)
+    memoized = run(manager, characters, memoized=True)
+    print(f"{ENTITIES} characters, {len(manager.list_derived_stats())} stats, {ROUNDS} rounds")
+    print(f"{'reads':<12} {'seconds':>9}")
+    print(f"{'recomputed':<12} {recomputed:>9.3f}")
+    print(f"{'memoized':<12} {memoized:>9.3f}")
+    print(f"{recomputed / memoized:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
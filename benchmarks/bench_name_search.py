@@ -0,0 +1,75 @@
+"""
+Name search benchmark on a 50,000-entry bestiary.
+
+Builds names from SRD-style templates (age, color, creature, numbered
+spawns) and reports the median and 99th percentile latency of Search
+Monsters for exact, prefix and misspelled queries.
+
+Usage:
+    python benchmarks/bench_name_search.py
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_monster.monster_manager import MonsterManager
+
+
+ENTITIES = 50_000
+AGES = ["", "Young ", "Adult ", "Ancient "]
+COLORS = ["Red", "Blue", "Green", "Black", "White", "Brass", "Bronze", "Copper", "Gold", "Silver"]
+CREATURES = [
+    "Dragon", "Goblin", "Goblin Boss", "Hobgoblin Captain", "Orc War Chief", "Owlbear", "Beholder",
+    "Mind Flayer", "Gelatinous Cube", "Troll", "Hill Giant", "Frost Giant", "Lich", "Vampire Spawn",
+    "Wraith", "Basilisk", "Chimera", "Manticore", "Kobold", "Bugbear", "Displacer Beast", "Wyvern",
+]
+QUERIES = {
+    "exact": ["Goblin", "Owlbear", "Lich"],
+    "prefix": ["Ancient Red", "gel", "Mind F", "frost"],
+    "fuzzy": ["Ancinet Red Dargon", "Bheolder", "Mantikore", "Displacr Beats"],
+}
+REPEATS = 200
+
+
+def load(manager: MonsterManager, rng: random.Random) -> None:
+    """Fill the manager with a mix of unique and repeated names."""
+    for index in range(ENTITIES):
+        creature = rng.choice(CREATURES)
+        if creature == "Dragon":
+            name = f"{rng.choice(AGES)}{rng.choice(COLORS)} Dragon"
+        elif rng.random() < 0.5:
+            name = f"{creature} {index}"
+        else:
+            name = creature
+        manager.set_monster(f"monster-{index}", name, 10, 10, 0, 0)
+
+
+def main() -> None:
+    """Print search latency per query kind."""
+    rng = random.Random(11)
+    manager = MonsterManager()
+    load(manager, rng)
+    print(f"{ENTITIES} monsters")
+    print(f"{'kind':>7} {'median us':>10} {'p99 us':>8}")
+    for kind, queries in QUERIES.items():
+        timings = []
+        for _ in range(REPEATS):
+            for query in queries:
+                start = time.perf_counter()
+                manager.search_monsters(query, limit=10)
+                timings.append((time.perf_counter() - start) * 1e6)
+        timings.sort()
+        p99 = timings[int(len(timings) * 0.99)]
+        print(f"{kind:>7} {statistics.median(timings):>10.1f} {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
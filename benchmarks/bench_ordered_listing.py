@@ -0,0 +1,59 @@
+"""
+Ordered listing benchmark for the maintained sorted views.
+
+Compares "ten most injured characters" computed by sorting the full list on
+every call with a top-k read from the currentHp sorted view, and reports the
+per-write cost of keeping the views up to date.
+
+Usage:
+    python benchmarks/bench_ordered_listing.py
+"""
+
+import os
+import random
+import sys
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_character.character_manager import CharacterManager
+
+
+ENTITIES = 50_000
+TOP_K = 10
+READS = 200
+
+
+def main() -> None:
+    """Print read latency for full sorts vs. sorted views, and write cost."""
+    rng = random.Random(7)
+    manager = CharacterManager()
+    start = time.perf_counter()
+    for index in range(ENTITIES):
+        manager.set_character(
+            f"char-{index}", f"Hero {index}", rng.randint(0, 100), 100, 0, 0, {"initiative": rng.randint(1, 20)}
+        )
+    write_us = (time.perf_counter() - start) / ENTITIES * 1e6
+
+    start = time.perf_counter()
+    for _ in range(READS):
+        full_sort = sorted(manager.list_characters(), key=lambda char: (char.current_hp, char.character_id))[:TOP_K]
+    sort_ms = (time.perf_counter() - start) / READS * 1000
+
+    start = time.perf_counter()
+    for _ in range(READS):
+        top_k = manager.order_characters("currentHp", limit=TOP_K)
+    view_ms = (time.perf_counter() - start) / READS * 1000
+
+    assert [char.character_id for char in top_k] == [char.character_id for char in full_sort]
+    print(f"{ENTITIES} characters, top {TOP_K} by currentHp")
+    print(f"  full sort per call: {sort_ms:8.3f} ms")
+    print(f"  sorted view:        {view_ms:8.3f} ms ({sort_ms / view_ms:.0f}x faster)")
+    print(f"  set_character incl. view maintenance: {write_us:.1f} us/write")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Serialization benchmark for field projection on List Monsters.
+
+Lists a 20,000-entry bestiary once with full records and once projected to
+id, name and HP, reporting the serialization time and the JSON payload size.
+
+Usage:
+    python benchmarks/bench_projection.py
+"""
+
+import json
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_monster import tools
+
+
+ENTITIES = 20_000
+PROJECTION = ["monsterId", "name", "currentHp", "maxHp"]
+
+
+def load_bestiary() -> None:
+    """Fill the global manager with monsters carrying realistic stat blocks."""
+    tools.execute_set_monsters({"monsters": [
+        {
+            "monsterId": f"monster-{index}",
+            "name": f"Goblin {index}",
+            "currentHp": 7,
+            "maxHp": 7,
+            "currentMagicPoints": 0,
+            "maxMagicPoints": 0,
+            "properties": {
+                "armorClass": 15,
+                "challengeRating": 0.25,
+                "type": "humanoid",
+                "abilities": {"str": 8, "dex": 14, "con": 10, "int": 10, "wis": 8, "cha": 8},
+                "actions": [
+                    {"name": "Scimitar", "toHit": 4, "damage": "1d6+2"},
+                    {"name": "Shortbow", "toHit": 4, "damage": "1d6+2", "range": "80/320"},
+                ],
+                "senses": ["darkvision 60 ft."],
+            },
+        }
+        for index in range(ENTITIES)
+    ]})
+
+
+def measure(arguments: dict) -> tuple[float, int]:
+    """Return (seconds, JSON bytes) for one List Monsters call."""
+    start = time.perf_counter()
+    _, result = tools.execute_list_monsters(arguments)
+    payload = json.dumps(result).encode()
+    return time.perf_counter() - start, len(payload)
+
+
+def main() -> None:
+    """Print full vs. projected listing cost."""
+    load_bestiary()
+    full_time, full_bytes = measure({})
+    projected_time, projected_bytes = measure({"fields": PROJECTION})
+
+    print(f"{'listing':<12} {'seconds':>9} {'bytes':>12}")
+    print(f"{'full':<12} {full_time:>9.3f} {full_bytes:>12,}")
+    print(f"{'projected':<12} {projected_time:>9.3f} {projected_bytes:>12,}")
+    print(f"time: {full_time / projected_time:.1f}x faster, size: {full_bytes / projected_bytes:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Bulk rest benchmark for party-wide recovery.
+
+Brings a wounded 20,000-character campaign back to full HP and magic points,
+once with one update per character (as a client calling Update Character for
+each one would) and once with a single long rest over the whole campaign.
+
+Usage:
+    python benchmarks/bench_rest.py
+"""
+
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_character.character_manager import CharacterManager
+
+
+ENTITIES = 20_000
+ROUNDS = 5
+
+
+def load_party(manager: CharacterManager) -> None:
+    """Fill a manager with characters."""
+    manager.set_characters([
+        {
+            "character_id": f"char-{index}",
+            "name": f"Adventurer {index}",
+            "current_hp": 30,
+            "max_hp": 30,
+            "current_magic_points": 10,
+            "max_magic_points": 10,
+        }
+        for index in range(ENTITIES)
+    ])
+
+
+def wound(manager: CharacterManager) -> None:
+    """Damage every character and spend some of their magic points."""
+    manager.apply_deltas([
+        {"character_id": f"char-{index}", "hp_delta": -(index % 20 + 1), "mp_delta": -5}
+        for index in range(ENTITIES)
+    ])
+
+
+def run(manager: CharacterManager, bulk: bool) -> float:
+    """Return seconds per rest of the whole campaign."""
+    elapsed = 0.0
+    for _ in range(ROUNDS):
+        wound(manager)
+        start = time.perf_counter()
+        if bulk:
+            manager.long_rest()
+        else:
+            for character in manager.list_characters():
+                manager.update_character(
+                    character.character_id,
+                    current_hp=character.max_hp,
+                    current_magic_points=character.max_magic_points,
+                )
+        elapsed += time.perf_counter() - start
+    return elapsed / ROUNDS
+
+
+def main() -> None:
+    """Print per-character updates vs. one bulk long rest."""
+    manager = CharacterManager()
+    load_party(manager)
+
+    per_character = run(manager, bulk=False)
+    bulk = run(manager, bulk=True)
+    print(f"{ENTITIES} characters, {ROUNDS} rests")
+    print(f"{'rest':<15} {'seconds':>9}")
+    print(f"{'per character':<15} {per_character:>9.3f}")
+    print(f"{'long rest':<15} {bulk:>9.3f}")
+    print(f"{per_character / bulk:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Serialization benchmark for cached entity views.
+
+Lists a 20,000-character party repeatedly with no writes in between, once
+rebuilding every record with ``dataclasses.asdict`` and once reusing the
+cached views, and reads the campaign resource built from cached JSON
+fragments vs. re-encoding every record.
+
+Usage:
+    python benchmarks/bench_serialization.py
+"""
+
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_character import tools
+from src.servers.DnD_common.namespaces import DEFAULT_CAMPAIGN
+
+
+ENTITIES = 20_000
+ROUNDS = 5
+
+
+def load_party() -> None:
+    """Fill the global manager with characters carrying nested properties."""
+    tools.execute_set_characters({"characters": [
+        {
+            "characterId": f"char-{index}",
+            "name": f"Adventurer {index}",
+            "currentHp": 30,
+            "maxHp": 30,
+            "currentMagicPoints": 10,
+            "maxMagicPoints": 10,
+            "properties": {
+                "class": "Wizard",
+                "level": 5,
+                "abilities": {"str": 8, "dex": 14, "con": 12, "int": 18, "wis": 12, "cha": 10},
+                "inventory": {"potions": 2, "scrolls": ["Fireball", "Shield"], "gold": index},
+            },
+        }
+        for index in range(ENTITIES)
+    ]})
+
+
+def timed(function) -> float:
+    """Return seconds per call of function over ROUNDS calls (after one warm-up call)."""
+    function()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        function()
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main() -> None:
+    """Print uncached vs. cached listing and campaign read cost."""
+    load_party()
+    characters = tools.get_character_manager().list_characters()
+    uri = tools.character_campaign_uri(DEFAULT_CAMPAIGN)
+
+    rows = [
+        ("list (asdict)", timed(lambda: [asdict(char) for char in characters])),
+        ("list (cached)", timed(lambda: tools.execute_list_characters({}))),
+        ("read (encode)", timed(lambda: json.dumps([asdict(char) for char in characters]))),
+        ("read (cached)", timed(lambda: tools.read_character_resource(uri))),
+    ]
+    print(f"{ENTITIES} characters, {ROUNDS} rounds")
+    print(f"{'operation':<16} {'seconds':>9}")
+    for label, seconds in rows:
+        print(f"{label:<16} {seconds:>9.3f}")
+    print(f"list: {rows[0][1] / rows[1][1]:.1f}x faster, read: {rows[2][1] / rows[3][1]:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Memory and latency benchmark for the monster memory budget.
+
+Creates a long campaign's worth of monsters with and without a resident
+budget, then reports the memory held by the manager and the latency of
+reading a resident monster vs. faulting a spilled one back in from disk.
+
+Usage:
+    python benchmarks/bench_spill.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_monster.monster_manager import MonsterManager
+
+
+MONSTERS = 20_000
+BUDGET = 1_000
+READS = 2_000
+
+STAT_BLOCK = {
+    "armorClass": 15,
+    "abilities": {"str": 8, "dex": 14, "con": 10, "int": 10, "wis": 8, "cha": 8},
+    "actions": [{"name": "Scimitar", "toHit": 4, "damage": "1d6+2"}],
+    "senses": ["darkvision 60 ft.", "passive Perception 9"],
+}
+
+
+def fill(max_resident) -> tuple:
+    """Create the monsters and return (manager, bytes held after the load)."""
+    tracemalloc.start()
+    manager = MonsterManager(max_resident=max_resident)
+    for index in range(MONSTERS):
+        manager.set_monster(f"orc-{index}", f"Orc {index}", 15, 15, 0, 0, dict(STAT_BLOCK, rank=index))
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return manager, held
+
+
+def read_latency(manager: MonsterManager, ids: list) -> float:
+    """Return microseconds per get_monster call over the given ids."""
+    start = time.perf_counter()
+    for monster_id in ids:
+        manager.get_monster(monster_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main() -> None:
+    """Print memory held and read latency with and without a memory budget."""
+    unlimited, unlimited_bytes = fill(None)
+    budgeted, budgeted_bytes = fill(BUDGET)
+    print(f"{MONSTERS} monsters")
+    print(f"{'unlimited':>22}: {unlimited_bytes / 2**20:8.1f} MiB held")
+    print(f"{f'budget {BUDGET}':>22}: {budgeted_bytes / 2**20:8.1f} MiB held")
+
+    hot = [f"orc-{index}" for index in range(MONSTERS - BUDGET // 2, MONSTERS)] * (READS // (BUDGET // 2))
+    cold = [f"orc-{index}" for index in range(READS)]
+    print(f"{'resident get':>22}: {read_latency(budgeted, hot):8.1f} us")
+    print(f"{'spilled get (fault)':>22}: {read_latency(budgeted, cold):8.1f} us")
+    print(f"{'unlimited get':>22}: {read_latency(unlimited, cold):8.1f} us")
+    print(f"metrics: {budgeted.storage_metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Memory benchmark for template-based monsters.
+
+Spawns goblins with a realistic stat block either as independent copies of
+the properties or from a shared template (copy-on-write overrides), and
+reports the memory allocated per monster.
+
+Usage:
+    python benchmarks/bench_templates.py
+"""
+
+import os
+import sys
+import tracemalloc
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.projection import copy_value
+from src.servers.DnD_monster.monster_manager import MonsterManager
+
+
+STAT_BLOCK = {
+    "armorClass": 15,
+    "challengeRating": 0.25,
+    "type": "humanoid",
+    "abilities": {"str": 8, "dex": 14, "con": 10, "int": 10, "wis": 8, "cha": 8},
+    "skills": {"stealth": 6},
+    "actions": [
+        {"name": "Scimitar", "toHit": 4, "damage": "1d6+2", "type": "slashing"},
+        {"name": "Shortbow", "toHit": 4, "damage": "1d6+2", "range": "80/320", "type": "piercing"},
+    ],
+    "senses": ["darkvision 60 ft.", "passive Perception 9"],
+    "languages": ["Common", "Goblin"],
+}
+
+
+def measure(count: int, use_template: bool) -> float:
+    """Return bytes allocated per monster for one spawning strategy."""
+    manager = MonsterManager()
+    manager.set_template("goblin", "Goblin", 7, 0, STAT_BLOCK)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for index in range(count):
+        if use_template:
+            manager.set_monster(f"goblin-{index}", f"Goblin {index}", 7, 7, 0, 0, template_id="goblin")
+        else:
+            manager.set_monster(f"goblin-{index}", f"Goblin {index}", 7, 7, 0, 0, copy_value(STAT_BLOCK))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / count
+
+
+def main() -> None:
+    """Print memory per monster for copied vs. template-based properties."""
+    print(f"{'monsters':>9} {'copied B/monster':>17} {'template B/monster':>19}")
+    for count in (200, 10_000):
+        copied = measure(count, use_template=False)
+        shared = measure(count, use_template=True)
+        print(f"{count:>9} {copied:>17.0f} {shared:>19.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Latency benchmark for multi-entity transactions.
+
+Resolves attacks (the attacker spends magic points, the target takes
+damage) once as two Update tool calls through the combined server's tool
+routing and once as a single Apply Transaction call.
+
+Usage:
+    python benchmarks/bench_transactions.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_entity.server import handle_call_tool
+
+
+ATTACKS = 20_000
+
+
+async def setup() -> None:
+    """Create the attacker and a target sturdy enough for every attack."""
+    await handle_call_tool("Set Character", {
+        "characterId": "wizard", "name": "Wizard", "currentHp": 20, "maxHp": 20,
+        "currentMagicPoints": ATTACKS * 2, "maxMagicPoints": ATTACKS * 2,
+    })
+    await handle_call_tool("Set Monster", {
+        "monsterId": "ogre", "name": "Ogre", "currentHp": ATTACKS * 2, "maxHp": ATTACKS * 2,
+        "currentMagicPoints": 0, "maxMagicPoints": 0,
+    })
+
+
+async def separate_updates() -> float:
+    """Return microseconds per attack issued as two Update calls."""
+    start = time.perf_counter()
+    for _ in range(ATTACKS):
+        await handle_call_tool("Update Character", {"characterId": "wizard", "mpDelta": -1})
+        await handle_call_tool("Update Monster", {"monsterId": "ogre", "hpDelta": -1})
+    return (time.perf_counter() - start) / ATTACKS * 1e6
+
+
+async def transactions() -> float:
+    """Return microseconds per attack issued as one Apply Transaction call."""
+    operations = [
+        {"entity": "character", "entityId": "wizard", "mpDelta": -1},
+        {"entity": "monster", "entityId": "ogre", "hpDelta": -1},
+    ]
+    start = time.perf_counter()
+    for _ in range(ATTACKS):
+        await handle_call_tool("Apply Transaction", {"operations": operations})
+    return (time.perf_counter() - start) / ATTACKS * 1e6
+
+
+async def main() -> None:
+    """Print per-attack latency of separate updates vs. transactions."""
+    await setup()
+    separate = await separate_updates()
+    combined = await transactions()
+    print(f"{ATTACKS} attacks (tool execution only, no transport)")
+    print(f"{'mode':<20} {'us/attack':>10}")
+    print(f"{'two updates':<20} {separate:>10.1f}")
+    print(f"{'one transaction':<20} {combined:>10.1f}")
+    print(f"speedup: {separate / combined:.2f}x (1 call instead of 2, atomic)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,11 +3,33 @@ Character management logic for D&D characters.
 Handles character creation, updates, retrieval, and listing.
 """
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional, Any, Sequence, Tuple
+from dataclasses import dataclass, field, fields
 import datetime
+import functools
+from itertools import islice
 
+from src.servers.DnD_common.changelog import DELETE, UPSERT, ChangeLog
+from src.servers.DnD_common.derived import DerivedStats, placeholder_names, substitute_stats, update_paths
+from src.servers.DnD_common.effects import Effect, EffectScheduler
+from src.servers.DnD_common.expressions import compile_filter
+from src.servers.DnD_common.indexes import SortedIndex, build_index
+from src.servers.DnD_common.insertion_order import InsertionOrderIndex
+from src.servers.DnD_common.locks import EntityLocks
+from src.servers.DnD_common.name_search import NameIndex
+from src.servers.DnD_common.namespaces import NamespaceRegistry
+from src.servers.DnD_common.patch import apply_merge_patch, apply_patch, undo
+from src.servers.DnD_common.paths import overlaps, parse_path
+from src.servers.DnD_common.projection import copy_touched, projector_for
+from src.servers.DnD_common.query import index_candidates, parse_predicate
+from src.servers.DnD_common.serialization import cached_dict, cached_json
+from src.servers.DnD_common.transactions import WorkingCopy
+from src.servers.DnD_common.versioning import check_version, collection_etag, entity_etag
+from src.servers.DnD_common.vitals import VITAL_FIELDS, VitalsTable, vital_columns
+from src.servers.DnD_dice.dice_roller import parse_dice_notation, roll_dice_notation, roll_dice_notation_batch
 
+
+@vital_columns
 @dataclass
 class Character:
     """Represents a D&D character with life points, properties, and magic points."""
@@ -21,21 +43,226 @@ class Character:
     properties: Dict[str, Any] = field(default_factory=dict)
     created_at: str = field(default_factory=lambda: datetime.datetime.now(datetime.UTC).isoformat())
     updated_at: str = field(default_factory=lambda: datetime.datetime.now(datetime.UTC).isoformat())
+    version: int = 1
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert character to dictionary."""
-        return asdict(self)
+        """Convert character to dictionary (nested values are shared until the next write)."""
+        return dict(cached_dict(self))
+    
+    def to_json(self) -> str:
+        """Convert character to a JSON object, encoded at most once per version."""
+        return cached_json(self)
+    
+    def project(self, field_paths: Sequence[str]) -> Dict[str, Any]:
+        """
+        Convert only the selected fields to a dictionary.
+        
+        Args:
+            field_paths: Field names (camelCase or snake_case) or nested property
+                paths such as "properties.inventory.potions"
+        
+        Raises:
+            ValueError: If a field path is invalid
+        """
+        return projector_for(field_paths, CHARACTER_FIELDS)(self)
+    
+    @property
+    def etag(self) -> str:
+        """ETag of the current version; changes on every write."""
+        return entity_etag(self.version, self.created_at)
+    
+    def update_timestamp(self, timestamp: Optional[str] = None):
+        """Record a modification: bump the version (invalidating cached views) and update the updated_at timestamp."""
+        self.version += 1
+        self.updated_at = timestamp or datetime.datetime.now(datetime.UTC).isoformat()
+
+
+# Attribute names usable in field paths (projections, indexes, queries)
+CHARACTER_FIELDS = tuple(f.name for f in fields(Character))
+
+# Sorted views maintained on every write for ordered listings (orderBy)
+CHARACTER_SORTED_VIEWS = ("name", "currentHp", "properties.initiative")
+
+# Fields changed by HP/MP deltas, for derived stat invalidation
+_VITALS_PATHS = (("current_hp",), ("current_magic_points",))
+
+# Fields every committed write changes, besides the ones its updates changed
+_COMMIT_PATHS = (("version",), ("updated_at",))
+
+# Fields a transaction's working copy holds; updates change no others
+_STAGED_FIELDS = ("name", *VITAL_FIELDS, "properties")
+
+
+def _validate_vitals(current_hp: int, max_hp: int, current_magic_points: int, max_magic_points: int) -> None:
+    """
+    Validate a full set of HP and magic point values.
+    
+    Raises:
+        ValueError: If HP or magic points are invalid
+    """
+    if max_hp < 1:
+        raise ValueError("Maximum HP must be at least 1")
+    if current_hp < 0:
+        raise ValueError("Current HP cannot be negative")
+    if current_hp > max_hp:
+        raise ValueError("Current HP cannot exceed maximum HP")
+    if max_magic_points < 0:
+        raise ValueError("Maximum magic points cannot be negative")
+    if current_magic_points < 0:
+        raise ValueError("Current magic points cannot be negative")
+    if current_magic_points > max_magic_points:
+        raise ValueError("Current magic points cannot exceed maximum magic points")
+
+
+def _check_update(
+    current_hp: Optional[int],
+    current_magic_points: Optional[int],
+    hp_delta: Optional[int],
+    mp_delta: Optional[int]
+) -> None:
+    """
+    Reject updates that both set and change the same value.
+    
+    Raises:
+        ValueError: If a current value and its delta are both given
+    """
+    if current_hp is not None and hp_delta is not None:
+        raise ValueError("Cannot set current HP and apply an HP delta in the same update")
+    if current_magic_points is not None and mp_delta is not None:
+        raise ValueError("Cannot set current magic points and apply a magic point delta in the same update")
+
+
+def _property_paths(paths: Sequence[Tuple[str, ...]]) -> List[Tuple[str, ...]]:
+    """Get the paths into properties among changed field paths, relative to properties."""
+    return [path[1:] for path in paths if path[0] == "properties"]
+
+
+def _apply_update(
+    character: Character,
+    name: Optional[str] = None,
+    current_hp: Optional[int] = None,
+    max_hp: Optional[int] = None,
+    current_magic_points: Optional[int] = None,
+    max_magic_points: Optional[int] = None,
+    properties: Optional[Dict[str, Any]] = None,
+    hp_delta: Optional[int] = None,
+    mp_delta: Optional[int] = None,
+    patch: Optional[List[Dict[str, Any]]] = None,
+    merge_patch: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Change the given fields of a character in place, without bumping its version.
+    
+    Property changes are applied as a merge patch, then a JSON patch, then a
+    shallow merge of ``properties``. If any change is invalid, the character is
+    left as it was.
+    
+    Raises:
+        ValueError: If invalid values are provided
+    """
+    snapshot = (
+        character.name, character.current_hp, character.max_hp,
+        character.current_magic_points, character.max_magic_points
+    )
+    undo_log: List[Callable[[], None]] = []
+    try:
+        _apply_changes(
+            character, name, current_hp, max_hp, current_magic_points, max_magic_points,
+            hp_delta, mp_delta, patch, merge_patch, undo_log
+        )
+    except ValueError:
+        undo(undo_log)
+        (
+            character.name, character.current_hp, character.max_hp,
+            character.current_magic_points, character.max_magic_points
+        ) = snapshot
+        raise
     
-    def update_timestamp(self):
-        """Update the updated_at timestamp."""
-        self.updated_at = datetime.datetime.now(datetime.UTC).isoformat()
+    if properties is not None:
+        # Update/merge properties
+        character.properties.update(properties)
+
+
+def _apply_changes(
+    character: Character,
+    name: Optional[str],
+    current_hp: Optional[int],
+    max_hp: Optional[int],
+    current_magic_points: Optional[int],
+    max_magic_points: Optional[int],
+    hp_delta: Optional[int],
+    mp_delta: Optional[int],
+    patch: Optional[List[Dict[str, Any]]],
+    merge_patch: Optional[Dict[str, Any]],
+    undo_log: List[Callable[[], None]]
+) -> None:
+    """Apply the name, vitals and property patches of an update, recording property changes in ``undo_log``."""
+    if name is not None:
+        character.name = name
+    
+    if max_hp is not None:
+        if max_hp < 1:
+            raise ValueError("Maximum HP must be at least 1")
+        character.max_hp = max_hp
+    
+    if current_hp is not None:
+        if current_hp < 0:
+            raise ValueError("Current HP cannot be negative")
+        if current_hp > character.max_hp:
+            raise ValueError("Current HP cannot exceed maximum HP")
+        character.current_hp = current_hp
+    
+    if hp_delta is not None:
+        character.current_hp = max(0, min(character.current_hp + hp_delta, character.max_hp))
+    
+    if max_magic_points is not None:
+        if max_magic_points < 0:
+            raise ValueError("Maximum magic points cannot be negative")
+        character.max_magic_points = max_magic_points
+    
+    if current_magic_points is not None:
+        if current_magic_points < 0:
+            raise ValueError("Current magic points cannot be negative")
+        if current_magic_points > character.max_magic_points:
+            raise ValueError("Current magic points cannot exceed maximum magic points")
+        character.current_magic_points = current_magic_points
+    
+    if mp_delta is not None:
+        character.current_magic_points = max(
+            0, min(character.current_magic_points + mp_delta, character.max_magic_points)
+        )
+    
+    if merge_patch is not None:
+        apply_merge_patch(character.properties, merge_patch, undo_log)
+    
+    if patch is not None:
+        apply_patch(character.properties, patch, undo_log)
 
 
 class CharacterManager:
-    """Manages D&D characters in memory."""
+    """
+    Manages D&D characters in memory.
+    
+    Writes hold the per-character locks in ``locks``, so operations on
+    different characters never wait for each other. Callers that coordinate
+    several operations (from threads or asyncio tasks) can hold the same
+    locks; they are reentrant for the holding thread or task.
+    """
     
     def __init__(self):
         self._characters: Dict[str, Character] = {}
+        self._vitals = VitalsTable()
+        self._order = InsertionOrderIndex()
+        self._indexes: Dict[str, Any] = {}
+        self._views: Dict[str, SortedIndex] = {}
+        for path in CHARACTER_SORTED_VIEWS:
+            parts = parse_path(path, CHARACTER_FIELDS)
+            self._views[".".join(parts)] = SortedIndex(parts)
+        self._names = NameIndex()
+        self._changes = ChangeLog()
+        self.locks = EntityLocks()
+        self.derived = DerivedStats(CHARACTER_FIELDS)
+        self.effects = EffectScheduler()
     
     def set_character(
         self,
@@ -45,11 +272,14 @@ class CharacterManager:
         max_hp: int,
         current_magic_points: int,
         max_magic_points: int,
-        properties: Optional[Dict[str, Any]] = None
+        properties: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None
     ) -> Character:
         """
         Create or completely replace a character.
         
+        A replaced character continues the version sequence of the previous one.
+        
         Args:
             character_id: Unique identifier for the character
             name: Character name
@@ -58,38 +288,154 @@ class CharacterManager:
             current_magic_points: Current magic points
             max_magic_points: Maximum magic points
             properties: Dictionary of character properties (strength, dexterity, etc.)
+            expected_version: Fail unless the stored version matches; 0 means
+                the character must not exist yet (optional)
         
         Returns:
             The created/updated Character object
         
         Raises:
+            VersionConflictError: If expected_version does not match
             ValueError: If HP or magic points are invalid
         """
-        if max_hp < 1:
-            raise ValueError("Maximum HP must be at least 1")
-        if current_hp < 0:
-            raise ValueError("Current HP cannot be negative")
-        if current_hp > max_hp:
-            raise ValueError("Current HP cannot exceed maximum HP")
-        if max_magic_points < 0:
-            raise ValueError("Maximum magic points cannot be negative")
-        if current_magic_points < 0:
-            raise ValueError("Current magic points cannot be negative")
-        if current_magic_points > max_magic_points:
-            raise ValueError("Current magic points cannot exceed maximum magic points")
-        
-        character = Character(
-            character_id=character_id,
-            name=name,
-            current_hp=current_hp,
-            max_hp=max_hp,
-            current_magic_points=current_magic_points,
-            max_magic_points=max_magic_points,
-            properties=properties or {}
-        )
+        _validate_vitals(current_hp, max_hp, current_magic_points, max_magic_points)
         
+        with self.locks.hold(character_id):
+            previous = self._characters.get(character_id)
+            check_version(character_id, previous.version if previous else 0, expected_version)
+            
+            character = Character(
+                character_id=character_id,
+                name=name,
+                current_hp=current_hp,
+                max_hp=max_hp,
+                current_magic_points=current_magic_points,
+                max_magic_points=max_magic_points,
+                properties=properties or {},
+                version=previous.version + 1 if previous else 1
+            )
+            self._install(character_id, character, previous)
+            return character
+    
+    def _install(self, character_id: str, character: Character, previous: Optional[Character]) -> None:
+        """Store a new or replacement character. The caller holds the character's lock."""
+        if previous is not None:
+            self._vitals.detach(character_id, previous)
+        self._vitals.attach(character_id, character)
         self._characters[character_id] = character
-        return character
+        self._order.add(character_id)
+        self._reindex(character_id, character)
+    
+    def _reindex(self, character_id: str, character: Character) -> None:
+        """Refresh the secondary indexes and sorted views after a write. The caller holds the character's lock."""
+        for index in self._indexes.values():
+            index.update(character_id, character)
+        for view in self._views.values():
+            view.update(character_id, character)
+        self._names.update(character_id, character.name)
+        self._changes.record(character_id, UPSERT)
+    
+    def _reindex_paths(self, character_id: str, character: Character, changed: List[Tuple[str, ...]]) -> None:
+        """
+        Refresh only the indexes and sorted views that read a changed path, after an in-place write.
+        
+        The caller holds the character's lock.
+        """
+        changed = [*changed, *_COMMIT_PATHS]
+        attributes = {path[0] for path in changed}
+        for index in self._indexes.values():
+            if index.parts[0] in attributes and any(overlaps(index.parts, path) for path in changed):
+                index.update(character_id, character)
+        for view in self._views.values():
+            if view.parts[0] in attributes and any(overlaps(view.parts, path) for path in changed):
+                view.update(character_id, character)
+        if "name" in attributes:
+            self._names.update(character_id, character.name)
+        self._changes.record(character_id, UPSERT)
+    
+    def _reindex_many(self, characters: List[Character]) -> None:
+        """
+        Refresh the secondary indexes and sorted views after a bulk write and log its changes at once.
+        
+        The caller holds the characters' locks.
+        """
+        entries = [(character.character_id, character) for character in characters]
+        for index in self._indexes.values():
+            index.update_many(entries)
+        for view in self._views.values():
+            view.update_many(entries)
+        for character_id, character in entries:
+            self._names.update(character_id, character.name)
+        self._changes.record_many([character_id for character_id, _ in entries], UPSERT)
+    
+    def set_characters(self, entries: List[Dict[str, Any]], atomic: bool = True) -> Dict[str, Any]:
+        """
+        Create or replace many characters in one call.
+        
+        Every entry is validated in a single pass before anything is written.
+        In atomic mode a single invalid entry rejects the whole batch; otherwise
+        the valid entries are applied and the invalid ones are reported. Later
+        entries for the same ID replace earlier ones.
+        
+        Args:
+            entries: List of dictionaries with the arguments of set_character
+                (character_id, name, current_hp, max_hp, current_magic_points,
+                max_magic_points, and optionally properties and expected_version)
+            atomic: Apply all entries or none of them (default True)
+        
+        Returns:
+            Summary dictionary with "applied", "failed" and per-item "errors"
+            ({"index", "character_id", "error"})
+        """
+        character_ids = [entry.get("character_id") for entry in entries]
+        with self.locks.hold(*character_ids):
+            valid: List[tuple] = []
+            errors: List[Dict[str, Any]] = []
+            versions: Dict[str, int] = {}
+            for index, entry in enumerate(entries):
+                character_id = entry.get("character_id")
+                try:
+                    if not character_id:
+                        raise ValueError("Missing required argument: character_id")
+                    if not entry.get("name"):
+                        raise ValueError("Missing required argument: name")
+                    for key in ("current_hp", "max_hp", "current_magic_points", "max_magic_points"):
+                        if entry.get(key) is None:
+                            raise ValueError(f"Missing required argument: {key}")
+                    _validate_vitals(
+                        entry["current_hp"], entry["max_hp"],
+                        entry["current_magic_points"], entry["max_magic_points"]
+                    )
+                    if character_id not in versions:
+                        previous = self._characters.get(character_id)
+                        versions[character_id] = previous.version if previous else 0
+                    check_version(character_id, versions[character_id], entry.get("expected_version"))
+                    versions[character_id] += 1
+                except ValueError as e:
+                    errors.append({"index": index, "character_id": character_id, "error": str(e)})
+                    continue
+                valid.append((character_id, entry, versions[character_id]))
+            
+            if errors and atomic:
+                valid = []
+            
+            timestamp = datetime.datetime.now(datetime.UTC).isoformat()
+            for character_id, entry, version in valid:
+                character = Character(
+                    character_id=character_id,
+                    name=entry["name"],
+                    current_hp=entry["current_hp"],
+                    max_hp=entry["max_hp"],
+                    current_magic_points=entry["current_magic_points"],
+                    max_magic_points=entry["max_magic_points"],
+                    properties=entry.get("properties") or {},
+                    created_at=timestamp,
+                    updated_at=timestamp,
+                    version=version
+                )
+                self._install(character_id, character, self._characters.get(character_id))
+            
+            return {"applied": len(valid), "failed": len(errors), "errors": errors}
     
     def get_character(self, character_id: str) -> Character:
         """
@@ -117,11 +463,22 @@ class CharacterManager:
         max_hp: Optional[int] = None,
         current_magic_points: Optional[int] = None,
         max_magic_points: Optional[int] = None,
-        properties: Optional[Dict[str, Any]] = None
+        properties: Optional[Dict[str, Any]] = None,
+        hp_delta: Optional[int] = None,
+        mp_delta: Optional[int] = None,
+        expected_version: Optional[int] = None,
+        patch: Optional[List[Dict[str, Any]]] = None,
+        merge_patch: Optional[Dict[str, Any]] = None
     ) -> Character:
         """
         Update specific fields of an existing character.
         
+        HP and magic points can be set absolutely or changed by a delta. Deltas
+        are applied server-side against the stored value and clamped to [0, max],
+        so concurrent damage/healing never overwrites another update. Likewise
+        ``patch`` and ``merge_patch`` change nested properties in place, leaving
+        the rest of each subtree untouched. The update is all-or-nothing.
+        
         Args:
             character_id: Unique identifier for the character
             name: New character name (optional)
@@ -130,49 +487,126 @@ class CharacterManager:
             current_magic_points: New current magic points (optional)
             max_magic_points: New maximum magic points (optional)
             properties: Dictionary of properties to update/add (optional)
+            hp_delta: Change to apply to current hit points, clamped (optional)
+            mp_delta: Change to apply to current magic points, clamped (optional)
+            expected_version: Fail unless the stored version matches (optional)
+            patch: JSON Patch operations on properties, e.g.
+                {"op": "increment", "path": "/inventory/potions/count", "value": -1} (optional)
+            merge_patch: JSON Merge Patch of properties; null removes a key (optional)
         
         Returns:
             The updated Character object
         
         Raises:
+            VersionConflictError: If expected_version does not match
             ValueError: If character not found or invalid values provided
         """
-        character = self.get_character(character_id)
+        _check_update(current_hp, current_magic_points, hp_delta, mp_delta)
         
-        # Update fields if provided
-        if name is not None:
-            character.name = name
+        with self.locks.hold(character_id):
+            character = self.get_character(character_id)
+            check_version(character_id, character.version, expected_version)
+            previous_version = character.version
+            _apply_update(character, name, current_hp, max_hp, current_magic_points, max_magic_points, properties, hp_delta, mp_delta, patch, merge_patch)
+            character.update_timestamp()
+            self.derived.invalidate(character, previous_version, update_paths(
+                name=name, current_hp=current_hp, max_hp=max_hp,
+                current_magic_points=current_magic_points, max_magic_points=max_magic_points,
+                properties=properties, hp_delta=hp_delta, mp_delta=mp_delta,
+                patch=patch, merge_patch=merge_patch
+            ))
+            self._reindex(character_id, character)
+            return character
+    
+    def stage_update(
+        self,
+        staged: Dict[str, WorkingCopy],
+        character_id: str,
+        expected_version: Optional[int] = None,
+        **changes: Any
+    ) -> WorkingCopy:
+        """
+        Apply an update to a working copy of a character (first phase of a transaction).
         
-        if max_hp is not None:
-            if max_hp < 1:
-                raise ValueError("Maximum HP must be at least 1")
-            character.max_hp = max_hp
+        The first update of a character adds a working copy to ``staged``; later
+        updates change the same copy. The copy shares the stored properties
+        until an update changes them, and then deep-copies only the top-level
+        keys that update changes. Nothing is visible to readers until
+        ``commit_staged``. The caller holds the character's lock until then.
         
-        if current_hp is not None:
-            if current_hp < 0:
-                raise ValueError("Current HP cannot be negative")
-            if current_hp > character.max_hp:
-                raise ValueError("Current HP cannot exceed maximum HP")
-            character.current_hp = current_hp
+        Args:
+            staged: Working copies of this transaction by character ID
+            character_id: Unique identifier for the character
+            expected_version: Fail unless the stored version matches (optional)
+            **changes: Arguments of update_character (name, current_hp, hp_delta, ...)
         
-        if max_magic_points is not None:
-            if max_magic_points < 0:
-                raise ValueError("Maximum magic points cannot be negative")
-            character.max_magic_points = max_magic_points
+        Returns:
+            The working copy
         
-        if current_magic_points is not None:
-            if current_magic_points < 0:
-                raise ValueError("Current magic points cannot be negative")
-            if current_magic_points > character.max_magic_points:
-                raise ValueError("Current magic points cannot exceed maximum magic points")
-            character.current_magic_points = current_magic_points
+        Raises:
+            VersionConflictError: If expected_version does not match
+            ValueError: If character not found or invalid values provided
+        """
+        _check_update(
+            changes.get("current_hp"), changes.get("current_magic_points"),
+            changes.get("hp_delta"), changes.get("mp_delta")
+        )
+        working = staged.get(character_id)
+        if working is None:
+            working = WorkingCopy(self.get_character(character_id), _STAGED_FIELDS)
+            staged[character_id] = working
+        check_version(character_id, working.version, expected_version)
+        changed = update_paths(**changes)
+        property_paths = _property_paths(changed)
+        if property_paths:
+            if working.properties is working.entity.properties:
+                working.properties = dict(working.entity.properties)
+            copy_touched(working.properties, property_paths, _property_paths(working.paths))
+        _apply_update(working, **changes)
+        working.paths.extend(changed)
+        return working
+    
+    def commit_staged(self, staged: Dict[str, WorkingCopy], timestamp: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Write the working copies of a transaction to the stored characters (second phase), all with one timestamp.
         
-        if properties is not None:
-            # Update/merge properties
-            character.properties.update(properties)
+        Only the indexes and sorted views that read a changed path are
+        refreshed. Each working copy in ``staged`` is replaced by its character.
+        The caller still holds their locks. If writing fails part-way, the
+        characters written so far are restored before the error is raised.
         
-        character.update_timestamp()
-        return character
+        Returns:
+            Journal of the replaced values by character ID, for ``restore``
+        """
+        timestamp = timestamp or datetime.datetime.now(datetime.UTC).isoformat()
+        journal: Dict[str, Dict[str, Any]] = {}
+        try:
+            for character_id, working in staged.items():
+                character = working.entity
+                previous_version = character.version
+                journal[character_id] = working.write()
+                character.update_timestamp(timestamp)
+                self.derived.invalidate(character, previous_version, working.paths)
+                self._reindex_paths(character_id, character, working.paths)
+                staged[character_id] = character
+        except BaseException:
+            self.restore(journal)
+            raise
+        return journal
+    
+    def restore(self, journal: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write back the values replaced by ``commit_staged`` (rolls a transaction back). The caller holds the locks.
+        
+        The rollback is a write of its own: versions keep increasing, so no
+        cached view or ETag of the rolled-back state is reused.
+        """
+        for character_id, previous in journal.items():
+            character = self.get_character(character_id)
+            for name, value in previous.items():
+                setattr(character, name, value)
+            character.update_timestamp()
+            self._reindex(character_id, character)
     
     def list_characters(self) -> List[Character]:
         """
@@ -183,6 +617,100 @@ class CharacterManager:
         """
         return list(self._characters.values())
     
+    def page_characters(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[Character], Optional[str]]:
+        """
+        List one page of characters in stable insertion order.
+        
+        Cursors stay valid when characters are added or deleted between pages;
+        a replaced character keeps its original position.
+        
+        Args:
+            limit: Maximum number of characters to return
+            cursor: Cursor from a previous page (optional, starts at the beginning)
+        
+        Returns:
+            Tuple of (characters, next cursor or None when there are no more)
+        
+        Raises:
+            ValueError: If the limit or cursor is invalid
+        """
+        character_ids, next_cursor = self._order.page(limit, cursor)
+        characters = [self._characters.get(character_id) for character_id in character_ids]
+        return [char for char in characters if char is not None], next_cursor
+    
+    def order_characters(
+        self,
+        order_by: str,
+        descending: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Character]:
+        """
+        List characters ordered by a field, reading only the first ``limit`` entries of a sorted view.
+        
+        Characters without a value for the field come last, in insertion order.
+        Ties are broken by character ID.
+        
+        Args:
+            order_by: A sorted view (name, currentHp, properties.initiative) or
+                any field with a sorted index
+            descending: Whether to return the largest values first
+            limit: Maximum number of characters to return (optional, default all)
+        
+        Returns:
+            List of characters in the requested order
+        
+        Raises:
+            ValueError: If there is no sorted view or sorted index for the field
+        """
+        path = ".".join(parse_path(order_by, CHARACTER_FIELDS))
+        view = self._views.get(path)
+        if view is None and getattr(self._indexes.get(path), "kind", None) == "sorted":
+            view = self._indexes[path]
+        if view is None:
+            raise ValueError(
+                f"Cannot order by '{order_by}': sorted views are {', '.join(CHARACTER_SORTED_VIEWS)}; "
+                "create a sorted index to order by another field"
+            )
+        ids = view.first(limit, descending)
+        if limit is None or len(ids) < limit:
+            missing = (character_id for character_id in self._order.ordered(list(self._characters)) if character_id not in view)
+            ids.extend(missing if limit is None else islice(missing, limit - len(ids)))
+        characters = (self._characters.get(character_id) for character_id in ids)
+        return [character for character in characters if character is not None]
+    
+    def search_characters(
+        self,
+        query: str,
+        limit: int = 10,
+        fuzzy: bool = True
+    ) -> List[Tuple[Character, float, str]]:
+        """
+        Search characters by name.
+        
+        Exact matches come first, then names with a word starting with the
+        query, then (if fuzzy) typo-tolerant matches; each group is ranked by
+        trigram similarity.
+        
+        Args:
+            query: Name or name prefix to search for
+            limit: Maximum number of results (default 10)
+            fuzzy: Whether to include typo-tolerant matches (default True)
+        
+        Returns:
+            List of (character, similarity score, match kind) tuples, where the
+            match kind is "exact", "prefix" or "fuzzy"
+        """
+        results = []
+        for character_id, score, kind in self._names.search(query, limit, fuzzy):
+            character = self._characters.get(character_id)
+            if character is not None:
+                results.append((character, score, kind))
+        return results
+    
+    def count_characters(self) -> int:
+        """Get the number of characters."""
+        return len(self._characters)
+    
     def delete_character(self, character_id: str) -> None:
         """
         Delete a character by ID.
@@ -193,16 +721,554 @@ class CharacterManager:
         Raises:
             ValueError: If character not found
         """
-        if character_id not in self._characters:
+        with self.locks.hold(character_id):
+            if character_id not in self._characters:
+                raise ValueError(f"Character with ID '{character_id}' not found")
+            
+            self._vitals.detach(character_id, self._characters.pop(character_id))
+            self._order.remove(character_id)
+            for index in self._indexes.values():
+                index.remove(character_id)
+            for view in self._views.values():
+                view.remove(character_id)
+            self._names.remove(character_id)
+            self._changes.record(character_id, DELETE)
+            self.effects.remove_entity(character_id)
+    
+    def apply_deltas(self, deltas: List[Dict[str, Any]]) -> List[Character]:
+        """
+        Apply HP and magic point deltas to many characters in one pass.
+        
+        Negative deltas deal damage or spend magic points, positive deltas heal
+        or recover them. Results are clamped to [0, max]. Deltas for the same
+        character are summed. Nothing is changed if any character is missing.
+        The characters' locks are all held for the duration of the batch.
+        
+        Args:
+            deltas: List of {"character_id", "hp_delta", "mp_delta"} dictionaries
+        
+        Returns:
+            The updated Character objects, one per distinct character
+        
+        Raises:
+            ValueError: If any character is not found
+        """
+        character_ids = [delta["character_id"] for delta in deltas]
+        totals: Dict[str, List[int]] = {}
+        with self.locks.hold(*character_ids):
+            for delta in deltas:
+                character_id = delta["character_id"]
+                if character_id not in self._characters:
+                    raise ValueError(f"Character with ID '{character_id}' not found")
+                total = totals.setdefault(character_id, [0, 0])
+                total[0] += delta.get("hp_delta") or 0
+                total[1] += delta.get("mp_delta") or 0
+            
+            rows = [self._vitals.row_of(character_id) for character_id in totals]
+            self._vitals.apply_deltas(
+                rows,
+                [total[0] for total in totals.values()],
+                [total[1] for total in totals.values()],
+            )
+            
+            timestamp = datetime.datetime.now(datetime.UTC).isoformat()
+            characters = [self._characters[character_id] for character_id in totals]
+            for character in characters:
+                previous_version = character.version
+                character.update_timestamp(timestamp)
+                self.derived.invalidate(character, previous_version, _VITALS_PATHS)
+            self._reindex_many(characters)
+            return characters
+    
+    def _rest(
+        self,
+        character_ids: Optional[Sequence[str]],
+        recover: Callable[[List[int]], List[int]]
+    ) -> Tuple[List[Character], List[str]]:
+        """
+        Recover the vitals of many characters in one pass over the vitals table.
+        
+        Only characters whose values changed get a new version and a change
+        record; the records of the whole batch are logged at once.
+        
+        Args:
+            character_ids: Characters to update (None for every character)
+            recover: Called with the characters' vitals rows; applies the
+                recovery and returns the positions of the rows it changed
+        
+        Returns:
+            The updated characters and the IDs of defeated (0 HP) characters,
+            which rests and regeneration leave untouched
+        
+        Raises:
+            ValueError: If an explicitly requested character is not found
+        """
+        everyone = character_ids is None
+        character_ids = list(dict.fromkeys(self._characters if everyone else character_ids))
+        with self.locks.hold(*character_ids):
+            characters = []
+            for character_id in character_ids:
+                character = self._characters.get(character_id)
+                if character is not None:
+                    characters.append(character)
+                elif not everyone:
+                    raise ValueError(f"Character with ID '{character_id}' not found")
+            
+            rows = [self._vitals.row_of(character.character_id) for character in characters]
+            changed = [characters[position] for position in recover(rows)]
+            
+            timestamp = datetime.datetime.now(datetime.UTC).isoformat()
+            for character in changed:
+                previous_version = character.version
+                character.update_timestamp(timestamp)
+                self.derived.invalidate(character, previous_version, _VITALS_PATHS)
+            self._reindex_many(changed)
+            defeated = [character.character_id for character in characters if character.current_hp <= 0]
+        return changed, defeated
+    
+    def long_rest(self, character_ids: Optional[Sequence[str]] = None) -> Tuple[List[Character], List[str]]:
+        """
+        Restore HP and magic points of many characters to their maximum.
+        
+        Args:
+            character_ids: Characters resting (optional, default every character)
+        
+        Returns:
+            The characters whose vitals changed and the IDs of defeated characters
+        
+        Raises:
+            ValueError: If a character is not found
+        """
+        return self._rest(character_ids, self._vitals.recover)
+    
+    def short_rest(
+        self,
+        character_ids: Optional[Sequence[str]] = None,
+        hp_dice: Optional[str] = None,
+        mp_dice: Optional[str] = None
+    ) -> Tuple[List[Character], List[str]]:
+        """
+        Recover HP and/or magic points of many characters by rolling dice for each.
+        
+        Each character gets its own roll; the rolls of the batch are made at once.
+        Recovery is capped at the maximum.
+        
+        Args:
+            character_ids: Characters resting (optional, default every character)
+            hp_dice: Dice notation of the HP recovered, e.g. "1d8+2" (optional)
+            mp_dice: Dice notation of the magic points recovered (optional)
+        
+        Returns:
+            The characters whose vitals changed and the IDs of defeated characters
+        
+        Raises:
+            ValueError: If neither notation is given, a notation is invalid
+                or a character is not found
+        """
+        if hp_dice is None and mp_dice is None:
+            raise ValueError("A short rest needs hp_dice and/or mp_dice")
+        
+        def recover(rows: List[int]) -> List[int]:
+            count = len(rows)
+            hp = roll_dice_notation_batch(hp_dice, count) if hp_dice is not None else [0] * count
+            mp = roll_dice_notation_batch(mp_dice, count) if mp_dice is not None else [0] * count
+            return self._vitals.recover(rows, hp, mp)
+        
+        return self._rest(character_ids, recover)
+    
+    def regenerate(
+        self,
+        character_ids: Optional[Sequence[str]] = None,
+        hp: int = 0,
+        mp: int = 0
+    ) -> Tuple[List[Character], List[str]]:
+        """
+        Recover a fixed amount of HP and magic points for many characters.
+        
+        Args:
+            character_ids: Characters regenerating (optional, default every character)
+            hp: HP recovered by each character
+            mp: Magic points recovered by each character
+        
+        Returns:
+            The characters whose vitals changed and the IDs of defeated characters
+        
+        Raises:
+            ValueError: If an amount is negative or a character is not found
+        """
+        if hp < 0 or mp < 0:
+            raise ValueError("Regeneration amounts cannot be negative")
+        return self._rest(character_ids, lambda rows: self._vitals.recover(rows, [hp] * len(rows), [mp] * len(rows)))
+    
+    def get_character_etag(self, character_id: str) -> str:
+        """
+        Get the ETag of a character without building its record.
+        
+        Raises:
+            ValueError: If character not found
+        """
+        character = self._characters.get(character_id)
+        if character is None:
             raise ValueError(f"Character with ID '{character_id}' not found")
+        return character.etag
+    
+    def listing_etag(self, request: Dict[str, Any]) -> str:
+        """
+        Get the ETag of a listing of this manager's characters.
+        
+        It changes with every write to any character, so it must be read before
+        the listing is built.
+        
+        Args:
+            request: Arguments that shape the listing (limit, cursor, fields...)
+        """
+        return collection_etag(self._changes.log_id, self._changes.latest_seq, request)
+    
+    def changes_since(self, seq: int, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get the characters created, changed or deleted after a sequence number.
+        
+        Every write gets the next sequence number of this manager. Only the
+        most recent changes are kept; a client whose sequence number has left
+        that window must list all characters again.
+        
+        Args:
+            seq: Last sequence number the client has seen (0 to start)
+            limit: Maximum number of changed characters to return (optional)
+        
+        Returns:
+            Dictionary with "changes" as (seq, character ID, Character or None if deleted)
+            tuples in sequence order, "seq" to pass on the next call, "has_more"
+            and "resync_required"
+        
+        Raises:
+            ValueError: If the sequence number or limit is invalid
+        """
+        latest_seq = self._changes.latest_seq
+        entries, has_more, resync_required = self._changes.since(seq, limit)
+        changes = []
+        for change_seq, character_id, op in entries:
+            character = self._characters.get(character_id) if op == UPSERT else None
+            changes.append((change_seq, character_id, character))
+        if has_more:
+            latest_seq = entries[-1][0]
+        elif entries:
+            latest_seq = max(latest_seq, entries[-1][0])
+        return {
+            "changes": changes,
+            "seq": latest_seq,
+            "has_more": has_more,
+            "resync_required": resync_required,
+        }
+    
+    def add_change_listener(self, callback: Callable[[str, str], None]) -> None:
+        """
+        Call back (character ID, op) after every write, where op is "upsert" or "delete".
+        
+        Callbacks run in the writer's thread while it holds the character's lock,
+        so they must be cheap and must not raise.
+        """
+        self._changes.add_listener(callback)
+    
+    def define_derived_stat(self, name: str, formula: str) -> None:
+        """
+        Define or replace a derived stat computed from character fields and other stats.
+        
+        Args:
+            name: Stat name, e.g. "strengthModifier"
+            formula: Filter expression language formula, e.g.
+                "floor((properties.strength - 10) / 2)"; other stats are read as
+                derived.<name>
+        
+        Raises:
+            ValueError: If the name or formula is invalid or stats would depend on themselves
+        """
+        self.derived.define(name, formula)
+    
+    def drop_derived_stat(self, name: str) -> None:
+        """
+        Remove a derived stat.
+        
+        Raises:
+            ValueError: If the stat does not exist or other stats read it
+        """
+        self.derived.drop(name)
+    
+    def list_derived_stats(self) -> Dict[str, str]:
+        """Get the formula of every derived stat by name."""
+        return self.derived.formulas()
+    
+    def get_derived_stats(self, character_id: str, names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Get the derived stats of a character.
+        
+        Values are memoized until an update changes a field they read. Stats
+        whose inputs are missing are left out.
+        
+        Args:
+            character_id: Unique identifier for the character
+            names: Stats to get (optional, default all)
+        
+        Raises:
+            ValueError: If character not found or a name is not a derived stat
+        """
+        return self.derived.values(self.get_character(character_id), names)
+    
+    def roll_check(self, character_id: str, notation: str) -> Tuple[int, str, str]:
+        """
+        Roll dice notation in which {stat} placeholders are replaced by the character's derived stats.
+        
+        Args:
+            character_id: Unique identifier for the character
+            notation: Dice notation such as "1d20+{strengthModifier}+{proficiencyBonus}"
+        
+        Returns:
+            Tuple of (total, breakdown, notation with the stats filled in)
+        
+        Raises:
+            ValueError: If character not found, a stat has no integer value or the notation is invalid
+        """
+        resolved = substitute_stats(notation, self.get_derived_stats(character_id, placeholder_names(notation)))
+        total, details = roll_dice_notation(resolved)
+        return total, details, resolved
+    
+    def add_effect(
+        self,
+        character_id: str,
+        name: str,
+        damage_dice: Optional[str] = None,
+        hp_delta: int = 0,
+        mp_delta: int = 0,
+        every: int = 1,
+        rounds: Optional[int] = None
+    ) -> Effect:
+        """
+        Add a per-round effect or condition to a character, e.g. poison or regeneration.
+        
+        The effect first ticks ``every`` rounds after the current round and
+        ticks on its last round before it expires.
+        
+        Args:
+            character_id: Unique identifier for the character
+            name: Effect name, e.g. "poisoned"
+            damage_dice: Dice notation of the damage dealt on every tick (optional)
+            hp_delta: HP change on every tick (negative for damage)
+            mp_delta: Magic point change on every tick
+            every: Rounds between ticks
+            rounds: Rounds until the effect expires (None lasts until removed)
+        
+        Returns:
+            The new Effect
+        
+        Raises:
+            ValueError: If character not found, the dice notation is invalid, or
+                the interval or duration is not positive
+        """
+        self.get_character(character_id)
+        if damage_dice is not None:
+            parse_dice_notation(damage_dice)
+        return self.effects.add(character_id, name, damage_dice, hp_delta, mp_delta, every, rounds)
+    
+    def remove_effect(self, effect_id: str) -> Effect:
+        """
+        Remove an effect before it expires.
+        
+        Raises:
+            ValueError: If the effect does not exist
+        """
+        return self.effects.remove(effect_id)
+    
+    def list_effects(self, character_id: Optional[str] = None) -> List[Effect]:
+        """Get the active effects of a character, or of every character."""
+        return self.effects.effects(character_id)
+    
+    def advance_round(self, rounds: int = 1) -> Dict[str, Any]:
+        """
+        Advance the effects by one or more rounds.
+        
+        Only effects that fall due are visited. The ticks of each round are
+        applied together: the damage dice of every effect sharing a
+        notation are rolled in one batch, and all HP/MP changes go through
+        ``apply_deltas`` in one pass.
+        
+        Args:
+            rounds: Number of rounds to advance
+        
+        Returns:
+            Dictionary with the new "round", the "ticks" applied as
+            (effect, hp change, mp change) tuples, the "expired" effects and
+            the updated characters ("characters", one per character)
+        
+        Raises:
+            ValueError: If rounds is not positive
+        """
+        if rounds < 1:
+            raise ValueError(f"Rounds must be at least 1, got {rounds}")
+        ticks: List[Tuple[Effect, int, int]] = []
+        expired: List[Effect] = []
+        updated: Dict[str, Character] = {}
+        for _ in range(rounds):
+            _, ticking, ended = self.effects.advance()
+            expired.extend(ended)
+            if not ticking:
+                continue
+            
+            by_notation: Dict[str, List[Effect]] = {}
+            for effect in ticking:
+                if effect.damage_dice:
+                    by_notation.setdefault(effect.damage_dice, []).append(effect)
+            damage: Dict[str, int] = {}
+            for notation, effects in by_notation.items():
+                for effect, roll in zip(effects, roll_dice_notation_batch(notation, len(effects))):
+                    damage[effect.effect_id] = max(roll, 0)
+            
+            with self.locks.hold(*(effect.entity_id for effect in ticking)):
+                deltas = []
+                for effect in ticking:
+                    if effect.entity_id not in self._characters:
+                        continue
+                    hp_change = effect.hp_delta - damage.get(effect.effect_id, 0)
+                    ticks.append((effect, hp_change, effect.mp_delta))
+                    deltas.append({"character_id": effect.entity_id, "hp_delta": hp_change, "mp_delta": effect.mp_delta})
+                if deltas:
+                    for character in self.apply_deltas(deltas):
+                        updated[character.character_id] = character
+        return {
+            "round": self.effects.round,
+            "ticks": ticks,
+            "expired": expired,
+            "characters": list(updated.values()),
+        }
+    
+    def create_index(self, field_path: str, kind: str = "hash") -> int:
+        """
+        Create (or rebuild) a secondary index on a character field.
+        
+        Hash indexes answer equality ("eq", "in") lookups and suit categorical
+        values such as properties.class; sorted indexes also answer range
+        lookups ("lt", "le", "gt", "ge") and suit numbers such as properties.level.
+        Indexes are maintained on every set, update and delete.
+        
+        Args:
+            field_path: Field name or nested property path (e.g. "properties.class")
+            kind: "hash" or "sorted"
+        
+        Returns:
+            Number of characters with a value for the field
+        
+        Raises:
+            ValueError: If the field path or kind is invalid
+        """
+        parts = parse_path(field_path, CHARACTER_FIELDS)
+        index = build_index(kind, parts, list(self._characters.items()))
+        self._indexes[".".join(parts)] = index
+        return len(index)
+    
+    def drop_index(self, field_path: str) -> None:
+        """
+        Remove a secondary index.
         
-        del self._characters[character_id]
+        Raises:
+            ValueError: If there is no index on the field
+        """
+        path = ".".join(parse_path(field_path, CHARACTER_FIELDS))
+        if self._indexes.pop(path, None) is None:
+            raise ValueError(f"No index on field '{field_path}'")
+    
+    def list_indexes(self) -> Dict[str, str]:
+        """Get the indexed field paths and their index kinds."""
+        return {path: index.kind for path, index in self._indexes.items()}
+    
+    def query_characters(
+        self,
+        where: Optional[List[Tuple[str, str, Any]]] = None,
+        limit: Optional[int] = None,
+        filter_expression: Optional[str] = None
+    ) -> Tuple[List[Character], Dict[str, Any]]:
+        """
+        Find characters matching all of the given predicates and filter expression.
+        
+        Equality and range predicates on indexed fields are answered from the
+        indexes; the remaining predicates are checked only on those candidates.
+        Top-level ``and`` conjuncts of the filter expression that compare a
+        field with a literal are pushed down to the indexes in the same way.
+        Without a usable index every character is scanned.
+        
+        Args:
+            where: List of (field path, operator, value) predicates; operators are
+                eq, ne, lt, le, gt, ge, in, contains (or ==, !=, <, <=, >, >=)
+            limit: Maximum number of characters to return (optional)
+            filter_expression: Expression such as
+                ``currentHp < maxHp * 0.25 and properties.class == "Wizard"`` (optional)
+        
+        Returns:
+            Tuple of (matching characters in insertion order, plan dictionary
+            with the "indexes" used and the number of characters "scanned")
+        
+        Raises:
+            ValueError: If a predicate or the filter expression is invalid
+        """
+        predicates = [parse_predicate(field_path, op, value, CHARACTER_FIELDS) for field_path, op, value in where or ()]
+        compiled = compile_filter(filter_expression, CHARACTER_FIELDS) if filter_expression else None
+        pushdown = predicates + list(compiled.conjuncts) if compiled else predicates
+        candidates, used = index_candidates(pushdown, self._indexes)
+        if candidates is None:
+            pool = list(self._characters.values())
+        else:
+            pool = [self._characters.get(character_id) for character_id in self._order.ordered(candidates)]
+        
+        matches: List[Character] = []
+        scanned = 0
+        for character in pool:
+            if limit is not None and len(matches) >= limit:
+                break
+            if character is None:
+                continue
+            scanned += 1
+            if all(predicate.matches(character) for predicate in predicates) and (
+                compiled is None or compiled.matches(character)
+            ):
+                matches.append(character)
+        return matches, {"indexes": list(dict.fromkeys(used)), "scanned": scanned}
 
 
-# Global character manager instance
-_character_manager = CharacterManager()
+# Character managers, one per campaign
+_character_managers = NamespaceRegistry(CharacterManager)
 
 
-def get_character_manager() -> CharacterManager:
-    """Get the global character manager instance."""
-    return _character_manager
+def get_character_manager(campaign_id: Optional[str] = None) -> CharacterManager:
+    """
+    Get the character manager of a campaign, creating it on first use.
+    
+    Args:
+        campaign_id: Campaign ID (optional, defaults to the default campaign)
+    
+    Raises:
+        ValueError: If the campaign ID is invalid
+    """
+    return _character_managers.get(campaign_id)
+
+
+def list_character_campaigns() -> List[str]:
+    """Get the IDs of all campaigns with a character manager."""
+    return _character_managers.campaigns()
+
+
+def add_character_change_listener(callback: Callable[[str, str, str], None]) -> None:
+    """Call back (campaign ID, character ID, op) after every write in every current and future campaign."""
+    _character_managers.add_observer(
+        lambda campaign_id, manager: manager.add_change_listener(functools.partial(callback, campaign_id))
+    )
+
+
+def drop_character_campaign(campaign_id: str) -> int:
+    """
+    Drop a campaign with all of its characters at once.
+    
+    Returns:
+        Number of characters dropped
+    
+    Raises:
+        ValueError: If the campaign does not exist
+    """
+    return _character_managers.drop(campaign_id).count_characters()
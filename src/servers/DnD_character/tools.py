@@ -1,7 +1,17 @@
 """Tool definitions for the Dungeons & Dragons Character MCP Server."""
 
-from mcp.types import Tool
-from src.servers.DnD_character.character_manager import get_character_manager
+from mcp.types import Resource, ResourceTemplate, Tool
+from src.servers.DnD_character.character_manager import (
+    CHARACTER_FIELDS,
+    drop_character_campaign,
+    get_character_manager,
+    list_character_campaigns,
+)
+from src.servers.DnD_common.namespaces import CAMPAIGN_ID_PROPERTY, DEFAULT_CAMPAIGN
+from src.servers.DnD_common.patch import MERGE_PATCH_PROPERTY, PATCH_PROPERTY
+from src.servers.DnD_common.serialization import cached_dict, json_array
+from src.servers.DnD_common.subscriptions import campaign_uri, entity_uri, parse_resource_uri
+from src.servers.DnD_common.projection import projector_for
 
 
 # Tool: Set Character (Create or Replace)
@@ -40,6 +50,10 @@ SET_CHARACTER_TOOL = Tool(
                 "description": "Character properties (e.g., strength, dexterity, intelligence, etc.)",
                 "additionalProperties": True,
             },
+            "expectedVersion": {
+                "type": "integer",
+                "description": "Only write if the stored version matches; 0 requires that the character does not exist yet (optional)",
+            },
         },
         "required": ["characterId", "name", "currentHp", "maxHp", "currentMagicPoints", "maxMagicPoints"],
     },
@@ -55,6 +69,7 @@ SET_CHARACTER_TOOL = Tool(
             "properties": {"type": "object"},
             "createdAt": {"type": "string"},
             "updatedAt": {"type": "string"},
+            "version": {"type": "integer"},
         },
         "required": ["characterId", "name", "currentHp", "maxHp", "currentMagicPoints", "maxMagicPoints", "createdAt", "updatedAt"],
     },
@@ -72,6 +87,19 @@ GET_CHARACTER_TOOL = Tool(
                 "type": "string",
                 "description": "Unique identifier for the character",
             },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only return these fields, e.g. [\"characterId\", \"name\", \"currentHp\", \"properties.inventory.potions\"]; include \"etag\" to get the ETag (optional, default all)",
+            },
+            "includeDerived": {
+                "type": "boolean",
+                "description": "Also return derived stats such as ability modifiers, armorClass and spellSaveDc (optional)",
+            },
+            "ifNoneMatch": {
+                "type": "string",
+                "description": "ETag from an earlier response; if nothing changed since, only notModified and the etag are returned (optional)",
+            },
         },
         "required": ["characterId"],
     },
@@ -87,6 +115,10 @@ GET_CHARACTER_TOOL = Tool(
             "properties": {"type": "object"},
             "createdAt": {"type": "string"},
             "updatedAt": {"type": "string"},
+            "version": {"type": "integer"},
+            "etag": {"type": "string"},
+            "derived": {"type": "object"},
+            "notModified": {"type": "boolean"},
         },
         "required": ["characterId", "name", "currentHp", "maxHp", "currentMagicPoints", "maxMagicPoints", "createdAt", "updatedAt"],
     },
@@ -129,6 +161,20 @@ UPDATE_CHARACTER_TOOL = Tool(
                 "description": "Properties to update/add (optional)",
                 "additionalProperties": True,
             },
+            "hpDelta": {
+                "type": "integer",
+                "description": "Change to current hit points, clamped to [0, maxHp] (optional, negative for damage)",
+            },
+            "mpDelta": {
+                "type": "integer",
+                "description": "Change to current magic points, clamped to [0, maxMagicPoints] (optional, negative to spend)",
+            },
+            "expectedVersion": {
+                "type": "integer",
+                "description": "Only update if the stored version matches (optional)",
+            },
+            "patch": PATCH_PROPERTY,
+            "mergePatch": MERGE_PATCH_PROPERTY,
         },
         "required": ["characterId"],
     },
@@ -144,6 +190,7 @@ UPDATE_CHARACTER_TOOL = Tool(
             "properties": {"type": "object"},
             "createdAt": {"type": "string"},
             "updatedAt": {"type": "string"},
+            "version": {"type": "integer"},
         },
         "required": ["characterId", "name", "currentHp", "maxHp", "currentMagicPoints", "maxMagicPoints", "createdAt", "updatedAt"],
     },
@@ -153,10 +200,44 @@ UPDATE_CHARACTER_TOOL = Tool(
 # Tool: List Characters
 LIST_CHARACTERS_TOOL = Tool(
     name="List Characters",
-    description="List all characters in the system",
+    description="List characters in the system, optionally one page at a time or ordered by a field (top-k)",
     inputSchema={
         "type": "object",
-        "properties": {},
+        "properties": {
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of characters to return (optional, default all)",
+            },
+            "cursor": {
+                "type": "string",
+                "description": "nextCursor from a previous page (optional)",
+            },
+            "orderBy": {
+                "type": "string",
+                "description": (
+                    "Order by 'name', 'currentHp', 'properties.initiative' or any field with a sorted index; "
+                    "with limit, returns the top-k without sorting everything (optional, cannot be combined with cursor)"
+                ),
+            },
+            "descending": {
+                "type": "boolean",
+                "description": "Largest values first when using orderBy (optional, default false)",
+            },
+            "includeTotal": {
+                "type": "boolean",
+                "description": "Also return the total number of characters (optional)",
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only return these fields, e.g. [\"characterId\", \"name\", \"currentHp\", \"properties.inventory.potions\"] (optional, default all)",
+            },
+            "ifNoneMatch": {
+                "type": "string",
+                "description": "ETag from an earlier response; if nothing changed since, only notModified and the etag are returned (optional)",
+            },
+        },
         "required": [],
     },
     outputSchema={
@@ -176,10 +257,15 @@ LIST_CHARACTERS_TOOL = Tool(
                         "properties": {"type": "object"},
                         "createdAt": {"type": "string"},
                         "updatedAt": {"type": "string"},
+                        "version": {"type": "integer"},
                     },
                 },
             },
             "count": {"type": "integer"},
+            "nextCursor": {"type": ["string", "null"]},
+            "total": {"type": "integer"},
+            "etag": {"type": "string"},
+            "notModified": {"type": "boolean"},
         },
         "required": ["characters", "count"],
     },
@@ -211,187 +297,1379 @@ DELETE_CHARACTER_TOOL = Tool(
 )
 
 
-TOOLS = {
-    SET_CHARACTER_TOOL.name: SET_CHARACTER_TOOL,
-    GET_CHARACTER_TOOL.name: GET_CHARACTER_TOOL,
-    UPDATE_CHARACTER_TOOL.name: UPDATE_CHARACTER_TOOL,
-    LIST_CHARACTERS_TOOL.name: LIST_CHARACTERS_TOOL,
-    DELETE_CHARACTER_TOOL.name: DELETE_CHARACTER_TOOL,
-}
-
-
-def get_tool(name: str) -> Tool | None:
-    """Get a tool by name."""
-    return TOOLS.get(name)
+# Tool: Apply Damage (bulk HP/MP deltas)
+APPLY_DAMAGE_TOOL = Tool(
+    name="Apply Damage",
+    description="Apply HP and magic point deltas to many characters at once (negative deals damage, positive heals); results are clamped to [0, max]",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "targets": {
+                "type": "array",
+                "description": "Characters to affect and the deltas to apply to each",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "characterId": {
+                            "type": "string",
+                            "description": "Unique identifier for the character",
+                        },
+                        "hpDelta": {
+                            "type": "integer",
+                            "description": "Change in current hit points (negative for damage)",
+                        },
+                        "mpDelta": {
+                            "type": "integer",
+                            "description": "Change in current magic points (negative to spend)",
+                        },
+                    },
+                    "required": ["characterId"],
+                },
+            },
+        },
+        "required": ["targets"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "characters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "characterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+        },
+        "required": ["characters", "count"],
+    },
+)
 
 
-def get_all_tools() -> list[Tool]:
-    """Get a list of all available tools."""
-    return list(TOOLS.values())
+# Tool: Set Characters (bulk create or replace)
+SET_CHARACTERS_TOOL = Tool(
+    name="Set Characters",
+    description="Create or replace many characters in one call and return a compact summary instead of the records",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "characters": {
+                "type": "array",
+                "description": "Characters to create or replace, each with the same fields as Set Character",
+                "items": dict(SET_CHARACTER_TOOL.inputSchema),
+            },
+            "atomic": {
+                "type": "boolean",
+                "description": "Apply all characters or none if any is invalid (default true); when false, valid characters are applied and errors are reported per item",
+            },
+        },
+        "required": ["characters"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "applied": {"type": "integer"},
+            "failed": {"type": "integer"},
+            "errors": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "index": {"type": "integer"},
+                        "characterId": {"type": ["string", "null"]},
+                        "error": {"type": "string"},
+                    },
+                },
+            },
+        },
+        "required": ["applied", "failed", "errors"],
+    },
+)
 
 
-def execute_set_character(arguments: dict) -> tuple[list[dict], dict]:
-    """
-    Execute the set character functionality.
-    
-    Args:
-        arguments: Dictionary containing character data
-        
-    Returns:
-        Tuple of (contents list, result dict) for MCP response
-    """
-    character_id = arguments.get("characterId")
-    if not character_id:
-        raise ValueError("Missing required argument: characterId")
-    
-    name = arguments.get("name")
-    if not name:
-        raise ValueError("Missing required argument: name")
-    
-    current_hp = arguments.get("currentHp")
-    max_hp = arguments.get("maxHp")
-    current_magic_points = arguments.get("currentMagicPoints")
-    max_magic_points = arguments.get("maxMagicPoints")
-    properties = arguments.get("properties", {})
-    
-    if current_hp is None:
-        raise ValueError("Missing required argument: currentHp")
-    if max_hp is None:
-        raise ValueError("Missing required argument: maxHp")
-    if current_magic_points is None:
-        raise ValueError("Missing required argument: currentMagicPoints")
-    if max_magic_points is None:
-        raise ValueError("Missing required argument: maxMagicPoints")
-    
-    manager = get_character_manager()
-    character = manager.set_character(
-        character_id=character_id,
-        name=name,
-        current_hp=current_hp,
-        max_hp=max_hp,
-        current_magic_points=current_magic_points,
-        max_magic_points=max_magic_points,
-        properties=properties
-    )
-    
-    result = character.to_dict()
-    
-    contents: list[dict] = [
-        {
-            "type": "text",
-            "text": f"Character '{result['name']}' (ID: {result['character_id']}) created/updated\n"
-                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
-                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
-                   f"Properties: {result['properties']}",
-        }
-    ]
-    
-    return contents, result
+# Tool: Create Character Index
+CREATE_CHARACTER_INDEX_TOOL = Tool(
+    name="Create Character Index",
+    description="Create a secondary index on a character field so Query Characters can answer predicates on it without scanning",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "field": {
+                "type": "string",
+                "description": "Field name or nested property path (e.g., 'properties.class', 'currentHp')",
+            },
+            "kind": {
+                "type": "string",
+                "enum": ["hash", "sorted"],
+                "description": "'hash' for equality on categorical values, 'sorted' for equality and ranges on numbers (default hash)",
+            },
+        },
+        "required": ["field"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "field": {"type": "string"},
+            "kind": {"type": "string"},
+            "entries": {"type": "integer"},
+        },
+        "required": ["field", "kind", "entries"],
+    },
+)
 
 
-def execute_get_character(arguments: dict) -> tuple[list[dict], dict]:
-    """
-    Execute the get character functionality.
-    
-    Args:
-        arguments: Dictionary containing characterId
-        
-    Returns:
-        Tuple of (contents list, result dict) for MCP response
-    """
-    character_id = arguments.get("characterId")
-    if not character_id:
-        raise ValueError("Missing required argument: characterId")
-    
-    manager = get_character_manager()
-    character = manager.get_character(character_id)
-    result = character.to_dict()
-    
-    contents: list[dict] = [
-        {
-            "type": "text",
-            "text": f"Character: {result['name']} (ID: {result['character_id']})\n"
-                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
-                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
-                   f"Properties: {result['properties']}\n"
-                   f"Created: {result['created_at']}\n"
-                   f"Updated: {result['updated_at']}",
-        }
-    ]
-    
-    return contents, result
+# Tool: Search Characters
+SEARCH_CHARACTERS_TOOL = Tool(
+    name="Search Characters",
+    description="Search characters by name: exact, word-prefix and typo-tolerant matches ranked by similarity",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Name or name prefix to search for (e.g., 'Gand' or 'Gandlaf')",
+            },
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of results (optional, default 10)",
+            },
+            "fuzzy": {
+                "type": "boolean",
+                "description": "Include typo-tolerant matches (optional, default true)",
+            },
+        },
+        "required": ["query"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "characterId": {"type": "string"},
+                        "name": {"type": "string"},
+                        "score": {"type": "number"},
+                        "match": {"type": "string", "enum": ["exact", "prefix", "fuzzy"]},
+                    },
+                    "required": ["characterId", "name", "score", "match"],
+                },
+            },
+            "count": {"type": "integer"},
+        },
+        "required": ["results", "count"],
+    },
+)
 
 
-def execute_update_character(arguments: dict) -> tuple[list[dict], dict]:
-    """
-    Execute the update character functionality.
-    
-    Args:
-        arguments: Dictionary containing character updates
-        
-    Returns:
-        Tuple of (contents list, result dict) for MCP response
-    """
-    character_id = arguments.get("characterId")
-    if not character_id:
-        raise ValueError("Missing required argument: characterId")
-    
-    manager = get_character_manager()
-    character = manager.update_character(
-        character_id=character_id,
-        name=arguments.get("name"),
-        current_hp=arguments.get("currentHp"),
-        max_hp=arguments.get("maxHp"),
-        current_magic_points=arguments.get("currentMagicPoints"),
-        max_magic_points=arguments.get("maxMagicPoints"),
-        properties=arguments.get("properties")
-    )
-    
-    result = character.to_dict()
-    
-    contents: list[dict] = [
-        {
-            "type": "text",
-            "text": f"Character '{result['name']}' (ID: {result['character_id']}) updated\n"
-                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
-                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
-                   f"Properties: {result['properties']}",
+# Tool: Query Characters
+QUERY_CHARACTERS_TOOL = Tool(
+    name="Query Characters",
+    description="Find characters matching field conditions and/or a filter expression, using secondary indexes where available",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "where": {
+                "type": "array",
+                "description": "Conditions that must all hold",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "field": {
+                            "type": "string",
+                            "description": "Field name or nested property path (e.g., 'properties.level')",
+                        },
+                        "op": {
+                            "type": "string",
+                            "enum": ["eq", "ne", "lt", "le", "gt", "ge", "in", "contains", "==", "!=", "<", "<=", ">", ">="],
+                            "description": "Comparison operator",
+                        },
+                        "value": {
+                            "description": "Value to compare against (a list for 'in')",
+                        },
+                    },
+                    "required": ["field", "op", "value"],
+                },
+            },
+            "filter": {
+                "type": "string",
+                "description": (
+                    "Filter expression (optional), e.g. 'currentHp < maxHp * 0.25 and properties.class == \"Wizard\"'. "
+                    "Supports and/or/not, ==, !=, <, <=, >, >=, in, contains, + - * / %, "
+                    "and the functions min, max, abs, floor, ceil, round, len"
+                ),
+            },
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of characters to return (optional)",
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only return these fields (optional, default all)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "characters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "characterId": {"type": "string"},
+                        "name": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "properties": {"type": "object"},
+                        "createdAt": {"type": "string"},
+                        "updatedAt": {"type": "string"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+            "plan": {
+                "type": "object",
+                "properties": {
+                    "indexes": {"type": "array", "items": {"type": "string"}},
+                    "scanned": {"type": "integer"},
+                },
+            },
+        },
+        "required": ["characters", "count", "plan"],
+    },
+)
+
+
+# Tool: Changes Since
+CHANGES_SINCE_TOOL = Tool(
+    name="Changes Since",
+    description=(
+        "Get only the characters created, changed or deleted after a sequence number, so mirrored state can be "
+        "kept up to date without re-listing every character"
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "since": {
+                "type": "integer",
+                "minimum": 0,
+                "description": "Sequence number returned by the previous call (0 to start)",
+            },
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of changed characters to return (optional)",
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only return these fields of each changed character (optional)",
+            },
+        },
+        "required": ["since"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "changes": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "seq": {"type": "integer"},
+                        "characterId": {"type": "string"},
+                        "op": {"type": "string", "enum": ["upsert", "delete"]},
+                        "character": {"type": ["object", "null"]},
+                    },
+                    "required": ["seq", "characterId", "op", "character"],
+                },
+            },
+            "count": {"type": "integer"},
+            "seq": {"type": "integer"},
+            "hasMore": {"type": "boolean"},
+            "resyncRequired": {"type": "boolean"},
+        },
+        "required": ["changes", "count", "seq", "hasMore", "resyncRequired"],
+    },
+)
+
+
+# Tool: List Character Campaigns
+LIST_CHARACTER_CAMPAIGNS_TOOL = Tool(
+    name="List Character Campaigns",
+    description="List the campaigns (namespaces) that hold characters, with the number of characters in each",
+    inputSchema={
+        "type": "object",
+        "properties": {},
+        "required": [],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "campaigns": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "campaignId": {"type": "string"},
+                        "count": {"type": "integer"},
+                    },
+                    "required": ["campaignId", "count"],
+                },
+            },
+            "count": {"type": "integer"},
+        },
+        "required": ["campaigns", "count"],
+    },
+)
+
+
+# Tool: Drop Character Campaign
+DROP_CHARACTER_CAMPAIGN_TOOL = Tool(
+    name="Drop Character Campaign",
+    description="Delete a whole campaign (namespace) with all of its characters in one step",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "campaignId": {
+                "type": "string",
+                "description": "Campaign to drop",
+            },
+        },
+        "required": ["campaignId"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "campaignId": {"type": "string"},
+            "dropped": {"type": "integer"},
+        },
+        "required": ["campaignId", "dropped"],
+    },
+)
+
+
+# Tool: Define Character Stat
+DEFINE_CHARACTER_STAT_TOOL = Tool(
+    name="Define Character Stat",
+    description="Define, replace or remove a derived character stat computed from a formula over character fields and other stats",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "name": {
+                "type": "string",
+                "description": "Stat name, e.g. 'athletics'",
+            },
+            "formula": {
+                "type": ["string", "null"],
+                "description": "Formula in the filter expression language, e.g. "
+                               "'derived.strengthModifier + derived.proficiencyBonus'; null removes the stat",
+            },
+        },
+        "required": ["name", "formula"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "formula": {"type": ["string", "null"]},
+            "stats": {"type": "object"},
+        },
+        "required": ["name", "formula", "stats"],
+    },
+)
+
+
+# Tool: Roll Character Check
+ROLL_CHARACTER_CHECK_TOOL = Tool(
+    name="Roll Character Check",
+    description="Roll dice notation using a character's derived stats, e.g. '1d20+{strengthModifier}+{proficiencyBonus}'",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "characterId": {
+                "type": "string",
+                "description": "Unique identifier for the character",
+            },
+            "notation": {
+                "type": "string",
+                "description": "Dice notation; {stat} placeholders preceded by + or - are replaced by the character's derived stats",
+            },
+        },
+        "required": ["characterId", "notation"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "characterId": {"type": "string"},
+            "notation": {"type": "string"},
+            "resolvedNotation": {"type": "string"},
+            "total": {"type": "integer"},
+            "details": {"type": "string"},
+        },
+        "required": ["characterId", "notation", "resolvedNotation", "total", "details"],
+    },
+)
+
+
+# Tool: Long Rest (bulk recovery to the maximum)
+LONG_REST_TOOL = Tool(
+    name="Long Rest",
+    description="Restore HP and magic points of many characters to their maximum in one batch; defeated (0 HP) characters are left unchanged",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "characterIds": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Characters affected (optional, default every character of the campaign)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "characters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "characterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+            "defeated": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["characters", "count", "defeated"],
+    },
+)
+
+
+# Tool: Short Rest (bulk dice-based recovery)
+SHORT_REST_TOOL = Tool(
+    name="Short Rest",
+    description="Recover HP and/or magic points of many characters by rolling dice for each (capped at the maximum); defeated (0 HP) characters are left unchanged",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "characterIds": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Characters affected (optional, default every character of the campaign)",
+            },
+            "hpDice": {
+                "type": "string",
+                "description": "Dice notation of the HP each character recovers, e.g. '1d8+2' (optional)",
+            },
+            "mpDice": {
+                "type": "string",
+                "description": "Dice notation of the magic points each character recovers (optional)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "characters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "characterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+            "defeated": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["characters", "count", "defeated"],
+    },
+)
+
+
+# Tool: Regenerate (bulk fixed recovery)
+REGENERATE_TOOL = Tool(
+    name="Regenerate",
+    description="Recover a fixed amount of HP and magic points for many characters (capped at the maximum); defeated (0 HP) characters are left unchanged",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "characterIds": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Characters affected (optional, default every character of the campaign)",
+            },
+            "hp": {
+                "type": "integer",
+                "minimum": 0,
+                "description": "HP each character recovers",
+            },
+            "mp": {
+                "type": "integer",
+                "minimum": 0,
+                "description": "Magic points each character recovers",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "characters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "characterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+            "defeated": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["characters", "count", "defeated"],
+    },
+)
+
+
+EFFECT_OUTPUT = {
+    "type": "object",
+    "properties": {
+        "effectId": {"type": "string"},
+        "characterId": {"type": "string"},
+        "name": {"type": "string"},
+        "damageDice": {"type": ["string", "null"]},
+        "hpDelta": {"type": "integer"},
+        "mpDelta": {"type": "integer"},
+        "every": {"type": "integer"},
+        "startedRound": {"type": "integer"},
+        "expiresRound": {"type": ["integer", "null"]},
+        "nextRound": {"type": "integer"},
+    },
+}
+
+
+# Tool: Add Character Effect
+ADD_CHARACTER_EFFECT_TOOL = Tool(
+    name="Add Character Effect",
+    description="Add a per-round effect or condition to a character (poison, regeneration, concentration, ...) that ticks every few rounds and may expire",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "characterId": {
+                "type": "string",
+                "description": "Unique identifier for the character",
+            },
+            "name": {
+                "type": "string",
+                "description": "Effect name, e.g. 'poisoned'",
+            },
+            "damageDice": {
+                "type": "string",
+                "description": "Dice notation of the damage dealt on every tick, e.g. '1d6' (optional)",
+            },
+            "hpDelta": {
+                "type": "integer",
+                "description": "HP change on every tick, e.g. 10 for regeneration (optional, negative for damage)",
+            },
+            "mpDelta": {
+                "type": "integer",
+                "description": "Magic point change on every tick (optional)",
+            },
+            "every": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Rounds between ticks (optional, default 1)",
+            },
+            "rounds": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Rounds until the effect expires (optional, default until removed)",
+            },
+        },
+        "required": ["characterId", "name"],
+    },
+    outputSchema=EFFECT_OUTPUT,
+)
+
+
+# Tool: Remove Character Effect
+REMOVE_CHARACTER_EFFECT_TOOL = Tool(
+    name="Remove Character Effect",
+    description="Remove an effect from a character before it expires (e.g. poison cured, concentration broken)",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "effectId": {
+                "type": "string",
+                "description": "Unique identifier of the effect",
+            },
+        },
+        "required": ["effectId"],
+    },
+    outputSchema=EFFECT_OUTPUT,
+)
+
+
+# Tool: List Character Effects
+LIST_CHARACTER_EFFECTS_TOOL = Tool(
+    name="List Character Effects",
+    description="List the active effects of a character, or of every character in the campaign",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "characterId": {
+                "type": "string",
+                "description": "Only list this character's effects (optional)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "round": {"type": "integer"},
+            "effects": {"type": "array", "items": EFFECT_OUTPUT},
+            "count": {"type": "integer"},
+        },
+        "required": ["round", "effects", "count"],
+    },
+)
+
+
+# Tool: Advance Round
+ADVANCE_ROUND_TOOL = Tool(
+    name="Advance Round",
+    description="Advance the campaign's effects by one or more rounds: due effects tick (damage dice rolled in batch) and expired ones end",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "rounds": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Rounds to advance (optional, default 1)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "round": {"type": "integer"},
+            "ticks": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "effectId": {"type": "string"},
+                        "characterId": {"type": "string"},
+                        "name": {"type": "string"},
+                        "hpChange": {"type": "integer"},
+                        "mpChange": {"type": "integer"},
+                    },
+                },
+            },
+            "expired": {"type": "array", "items": EFFECT_OUTPUT},
+            "characters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "characterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+        },
+        "required": ["round", "ticks", "expired", "characters"],
+    },
+)
+
+
+TOOLS = {
+    SET_CHARACTER_TOOL.name: SET_CHARACTER_TOOL,
+    GET_CHARACTER_TOOL.name: GET_CHARACTER_TOOL,
+    UPDATE_CHARACTER_TOOL.name: UPDATE_CHARACTER_TOOL,
+    LIST_CHARACTERS_TOOL.name: LIST_CHARACTERS_TOOL,
+    DELETE_CHARACTER_TOOL.name: DELETE_CHARACTER_TOOL,
+    APPLY_DAMAGE_TOOL.name: APPLY_DAMAGE_TOOL,
+    SET_CHARACTERS_TOOL.name: SET_CHARACTERS_TOOL,
+    CREATE_CHARACTER_INDEX_TOOL.name: CREATE_CHARACTER_INDEX_TOOL,
+    SEARCH_CHARACTERS_TOOL.name: SEARCH_CHARACTERS_TOOL,
+    QUERY_CHARACTERS_TOOL.name: QUERY_CHARACTERS_TOOL,
+    CHANGES_SINCE_TOOL.name: CHANGES_SINCE_TOOL,
+    LIST_CHARACTER_CAMPAIGNS_TOOL.name: LIST_CHARACTER_CAMPAIGNS_TOOL,
+    DROP_CHARACTER_CAMPAIGN_TOOL.name: DROP_CHARACTER_CAMPAIGN_TOOL,
+    DEFINE_CHARACTER_STAT_TOOL.name: DEFINE_CHARACTER_STAT_TOOL,
+    ROLL_CHARACTER_CHECK_TOOL.name: ROLL_CHARACTER_CHECK_TOOL,
+    LONG_REST_TOOL.name: LONG_REST_TOOL,
+    SHORT_REST_TOOL.name: SHORT_REST_TOOL,
+    REGENERATE_TOOL.name: REGENERATE_TOOL,
+    ADD_CHARACTER_EFFECT_TOOL.name: ADD_CHARACTER_EFFECT_TOOL,
+    REMOVE_CHARACTER_EFFECT_TOOL.name: REMOVE_CHARACTER_EFFECT_TOOL,
+    LIST_CHARACTER_EFFECTS_TOOL.name: LIST_CHARACTER_EFFECTS_TOOL,
+    ADVANCE_ROUND_TOOL.name: ADVANCE_ROUND_TOOL,
+}
+
+# Every character tool works within one campaign
+for _tool in TOOLS.values():
+    if _tool is not LIST_CHARACTER_CAMPAIGNS_TOOL:
+        _tool.inputSchema["properties"] = {**_tool.inputSchema["properties"], "campaignId": CAMPAIGN_ID_PROPERTY}
+
+
+# Resources: every character is readable (and subscribable) as character://{campaignId}/{characterId},
+# and all characters of a campaign as character://{campaignId}
+CHARACTER_URI_SCHEME = "character"
+
+CHARACTER_RESOURCE_TEMPLATE = ResourceTemplate(
+    name="Character",
+    uriTemplate="character://{campaignId}/{characterId}",
+    description="A character as JSON; subscribe to be notified when it changes",
+    mimeType="application/json",
+)
+
+CHARACTER_CAMPAIGN_RESOURCE_TEMPLATE = ResourceTemplate(
+    name="Character Campaign",
+    uriTemplate="character://{campaignId}",
+    description="All characters of a campaign as a JSON array; subscribe to be notified when any of them changes",
+    mimeType="application/json",
+)
+
+# Characters per resources/list page
+RESOURCE_PAGE_SIZE = 100
+
+
+def get_tool(name: str) -> Tool | None:
+    """Get a tool by name."""
+    return TOOLS.get(name)
+
+
+def get_all_tools() -> list[Tool]:
+    """Get a list of all available tools."""
+    return list(TOOLS.values())
+
+
+def execute_set_character(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the set character functionality.
+    
+    Args:
+        arguments: Dictionary containing character data
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    character_id = arguments.get("characterId")
+    if not character_id:
+        raise ValueError("Missing required argument: characterId")
+    
+    name = arguments.get("name")
+    if not name:
+        raise ValueError("Missing required argument: name")
+    
+    current_hp = arguments.get("currentHp")
+    max_hp = arguments.get("maxHp")
+    current_magic_points = arguments.get("currentMagicPoints")
+    max_magic_points = arguments.get("maxMagicPoints")
+    properties = arguments.get("properties", {})
+    
+    if current_hp is None:
+        raise ValueError("Missing required argument: currentHp")
+    if max_hp is None:
+        raise ValueError("Missing required argument: maxHp")
+    if current_magic_points is None:
+        raise ValueError("Missing required argument: currentMagicPoints")
+    if max_magic_points is None:
+        raise ValueError("Missing required argument: maxMagicPoints")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    character = manager.set_character(
+        character_id=character_id,
+        name=name,
+        current_hp=current_hp,
+        max_hp=max_hp,
+        current_magic_points=current_magic_points,
+        max_magic_points=max_magic_points,
+        properties=properties,
+        expected_version=arguments.get("expectedVersion")
+    )
+    
+    result = character.to_dict()
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Character '{result['name']}' (ID: {result['character_id']}) created/updated\n"
+                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
+                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
+                   f"Properties: {result['properties']}",
+        }
+    ]
+    
+    return contents, result
+
+
+def _not_modified(subject: str, etag: str) -> tuple[list[dict], dict]:
+    """Build the short response for a conditional read whose ETag still matches."""
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"{subject} not modified (ETag: {etag})",
+        }
+    ]
+    return contents, {"notModified": True, "etag": etag}
+
+
+def execute_get_character(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the get character functionality.
+    
+    Args:
+        arguments: Dictionary containing characterId and optional fields, includeDerived, ifNoneMatch
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    character_id = arguments.get("characterId")
+    if not character_id:
+        raise ValueError("Missing required argument: characterId")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    if_none_match = arguments.get("ifNoneMatch")
+    if if_none_match and manager.get_character_etag(character_id) == if_none_match:
+        return _not_modified(f"Character (ID: {character_id})", if_none_match)
+    character = manager.get_character(character_id)
+    etag = character.etag
+    
+    field_paths = arguments.get("fields")
+    if field_paths:
+        result = character.project([path for path in field_paths if path != "etag"])
+        if "etag" in field_paths:
+            result["etag"] = etag
+        if arguments.get("includeDerived"):
+            result["derived"] = manager.derived.values(character)
+        contents: list[dict] = [
+            {
+                "type": "text",
+                "text": f"Character (ID: {character_id}): {result}",
+            }
+        ]
+        return contents, result
+    
+    result = character.to_dict()
+    result["etag"] = etag
+    derived = ""
+    if arguments.get("includeDerived"):
+        result["derived"] = manager.derived.values(character)
+        derived = f"\nDerived: {result['derived']}"
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Character: {result['name']} (ID: {result['character_id']})\n"
+                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
+                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
+                   f"Properties: {result['properties']}\n"
+                   f"Created: {result['created_at']}\n"
+                   f"Updated: {result['updated_at']}\n"
+                   f"Version: {result['version']}\n"
+                   f"ETag: {etag}{derived}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_update_character(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the update character functionality.
+    
+    Args:
+        arguments: Dictionary containing character updates
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    character_id = arguments.get("characterId")
+    if not character_id:
+        raise ValueError("Missing required argument: characterId")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    character = manager.update_character(
+        character_id=character_id,
+        name=arguments.get("name"),
+        current_hp=arguments.get("currentHp"),
+        max_hp=arguments.get("maxHp"),
+        current_magic_points=arguments.get("currentMagicPoints"),
+        max_magic_points=arguments.get("maxMagicPoints"),
+        properties=arguments.get("properties"),
+        hp_delta=arguments.get("hpDelta"),
+        mp_delta=arguments.get("mpDelta"),
+        expected_version=arguments.get("expectedVersion"),
+        patch=arguments.get("patch"),
+        merge_patch=arguments.get("mergePatch")
+    )
+    
+    result = character.to_dict()
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Character '{result['name']}' (ID: {result['character_id']}) updated\n"
+                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
+                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
+                   f"Properties: {result['properties']}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_list_characters(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the list characters functionality.
+    
+    Args:
+        arguments: Dictionary with optional limit, cursor, orderBy, descending, includeTotal,
+            fields and ifNoneMatch (empty for list all)
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    limit = arguments.get("limit")
+    cursor = arguments.get("cursor")
+    order_by = arguments.get("orderBy")
+    if order_by and cursor:
+        raise ValueError("cursor cannot be combined with orderBy; use limit to get the top results")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    etag = manager.listing_etag({key: value for key, value in arguments.items() if key != "ifNoneMatch"})
+    if arguments.get("ifNoneMatch") == etag:
+        return _not_modified("Characters", etag)
+    next_cursor = None
+    if order_by:
+        characters = manager.order_characters(order_by, bool(arguments.get("descending")), limit)
+    elif limit is None and not cursor:
+        characters = manager.list_characters()
+    else:
+        characters, next_cursor = manager.page_characters(limit or max(manager.count_characters(), 1), cursor)
+    
+    field_paths = arguments.get("fields")
+    if field_paths:
+        projector = projector_for(field_paths, CHARACTER_FIELDS)
+        character_list = [projector(char) for char in characters]
+    else:
+        character_list = [cached_dict(char) for char in characters]
+    result = {
+        "characters": character_list,
+        "count": len(character_list)
+    }
+    if (limit is not None or cursor) and not order_by:
+        result["nextCursor"] = next_cursor
+    if arguments.get("includeTotal"):
+        result["total"] = manager.count_characters()
+    result["etag"] = etag
+    
+    if not character_list:
+        text = "No characters found."
+    elif field_paths:
+        lines = [f"Found {len(character_list)} character(s):\n"]
+        lines.extend(f"- {char_dict}" for char_dict in character_list)
+        text = "\n".join(lines)
+    else:
+        lines = [f"Found {len(character_list)} character(s):\n"]
+        for char_dict in character_list:
+            lines.append(
+                f"- {char_dict['name']} (ID: {char_dict['character_id']}): "
+                f"HP {char_dict['current_hp']}/{char_dict['max_hp']}, "
+                f"MP {char_dict['current_magic_points']}/{char_dict['max_magic_points']}"
+            )
+        text = "\n".join(lines)
+    if next_cursor:
+        text += f"\nMore characters available (cursor: {next_cursor})"
+    if "total" in result:
+        text += f"\nTotal characters: {result['total']}"
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_delete_character(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the delete character functionality.
+    
+    Args:
+        arguments: Dictionary containing characterId
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    character_id = arguments.get("characterId")
+    if not character_id:
+        raise ValueError("Missing required argument: characterId")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    manager.delete_character(character_id)
+    
+    result = {
+        "characterId": character_id,
+        "deleted": True
+    }
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Character with ID '{character_id}' has been deleted.",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_apply_damage(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk apply damage functionality.
+    
+    Args:
+        arguments: Dictionary containing a list of targets with deltas
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    targets = arguments.get("targets")
+    if not targets:
+        raise ValueError("Missing required argument: targets")
+    
+    deltas = []
+    for target in targets:
+        character_id = target.get("characterId")
+        if not character_id:
+            raise ValueError("Missing required argument: characterId")
+        deltas.append({
+            "character_id": character_id,
+            "hp_delta": target.get("hpDelta", 0),
+            "mp_delta": target.get("mpDelta", 0),
+        })
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    characters = manager.apply_deltas(deltas)
+    
+    character_list = [
+        {
+            "characterId": char.character_id,
+            "currentHp": char.current_hp,
+            "maxHp": char.max_hp,
+            "currentMagicPoints": char.current_magic_points,
+            "maxMagicPoints": char.max_magic_points,
+            "version": char.version,
+        }
+        for char in characters
+    ]
+    result = {
+        "characters": character_list,
+        "count": len(character_list)
+    }
+    
+    lines = [f"Applied deltas to {len(character_list)} character(s):\n"]
+    for char in characters:
+        lines.append(
+            f"- {char.name} (ID: {char.character_id}): "
+            f"HP {char.current_hp}/{char.max_hp}, "
+            f"MP {char.current_magic_points}/{char.max_magic_points}"
+        )
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_set_characters(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk set characters functionality.
+    
+    Args:
+        arguments: Dictionary containing a list of characters and the atomic flag
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    characters = arguments.get("characters")
+    if characters is None:
+        raise ValueError("Missing required argument: characters")
+    atomic = arguments.get("atomic", True)
+    
+    entries = [
+        {
+            "character_id": char.get("characterId"),
+            "name": char.get("name"),
+            "current_hp": char.get("currentHp"),
+            "max_hp": char.get("maxHp"),
+            "current_magic_points": char.get("currentMagicPoints"),
+            "max_magic_points": char.get("maxMagicPoints"),
+            "properties": char.get("properties"),
+            "expected_version": char.get("expectedVersion"),
+        }
+        for char in characters
+    ]
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    summary = manager.set_characters(entries, atomic=atomic)
+    
+    result = {
+        "applied": summary["applied"],
+        "failed": summary["failed"],
+        "errors": [
+            {"index": error["index"], "characterId": error["character_id"], "error": error["error"]}
+            for error in summary["errors"]
+        ],
+    }
+    
+    lines = [f"Applied {result['applied']} character(s), {result['failed']} failed"]
+    if result["errors"] and atomic:
+        lines[0] += " (atomic batch rejected)"
+    for error in result["errors"]:
+        lines.append(f"- #{error['index']} (ID: {error['characterId']}): {error['error']}")
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_create_character_index(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the create character index functionality.
+    
+    Args:
+        arguments: Dictionary containing field and optional kind
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    field_path = arguments.get("field")
+    if not field_path:
+        raise ValueError("Missing required argument: field")
+    kind = arguments.get("kind", "hash")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    entries = manager.create_index(field_path, kind)
+    
+    result = {
+        "field": field_path,
+        "kind": kind,
+        "entries": entries
+    }
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Created {kind} index on '{field_path}' covering {entries} character(s).",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_search_characters(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the search characters functionality.
+    
+    Args:
+        arguments: Dictionary containing query and optional limit and fuzzy
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    query = arguments.get("query")
+    if query is None:
+        raise ValueError("Missing required argument: query")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    matches = manager.search_characters(query, arguments.get("limit", 10), arguments.get("fuzzy", True))
+    
+    results = [
+        {"characterId": char.character_id, "name": char.name, "score": score, "match": kind}
+        for char, score, kind in matches
+    ]
+    result = {
+        "results": results,
+        "count": len(results)
+    }
+    
+    if not results:
+        text = f"No characters matching '{query}'."
+    else:
+        lines = [f"Found {len(results)} character(s) matching '{query}':"]
+        for char, score, kind in matches:
+            lines.append(f"- {char.name} (ID: {char.character_id}): {kind} match, score {score:.2f}")
+        text = "\n".join(lines)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_query_characters(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the query characters functionality.
+    
+    Args:
+        arguments: Dictionary containing where conditions and/or a filter expression,
+            and optional limit and fields
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    where = arguments.get("where")
+    filter_expression = arguments.get("filter")
+    if where is None and filter_expression is None:
+        raise ValueError("Missing required argument: where or filter")
+    
+    predicates = []
+    for condition in where or []:
+        if "field" not in condition or "op" not in condition or "value" not in condition:
+            raise ValueError("Each condition requires field, op and value")
+        predicates.append((condition["field"], condition["op"], condition["value"]))
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    characters, plan = manager.query_characters(
+        predicates,
+        limit=arguments.get("limit"),
+        filter_expression=filter_expression
+    )
+    
+    field_paths = arguments.get("fields")
+    if field_paths:
+        projector = projector_for(field_paths, CHARACTER_FIELDS)
+        character_list = [projector(char) for char in characters]
+    else:
+        character_list = [cached_dict(char) for char in characters]
+    result = {
+        "characters": character_list,
+        "count": len(character_list),
+        "plan": plan
+    }
+    
+    strategy = f"indexes: {', '.join(plan['indexes'])}" if plan["indexes"] else "full scan"
+    lines = [f"Found {len(character_list)} character(s) ({strategy}, {plan['scanned']} checked):"]
+    for char in characters:
+        lines.append(
+            f"- {char.name} (ID: {char.character_id}): "
+            f"HP {char.current_hp}/{char.max_hp}, "
+            f"MP {char.current_magic_points}/{char.max_magic_points}"
+        )
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
         }
     ]
     
     return contents, result
 
 
-def execute_list_characters(arguments: dict) -> tuple[list[dict], dict]:
+def execute_changes_since(arguments: dict) -> tuple[list[dict], dict]:
     """
-    Execute the list characters functionality.
+    Execute the changes since functionality.
     
     Args:
-        arguments: Dictionary (empty for list all)
+        arguments: Dictionary containing since and optional limit and fields
         
     Returns:
         Tuple of (contents list, result dict) for MCP response
     """
-    manager = get_character_manager()
-    characters = manager.list_characters()
+    since = arguments.get("since")
+    if since is None:
+        raise ValueError("Missing required argument: since")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    feed = manager.changes_since(since, arguments.get("limit"))
     
-    character_list = [char.to_dict() for char in characters]
+    field_paths = arguments.get("fields")
+    to_record = projector_for(field_paths, CHARACTER_FIELDS) if field_paths else (lambda character: character.to_dict())
+    changes = [
+        {
+            "seq": seq,
+            "characterId": character_id,
+            "op": "upsert" if character is not None else "delete",
+            "character": to_record(character) if character is not None else None,
+        }
+        for seq, character_id, character in feed["changes"]
+    ]
     result = {
-        "characters": character_list,
-        "count": len(character_list)
+        "changes": changes,
+        "count": len(changes),
+        "seq": feed["seq"],
+        "hasMore": feed["has_more"],
+        "resyncRequired": feed["resync_required"],
     }
     
-    if not character_list:
-        text = "No characters found."
+    if result["resyncRequired"]:
+        text = (
+            f"Changes after sequence {since} are no longer available; list all characters again "
+            f"and continue from sequence {result['seq']}."
+        )
+    elif not changes:
+        text = f"No changes since sequence {since}."
     else:
-        lines = [f"Found {len(character_list)} character(s):\n"]
-        for char_dict in character_list:
-            lines.append(
-                f"- {char_dict['name']} (ID: {char_dict['character_id']}): "
-                f"HP {char_dict['current_hp']}/{char_dict['max_hp']}, "
-                f"MP {char_dict['current_magic_points']}/{char_dict['max_magic_points']}"
-            )
+        lines = [f"{len(changes)} character(s) changed since sequence {since}:\n"]
+        for change in changes:
+            lines.append(f"- #{change['seq']} {change['op']} {change['characterId']}")
         text = "\n".join(lines)
+    text += f"\nNext sequence: {result['seq']}" + (" (more changes available)" if result["hasMore"] else "")
     
     contents: list[dict] = [
         {
@@ -403,12 +1681,119 @@ def execute_list_characters(arguments: dict) -> tuple[list[dict], dict]:
     return contents, result
 
 
-def execute_delete_character(arguments: dict) -> tuple[list[dict], dict]:
+def execute_list_character_campaigns(arguments: dict) -> tuple[list[dict], dict]:
     """
-    Execute the delete character functionality.
+    Execute the list character campaigns functionality.
     
     Args:
-        arguments: Dictionary containing characterId
+        arguments: Empty dictionary
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    campaigns = [
+        {"campaignId": campaign_id, "count": get_character_manager(campaign_id).count_characters()}
+        for campaign_id in list_character_campaigns()
+    ]
+    result = {
+        "campaigns": campaigns,
+        "count": len(campaigns)
+    }
+    
+    if not campaigns:
+        text = "No campaigns found."
+    else:
+        lines = [f"Found {len(campaigns)} campaign(s):\n"]
+        for campaign in campaigns:
+            lines.append(f"- {campaign['campaignId']}: {campaign['count']} character(s)")
+        text = "\n".join(lines)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_drop_character_campaign(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the drop character campaign functionality.
+    
+    Args:
+        arguments: Dictionary containing campaignId
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    campaign_id = arguments.get("campaignId")
+    if not campaign_id:
+        raise ValueError("Missing required argument: campaignId")
+    
+    dropped = drop_character_campaign(campaign_id)
+    
+    result = {
+        "campaignId": campaign_id,
+        "dropped": dropped
+    }
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Campaign '{campaign_id}' has been dropped with {dropped} character(s).",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_define_character_stat(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the define character stat functionality.
+    
+    Args:
+        arguments: Dictionary containing name and formula (null to remove the stat)
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    name = arguments.get("name")
+    if not name:
+        raise ValueError("Missing required argument: name")
+    formula = arguments.get("formula")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    if formula is None:
+        manager.drop_derived_stat(name)
+        text = f"Derived stat '{name}' has been removed."
+    else:
+        manager.define_derived_stat(name, formula)
+        text = f"Derived stat '{name}' = {formula}"
+    
+    result = {
+        "name": name,
+        "formula": formula,
+        "stats": manager.list_derived_stats()
+    }
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_roll_character_check(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the roll character check functionality.
+    
+    Args:
+        arguments: Dictionary containing characterId and notation
         
     Returns:
         Tuple of (contents list, result dict) for MCP response
@@ -416,20 +1801,363 @@ def execute_delete_character(arguments: dict) -> tuple[list[dict], dict]:
     character_id = arguments.get("characterId")
     if not character_id:
         raise ValueError("Missing required argument: characterId")
+    notation = arguments.get("notation")
+    if not notation:
+        raise ValueError("Missing required argument: notation")
     
-    manager = get_character_manager()
-    manager.delete_character(character_id)
+    manager = get_character_manager(arguments.get("campaignId"))
+    total, details, resolved = manager.roll_check(character_id, notation)
     
     result = {
         "characterId": character_id,
-        "deleted": True
+        "notation": notation,
+        "resolvedNotation": resolved,
+        "total": total,
+        "details": details
     }
     
     contents: list[dict] = [
         {
             "type": "text",
-            "text": f"Character with ID '{character_id}' has been deleted.",
+            "text": f"Character {character_id} rolled {resolved} → {total}\nDetails: {details}",
+        }
+    ]
+    
+    return contents, result
+
+
+def _recovery_response(characters: list, defeated: list[str], action: str) -> tuple[list[dict], dict]:
+    """Build the response of a bulk recovery (rests and regeneration)."""
+    character_list = [
+        {
+            "characterId": char.character_id,
+            "currentHp": char.current_hp,
+            "maxHp": char.max_hp,
+            "currentMagicPoints": char.current_magic_points,
+            "maxMagicPoints": char.max_magic_points,
+            "version": char.version,
+        }
+        for char in characters
+    ]
+    result = {
+        "characters": character_list,
+        "count": len(character_list),
+        "defeated": defeated
+    }
+    
+    lines = [f"{action}: {len(character_list)} character(s) recovered\n"]
+    for char in characters:
+        lines.append(
+            f"- {char.name} (ID: {char.character_id}): "
+            f"HP {char.current_hp}/{char.max_hp}, "
+            f"MP {char.current_magic_points}/{char.max_magic_points}"
+        )
+    if defeated:
+        lines.append(f"\nDefeated (unchanged): {', '.join(defeated)}")
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_long_rest(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk long rest functionality.
+    
+    Args:
+        arguments: Dictionary containing optional characterIds
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_character_manager(arguments.get("campaignId"))
+    characters, defeated = manager.long_rest(arguments.get("characterIds"))
+    return _recovery_response(characters, defeated, "Long rest")
+
+
+def execute_short_rest(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk short rest functionality.
+    
+    Args:
+        arguments: Dictionary containing optional characterIds, hpDice and mpDice
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    hp_dice = arguments.get("hpDice")
+    mp_dice = arguments.get("mpDice")
+    if not hp_dice and not mp_dice:
+        raise ValueError("Missing required argument: hpDice or mpDice")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    characters, defeated = manager.short_rest(arguments.get("characterIds"), hp_dice or None, mp_dice or None)
+    return _recovery_response(characters, defeated, "Short rest")
+
+
+def execute_regenerate(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk regenerate functionality.
+    
+    Args:
+        arguments: Dictionary containing optional characterIds, hp and mp
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_character_manager(arguments.get("campaignId"))
+    characters, defeated = manager.regenerate(
+        arguments.get("characterIds"),
+        arguments.get("hp", 0),
+        arguments.get("mp", 0),
+    )
+    return _recovery_response(characters, defeated, "Regeneration")
+
+
+def _effect_to_dict(effect) -> dict:
+    """Convert an effect to its tool representation."""
+    return {
+        "effectId": effect.effect_id,
+        "characterId": effect.entity_id,
+        "name": effect.name,
+        "damageDice": effect.damage_dice,
+        "hpDelta": effect.hp_delta,
+        "mpDelta": effect.mp_delta,
+        "every": effect.every,
+        "startedRound": effect.started_round,
+        "expiresRound": effect.expires_round,
+        "nextRound": effect.next_round,
+    }
+
+
+def _describe_effect(effect) -> str:
+    """Describe an effect in one line."""
+    changes = []
+    if effect.damage_dice:
+        changes.append(f"{effect.damage_dice} damage")
+    if effect.hp_delta:
+        changes.append(f"HP {effect.hp_delta:+d}")
+    if effect.mp_delta:
+        changes.append(f"MP {effect.mp_delta:+d}")
+    schedule = f"every {effect.every} round(s)" if changes else "condition"
+    ending = f"until round {effect.expires_round}" if effect.expires_round is not None else "until removed"
+    details = ", ".join(changes + [schedule, ending])
+    return f"{effect.name} (ID: {effect.effect_id}) on {effect.entity_id}: {details}"
+
+
+def execute_add_character_effect(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the add character effect functionality.
+    
+    Args:
+        arguments: Dictionary containing characterId, name and the effect's ticks and duration
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    character_id = arguments.get("characterId")
+    if not character_id:
+        raise ValueError("Missing required argument: characterId")
+    name = arguments.get("name")
+    if not name:
+        raise ValueError("Missing required argument: name")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    effect = manager.add_effect(
+        character_id,
+        name,
+        damage_dice=arguments.get("damageDice") or None,
+        hp_delta=arguments.get("hpDelta", 0),
+        mp_delta=arguments.get("mpDelta", 0),
+        every=arguments.get("every", 1),
+        rounds=arguments.get("rounds"),
+    )
+    
+    result = _effect_to_dict(effect)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Added effect {_describe_effect(effect)}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_remove_character_effect(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the remove character effect functionality.
+    
+    Args:
+        arguments: Dictionary containing effectId
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    effect_id = arguments.get("effectId")
+    if not effect_id:
+        raise ValueError("Missing required argument: effectId")
+    
+    manager = get_character_manager(arguments.get("campaignId"))
+    effect = manager.remove_effect(effect_id)
+    
+    result = _effect_to_dict(effect)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Removed effect {_describe_effect(effect)}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_list_character_effects(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the list character effects functionality.
+    
+    Args:
+        arguments: Dictionary containing an optional characterId
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_character_manager(arguments.get("campaignId"))
+    effects = manager.list_effects(arguments.get("characterId"))
+    
+    result = {
+        "round": manager.effects.round,
+        "effects": [_effect_to_dict(effect) for effect in effects],
+        "count": len(effects)
+    }
+    
+    lines = [f"Round {manager.effects.round}: {len(effects)} active effect(s)"]
+    lines.extend(f"- {_describe_effect(effect)}" for effect in effects)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_advance_round(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the advance round functionality.
+    
+    Args:
+        arguments: Dictionary containing the optional number of rounds
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_character_manager(arguments.get("campaignId"))
+    outcome = manager.advance_round(arguments.get("rounds", 1))
+    
+    result = {
+        "round": outcome["round"],
+        "ticks": [
+            {
+                "effectId": effect.effect_id,
+                "characterId": effect.entity_id,
+                "name": effect.name,
+                "hpChange": hp_change,
+                "mpChange": mp_change,
+            }
+            for effect, hp_change, mp_change in outcome["ticks"]
+        ],
+        "expired": [_effect_to_dict(effect) for effect in outcome["expired"]],
+        "characters": [
+            {
+                "characterId": char.character_id,
+                "currentHp": char.current_hp,
+                "maxHp": char.max_hp,
+                "currentMagicPoints": char.current_magic_points,
+                "maxMagicPoints": char.max_magic_points,
+                "version": char.version,
+            }
+            for char in outcome["characters"]
+        ],
+    }
+    
+    lines = [f"Round {outcome['round']}: {len(result['ticks'])} effect tick(s), {len(result['expired'])} expired"]
+    for tick in result["ticks"]:
+        lines.append(f"- {tick['name']} on {tick['characterId']}: HP {tick['hpChange']:+d}, MP {tick['mpChange']:+d}")
+    for effect in outcome["expired"]:
+        lines.append(f"- {effect.name} on {effect.entity_id} expired")
+    for char in outcome["characters"]:
+        lines.append(
+            f"- {char.name} (ID: {char.character_id}): "
+            f"HP {char.current_hp}/{char.max_hp}, "
+            f"MP {char.current_magic_points}/{char.max_magic_points}"
+        )
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
         }
     ]
     
     return contents, result
+
+
+def character_uri(campaign_id: str, character_id: str) -> str:
+    """Get the resource URI of a character."""
+    return entity_uri(CHARACTER_URI_SCHEME, campaign_id, character_id)
+
+
+def character_campaign_uri(campaign_id: str) -> str:
+    """Get the resource URI of all characters of a campaign."""
+    return campaign_uri(CHARACTER_URI_SCHEME, campaign_id)
+
+
+def canonical_character_uri(uri: str) -> str:
+    """
+    Normalize a character or campaign resource URI (percent-encoding) so it matches the URIs used in notifications.
+    
+    Raises:
+        ValueError: If the URI is not a character resource URI
+    """
+    campaign_id, character_id = parse_resource_uri(CHARACTER_URI_SCHEME, uri)
+    return character_campaign_uri(campaign_id) if character_id is None else character_uri(campaign_id, character_id)
+
+
+def list_character_resources(cursor: str | None = None) -> tuple[list[Resource], str | None]:
+    """
+    List the default campaign's characters as resources, one page at a time.
+    
+    Returns:
+        Tuple of (resources, next cursor or None when there are no more)
+    """
+    characters, next_cursor = get_character_manager().page_characters(RESOURCE_PAGE_SIZE, cursor)
+    resources = [
+        Resource(name=character.name, uri=character_uri(DEFAULT_CAMPAIGN, character.character_id), mimeType="application/json")
+        for character in characters
+    ]
+    return resources, next_cursor
+
+
+def read_character_resource(uri: str) -> str:
+    """
+    Get the JSON record of the character a resource URI points to, or the JSON
+    array of a campaign's characters, joined from their cached encodings.
+    
+    Raises:
+        ValueError: If the URI is invalid or the character is not found
+    """
+    campaign_id, character_id = parse_resource_uri(CHARACTER_URI_SCHEME, uri)
+    manager = get_character_manager(campaign_id)
+    if character_id is None:
+        return json_array(character.to_json() for character in manager.list_characters())
+    return manager.get_character(character_id).to_json()
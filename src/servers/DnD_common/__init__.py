@@ -0,0 +1 @@
+"""DnD Common building blocks shared by the entity MCP servers."""
@@ -0,0 +1,109 @@
+"""
+Bounded change log for the entity managers.
+Every write gets the next value of a monotonically increasing sequence
+number. The most recent changes (upserts and delete tombstones) are kept in a
+ring buffer, so mirroring clients can fetch only the entities changed after
+the last sequence number they saw instead of re-listing everything. Clients
+whose sequence number has fallen out of the window are told to resync.
+"""
+
+import secrets
+import threading
+from collections import deque
+from itertools import islice
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+
+# Number of changes kept in the log
+DEFAULT_CAPACITY = 10_000
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+class ChangeLog:
+    """A ring buffer of (sequence number, entity id, operation) entries."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("Change log capacity must be at least 1")
+        self._entries: Deque[Tuple[int, str, str]] = deque(maxlen=capacity)
+        self._seq = 0
+        # Tells sequence numbers of different logs (managers, server runs) apart
+        self.log_id = secrets.token_hex(4)
+        self._listeners: List[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def latest_seq(self) -> int:
+        """Sequence number of the most recent change (0 before the first one)."""
+        return self._seq
+
+    def add_listener(self, callback: Callable[[str, str], None]) -> None:
+        """Call back (entity id, op) after every recorded change; callbacks must be cheap and not raise."""
+        self._listeners.append(callback)
+
+    def record(self, entity_id: str, op: str) -> int:
+        """Append a change, notify the listeners and return its sequence number."""
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._entries.append((seq, entity_id, op))
+        for callback in self._listeners:
+            callback(entity_id, op)
+        return seq
+
+    def record_many(self, entity_ids: Sequence[str], op: str) -> int:
+        """
+        Append the same change for many entities with consecutive sequence numbers.
+
+        The log is locked once for the whole batch, so bulk writes are never
+        interleaved with other changes. Returns the last sequence number.
+        """
+        with self._lock:
+            first = self._seq + 1
+            self._entries.extend((first + offset, entity_id, op) for offset, entity_id in enumerate(entity_ids))
+            self._seq += len(entity_ids)
+            seq = self._seq
+        for entity_id in entity_ids:
+            for callback in self._listeners:
+                callback(entity_id, op)
+        return seq
+
+    def since(self, seq: int, limit: Optional[int] = None) -> Tuple[List[Tuple[int, str, str]], bool, bool]:
+        """
+        Get the latest change of every entity changed after a sequence number.
+
+        An entity changed several times is reported once, at its latest
+        sequence number, so the result is bounded by the number of distinct
+        entities rather than the number of writes.
+
+        Args:
+            seq: Last sequence number the client has seen (0 for everything in the log)
+            limit: Maximum number of changes to return (optional)
+
+        Returns:
+            Tuple of (changes as (seq, entity id, op) in sequence order, whether
+            more changes remain after the last one returned, whether the client
+            must resync because changes after ``seq`` have left the log or
+            ``seq`` is from a different log)
+
+        Raises:
+            ValueError: If the sequence number or limit is invalid
+        """
+        if seq < 0:
+            raise ValueError("Sequence number cannot be negative")
+        if limit is not None and limit < 1:
+            raise ValueError("Limit must be at least 1")
+        with self._lock:
+            entries = self._entries
+            oldest = entries[0][0] if entries else self._seq + 1
+            if seq + 1 < oldest or seq > self._seq:
+                return [], False, True
+            latest: Dict[str, Tuple[int, str, str]] = {}
+            for entry in islice(entries, seq + 1 - oldest, None):
+                latest[entry[1]] = entry
+        changes = sorted(latest.values())
+        if limit is not None and len(changes) > limit:
+            return changes[:limit], True, False
+        return changes, False, False
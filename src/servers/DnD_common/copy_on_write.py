@@ -0,0 +1,151 @@
+"""
+Copy-on-write property mappings for template-based entities.
+Many entities spawned from one stat block share its (read-only) properties
+and store only their own overrides. Reads fall through to the shared base;
+writes and deletions only ever touch the entity's private override layer.
+"""
+
+import copy
+from collections.abc import Mapping, MutableMapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.servers.DnD_common.projection import copy_value
+
+
+class _Deleted:
+    """Marks a base key removed by an override."""
+
+    __slots__ = ()
+
+
+_DELETED = _Deleted()
+
+
+def freeze_properties(properties: Optional[Mapping]) -> Mapping:
+    """Deep-copy properties into a read-only mapping suitable for sharing between entities."""
+    return MappingProxyType(copy.deepcopy(dict(properties or {})))
+
+
+class CopyOnWriteProperties(MutableMapping):
+    """
+    A mutable view of shared base properties plus private overrides.
+
+    The override layer is only allocated on the first write, so an entity
+    that never diverges from its template costs one small object. Deep copies
+    (and therefore ``dataclasses.asdict``) produce a plain dict of the
+    effective properties. Nested values of the base are shared as well:
+    replace them (``properties["abilities"] = {...}``) rather than mutating
+    them in place, or get a private copy to change with ``own(key)``.
+    """
+
+    __slots__ = ("_base", "_overrides")
+
+    def __init__(self, base: Mapping, overrides: Optional[Mapping] = None, deleted: Iterable[str] = ()):
+        """
+        Args:
+            base: Shared read-only properties
+            overrides: The entity's own values (optional)
+            deleted: Base keys the entity removed (optional)
+        """
+        self._base = base
+        # Overrides are deep-copied so no nested value is shared with the caller
+        # or with other entities built from the same overrides
+        self._overrides: Optional[Dict[str, Any]] = None
+        if overrides:
+            self._overrides = {key: copy_value(value) for key, value in overrides.items()}
+        for key in deleted:
+            if key in base:
+                self[key] = _DELETED
+
+    def __getitem__(self, key: str) -> Any:
+        overrides = self._overrides
+        if overrides is not None and key in overrides:
+            value = overrides[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        return self._base[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._overrides is None:
+            self._overrides = {}
+        self._overrides[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if key in self._base:
+            self[key] = _DELETED
+        else:
+            del self._overrides[key]
+
+    def __contains__(self, key: object) -> bool:
+        overrides = self._overrides
+        if overrides is not None and key in overrides:
+            return overrides[key] is not _DELETED
+        return key in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        overrides = self._overrides or {}
+        for key in self._base:
+            if overrides.get(key) is not _DELETED:
+                yield key
+        for key, value in overrides.items():
+            if key not in self._base and value is not _DELETED:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def own(self, key: str) -> Any:
+        """
+        Get a value that may be changed in place.
+
+        A value still shared with the base is deep-copied into the overrides
+        first, so nested edits never leak into the template or its other entities.
+        """
+        overrides = self._overrides
+        if overrides is not None and key in overrides:
+            return self[key]
+        value = copy_value(self._base[key])
+        self[key] = value
+        return value
+
+    @property
+    def base(self) -> Mapping:
+        """The shared base properties."""
+        return self._base
+
+    def overrides(self) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Get what the entity changed on top of the base, e.g. to store it apart from the shared base.
+
+        Returns:
+            Tuple of (the entity's own values, base keys it removed); the
+            values are shared, not copied
+        """
+        overrides = self._overrides or {}
+        values = {key: value for key, value in overrides.items() if value is not _DELETED}
+        deleted = [key for key, value in overrides.items() if value is _DELETED]
+        return values, deleted
+
+    def copy(self, deep: bool = True) -> "CopyOnWriteProperties":
+        """
+        Get an independent view of the same base with a copy of the overrides.
+
+        A shallow copy (``deep=False``) shares the overrides' values: replace
+        them rather than changing them in place.
+        """
+        clone = CopyOnWriteProperties(self._base)
+        if self._overrides is not None:
+            clone._overrides = {
+                key: copy_value(value) if deep else value for key, value in self._overrides.items()
+            }
+        return clone
+
+    def __deepcopy__(self, memo: dict) -> Dict[str, Any]:
+        return copy.deepcopy(dict(self.items()), memo)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
@@ -0,0 +1,303 @@
+"""
+Derived stats of entities: ability modifiers, armor class, spell save DC, ...
+Each stat is a formula in the filter expression language over the entity's
+fields and other stats (``derived.<name>``), e.g.
+``floor((properties.strength - 10) / 2)``. Values are computed on first read
+and memoized on the entity. An update drops only the stats that depend,
+directly or through other stats, on the fields it changed; any other write
+bumps the entity's version, which discards the whole memo.
+"""
+
+import re
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.servers.DnD_common.expressions import CompiledFilter, compile_filter
+from src.servers.DnD_common.patch import parse_pointer
+from src.servers.DnD_common.paths import MISSING, overlaps
+
+# Pseudo-attribute through which formulas read other derived stats
+DERIVED = "derived"
+
+ABILITIES = ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")
+
+DEFAULT_FORMULAS = {
+    **{f"{ability}Modifier": f"floor((properties.{ability} - 10) / 2)" for ability in ABILITIES},
+    "proficiencyBonus": "coalesce(properties.proficiencyBonus, "
+                        "2 + floor((max(coalesce(properties.level, properties.challengeRating, 1), 1) - 1) / 4))",
+    "armorClass": "coalesce(properties.armorClass, 10 + derived.dexterityModifier)",
+    "initiativeBonus": "derived.dexterityModifier",
+    "passivePerception": "10 + derived.wisdomModifier",
+    "spellSaveDc": "8 + derived.proficiencyBonus + "
+                   "max(derived.intelligenceModifier, derived.wisdomModifier, derived.charismaModifier)",
+}
+
+# Update arguments and the field they change
+_UPDATED_FIELDS = {
+    "name": "name",
+    "current_hp": "current_hp",
+    "hp_delta": "current_hp",
+    "max_hp": "max_hp",
+    "current_magic_points": "current_magic_points",
+    "mp_delta": "current_magic_points",
+    "max_magic_points": "max_magic_points",
+}
+
+_STAT_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+# A dice notation placeholder such as "+{strengthModifier}"
+_PLACEHOLDER = re.compile(r"\s*([+-]?)\s*\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+# Instance attribute holding [definitions generation, entity version, {stat: value}]
+_MEMO_ATTRIBUTE = "_derived"
+
+Path = Tuple[str, ...]
+
+
+class _Definitions(NamedTuple):
+    """An immutable snapshot of the formulas, replaced as a whole on every change."""
+
+    generation: int
+    formulas: Dict[str, CompiledFilter]
+    order: Tuple[str, ...]
+    requires: Dict[str, frozenset]
+    inputs: Dict[str, Tuple[Path, ...]]
+
+
+class _Scope:
+    """An entity whose ``derived`` attribute holds its memoized stats."""
+
+    __slots__ = ("_entity", "derived")
+
+    def __init__(self, entity: Any, derived: Dict[str, Any]):
+        self._entity = entity
+        self.derived = derived
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._entity, name)
+
+
+def _merge_patch_paths(prefix: Path, patch: Mapping) -> Iterable[Path]:
+    """Yield the paths a merge patch changes."""
+    for key, value in patch.items():
+        if isinstance(value, Mapping) and value:
+            yield from _merge_patch_paths(prefix + (key,), value)
+        else:
+            yield prefix + (key,)
+
+
+def update_paths(**changes: Any) -> List[Path]:
+    """
+    Get the field paths an update changed from the arguments it was given.
+
+    Args:
+        **changes: Arguments of update_character/update_monster (name,
+            current_hp, hp_delta, properties, patch, merge_patch, ...); None
+            values are ignored
+
+    Returns:
+        List of paths such as ("current_hp",) or ("properties", "inventory", "potions")
+    """
+    paths: List[Path] = []
+    for argument, value in changes.items():
+        if value is None:
+            continue
+        if argument in _UPDATED_FIELDS:
+            paths.append((_UPDATED_FIELDS[argument],))
+        elif argument == "properties":
+            paths.extend(("properties", key) for key in value)
+        elif argument == "patch":
+            paths.extend(("properties",) + parse_pointer(operation["path"]) for operation in value)
+        elif argument == "merge_patch":
+            paths.extend(_merge_patch_paths(("properties",), value))
+    return paths
+
+
+def substitute_stats(notation: str, values: Mapping[str, Any]) -> str:
+    """
+    Replace ``{stat}`` placeholders in dice notation, e.g. "1d20+{strengthModifier}".
+
+    Raises:
+        ValueError: If a stat has no integer value or a placeholder is not
+            preceded by + or - (except at the start)
+    """
+    def replace(match: "re.Match[str]") -> str:
+        sign, name = match.groups()
+        if not sign and match.start() > 0:
+            raise ValueError(f"Derived stat '{{{name}}}' must be preceded by + or - in dice notation")
+        value = values.get(name, MISSING)
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"Derived stat '{name}' has no integer value")
+        if sign == "-":
+            value = -value
+        return f"{value:+d}" if sign else str(value)
+
+    return _PLACEHOLDER.sub(replace, notation)
+
+
+def placeholder_names(notation: str) -> List[str]:
+    """Get the stat names used as placeholders in dice notation."""
+    return [name for _, name in _PLACEHOLDER.findall(notation)]
+
+
+class DerivedStats:
+    """
+    Formulas computing derived stats of one manager's entities.
+
+    Values are memoized on each entity, tagged with the entity's version and
+    with a generation that changes whenever a formula is defined or dropped.
+    """
+
+    def __init__(self, attributes: Tuple[str, ...], formulas: Optional[Mapping[str, str]] = None):
+        """
+        Args:
+            attributes: Attribute names the entities support
+            formulas: Initial formulas by stat name (default DEFAULT_FORMULAS)
+        """
+        self._attributes = attributes + (DERIVED,)
+        self._lock = threading.Lock()
+        self._definitions = self._build(0, {}, DEFAULT_FORMULAS if formulas is None else formulas)
+
+    def _build(self, generation: int, compiled: Dict[str, CompiledFilter], texts: Mapping[str, str]) -> _Definitions:
+        """Compile new formulas and order every formula after the stats it reads."""
+        formulas = dict(compiled)
+        for name, text in texts.items():
+            if not isinstance(name, str) or not _STAT_NAME.match(name):
+                raise ValueError(f"Invalid derived stat name '{name}': use letters, digits and underscores")
+            formulas[name] = compile_filter(text, self._attributes)
+
+        reads = {
+            name: {path[1] for path in formula.paths if path[0] == DERIVED and len(path) > 1}
+            for name, formula in formulas.items()
+        }
+        for name, names in reads.items():
+            unknown = names - formulas.keys()
+            if unknown:
+                raise ValueError(f"Derived stat '{name}' reads unknown stat '{sorted(unknown)[0]}'")
+
+        order: List[str] = []
+        requires: Dict[str, frozenset] = {}
+        visiting: set = set()
+
+        def visit(name: str) -> frozenset:
+            if name in requires:
+                return requires[name]
+            if name in visiting:
+                raise ValueError(f"Derived stat '{name}' depends on itself")
+            visiting.add(name)
+            required = {name}
+            for dependency in sorted(reads[name]):
+                required |= visit(dependency)
+            visiting.discard(name)
+            requires[name] = frozenset(required)
+            order.append(name)
+            return requires[name]
+
+        for name in formulas:
+            visit(name)
+
+        inputs = {
+            name: tuple(
+                path
+                for required in requires[name]
+                for path in formulas[required].paths
+                if path[0] != DERIVED
+            )
+            for name in formulas
+        }
+        return _Definitions(generation, formulas, tuple(order), requires, inputs)
+
+    def define(self, name: str, formula: str) -> None:
+        """
+        Define or replace a derived stat.
+
+        Raises:
+            ValueError: If the name or formula is invalid, reads an unknown
+                stat or makes stats depend on themselves
+        """
+        with self._lock:
+            current = self._definitions
+            self._definitions = self._build(current.generation + 1, current.formulas, {name: formula})
+
+    def drop(self, name: str) -> None:
+        """
+        Remove a derived stat.
+
+        Raises:
+            ValueError: If the stat does not exist or other stats read it
+        """
+        with self._lock:
+            current = self._definitions
+            if name not in current.formulas:
+                raise ValueError(f"Unknown derived stat '{name}'")
+            readers = sorted(other for other, required in current.requires.items() if other != name and name in required)
+            if readers:
+                raise ValueError(f"Derived stat '{name}' is read by {', '.join(readers)}")
+            formulas = {other: formula for other, formula in current.formulas.items() if other != name}
+            self._definitions = self._build(current.generation + 1, formulas, {})
+
+    def formulas(self) -> Dict[str, str]:
+        """Get the formula text of every derived stat by name."""
+        return {name: formula.text for name, formula in self._definitions.formulas.items()}
+
+    def values(self, entity: Any, names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Get derived stats of an entity, computing only those not memoized.
+
+        Stats whose inputs are missing are left out.
+
+        Args:
+            entity: The entity
+            names: Stats to get (optional, default all)
+
+        Raises:
+            ValueError: If a name is not a derived stat
+        """
+        definitions = self._definitions
+        if names is None:
+            names = definitions.order
+            needed = None
+        else:
+            needed = set()
+            for name in names:
+                if name not in definitions.requires:
+                    raise ValueError(f"Unknown derived stat '{name}'")
+                needed |= definitions.requires[name]
+
+        # Read the version before computing: a write racing the computation
+        # bumps it afterwards, so values computed from half-written data are
+        # never reused.
+        version = entity.version
+        memo = entity.__dict__.get(_MEMO_ATTRIBUTE)
+        if memo is None or memo[0] != definitions.generation or memo[1] != version:
+            memo = [definitions.generation, version, {}]
+            entity.__dict__[_MEMO_ATTRIBUTE] = memo
+        values = memo[2]
+
+        scope = _Scope(entity, values)
+        for name in definitions.order:
+            if name not in values and (needed is None or name in needed):
+                values[name] = definitions.formulas[name].evaluate(scope)
+        return {name: values[name] for name in names if values[name] is not MISSING}
+
+    def invalidate(self, entity: Any, previous_version: int, changed: Iterable[Path]) -> None:
+        """
+        Carry an entity's memoized stats over an update, dropping those that read a changed path.
+
+        Call after the update bumped the version. Stats memoized for another
+        version than ``previous_version`` are stale anyway and left to expire.
+        """
+        definitions = self._definitions
+        memo = entity.__dict__.get(_MEMO_ATTRIBUTE)
+        if memo is None or memo[0] != definitions.generation or memo[1] != previous_version:
+            return
+        changed = list(changed)
+        kept = {
+            name: value
+            for name, value in memo[2].items()
+            if not any(overlaps(path, change) for path in definitions.inputs[name] for change in changed)
+        }
+        entity.__dict__[_MEMO_ATTRIBUTE] = [definitions.generation, entity.version, kept]
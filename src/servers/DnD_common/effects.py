@@ -0,0 +1,175 @@
+"""
+Per-round conditions and effects (poison, regeneration, concentration, ...).
+Each effect schedules its next event, a tick or its expiry, in a timer wheel
+keyed by round, so advancing a round only looks at the effects that fall due.
+The scheduler keeps the bookkeeping; managers roll the dice and apply the
+ticks to their entities in one batch.
+"""
+
+import itertools
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.servers.DnD_common.timer_wheel import TimerWheel
+
+
+@dataclass
+class Effect:
+    """A condition on an entity that changes its HP/MP every few rounds and may expire."""
+
+    effect_id: str
+    entity_id: str
+    name: str
+    damage_dice: Optional[str] = None
+    hp_delta: int = 0
+    mp_delta: int = 0
+    every: int = 1
+    started_round: int = 0
+    expires_round: Optional[int] = None
+    next_round: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the effect to a dictionary."""
+        return asdict(self)
+
+    @property
+    def ticks(self) -> bool:
+        """Whether the effect changes HP or magic points (a pure condition only expires)."""
+        return bool(self.damage_dice or self.hp_delta or self.mp_delta)
+
+
+class EffectScheduler:
+    """Effects of one manager's entities and the current round."""
+
+    def __init__(self):
+        self._wheel = TimerWheel()
+        self._effects: Dict[str, Effect] = {}
+        self._by_entity: Dict[str, Set[str]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def round(self) -> int:
+        """The current round."""
+        return self._wheel.now
+
+    def add(
+        self,
+        entity_id: str,
+        name: str,
+        damage_dice: Optional[str] = None,
+        hp_delta: int = 0,
+        mp_delta: int = 0,
+        every: int = 1,
+        rounds: Optional[int] = None
+    ) -> Effect:
+        """
+        Add an effect. It first ticks ``every`` rounds from now.
+
+        Args:
+            entity_id: Entity affected
+            name: Effect name, e.g. "poisoned"
+            damage_dice: Dice notation of the damage dealt on every tick (optional)
+            hp_delta: HP change on every tick (negative for damage)
+            mp_delta: Magic point change on every tick
+            every: Rounds between ticks
+            rounds: Rounds until the effect expires (None lasts until removed)
+
+        Raises:
+            ValueError: If every or rounds is not positive, or the effect
+                neither ticks nor expires
+        """
+        if every < 1:
+            raise ValueError(f"Effect interval must be at least 1 round, got {every}")
+        if rounds is not None and rounds < 1:
+            raise ValueError(f"Effect duration must be at least 1 round, got {rounds}")
+        with self._lock:
+            now = self._wheel.now
+            effect = Effect(
+                effect_id=f"effect-{next(self._ids)}",
+                entity_id=entity_id,
+                name=name,
+                damage_dice=damage_dice,
+                hp_delta=hp_delta,
+                mp_delta=mp_delta,
+                every=every,
+                started_round=now,
+                expires_round=None if rounds is None else now + rounds,
+            )
+            if not effect.ticks and effect.expires_round is None:
+                raise ValueError("An effect needs damageDice, hpDelta, mpDelta or a duration")
+            self._effects[effect.effect_id] = effect
+            self._by_entity.setdefault(entity_id, set()).add(effect.effect_id)
+            self._schedule(effect, now + every)
+            return effect
+
+    def _schedule(self, effect: Effect, tick_round: int) -> None:
+        """Schedule an effect's next event: its next tick or its expiry, whichever comes first."""
+        next_round = tick_round if effect.ticks else effect.expires_round
+        if effect.expires_round is not None:
+            next_round = min(next_round, effect.expires_round)
+        effect.next_round = next_round
+        self._wheel.schedule(next_round, (effect.effect_id, next_round))
+
+    def remove(self, effect_id: str) -> Effect:
+        """
+        Remove an effect (its pending timer is ignored when it falls due).
+
+        Raises:
+            ValueError: If the effect does not exist
+        """
+        with self._lock:
+            effect = self._effects.get(effect_id)
+            if effect is None:
+                raise ValueError(f"Effect with ID '{effect_id}' not found")
+            self._discard(effect)
+            return effect
+
+    def remove_entity(self, entity_id: str) -> None:
+        """Remove every effect on an entity (e.g. when it is deleted)."""
+        with self._lock:
+            for effect_id in list(self._by_entity.get(entity_id, ())):
+                self._discard(self._effects[effect_id])
+
+    def _discard(self, effect: Effect) -> None:
+        del self._effects[effect.effect_id]
+        effect_ids = self._by_entity[effect.entity_id]
+        effect_ids.discard(effect.effect_id)
+        if not effect_ids:
+            del self._by_entity[effect.entity_id]
+
+    def effects(self, entity_id: Optional[str] = None) -> List[Effect]:
+        """Get the active effects of an entity, or of every entity, in the order they were added."""
+        with self._lock:
+            if entity_id is None:
+                return list(self._effects.values())
+            effect_ids = self._by_entity.get(entity_id, ())
+            return [effect for effect in self._effects.values() if effect.effect_id in effect_ids]
+
+    def advance(self) -> Tuple[int, List[Effect], List[Effect]]:
+        """
+        Move to the next round and collect the effects that fall due.
+
+        Ticking effects are rescheduled; expired ones are removed.
+
+        Returns:
+            Tuple of (new round, effects that tick this round, effects that expired)
+        """
+        with self._lock:
+            due = self._wheel.advance()
+            now = self._wheel.now
+            ticking: List[Effect] = []
+            expired: List[Effect] = []
+            for effect_id, scheduled in due:
+                effect = self._effects.get(effect_id)
+                if effect is None or effect.next_round != scheduled:
+                    continue
+                if effect.ticks and (now - effect.started_round) % effect.every == 0:
+                    ticking.append(effect)
+                if effect.expires_round is not None and now >= effect.expires_round:
+                    self._discard(effect)
+                    expired.append(effect)
+                else:
+                    self._schedule(effect, now + effect.every)
+            return now, ticking, expired
@@ -0,0 +1,378 @@
+"""
+Filter expressions for entity queries.
+A small, safe expression language such as
+``currentHp < maxHp * 0.25 and properties.type == "goblin"``. Expressions are
+parsed once, compiled to nested Python closures (nothing is ever passed to
+``eval``) and cached by expression text. Top-level ``and`` conjuncts of the
+form ``path op literal`` are exposed as predicates so the query planner can
+answer them from secondary indexes.
+
+Grammar (lowest to highest precedence)::
+
+    expr       := and ("or" and)*
+    and        := not ("and" not)*
+    not        := "not" not | comparison
+    comparison := sum (("==" | "!=" | "<" | "<=" | ">" | ">=" | "in" | "contains") sum)?
+    sum        := product (("+" | "-") product)*
+    product    := unary (("*" | "/" | "%") unary)*
+    unary      := "-" unary | primary
+    primary    := number | string | true | false | null | "[" items "]"
+                | function "(" items ")" | field.path | "(" expr ")"
+
+Missing fields and type mismatches never raise: arithmetic yields a missing
+value and comparisons involving one are false, matching ``Predicate.matches``.
+``coalesce(a, b, ...)`` yields its first argument that is not missing.
+"""
+
+import math
+import operator
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Callable, List, Tuple
+
+from src.servers.DnD_common.paths import MISSING, parse_path
+from src.servers.DnD_common.query import OPERATORS, Predicate
+
+
+Evaluator = Callable[[Any], Any]
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_]+)*)
+      | (?P<op>==|!=|<=|>=|<|>|\+|-|\*|/|%|\(|\)|\[|\]|,)
+    )""", re.VERBOSE)
+
+_KEYWORDS = {"and", "or", "not", "in", "contains", "true", "false", "null"}
+_CONSTANTS = {"true": True, "false": False, "null": None}
+_COMPARISONS = {"==": "eq", "!=": "ne", "<": "lt", "<=": "le", ">": "gt", ">=": "ge", "in": "in", "contains": "contains"}
+_FLIPPED = {"eq": "eq", "ne": "ne", "lt": "gt", "le": "ge", "gt": "lt", "ge": "le"}
+_ARITHMETIC = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv, "%": operator.mod}
+FUNCTIONS = {"min": min, "max": max, "abs": abs, "floor": math.floor, "ceil": math.ceil, "round": round, "len": len}
+COALESCE = "coalesce"
+
+
+def _truthy(value: Any) -> bool:
+    return value is not MISSING and bool(value)
+
+
+def _tokenize(text: str) -> List[Tuple[str, Any, int]]:
+    """Split an expression into (kind, value, position) tokens."""
+    tokens = []
+    position = 0
+    end = len(text.rstrip())
+    while position < end:
+        while text[position].isspace():
+            position += 1
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid filter expression at position {position}: unexpected '{text[position:position + 1]}'")
+        kind = match.lastgroup
+        token = match.group(kind)
+        start = match.start(kind)
+        if kind == "number":
+            tokens.append(("literal", float(token) if any(c in token for c in ".eE") else int(token), start))
+        elif kind == "string":
+            tokens.append(("literal", re.sub(r"\\(.)", r"\1", token[1:-1]), start))
+        elif kind == "name" and token in _CONSTANTS:
+            tokens.append(("literal", _CONSTANTS[token], start))
+        elif kind == "name" and token in _KEYWORDS:
+            tokens.append(("op", token, start))
+        else:
+            tokens.append((kind, token, start))
+        position = match.end()
+    tokens.append(("end", None, end))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing a tuple-based syntax tree."""
+
+    def __init__(self, text: str, attributes: Tuple[str, ...]):
+        self.text = text
+        self.attributes = attributes
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"Invalid filter expression at position {self.tokens[self.index][2]}: {message}")
+
+    def peek(self, *ops: str) -> bool:
+        kind, value, _ = self.tokens[self.index]
+        return kind == "op" and value in ops
+
+    def take(self) -> Tuple[str, Any, int]:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, op: str) -> None:
+        if not self.peek(op):
+            raise self.error(f"expected '{op}'")
+        self.index += 1
+
+    def parse(self) -> tuple:
+        node = self.parse_or()
+        if self.tokens[self.index][0] != "end":
+            raise self.error(f"unexpected '{self.tokens[self.index][1]}'")
+        return node
+
+    def parse_or(self) -> tuple:
+        items = [self.parse_and()]
+        while self.peek("or"):
+            self.index += 1
+            items.append(self.parse_and())
+        return items[0] if len(items) == 1 else ("or", items)
+
+    def parse_and(self) -> tuple:
+        items = [self.parse_not()]
+        while self.peek("and"):
+            self.index += 1
+            items.append(self.parse_not())
+        return items[0] if len(items) == 1 else ("and", items)
+
+    def parse_not(self) -> tuple:
+        if self.peek("not"):
+            self.index += 1
+            return ("not", self.parse_not())
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> tuple:
+        left = self.parse_sum()
+        if self.peek(*_COMPARISONS):
+            op = _COMPARISONS[self.take()[1]]
+            return ("compare", op, left, self.parse_sum())
+        return left
+
+    def parse_sum(self) -> tuple:
+        node = self.parse_product()
+        while self.peek("+", "-"):
+            node = ("arith", self.take()[1], node, self.parse_product())
+        return node
+
+    def parse_product(self) -> tuple:
+        node = self.parse_unary()
+        while self.peek("*", "/", "%"):
+            node = ("arith", self.take()[1], node, self.parse_unary())
+        return node
+
+    def parse_unary(self) -> tuple:
+        if self.peek("-"):
+            self.index += 1
+            return ("arith", "-", ("literal", 0), self.parse_unary())
+        return self.parse_primary()
+
+    def parse_items(self, closing: str) -> List[tuple]:
+        items: List[tuple] = []
+        while not self.peek(closing):
+            items.append(self.parse_or())
+            if not self.peek(closing):
+                self.expect(",")
+        self.index += 1
+        return items
+
+    def parse_primary(self) -> tuple:
+        kind, value, _ = self.tokens[self.index]
+        if kind == "literal":
+            self.index += 1
+            return ("literal", value)
+        if kind == "op" and value == "(":
+            self.index += 1
+            node = self.parse_or()
+            self.expect(")")
+            return node
+        if kind == "op" and value == "[":
+            self.index += 1
+            return ("list", self.parse_items("]"))
+        if kind == "name":
+            self.index += 1
+            if self.peek("("):
+                if value not in FUNCTIONS and value != COALESCE:
+                    raise self.error(f"unknown function '{value}'")
+                self.index += 1
+                return ("call", value, self.parse_items(")"))
+            return ("path", parse_path(value, self.attributes))
+        raise self.error("expected a value" if kind == "end" else f"unexpected '{value}'")
+
+
+def _compile(node: tuple) -> Evaluator:
+    """Compile a syntax tree node into a closure over an entity."""
+    kind = node[0]
+    if kind == "literal":
+        value = node[1]
+        return lambda entity: value
+    if kind == "path":
+        attribute, *keys = node[1]
+
+        def get_path(entity: Any) -> Any:
+            value = getattr(entity, attribute)
+            for key in keys:
+                if not isinstance(value, Mapping) or key not in value:
+                    return MISSING
+                value = value[key]
+            return value
+        return get_path
+    if kind == "list":
+        items = [_compile(item) for item in node[1]]
+        return lambda entity: [item(entity) for item in items]
+    if kind == "call" and node[1] == COALESCE:
+        args = [_compile(arg) for arg in node[2]]
+
+        def coalesce(entity: Any) -> Any:
+            for arg in args:
+                value = arg(entity)
+                if value is not MISSING:
+                    return value
+            return MISSING
+        return coalesce
+    if kind == "call":
+        function = FUNCTIONS[node[1]]
+        args = [_compile(arg) for arg in node[2]]
+
+        def call(entity: Any) -> Any:
+            values = [arg(entity) for arg in args]
+            if any(value is MISSING for value in values):
+                return MISSING
+            try:
+                return function(*values)
+            except (TypeError, ValueError, OverflowError):
+                return MISSING
+        return call
+    if kind == "arith":
+        function = _ARITHMETIC[node[1]]
+        left, right = _compile(node[2]), _compile(node[3])
+
+        def arith(entity: Any) -> Any:
+            a, b = left(entity), right(entity)
+            if a is MISSING or b is MISSING:
+                return MISSING
+            try:
+                return function(a, b)
+            except (TypeError, ZeroDivisionError, OverflowError):
+                return MISSING
+        return arith
+    if kind == "compare":
+        function = OPERATORS[node[1]]
+        left, right = _compile(node[2]), _compile(node[3])
+
+        def compare(entity: Any) -> bool:
+            a, b = left(entity), right(entity)
+            if a is MISSING or b is MISSING:
+                return False
+            try:
+                return bool(function(a, b))
+            except TypeError:
+                return False
+        return compare
+    if kind == "not":
+        operand = _compile(node[1])
+        return lambda entity: not _truthy(operand(entity))
+    if kind == "and":
+        items = [_compile(item) for item in node[1]]
+        return lambda entity: all(_truthy(item(entity)) for item in items)
+    items = [_compile(item) for item in node[1]]
+    return lambda entity: any(_truthy(item(entity)) for item in items)
+
+
+def _fold(node: tuple) -> tuple:
+    """Evaluate constant subtrees (e.g. ``10 * 2`` or ``[1, 2]``) at compile time."""
+    kind = node[0]
+    if kind in ("literal", "path"):
+        return node
+    if kind in ("arith", "compare"):
+        node = (kind, node[1], _fold(node[2]), _fold(node[3]))
+        children = node[2:]
+    elif kind == "call":
+        node = (kind, node[1], [_fold(arg) for arg in node[2]])
+        children = node[2]
+    elif kind == "not":
+        node = (kind, _fold(node[1]))
+        children = node[1:]
+    else:
+        node = (kind, [_fold(item) for item in node[1]])
+        children = node[1]
+    if all(child[0] == "literal" for child in children):
+        value = _compile(node)(None)
+        if value is not MISSING:
+            return ("literal", value)
+    return node
+
+
+def _pushdown(node: tuple) -> Tuple[Predicate, ...]:
+    """Collect top-level ``path op literal`` conjuncts as index-answerable predicates."""
+    conjuncts = node[1] if node[0] == "and" else [node]
+    predicates = []
+    for item in conjuncts:
+        if item[0] != "compare":
+            continue
+        op, left, right = item[1:]
+        if left[0] == "literal" and right[0] == "path" and op in _FLIPPED:
+            op, left, right = _FLIPPED[op], right, left
+        if left[0] == "path" and right[0] == "literal":
+            if op == "in" and not isinstance(right[1], list):
+                continue
+            parts = left[1]
+            predicates.append(Predicate(".".join(parts), parts, op, right[1]))
+    return tuple(predicates)
+
+
+def _paths(node: tuple) -> Tuple[Tuple[str, ...], ...]:
+    """Collect the field paths an expression reads, in order of appearance."""
+    kind = node[0]
+    if kind == "path":
+        return (node[1],)
+    if kind == "literal":
+        return ()
+    if kind in ("arith", "compare"):
+        children = node[2:]
+    elif kind == "call":
+        children = node[2]
+    elif kind == "not":
+        children = node[1:]
+    else:
+        children = node[1]
+    return tuple(path for child in children for path in _paths(child))
+
+
+class CompiledFilter:
+    """A parsed and compiled filter expression."""
+
+    __slots__ = ("text", "evaluate", "conjuncts", "paths")
+
+    def __init__(
+        self,
+        text: str,
+        evaluate: Evaluator,
+        conjuncts: Tuple[Predicate, ...],
+        paths: Tuple[Tuple[str, ...], ...] = ()
+    ):
+        self.text = text
+        self.evaluate = evaluate
+        self.conjuncts = conjuncts
+        self.paths = paths
+
+    def matches(self, entity: Any) -> bool:
+        """Check whether the expression is true for an entity."""
+        return _truthy(self.evaluate(entity))
+
+
+@lru_cache(maxsize=256)
+def compile_filter(text: str, attributes: Tuple[str, ...]) -> CompiledFilter:
+    """
+    Parse and compile a filter expression, caching the result by expression text.
+
+    Args:
+        text: Expression such as ``currentHp < maxHp * 0.25 and properties.type == "goblin"``
+        attributes: Attribute names the entity supports
+
+    Returns:
+        CompiledFilter with a ``matches(entity)`` method, pushdown ``conjuncts``
+        and the field ``paths`` it reads
+
+    Raises:
+        ValueError: If the expression is malformed or names an unknown field or function
+    """
+    tree = _fold(_Parser(text, attributes).parse())
+    return CompiledFilter(text, _compile(tree), _pushdown(tree), _paths(tree))
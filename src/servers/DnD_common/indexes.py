@@ -0,0 +1,276 @@
+"""
+Secondary indexes over entity fields.
+Hash indexes answer equality lookups on categorical values; sorted indexes also
+answer range lookups on ordered values. Both are maintained incrementally: the
+manager calls ``update`` after every write and ``remove`` on delete. Sorted
+indexes double as sorted views for ordered, top-k listings.
+"""
+
+import json
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from src.servers.DnD_common.paths import MISSING, resolve
+
+
+INDEX_KINDS = ("hash", "sorted")
+
+# A sorted index re-sorts all entries at once instead of inserting one by one
+# when a bulk update changes at least 1/REBUILD_RATIO of them
+REBUILD_RATIO = 16
+
+
+def hash_key(value: Any) -> Hashable:
+    """Make any JSON-like value usable as a hash key (lists/dicts are keyed by their JSON form)."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ("__json__", json.dumps(value, sort_keys=True, default=str))
+
+
+def sort_key(value: Any) -> Tuple:
+    """
+    Order values of mixed types: None, then numbers, then strings, then anything else.
+
+    Range lookups only compare values of the same group, so ``< 5`` never
+    matches strings.
+    """
+    if value is None:
+        return (0,)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, json.dumps(value, sort_keys=True, default=str))
+
+
+class _Top:
+    """Compares greater than any entity id; used as an inclusive upper bound."""
+
+    def __gt__(self, other: Any) -> bool:
+        return True
+
+    def __lt__(self, other: Any) -> bool:
+        return False
+
+
+_TOP = _Top()
+
+
+class HashIndex:
+    """Equality index: field value -> set of entity ids."""
+
+    kind = "hash"
+
+    def __init__(self, parts: Tuple[str, ...]):
+        self.parts = parts
+        self._buckets: Dict[Hashable, Set[str]] = {}
+        self._keys: Dict[str, Hashable] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, entity_id: str, entity: Any) -> None:
+        """Re-index an entity after a write."""
+        value = resolve(entity, self.parts)
+        with self._lock:
+            self._discard(entity_id)
+            if value is not MISSING:
+                key = hash_key(value)
+                self._buckets.setdefault(key, set()).add(entity_id)
+                self._keys[entity_id] = key
+
+    def update_many(self, entities: Iterable[Tuple[str, Any]]) -> None:
+        """Re-index many entities after a bulk write, taking the lock once."""
+        values = [(entity_id, resolve(entity, self.parts)) for entity_id, entity in entities]
+        with self._lock:
+            for entity_id, value in values:
+                self._discard(entity_id)
+                if value is not MISSING:
+                    key = hash_key(value)
+                    self._buckets.setdefault(key, set()).add(entity_id)
+                    self._keys[entity_id] = key
+
+    def remove(self, entity_id: str) -> None:
+        """Drop an entity from the index."""
+        with self._lock:
+            self._discard(entity_id)
+
+    def _discard(self, entity_id: str) -> None:
+        key = self._keys.pop(entity_id, MISSING)
+        if key is not MISSING:
+            bucket = self._buckets[key]
+            bucket.discard(entity_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def lookup(self, op: str, value: Any) -> Optional[Set[str]]:
+        """
+        Find candidate ids for a predicate.
+
+        Returns:
+            Set of ids, or None if this index cannot answer the operator
+        """
+        with self._lock:
+            if op == "eq":
+                return set(self._buckets.get(hash_key(value), ()))
+            if op == "in" and isinstance(value, list):
+                found: Set[str] = set()
+                for item in value:
+                    found.update(self._buckets.get(hash_key(item), ()))
+                return found
+        return None
+
+
+class SortedIndex:
+    """Ordered index: sorted list of (sort key, entity id) for equality and range lookups."""
+
+    kind = "sorted"
+
+    def __init__(self, parts: Tuple[str, ...]):
+        self.parts = parts
+        self._entries: List[Tuple[Tuple, str]] = []
+        self._keys: Dict[str, Tuple] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._keys
+
+    def update(self, entity_id: str, entity: Any) -> None:
+        """Re-index an entity after a write (O(log n) search, skipped if the key is unchanged)."""
+        value = resolve(entity, self.parts)
+        key = None if value is MISSING else sort_key(value)
+        with self._lock:
+            if self._keys.get(entity_id) == key and key is not None:
+                return
+            self._discard(entity_id)
+            if key is not None:
+                insort(self._entries, (key, entity_id))
+                self._keys[entity_id] = key
+
+    def update_many(self, entities: Iterable[Tuple[str, Any]]) -> None:
+        """
+        Re-index many entities after a bulk write.
+
+        Small batches are inserted one by one; a batch changing a large share
+        of the entries rebuilds the list with one merge of the unchanged
+        entries and the sorted changes, O(n + k log k) instead of O(k * n).
+        """
+        keys = {}
+        for entity_id, entity in entities:
+            value = resolve(entity, self.parts)
+            keys[entity_id] = None if value is MISSING else sort_key(value)
+        with self._lock:
+            changed = {
+                entity_id: key
+                for entity_id, key in keys.items()
+                if key is None or self._keys.get(entity_id) != key
+            }
+            if len(changed) * REBUILD_RATIO < len(self._entries):
+                for entity_id, key in changed.items():
+                    self._discard(entity_id)
+                    if key is not None:
+                        insort(self._entries, (key, entity_id))
+                        self._keys[entity_id] = key
+                return
+            kept = [entry for entry in self._entries if entry[1] not in changed]
+            added = sorted((key, entity_id) for entity_id, key in changed.items() if key is not None)
+            # Two sorted runs: the sort merges them in linear time
+            self._entries = sorted(kept + added)
+            for entity_id, key in changed.items():
+                if key is None:
+                    self._keys.pop(entity_id, None)
+                else:
+                    self._keys[entity_id] = key
+
+    def remove(self, entity_id: str) -> None:
+        """Drop an entity from the index."""
+        with self._lock:
+            self._discard(entity_id)
+
+    def _discard(self, entity_id: str) -> None:
+        key = self._keys.pop(entity_id, None)
+        if key is not None:
+            position = bisect_left(self._entries, (key, entity_id))
+            del self._entries[position]
+
+    def _range(self, low: Tuple, high: Tuple) -> List[str]:
+        """Ids whose entries fall in [low, high) under tuple ordering."""
+        entries = self._entries
+        start = bisect_left(entries, low)
+        stop = bisect_left(entries, high)
+        return [entity_id for _, entity_id in entries[start:stop]]
+
+    def first(self, count: Optional[int] = None, descending: bool = False) -> List[str]:
+        """Get the first ``count`` ids in key order (all ids if count is None) without sorting."""
+        with self._lock:
+            entries = self._entries
+            if count is None:
+                selected = entries[::-1] if descending else entries
+            elif descending:
+                selected = entries[:-count - 1:-1] if count else []
+            else:
+                selected = entries[:count]
+            return [entity_id for _, entity_id in selected]
+
+    def lookup(self, op: str, value: Any) -> Optional[Set[str]]:
+        """
+        Find candidate ids for a predicate.
+
+        Returns:
+            Set of ids, or None if this index cannot answer the operator
+        """
+        ids = self.scan(op, value)
+        return None if ids is None else set(ids)
+
+    def scan(self, op: str, value: Any, descending: bool = False) -> Optional[List[str]]:
+        """
+        Find ids for a predicate in key order.
+
+        Returns:
+            List of ids, or None if this index cannot answer the operator
+        """
+        if op == "in":
+            if not isinstance(value, list):
+                return None
+            ranges = [((key,), (key, _TOP)) for key in sorted({sort_key(item) for item in value})]
+        else:
+            key = sort_key(value)
+            group_start = ((key[0],),)
+            group_end = ((key[0] + 1,),)
+            bounds = {
+                "eq": ((key,), (key, _TOP)),
+                "lt": (group_start, (key,)),
+                "le": (group_start, (key, _TOP)),
+                "gt": ((key, _TOP), group_end),
+                "ge": ((key,), group_end),
+            }.get(op)
+            if bounds is None:
+                return None
+            ranges = [bounds]
+        with self._lock:
+            ids = [entity_id for low, high in ranges for entity_id in self._range(low, high)]
+        return ids[::-1] if descending else ids
+
+
+def build_index(kind: str, parts: Tuple[str, ...], entities: Iterable[Tuple[str, Any]]):
+    """
+    Create an index of the given kind and fill it from existing entities.
+
+    Raises:
+        ValueError: If the index kind is unknown
+    """
+    if kind == "hash":
+        index = HashIndex(parts)
+    elif kind == "sorted":
+        index = SortedIndex(parts)
+    else:
+        raise ValueError(f"Unknown index kind: '{kind}' (expected one of {', '.join(INDEX_KINDS)})")
+    index.update_many(entities)
+    return index
@@ -0,0 +1,172 @@
+"""
+Initiative order for encounters.
+Combatants act by round, then by initiative (highest first); ties keep the
+order in which combatants joined. The order is a binary heap keyed by
+(round, -initiative, join order): the next actor is always at the top, and
+adding, removing or re-rolling a combatant costs O(log n). Removed and
+re-prioritized entries are only marked dead and are dropped when they reach
+the top, so nothing is searched for in the heap.
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+
+# A dead entry is compacted away once it outnumbers the live ones by this factor
+COMPACT_RATIO = 2
+
+# Heap entry layout: [round, -initiative, join order, combatant, live]
+_ROUND, _PRIORITY, _JOINED, _COMBATANT, _LIVE = range(5)
+
+
+class InitiativeOrder:
+    """
+    Turn order of one encounter.
+
+    Combatants are any hashable keys, e.g. ("monster", "goblin-1"). A
+    combatant that joins or changes initiative after its turn in the current
+    round has passed waits until the next round.
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._joined = itertools.count()
+        self._position: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+        self.round = 1
+        self.current: Optional[Hashable] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, combatant: Hashable) -> bool:
+        return combatant in self._entries
+
+    def initiative_of(self, combatant: Hashable) -> int:
+        """
+        Get a combatant's initiative.
+
+        Raises:
+            KeyError: If the combatant is not in the order
+        """
+        return -self._entries[combatant][_PRIORITY]
+
+    def set(self, combatant: Hashable, initiative: int) -> None:
+        """Add a combatant or change its initiative (O(log n))."""
+        with self._lock:
+            previous = self._entries.pop(combatant, None)
+            if previous is not None:
+                previous[_LIVE] = False
+            round_number = self.round
+            if previous is not None and previous[_ROUND] > round_number:
+                round_number = previous[_ROUND]
+            entry = [round_number, -initiative, next(self._joined), combatant, True]
+            if self._position is not None and tuple(entry[:_COMBATANT]) < self._position:
+                entry[_ROUND] += 1
+            self._entries[combatant] = entry
+            heapq.heappush(self._heap, entry)
+            self._compact()
+
+    def remove(self, combatant: Hashable) -> bool:
+        """
+        Remove a combatant (O(1); its heap entry is dropped lazily).
+
+        Returns:
+            False if the combatant was not in the order
+        """
+        with self._lock:
+            entry = self._entries.pop(combatant, None)
+            if entry is None:
+                return False
+            entry[_LIVE] = False
+            if self.current == combatant:
+                self.current = None
+            self._compact()
+            return True
+
+    def clear(self) -> None:
+        """Remove every combatant and start again at round 1."""
+        with self._lock:
+            self._heap.clear()
+            self._entries.clear()
+            self._position = None
+            self.round = 1
+            self.current = None
+
+    def peek(self) -> Optional[Tuple[Hashable, int, int]]:
+        """Get the next (combatant, initiative, round) without advancing (O(1) amortized)."""
+        with self._lock:
+            self._drop_dead()
+            if not self._heap:
+                return None
+            entry = self._heap[0]
+            return entry[_COMBATANT], -entry[_PRIORITY], entry[_ROUND]
+
+    def advance(
+        self,
+        can_act: Callable[[Hashable], Optional[bool]]
+    ) -> Tuple[Optional[Tuple[Hashable, int, int]], List[Hashable]]:
+        """
+        Move to the next combatant that can act.
+
+        The top combatant is moved to the next round (O(log n)). Combatants
+        that cannot act are checked only when they reach the top, and
+        passed over until the next round.
+
+        Args:
+            can_act: Called with a combatant; True if it can act, False to
+                skip its turn (e.g. defeated), None to remove it from the
+                order (e.g. deleted)
+
+        Returns:
+            Tuple of ((combatant, initiative, round) or None if no combatant
+            can act, combatants skipped or removed on the way)
+        """
+        passed: List[Hashable] = []
+        with self._lock:
+            skipped = 0
+            while True:
+                self._drop_dead()
+                if not self._heap or skipped >= len(self._entries):
+                    self.current = None
+                    return None, passed
+                entry = self._heap[0]
+                combatant = entry[_COMBATANT]
+                verdict = can_act(combatant)
+                if verdict is None:
+                    entry[_LIVE] = False
+                    del self._entries[combatant]
+                    passed.append(combatant)
+                    continue
+                self._position = tuple(entry[:_COMBATANT])
+                self.round = entry[_ROUND]
+                following = [entry[_ROUND] + 1, entry[_PRIORITY], entry[_JOINED], combatant, True]
+                entry[_LIVE] = False
+                self._entries[combatant] = following
+                heapq.heapreplace(self._heap, following)
+                if verdict:
+                    self.current = combatant
+                    return (combatant, -entry[_PRIORITY], entry[_ROUND]), passed
+                skipped += 1
+                passed.append(combatant)
+
+    def order(self) -> List[Tuple[Hashable, int, int]]:
+        """Get every combatant as (combatant, initiative, round) in turn order."""
+        with self._lock:
+            entries = sorted(self._entries.values())
+        return [(entry[_COMBATANT], -entry[_PRIORITY], entry[_ROUND]) for entry in entries]
+
+    def _drop_dead(self) -> None:
+        """Pop dead entries off the top of the heap. The caller holds the lock."""
+        heap = self._heap
+        while heap and not heap[0][_LIVE]:
+            heapq.heappop(heap)
+
+    def _compact(self) -> None:
+        """Rebuild the heap once dead entries dominate it. The caller holds the lock."""
+        if len(self._heap) > COMPACT_RATIO * (len(self._entries) + 1):
+            self._heap = [entry for entry in self._heap if entry[_LIVE]]
+            heapq.heapify(self._heap)
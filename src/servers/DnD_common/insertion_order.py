@@ -0,0 +1,113 @@
+"""
+Stable insertion-ordered index of entity ids for cursor-based pagination.
+Every id gets a monotonically increasing sequence number when first inserted.
+Cursors encode the last sequence number a client has seen, so they remain
+valid across later inserts and deletes.
+"""
+
+import base64
+import threading
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def encode_cursor(seq: int) -> str:
+    """Encode a sequence number as an opaque cursor string."""
+    return base64.urlsafe_b64encode(f"seq:{seq}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, seq = text.split(":", 1)
+        if prefix != "seq":
+            raise ValueError
+        return int(seq)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+class InsertionOrderIndex:
+    """
+    Entity ids in first-insertion order, seekable by sequence number.
+
+    Replacing an id keeps its original position. Deleted ids leave tombstones
+    in the sequence list that are compacted once they outnumber live entries.
+    """
+
+    def __init__(self):
+        self._next_seq = 1
+        self._seqs: List[int] = []
+        self._id_by_seq: Dict[int, str] = {}
+        self._seq_by_id: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._seq_by_id)
+
+    def add(self, entity_id: str) -> None:
+        """Append an id unless it is already present."""
+        with self._lock:
+            if entity_id in self._seq_by_id:
+                return
+            seq = self._next_seq
+            self._next_seq += 1
+            self._seqs.append(seq)
+            self._id_by_seq[seq] = entity_id
+            self._seq_by_id[entity_id] = seq
+
+    def remove(self, entity_id: str) -> None:
+        """Remove an id if present."""
+        with self._lock:
+            seq = self._seq_by_id.pop(entity_id, None)
+            if seq is None:
+                return
+            del self._id_by_seq[seq]
+            if len(self._seqs) > 2 * len(self._seq_by_id) + 32:
+                self._seqs = [s for s in self._seqs if s in self._id_by_seq]
+
+    def ordered(self, entity_ids: Iterable[str]) -> List[str]:
+        """Sort ids by insertion order, dropping ids that are not in the index."""
+        seq_by_id = self._seq_by_id
+        present = [entity_id for entity_id in entity_ids if entity_id in seq_by_id]
+        return sorted(present, key=lambda entity_id: seq_by_id.get(entity_id, 0))
+
+    def page(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """
+        Get up to ``limit`` ids after the cursor position.
+
+        Args:
+            limit: Maximum number of ids to return
+            cursor: Cursor returned by a previous page, or None to start at the beginning
+
+        Returns:
+            Tuple of (ids, next cursor or None when there are no more ids)
+
+        Raises:
+            ValueError: If the limit or cursor is invalid
+        """
+        if limit < 1:
+            raise ValueError("Limit must be at least 1")
+        after = decode_cursor(cursor) if cursor else 0
+        with self._lock:
+            seqs = self._seqs
+            id_by_seq = self._id_by_seq
+            ids: List[str] = []
+            position = bisect_right(seqs, after)
+            last_seq = after
+            while position < len(seqs) and len(ids) < limit:
+                seq = seqs[position]
+                position += 1
+                if seq in id_by_seq:
+                    ids.append(id_by_seq[seq])
+                    last_seq = seq
+            while position < len(seqs) and seqs[position] not in id_by_seq:
+                position += 1
+            has_more = position < len(seqs)
+        return ids, (encode_cursor(last_seq) if has_more else None)
@@ -0,0 +1,172 @@
+"""
+Per-entity locks for the entity managers.
+Every entity id gets its own reentrant lock, created when it is first needed
+and dropped once nobody holds or waits for it, so operations on different
+entities never contend. Locks can be held from worker threads (blocking) or
+from asyncio tasks (without blocking the event loop), and multi-entity
+operations always take their locks in ascending id order so that two callers
+can never deadlock on each other.
+"""
+
+import asyncio
+import itertools
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Polling backoff (seconds) used when an asyncio task waits for a lock held elsewhere
+_ASYNC_BACKOFF_START = 0.0001
+_ASYNC_BACKOFF_MAX = 0.005
+
+# Distinct owners for non-blocking probes; -1 is never a thread id
+_probe_owners = itertools.count()
+
+
+def _current_owner() -> Tuple[int, Optional[int]]:
+    """Identify the caller as (thread id, asyncio task id or None)."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.get_ident(), (id(task) if task is not None else None)
+
+
+class _EntityLock:
+    """A reentrant lock whose owner is a thread or an asyncio task within a thread."""
+
+    __slots__ = ("_lock", "_owner", "_depth", "users")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owner: Optional[Tuple[int, Optional[int]]] = None
+        self._depth = 0
+        # Holds and waits in progress; the lock is dropped when this reaches zero
+        self.users = 0
+
+    def acquire(self, owner: Tuple[int, Optional[int]], blocking: bool) -> bool:
+        if self._owner == owner:
+            self._depth += 1
+            return True
+        if blocking:
+            holder = self._owner
+            if holder is not None and holder[0] == owner[0]:
+                # Another task on this thread's event loop holds the lock across
+                # an await; blocking here would stall the loop forever.
+                raise RuntimeError("Entity lock is held by another task on this event loop")
+        if not self._lock.acquire(blocking):
+            return False
+        self._owner = owner
+        self._depth = 1
+        return True
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._owner = None
+            self._lock.release()
+
+
+class EntityLocks:
+    """
+    Reentrant locks keyed by entity id.
+
+    Only the locks currently held or waited for exist, so memory stays
+    proportional to the operations in flight rather than to the entities.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, _EntityLock] = {}
+        self._guard = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def _checkout(self, key: str) -> _EntityLock:
+        """Get an id's lock, creating it if needed, and register the caller as a user."""
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = _EntityLock()
+            lock.users += 1
+            return lock
+
+    def _checkin(self, key: str, lock: _EntityLock) -> None:
+        """Unregister a user of an id's lock, dropping the lock once it has none."""
+        with self._guard:
+            lock.users -= 1
+            if not lock.users:
+                del self._locks[key]
+
+    @staticmethod
+    def ordered(keys: Iterable[str]) -> List[str]:
+        """Get the distinct ids in the deterministic (ascending) order their locks are taken in."""
+        return sorted(set(keys))
+
+    @contextmanager
+    def hold(self, *keys: str) -> Iterator[None]:
+        """
+        Hold the locks for the given entity ids, blocking until available.
+
+        Raises:
+            RuntimeError: If called from an event loop while another task on
+                that loop holds one of the locks
+        """
+        owner = _current_owner()
+        acquired: List[Tuple[str, _EntityLock]] = []
+        try:
+            for key in self.ordered(keys):
+                lock = self._checkout(key)
+                try:
+                    lock.acquire(owner, blocking=True)
+                except BaseException:
+                    self._checkin(key, lock)
+                    raise
+                acquired.append((key, lock))
+            yield
+        finally:
+            for key, lock in reversed(acquired):
+                lock.release()
+                self._checkin(key, lock)
+
+    @contextmanager
+    def hold_if_free(self, key: str) -> Iterator[bool]:
+        """
+        Hold an entity's lock only if nobody, including the caller, holds it.
+
+        Never blocks, so it is safe to use while other locks are held (e.g.
+        for background eviction). Yields whether the lock was acquired.
+        """
+        lock = self._checkout(key)
+        try:
+            acquired = lock.acquire((-1, next(_probe_owners)), blocking=False)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    lock.release()
+        finally:
+            self._checkin(key, lock)
+
+    @asynccontextmanager
+    async def ahold(self, *keys: str) -> AsyncIterator[None]:
+        """Hold the locks for the given entity ids, yielding to the event loop while waiting."""
+        owner = _current_owner()
+        acquired: List[Tuple[str, _EntityLock]] = []
+        try:
+            for key in self.ordered(keys):
+                lock = self._checkout(key)
+                try:
+                    delay = _ASYNC_BACKOFF_START
+                    while not lock.acquire(owner, blocking=False):
+                        await asyncio.sleep(delay)
+                        delay = min(delay * 2, _ASYNC_BACKOFF_MAX)
+                except BaseException:
+                    self._checkin(key, lock)
+                    raise
+                acquired.append((key, lock))
+            yield
+        finally:
+            for key, lock in reversed(acquired):
+                lock.release()
+                self._checkin(key, lock)
@@ -0,0 +1,184 @@
+"""
+Name search index for the entity managers.
+Names are normalized (case-folded, whitespace collapsed) and grouped by their
+base name, i.e. the name without numeric words, so thousands of spawned
+"Goblin 1" ... "Goblin 5000" entries share one index entry. Prefix lookups
+bisect a sorted list of word-start suffixes of the base names ("ancient red
+dragon", "red dragon", "dragon"); typo-tolerant lookups use a trigram inverted
+index and rank candidates by Dice similarity of their trigram sets.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+
+# Minimum trigram similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.3
+# Maximum number of distinct base names scored per search
+CANDIDATE_BUDGET = 128
+
+_MATCH_RANK = {"exact": 0, "prefix": 1, "fuzzy": 2}
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold a name and collapse runs of whitespace."""
+    return " ".join(name.casefold().split())
+
+
+def base_name(normalized: str) -> str:
+    """Drop numeric words ("goblin 12" -> "goblin"), keeping the name if nothing else is left."""
+    base = " ".join(word for word in normalized.split() if not word.isdigit())
+    return base or normalized
+
+
+def trigrams(normalized: str) -> FrozenSet[str]:
+    """Get the padded trigrams of every word in a normalized name."""
+    grams: Set[str] = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _word_starts(normalized: str) -> List[str]:
+    """Get the suffixes of a name that start at a word boundary."""
+    suffixes = [normalized]
+    for position, char in enumerate(normalized):
+        if char == " ":
+            suffixes.append(normalized[position + 1:])
+    return suffixes
+
+
+class NameIndex:
+    """Incrementally maintained prefix and trigram index over entity names."""
+
+    def __init__(self):
+        self._name_by_id: Dict[str, str] = {}
+        # base name -> sorted (length, full name, id), so shorter names and lower numbers come first
+        self._members: Dict[str, List[Tuple[int, str, str]]] = {}
+        self._grams: Dict[str, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._prefixes: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._name_by_id)
+
+    def update(self, entity_id: str, name: str) -> None:
+        """Index an entity's (possibly changed) name."""
+        normalized = normalize_name(name)
+        with self._lock:
+            if self._name_by_id.get(entity_id) == normalized:
+                return
+            self._discard(entity_id)
+            self._name_by_id[entity_id] = normalized
+            base = base_name(normalized)
+            members = self._members.get(base)
+            if members is None:
+                members = self._members[base] = []
+                grams = self._grams[base] = trigrams(base)
+                for gram in grams:
+                    self._postings.setdefault(gram, set()).add(base)
+                for suffix in _word_starts(base):
+                    insort(self._prefixes, (suffix, base))
+            insort(members, (len(normalized), normalized, entity_id))
+
+    def remove(self, entity_id: str) -> None:
+        """Drop an entity from the index."""
+        with self._lock:
+            self._discard(entity_id)
+
+    def _discard(self, entity_id: str) -> None:
+        normalized = self._name_by_id.pop(entity_id, None)
+        if normalized is None:
+            return
+        base = base_name(normalized)
+        members = self._members[base]
+        del members[bisect_left(members, (len(normalized), normalized, entity_id))]
+        if members:
+            return
+        del self._members[base]
+        for gram in self._grams.pop(base):
+            posting = self._postings[gram]
+            posting.discard(base)
+            if not posting:
+                del self._postings[gram]
+        for suffix in _word_starts(base):
+            del self._prefixes[bisect_left(self._prefixes, (suffix, base))]
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True) -> List[Tuple[str, float, str]]:
+        """
+        Find entities whose name matches the query exactly, by prefix of any word, or approximately.
+
+        Numbers in the query ("goblin 12") only keep entities whose name
+        contains them.
+
+        Args:
+            query: Name or name prefix, e.g. "Ancient Red" or "ancinet red dragon"
+            limit: Maximum number of results
+            fuzzy: Whether to include typo-tolerant matches
+
+        Returns:
+            List of (entity id, similarity score, match kind) tuples, best first;
+            match kind is "exact", "prefix" or "fuzzy"
+        """
+        normalized = normalize_name(query)
+        if not normalized or limit < 1:
+            return []
+        base = base_name(normalized)
+        numbers = set(normalized.split()) - set(base.split())
+        query_grams = trigrams(base)
+        with self._lock:
+            groups: Dict[str, str] = {}
+            prefixes = self._prefixes
+            position = bisect_left(prefixes, (base, ""))
+            while position < len(prefixes) and len(groups) < CANDIDATE_BUDGET:
+                suffix, name = prefixes[position]
+                if not suffix.startswith(base):
+                    break
+                groups.setdefault(name, "exact" if name == base else "prefix")
+                position += 1
+            if fuzzy and len(groups) < limit:
+                for name in self._fuzzy_candidates(query_grams):
+                    groups.setdefault(name, "fuzzy")
+
+            scored = []
+            for name, kind in groups.items():
+                grams = self._grams[name]
+                score = 2.0 * len(query_grams & grams) / (len(query_grams) + len(grams))
+                if kind == "fuzzy" and score < FUZZY_THRESHOLD:
+                    continue
+                scored.append((_MATCH_RANK[kind], -score, name, kind))
+            scored.sort()
+
+            results: List[Tuple[str, float, str]] = []
+            for _, score, name, kind in scored:
+                for _, full_name, entity_id in self._members[name]:
+                    if numbers and not numbers.issubset(full_name.split()):
+                        continue
+                    if full_name == normalized:
+                        results.append((entity_id, 1.0, "exact"))
+                    else:
+                        results.append((entity_id, round(-score, 4), "prefix" if kind == "exact" else kind))
+                    if len(results) >= limit:
+                        break
+                if len(results) >= limit:
+                    break
+        results.sort(key=lambda result: _MATCH_RANK[result[2]])
+        return results
+
+    def _fuzzy_candidates(self, query_grams: FrozenSet[str]) -> Set[str]:
+        """Collect base names sharing the query's rarest trigrams, up to the candidate budget."""
+        postings = sorted(
+            (self._postings[gram] for gram in query_grams if gram in self._postings),
+            key=len
+        )
+        candidates: Set[str] = set()
+        for posting in postings:
+            if len(candidates) + len(posting) > CANDIDATE_BUDGET:
+                if not candidates:
+                    candidates.update(name for _, name in zip(range(CANDIDATE_BUDGET), posting))
+                break
+            candidates |= posting
+        return candidates
@@ -0,0 +1,81 @@
+"""
+Campaign namespaces for the entity managers.
+Each campaign gets its own manager instance, and with it its own store,
+indexes, sorted views, locks and memory budget, so operations only ever
+touch one campaign's entities and a whole campaign is dropped at once.
+"""
+
+import threading
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+
+# Campaign used when a call does not name one
+DEFAULT_CAMPAIGN = "default"
+
+# Input schema property added to every entity tool
+CAMPAIGN_ID_PROPERTY = {
+    "type": "string",
+    "description": f"Campaign (namespace) the entities belong to (optional, default '{DEFAULT_CAMPAIGN}')",
+}
+
+Manager = TypeVar("Manager")
+
+
+class NamespaceRegistry(Generic[Manager]):
+    """Independent managers keyed by campaign id, created on first use."""
+
+    def __init__(self, factory: Callable[[], Manager]):
+        self._factory = factory
+        self._managers: Dict[str, Manager] = {}
+        self._observers: List[Callable[[str, Manager], None]] = []
+        self._lock = threading.Lock()
+
+    def add_observer(self, callback: Callable[[str, Manager], None]) -> None:
+        """Call back (campaign id, manager) for every existing and every future campaign."""
+        with self._lock:
+            self._observers.append(callback)
+            existing = list(self._managers.items())
+        for campaign_id, manager in existing:
+            callback(campaign_id, manager)
+
+    def get(self, campaign_id: Optional[str] = None) -> Manager:
+        """
+        Get a campaign's manager, creating an empty one if the campaign is new.
+
+        Raises:
+            ValueError: If the campaign id is not a non-empty string
+        """
+        if campaign_id is None:
+            campaign_id = DEFAULT_CAMPAIGN
+        manager = self._managers.get(campaign_id)
+        if manager is None:
+            if not isinstance(campaign_id, str) or not campaign_id:
+                raise ValueError("Campaign ID must be a non-empty string")
+            with self._lock:
+                manager = self._managers.get(campaign_id)
+                if manager is None:
+                    manager = self._factory()
+                    for callback in self._observers:
+                        callback(campaign_id, manager)
+                    self._managers[campaign_id] = manager
+        return manager
+
+    def drop(self, campaign_id: str) -> Manager:
+        """
+        Remove a campaign with all of its entities; later calls for it start empty.
+
+        Returns:
+            The dropped manager
+
+        Raises:
+            ValueError: If the campaign does not exist
+        """
+        with self._lock:
+            manager = self._managers.pop(campaign_id, None)
+        if manager is None:
+            raise ValueError(f"Campaign '{campaign_id}' not found")
+        return manager
+
+    def campaigns(self) -> List[str]:
+        """Get the ids of all existing campaigns."""
+        return sorted(self._managers)
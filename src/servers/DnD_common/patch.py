@@ -0,0 +1,223 @@
+"""
+JSON Patch (RFC 6902) and JSON Merge Patch (RFC 7386) for entity properties.
+Patches change nested values in place, so a client can set
+``/inventory/potions/count`` without resending the ``inventory`` subtree and
+without overwriting concurrent edits of its other keys. Besides ``add``,
+``remove``, ``replace`` and ``test``, an ``increment`` operation adds a
+number to a numeric value. Every change is recorded in an undo log, so a
+patch that fails part-way is rolled back and applies completely or not at all.
+"""
+
+from collections.abc import Mapping, MutableMapping
+from numbers import Number
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from src.servers.DnD_common.projection import copy_value
+
+
+PATCH_OPERATIONS = ("add", "remove", "replace", "test", "increment")
+
+UndoLog = List[Callable[[], None]]
+
+
+def parse_pointer(pointer: str) -> Tuple[str, ...]:
+    """
+    Split a JSON Pointer (RFC 6901) such as ``/inventory/potions/count`` into its tokens.
+
+    Raises:
+        ValueError: If the pointer is not a string starting with "/"
+    """
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise ValueError(f"Invalid patch path '{pointer}': expected a JSON Pointer such as /inventory/potions")
+    return tuple(token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/"))
+
+
+def undo(undo_log: UndoLog) -> None:
+    """Revert the changes recorded in an undo log, most recent first."""
+    while undo_log:
+        undo_log.pop()()
+
+
+def _owned(root: MutableMapping, key: str) -> Any:
+    """Get a top-level value that may be changed in place (copy-on-write mappings copy shared values first)."""
+    own = getattr(root, "own", None)
+    return own(key) if own is not None else root[key]
+
+
+def _index(container: list, token: str, pointer: str, allow_end: bool = False) -> int:
+    """Convert a pointer token to a list index."""
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise ValueError(f"Invalid array index '{token}' in patch path '{pointer}'")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise ValueError(f"Array index {index} out of range in patch path '{pointer}'")
+    return index
+
+
+def _parent(root: MutableMapping, tokens: Tuple[str, ...], pointer: str) -> Any:
+    """Get the container holding the value a pointer points to."""
+    container: Any = root
+    for depth, token in enumerate(tokens[:-1]):
+        if isinstance(container, list):
+            container = container[_index(container, token, pointer)]
+        elif isinstance(container, Mapping) and token in container:
+            container = _owned(root, token) if depth == 0 else container[token]
+        else:
+            raise ValueError(f"Path '{pointer}' does not exist")
+        if not isinstance(container, (list, MutableMapping)):
+            raise ValueError(f"Path '{pointer}' does not exist")
+    return container
+
+
+def _set(container: Any, key: Any, value: Any, undo_log: UndoLog) -> None:
+    """Set a mapping key or list item, recording how to restore it."""
+    if isinstance(container, list):
+        previous = container[key]
+        undo_log.append(lambda: container.__setitem__(key, previous))
+    elif key in container:
+        previous = container[key]
+        undo_log.append(lambda: container.__setitem__(key, previous))
+    else:
+        undo_log.append(lambda: container.__delitem__(key))
+    container[key] = value
+
+
+def _apply_operation(root: MutableMapping, operation: Mapping, undo_log: UndoLog) -> None:
+    """Apply one patch operation, recording its undo steps."""
+    op = operation.get("op")
+    if op not in PATCH_OPERATIONS:
+        raise ValueError(f"Invalid patch op '{op}': expected one of {', '.join(PATCH_OPERATIONS)}")
+    pointer = operation.get("path")
+    tokens = parse_pointer(pointer)
+    if op != "remove" and "value" not in operation:
+        raise ValueError(f"Patch op '{op}' at '{pointer}' requires a value")
+    value = operation.get("value")
+    container = _parent(root, tokens, pointer)
+    key: Any = tokens[-1]
+
+    if isinstance(container, list):
+        key = _index(container, key, pointer, allow_end=op == "add")
+        exists = key < len(container)
+    else:
+        exists = key in container
+
+    if op == "add":
+        if isinstance(container, list):
+            container.insert(key, copy_value(value))
+            undo_log.append(lambda: container.pop(key))
+        else:
+            _set(container, key, copy_value(value), undo_log)
+    elif op == "increment":
+        current = container[key] if exists else 0
+        if not isinstance(current, Number) or isinstance(current, bool):
+            raise ValueError(f"Cannot increment non-numeric value at '{pointer}'")
+        if not isinstance(value, Number) or isinstance(value, bool):
+            raise ValueError(f"Increment at '{pointer}' requires a numeric value")
+        _set(container, key, current + value, undo_log)
+    elif not exists:
+        raise ValueError(f"Path '{pointer}' does not exist")
+    elif op == "test":
+        if container[key] != value:
+            raise ValueError(f"Patch test failed at '{pointer}': value is {container[key]!r}, expected {value!r}")
+    elif op == "replace":
+        _set(container, key, copy_value(value), undo_log)
+    else:
+        previous = container[key]
+        if isinstance(container, list):
+            container.pop(key)
+            undo_log.append(lambda: container.insert(key, previous))
+        else:
+            del container[key]
+            undo_log.append(lambda: container.__setitem__(key, previous))
+
+
+def apply_patch(
+    target: MutableMapping,
+    operations: Sequence[Mapping],
+    undo_log: Optional[UndoLog] = None
+) -> None:
+    """
+    Apply JSON Patch operations to a mapping in place.
+
+    Each operation is {"op", "path", "value"}; ``increment`` treats a missing
+    value as 0. Without an undo log the patch is all-or-nothing; with one,
+    undo steps are appended to it and undoing on failure is up to the caller.
+
+    Raises:
+        ValueError: If an operation is invalid, a path does not exist or a test fails
+    """
+    if not isinstance(operations, (list, tuple)):
+        raise ValueError("Patch must be a list of operations")
+    log: UndoLog = [] if undo_log is None else undo_log
+    try:
+        for operation in operations:
+            if not isinstance(operation, Mapping):
+                raise ValueError("Every patch operation must be an object")
+            _apply_operation(target, operation, log)
+    except ValueError:
+        if undo_log is None:
+            undo(log)
+        raise
+
+
+def apply_merge_patch(
+    target: MutableMapping,
+    patch: Mapping,
+    undo_log: Optional[UndoLog] = None,
+    _root: Optional[MutableMapping] = None
+) -> None:
+    """
+    Apply a JSON Merge Patch to a mapping in place.
+
+    Objects are merged recursively, null removes a key and any other value
+    replaces it. Undo steps are appended to ``undo_log`` if given.
+
+    Raises:
+        ValueError: If the patch is not an object
+    """
+    if not isinstance(patch, Mapping):
+        raise ValueError("Merge patch must be an object")
+    log: UndoLog = [] if undo_log is None else undo_log
+    for key, value in patch.items():
+        if value is None:
+            if key in target:
+                previous = target[key]
+                del target[key]
+                log.append(lambda target=target, key=key, previous=previous: target.__setitem__(key, previous))
+        elif isinstance(value, Mapping) and isinstance(target.get(key), MutableMapping):
+            child = _owned(target, key) if _root is None else target[key]
+            apply_merge_patch(child, value, log, _root=_root or target)
+        else:
+            _set(target, key, _without_nulls(value), log)
+
+
+def _without_nulls(value: Any) -> Any:
+    """Copy a merge patch value to store, dropping null members of objects (RFC 7386)."""
+    if isinstance(value, Mapping):
+        return {key: _without_nulls(item) for key, item in value.items() if item is not None}
+    return copy_value(value)
+
+
+# Tool input schemas of the patch arguments of update tools
+PATCH_PROPERTY = {
+    "type": "array",
+    "description": "JSON Patch operations on properties, applied in order, e.g. "
+                   "{\"op\": \"increment\", \"path\": \"/inventory/potions/count\", \"value\": -1} (optional)",
+    "items": {
+        "type": "object",
+        "properties": {
+            "op": {"type": "string", "enum": list(PATCH_OPERATIONS)},
+            "path": {"type": "string", "description": "JSON Pointer into properties, e.g. /inventory/potions"},
+            "value": {"description": "Value to add, replace, test or increment by"},
+        },
+        "required": ["op", "path"],
+    },
+}
+
+MERGE_PATCH_PROPERTY = {
+    "type": "object",
+    "description": "JSON Merge Patch of properties: nested objects are merged, null removes a key (optional)",
+    "additionalProperties": True,
+}
@@ -0,0 +1,71 @@
+"""
+Field path helpers shared by projections, indexes and queries.
+Paths name an entity attribute, in tool (camelCase) or Python (snake_case)
+spelling, optionally followed by dot-separated keys into nested mappings,
+e.g. ``currentHp`` or ``properties.inventory.potions``.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Tuple
+from collections.abc import Mapping
+
+
+class _Missing:
+    """Sentinel for a path that does not resolve."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def to_attribute(name: str) -> str:
+    """Convert a camelCase tool field name to its snake_case attribute name."""
+    return _CAMEL_BOUNDARY.sub("_", name).lower()
+
+
+@lru_cache(maxsize=1024)
+def parse_path(path: str, attributes: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Split a field path into an attribute name followed by nested keys.
+
+    Args:
+        path: Field path such as ``currentHp`` or ``properties.stats.str``
+        attributes: Attribute names the entity supports
+
+    Returns:
+        Tuple of (attribute, key, key, ...)
+
+    Raises:
+        ValueError: If the path is empty or names an unknown attribute
+    """
+    parts = path.split(".")
+    if not path or not all(parts):
+        raise ValueError(f"Invalid field path: '{path}'")
+    attribute = parts[0] if parts[0] in attributes else to_attribute(parts[0])
+    if attribute not in attributes:
+        raise ValueError(f"Unknown field: '{parts[0]}'")
+    return (attribute, *parts[1:])
+
+
+def resolve(entity: Any, parts: Iterable[str]) -> Any:
+    """Resolve parsed path parts against an entity, returning MISSING if any key is absent."""
+    parts = iter(parts)
+    value = getattr(entity, next(parts))
+    for key in parts:
+        if not isinstance(value, Mapping) or key not in value:
+            return MISSING
+        value = value[key]
+    return value
+
+
+def overlaps(first: Tuple[str, ...], second: Tuple[str, ...]) -> bool:
+    """Check whether one parsed path is a prefix of the other (changing one may change the other)."""
+    length = min(len(first), len(second))
+    return first[:length] == second[:length]
@@ -0,0 +1,129 @@
+"""
+Field projections for entity serialization.
+A projection copies only the requested attributes (and nested property paths)
+of an entity instead of deep-copying the whole object with ``asdict``.
+Projectors are compiled once per field list and cached.
+"""
+
+from collections.abc import Mapping, MutableMapping
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from src.servers.DnD_common.paths import MISSING, parse_path
+
+
+Projector = Callable[[Any], Dict[str, Any]]
+
+
+def copy_value(value: Any) -> Any:
+    """Copy JSON-like data: mappings and lists are copied recursively, scalars are shared."""
+    if isinstance(value, Mapping):
+        return {key: copy_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+
+def copy_touched(mapping: MutableMapping, paths: Iterable[Tuple[str, ...]], copied: Iterable[Tuple[str, ...]] = ()) -> None:
+    """
+    Deep-copy the values of a shallow copy that paths lead into, so they can be changed in place.
+
+    Args:
+        mapping: Shallow copy whose values are still shared with the original
+        paths: Key paths into the mapping about to be changed; an empty path
+            changes every key
+        copied: Paths whose values were already copied by earlier calls
+    """
+    copied = list(copied)
+    if () in copied:
+        return
+    done = {path[0] for path in copied}
+    for path in paths:
+        for key in (list(mapping) if not path else path[:1]):
+            if key not in done and key in mapping:
+                mapping[key] = copy_value(mapping[key])
+            done.add(key)
+
+
+def _compile_subtree(tree: Dict[str, Optional[dict]]) -> Callable[[Any], Any]:
+    """Compile a tree of nested keys into a function extracting them from a mapping."""
+    steps = [(key, None if subtree is None else _compile_subtree(subtree)) for key, subtree in tree.items()]
+
+    def extract(value: Any) -> Any:
+        if not isinstance(value, Mapping):
+            return MISSING
+        out = {}
+        for key, nested in steps:
+            if key not in value:
+                continue
+            item = value[key]
+            if nested is None:
+                out[key] = copy_value(item)
+            else:
+                item = nested(item)
+                if item is not MISSING:
+                    out[key] = item
+        return out
+
+    return extract
+
+
+@lru_cache(maxsize=256)
+def compile_projection(fields: Tuple[str, ...], attributes: Tuple[str, ...]) -> Projector:
+    """
+    Compile a list of field paths into a projector function.
+
+    Output keys use attribute names (as ``to_dict`` does); nested paths produce
+    nested dictionaries containing only the requested keys. Requesting a whole
+    attribute and a path inside it returns the whole attribute.
+
+    Args:
+        fields: Field paths, e.g. ("characterId", "name", "properties.stats.str")
+        attributes: Attribute names the entity supports
+
+    Returns:
+        Function mapping an entity to its projected dictionary
+
+    Raises:
+        ValueError: If a field path is invalid
+    """
+    tree: Dict[str, Optional[dict]] = {}
+    for path in fields:
+        attribute, *keys = parse_path(path, attributes)
+        if attribute in tree and tree[attribute] is None:
+            continue
+        if not keys:
+            tree[attribute] = None
+            continue
+        node = tree.setdefault(attribute, {})
+        for key in keys[:-1]:
+            child = node.setdefault(key, {})
+            if child is None:
+                break
+            node = child
+        else:
+            node[keys[-1]] = None
+
+    steps = [
+        (attribute, None if subtree is None else _compile_subtree(subtree))
+        for attribute, subtree in tree.items()
+    ]
+
+    def project(entity: Any) -> Dict[str, Any]:
+        out = {}
+        for attribute, nested in steps:
+            value = getattr(entity, attribute)
+            if nested is None:
+                out[attribute] = copy_value(value)
+            else:
+                value = nested(value)
+                if value is not MISSING:
+                    out[attribute] = value
+        return out
+
+    return project
+
+
+def projector_for(fields: Sequence[str], attributes: Tuple[str, ...]) -> Projector:
+    """Get the cached projector for a field list."""
+    return compile_projection(tuple(fields), attributes)
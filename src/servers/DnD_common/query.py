@@ -0,0 +1,99 @@
+"""
+Predicate queries over entity managers.
+A query is a conjunction of ``field op value`` predicates. The planner asks the
+available secondary indexes for candidate ids and only falls back to a full
+scan when no index can answer any predicate. Candidates are always re-checked
+against every predicate, so indexes only ever narrow the search.
+"""
+
+import operator
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from src.servers.DnD_common.paths import MISSING, parse_path, resolve
+
+
+def _contains(value: Any, target: Any) -> bool:
+    return target in value
+
+
+def _in(value: Any, target: Any) -> bool:
+    return value in target
+
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "in": _in,
+    "contains": _contains,
+}
+
+OPERATOR_ALIASES = {"==": "eq", "!=": "ne", "<": "lt", "<=": "le", ">": "gt", ">=": "ge"}
+
+
+class Predicate(NamedTuple):
+    """A single ``field op value`` condition with its field path parsed."""
+
+    path: str
+    parts: Tuple[str, ...]
+    op: str
+    value: Any
+
+    def matches(self, entity: Any) -> bool:
+        """Check the predicate against an entity; missing fields and type mismatches never match."""
+        actual = resolve(entity, self.parts)
+        if actual is MISSING:
+            return False
+        try:
+            return bool(OPERATORS[self.op](actual, self.value))
+        except TypeError:
+            return False
+
+
+def parse_predicate(field: str, op: str, value: Any, attributes: Tuple[str, ...]) -> Predicate:
+    """
+    Build a predicate from tool input.
+
+    Raises:
+        ValueError: If the field path or operator is invalid
+    """
+    op = OPERATOR_ALIASES.get(op, op)
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown operator: '{op}'")
+    if op == "in" and not isinstance(value, list):
+        raise ValueError("Operator 'in' requires a list value")
+    parts = parse_path(field, attributes)
+    return Predicate(".".join(parts), parts, op, value)
+
+
+def index_candidates(
+    predicates: Iterable[Predicate],
+    indexes: Dict[str, Any]
+) -> Tuple[Optional[Set[str]], List[str]]:
+    """
+    Intersect the candidate ids of every predicate an index can answer.
+
+    Args:
+        predicates: Predicates of a conjunctive query
+        indexes: Secondary indexes keyed by normalized field path
+
+    Returns:
+        Tuple of (candidate ids, or None if no index applies; paths of the indexes used)
+    """
+    candidates: Optional[Set[str]] = None
+    used: List[str] = []
+    for predicate in predicates:
+        index = indexes.get(predicate.path)
+        if index is None:
+            continue
+        ids = index.lookup(predicate.op, predicate.value)
+        if ids is None:
+            continue
+        used.append(predicate.path)
+        candidates = ids if candidates is None else candidates & ids
+        if not candidates:
+            break
+    return candidates, used
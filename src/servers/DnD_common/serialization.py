@@ -0,0 +1,50 @@
+"""
+Cached serialized views of versioned entities.
+``dataclasses.asdict`` deep-copies every nested property on each call, so
+reads between two writes rebuilt the same dicts over and over. Entities
+instead keep the dict (and its JSON encoding) they last produced, tagged with
+the version it was built from. Every write bumps the version, so a stale view
+is never served; it is rebuilt lazily on the next read.
+"""
+
+import json
+from dataclasses import asdict
+from typing import Any, Dict, Iterable
+
+# Instance attribute holding [version, dict, JSON text or None]
+_CACHE_ATTRIBUTE = "_serialized"
+
+
+def _cache(entity: Any) -> list:
+    """Get an entity's cache entry, rebuilding it if the entity changed since."""
+    cache = entity.__dict__.get(_CACHE_ATTRIBUTE)
+    # Read the version before building: a write racing the build bumps it
+    # afterwards, so a dict built from half-written data is never reused.
+    version = entity.version
+    if cache is None or cache[0] != version:
+        cache = [version, asdict(entity), None]
+        entity.__dict__[_CACHE_ATTRIBUTE] = cache
+    return cache
+
+
+def cached_dict(entity: Any) -> Dict[str, Any]:
+    """
+    Get an entity's fields as a dictionary, built at most once per version.
+
+    The dictionary is shared with later calls until the next write; copy it
+    before changing it.
+    """
+    return _cache(entity)[1]
+
+
+def cached_json(entity: Any) -> str:
+    """Get an entity's fields encoded as a JSON object, encoded at most once per version."""
+    cache = _cache(entity)
+    if cache[2] is None:
+        cache[2] = json.dumps(cache[1])
+    return cache[2]
+
+
+def json_array(fragments: Iterable[str]) -> str:
+    """Join pre-encoded JSON values into a JSON array without re-encoding them."""
+    return "[" + ",".join(fragments) + "]"
@@ -0,0 +1,116 @@
+"""
+On-disk spill store for entities evicted from memory.
+Records are kept as JSON in a SQLite table keyed by entity id, so a manager
+with a memory budget can move cold entities out of RAM and fault them back
+in on access. The store is internally synchronized.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _close(connection: sqlite3.Connection, path: str, temporary: bool) -> None:
+    """Close a store's connection and remove its files if they are temporary."""
+    connection.close()
+    if temporary:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+class SpillStore:
+    """
+    A SQLite-backed id -> record mapping.
+
+    Without a path the store lives in a temporary file that is removed when
+    the store is closed or garbage collected.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        temporary = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(prefix="dnd-spill-", suffix=".sqlite")
+            os.close(handle)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS records (id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self._lock = threading.Lock()
+        self._count = self._connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+        self._finalizer = weakref.finalize(self, _close, self._connection, path, temporary)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, entity_id: str) -> bool:
+        if not self._count:
+            return False
+        with self._lock:
+            row = self._connection.execute("SELECT 1 FROM records WHERE id = ?", (entity_id,)).fetchone()
+        return row is not None
+
+    def put_many(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store (or replace) records in one transaction."""
+        rows = {entity_id: json.dumps(record) for entity_id, record in records}
+        if not rows:
+            return
+        connection = self._connection
+        with self._lock:
+            with connection:
+                connection.execute("BEGIN")
+                before = connection.total_changes
+                connection.executemany("DELETE FROM records WHERE id = ?", ((entity_id,) for entity_id in rows))
+                replaced = connection.total_changes - before
+                connection.executemany("INSERT INTO records (id, data) VALUES (?, ?)", rows.items())
+            self._count += len(rows) - replaced
+
+    def get(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Read a record without removing it."""
+        if not self._count:
+            return None
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM records WHERE id = ?", (entity_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def take(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Remove and return a record, or None if it is not stored."""
+        if not self._count:
+            return None
+        with self._lock:
+            row = self._connection.execute(
+                "DELETE FROM records WHERE id = ? RETURNING data", (entity_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._count -= 1
+        return json.loads(row[0])
+
+    def delete(self, entity_id: str) -> bool:
+        """Remove a record; returns whether it was stored."""
+        return self.take(entity_id) is not None
+
+    def ids(self) -> List[str]:
+        """Get the ids of all stored records."""
+        if not self._count:
+            return []
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT id FROM records")]
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get all stored (id, record) pairs."""
+        if not self._count:
+            return []
+        with self._lock:
+            rows = self._connection.execute("SELECT id, data FROM records").fetchall()
+        return [(entity_id, json.loads(data)) for entity_id, data in rows]
+
+    def close(self) -> None:
+        """Close the database (and remove it if it is temporary)."""
+        with self._lock:
+            self._finalizer()
@@ -0,0 +1,134 @@
+"""
+Resource subscriptions for the entity servers.
+Every entity is exposed as a resource such as ``character://{campaignId}/{characterId}``.
+Clients subscribe to the URIs they display; entity writes mark the URI as
+changed and, after a short coalescing window, each subscriber gets a single
+``notifications/resources/updated`` per changed URI, however many writes
+happened within the window.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+
+
+# Seconds to collect writes before notifying subscribers
+COALESCE_WINDOW = 0.05
+
+
+def entity_uri(scheme: str, campaign_id: str, entity_id: str) -> str:
+    """Build an entity's resource URI, e.g. ``monster://default/goblin-1``."""
+    return f"{scheme}://{quote(campaign_id, safe='')}/{quote(entity_id, safe='')}"
+
+
+def campaign_uri(scheme: str, campaign_id: str) -> str:
+    """Build the resource URI of a whole campaign's entities, e.g. ``monster://default``."""
+    return f"{scheme}://{quote(campaign_id, safe='')}"
+
+
+def parse_resource_uri(scheme: str, uri: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a campaign or entity resource URI into (campaign ID, entity ID or None).
+
+    Raises:
+        ValueError: If the URI does not have the scheme or a campaign
+    """
+    prefix = f"{scheme}://"
+    campaign_id, slash, entity_id = uri[len(prefix):].partition("/") if uri.startswith(prefix) else ("", "", "")
+    if not campaign_id or (slash and not entity_id):
+        raise ValueError(
+            f"Invalid resource URI '{uri}': expected {scheme}://{{campaignId}} or {scheme}://{{campaignId}}/{{{scheme}Id}}"
+        )
+    return unquote(campaign_id), unquote(entity_id) if entity_id else None
+
+
+def parse_entity_uri(scheme: str, uri: str) -> Tuple[str, str]:
+    """
+    Split an entity resource URI into (campaign ID, entity ID).
+
+    Raises:
+        ValueError: If the URI does not have the scheme or both parts
+    """
+    prefix = f"{scheme}://"
+    campaign_id, _, entity_id = uri[len(prefix):].partition("/") if uri.startswith(prefix) else ("", "", "")
+    if not campaign_id or not entity_id:
+        raise ValueError(f"Invalid resource URI '{uri}': expected {scheme}://{{campaignId}}/{{{scheme}Id}}")
+    return unquote(campaign_id), unquote(entity_id)
+
+
+class SubscriptionHub:
+    """
+    Tracks which sessions subscribe to which URIs and sends coalesced update notifications.
+
+    ``notify`` may be called from any thread; notifications are sent from the
+    event loop the subscriptions were made on. A session only needs an async
+    ``send_resource_updated(uri)`` method; sessions whose send fails are
+    dropped from every subscription.
+    """
+
+    def __init__(self, window: float = COALESCE_WINDOW):
+        self.window = window
+        self._subscribers: Dict[str, Set[Any]] = {}
+        self._pending: Set[str] = set()
+        self._flush_scheduled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Whether any URI has a subscriber (a cheap check before building URIs)."""
+        return bool(self._subscribers)
+
+    def subscribe(self, uri: str, session: Any) -> None:
+        """Subscribe a session to a URI. Must be called from the event loop that sends notifications."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._loop = loop
+            self._subscribers.setdefault(uri, set()).add(session)
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        """Remove a session's subscription to a URI, if any."""
+        with self._lock:
+            self._discard(uri, session)
+
+    def notify(self, uri: str) -> None:
+        """Mark a URI as changed; subscribers are notified once at the end of the window."""
+        with self._lock:
+            if uri not in self._subscribers:
+                return
+            self._pending.add(uri)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            loop = self._loop
+        loop.call_soon_threadsafe(self._start_flush)
+
+    def _start_flush(self) -> None:
+        task = asyncio.ensure_future(self._flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self.window)
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            self._flush_scheduled = False
+            targets = [(uri, list(self._subscribers.get(uri, ()))) for uri in pending]
+        for uri, sessions in targets:
+            for session in sessions:
+                try:
+                    await session.send_resource_updated(uri)
+                except Exception:
+                    with self._lock:
+                        for subscribed in list(self._subscribers):
+                            self._discard(subscribed, session)
+
+    def _discard(self, uri: str, session: Any) -> None:
+        sessions = self._subscribers.get(uri)
+        if sessions is None:
+            return
+        sessions.discard(session)
+        if not sessions:
+            del self._subscribers[uri]
@@ -0,0 +1,107 @@
+"""
+Hierarchical timer wheel keyed by round.
+Level 0 has one slot per round for the next SLOTS rounds; each higher level
+covers SLOTS times more rounds per slot. Scheduling is O(1). Advancing a
+round empties one level-0 slot; every SLOTS rounds the matching slot of the
+level above is cascaded down, so each timer is moved at most once per level.
+An advance therefore costs time proportional to the timers that fall due,
+not to the number of timers scheduled.
+"""
+
+import heapq
+import itertools
+from typing import Any, List, Tuple
+
+
+# Slots per wheel (a power of two) and number of wheels
+SLOTS = 64
+LEVELS = 4
+
+
+class TimerWheel:
+    """
+    Items scheduled for future rounds.
+
+    Not synchronized; callers serialize access. Items cannot be cancelled:
+    callers mark them stale and ignore them when they fall due.
+    """
+
+    def __init__(self, slots: int = SLOTS, levels: int = LEVELS, start: int = 0):
+        """
+        Args:
+            slots: Slots per wheel (a power of two)
+            levels: Number of wheels; rounds beyond their span wait in an overflow heap
+            start: Current round
+        """
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError(f"Slots must be a power of two, got {slots}")
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._wheels: List[List[List[Tuple[int, Any]]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._span = slots ** levels
+        self._overflow: List[Tuple[int, int, Any]] = []
+        self._order = itertools.count()
+        self._count = 0
+        self.now = start
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, round_number: int, item: Any) -> None:
+        """
+        Schedule an item to fall due at a future round (O(1)).
+
+        Raises:
+            ValueError: If the round is not after the current round
+        """
+        if round_number <= self.now:
+            raise ValueError(f"Round {round_number} is not after the current round {self.now}")
+        self._place(round_number, item)
+        self._count += 1
+
+    def _place(self, round_number: int, item: Any) -> None:
+        """Put an item in the lowest wheel whose span reaches its round."""
+        delay = round_number - self.now
+        if delay >= self._span:
+            heapq.heappush(self._overflow, (round_number, next(self._order), item))
+            return
+        level = 0
+        while delay >> (self._bits * (level + 1)):
+            level += 1
+        slot = (round_number >> (self._bits * level)) & self._mask
+        self._wheels[level][slot].append((round_number, item))
+
+    def advance(self) -> List[Any]:
+        """
+        Move to the next round.
+
+        Returns:
+            The items due at the new round, in the order they were scheduled
+            (cascaded items after those placed directly)
+        """
+        self.now += 1
+        now = self.now
+        slot = now & self._mask
+        if slot == 0:
+            self._cascade(now)
+        due = self._wheels[0][slot]
+        if not due:
+            return []
+        self._wheels[0][slot] = []
+        self._count -= len(due)
+        return [item for _, item in due]
+
+    def _cascade(self, now: int) -> None:
+        """Redistribute the higher-level slots whose span starts at this round."""
+        for level in range(1, len(self._wheels)):
+            slot = (now >> (self._bits * level)) & self._mask
+            timers = self._wheels[level][slot]
+            self._wheels[level][slot] = []
+            for round_number, item in timers:
+                self._place(round_number, item)
+            if slot:
+                return
+        # Every wheel wrapped: bring overflow timers within reach
+        while self._overflow and self._overflow[0][0] - now < self._span:
+            round_number, _, item = heapq.heappop(self._overflow)
+            self._place(round_number, item)
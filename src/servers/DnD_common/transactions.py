@@ -0,0 +1,114 @@
+"""
+Multi-entity transactions across entity managers.
+A transaction locks every entity it touches (managers in a fixed order,
+ids in ascending order within each manager, so transactions cannot
+deadlock), applies its operations to working copies that hold only the
+attributes they change, and commits them together with one timestamp. A
+failing operation leaves nothing written; a commit that fails part-way writes
+back the journal of replaced values, so no half-applied transaction remains.
+"""
+
+import datetime
+from collections.abc import Mapping
+from contextlib import ExitStack
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+class WorkingCopy:
+    """
+    A transaction's copy of one entity.
+
+    The copy references the values of the given fields (scalars and the
+    properties mapping, which stays shared until an operation replaces it
+    with a copy); any other attribute is read from the stored entity. The
+    stored entity is left untouched until ``write``, which sets only the
+    fields the copy changed.
+    """
+
+    __slots__ = ("entity", "paths", "__dict__")
+
+    def __init__(self, entity: Any, field_names: Sequence[str]):
+        self.entity = entity
+        # Field paths changed by the operations applied so far
+        self.paths: List[Tuple[str, ...]] = []
+        fields = self.__dict__
+        for name in field_names:
+            fields[name] = getattr(entity, name)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.entity, name)
+
+    def write(self) -> Dict[str, Any]:
+        """
+        Set the changed fields on the stored entity.
+
+        Returns:
+            The values they replaced, by field name
+        """
+        entity = self.entity
+        previous = {}
+        for name, value in self.__dict__.items():
+            stored = getattr(entity, name)
+            # Replaced mappings always count as changed (no deep comparison)
+            if value is stored or (not isinstance(value, Mapping) and value == stored):
+                continue
+            previous[name] = stored
+            setattr(entity, name, value)
+        return previous
+
+
+def run_transaction(
+    operations: Sequence[Tuple[Any, str, Dict[str, Any]]],
+    lock_order: Sequence[Any]
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Apply updates to entities of one or more managers atomically.
+
+    Managers provide ``locks`` (``EntityLocks``), ``stage_update``,
+    ``commit_staged`` and ``restore``. Several operations on the same entity
+    are applied in order to the same working copy, and the entity's version
+    is bumped once. The commit replaces each working copy in the staged
+    entities by the stored entity it was written to.
+
+    Args:
+        operations: (manager, entity ID, update arguments with snake_case keys
+            and an optional expected_version) in the order to apply them
+        lock_order: Every manager used by the operations, in the order their
+            locks are taken
+
+    Returns:
+        The committed entities by manager, each a dictionary by entity ID
+
+    Raises:
+        ValueError: If an operation is invalid; nothing is written
+    """
+    entity_ids: Dict[Any, List[str]] = {manager: [] for manager in lock_order}
+    for manager, entity_id, _ in operations:
+        if manager not in entity_ids:
+            raise ValueError("Every manager of a transaction must be in its lock order")
+        entity_ids[manager].append(entity_id)
+
+    with ExitStack() as locks:
+        for manager, ids in entity_ids.items():
+            if ids:
+                locks.enter_context(manager.locks.hold(*ids))
+
+        staged: Dict[Any, Dict[str, Any]] = {manager: {} for manager in entity_ids}
+        for index, (manager, entity_id, changes) in enumerate(operations):
+            try:
+                manager.stage_update(staged[manager], entity_id, **changes)
+            except ValueError as e:
+                raise ValueError(f"Operation {index} ({entity_id}) failed, nothing was changed: {e}") from e
+
+        timestamp = datetime.datetime.now(datetime.UTC).isoformat()
+        journals: List[Tuple[Any, Dict[str, Any]]] = []
+        try:
+            for manager, entities in staged.items():
+                if entities:
+                    journals.append((manager, manager.commit_staged(entities, timestamp)))
+        except BaseException:
+            for manager, journal in reversed(journals):
+                manager.restore(journal)
+            raise
+
+    return {manager: entities for manager, entities in staged.items() if entities}
@@ -0,0 +1,63 @@
+"""
+Optimistic concurrency helpers for versioned D&D entities.
+Every entity carries a monotonically increasing version; writers may pass the
+version they last saw so that a stale write fails instead of silently winning.
+Readers may pass the ETag they last saw to skip re-sending unchanged data.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+
+class VersionConflictError(ValueError):
+    """Raised when a compare-and-set write sees a different version than expected."""
+
+    def __init__(self, entity_id: str, expected_version: int, actual_version: int):
+        self.entity_id = entity_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+        super().__init__(
+            f"Version conflict for '{entity_id}': expected version {expected_version}, "
+            f"found {actual_version}"
+        )
+
+
+def check_version(entity_id: str, actual_version: int, expected_version: Optional[int]) -> None:
+    """
+    Fail fast if a write was based on a stale version.
+
+    Args:
+        entity_id: Identifier of the entity being written
+        actual_version: Current version of the entity (0 if it does not exist)
+        expected_version: Version the caller expects, or None to skip the check
+
+    Raises:
+        VersionConflictError: If the versions differ
+    """
+    if expected_version is not None and expected_version != actual_version:
+        raise VersionConflictError(entity_id, expected_version, actual_version)
+
+
+def entity_etag(version: int, created_at: str) -> str:
+    """
+    Build an entity's ETag from its version and creation time.
+
+    The version changes on every write and the creation time tells apart an
+    entity deleted and recreated under the same id, so the ETag follows the
+    entity's content without ever hashing the whole record.
+    """
+    return f'"{version}-{zlib.crc32(created_at.encode()):08x}"'
+
+
+def collection_etag(log_id: str, seq: int, request: Dict[str, Any]) -> str:
+    """
+    Build the ETag of a listing from its change log position and request arguments.
+
+    Args:
+        log_id: Identifier of the change log (unique per manager instance)
+        seq: Change log sequence number read before the listing was built
+        request: Arguments that shape the listing (limit, cursor, fields...)
+    """
+    arguments = zlib.crc32(json.dumps(request, sort_keys=True, default=str).encode())
+    return f'"{log_id}-{seq}-{arguments:08x}"'
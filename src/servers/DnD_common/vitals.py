@@ -0,0 +1,186 @@
+"""
+Columnar storage for the numeric vitals of D&D entities.
+Keeps current/maximum HP and magic points in array-backed columns with an
+id -> row index so bulk operations can update many entities in one pass.
+"""
+
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+
+VITAL_FIELDS = ("current_hp", "max_hp", "current_magic_points", "max_magic_points")
+
+
+def _vital_property(name: str) -> property:
+    """Build a property that reads/writes a vital from the bound table, or locally when detached."""
+    local_name = "_" + name
+
+    def getter(entity: Any) -> int:
+        table = entity.__dict__.get("_vitals")
+        if table is None:
+            return entity.__dict__[local_name]
+        return table._columns[name][entity.__dict__["_vitals_row"]]
+
+    def setter(entity: Any, value: int) -> None:
+        table = entity.__dict__.get("_vitals")
+        if table is None:
+            entity.__dict__[local_name] = value
+        else:
+            table._columns[name][entity.__dict__["_vitals_row"]] = value
+
+    return property(getter, setter)
+
+
+def vital_columns(cls):
+    """
+    Class decorator for entity dataclasses whose vitals live in a VitalsTable.
+
+    The dataclass keeps its ``current_hp``/``max_hp``/``current_magic_points``/
+    ``max_magic_points`` fields, but the values are stored in the table the
+    entity is attached to. Detached entities keep their values locally.
+    """
+    for name in VITAL_FIELDS:
+        setattr(cls, name, _vital_property(name))
+    return cls
+
+
+class VitalsTable:
+    """
+    Array-backed HP/MP columns with an id -> row index.
+
+    Row allocation is internally synchronized. Reads and writes of an attached
+    row are not; callers serialize them per entity (see ``EntityLocks``).
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, array] = {name: array("q") for name in VITAL_FIELDS}
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._allocation_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._rows
+
+    def row_of(self, entity_id: str) -> int:
+        """
+        Get the row holding an entity's vitals.
+
+        Raises:
+            KeyError: If the entity is not attached to this table
+        """
+        return self._rows[entity_id]
+
+    def attach(self, entity_id: str, entity: Any) -> int:
+        """
+        Move an entity's vitals into the table and bind the entity to its row.
+
+        Rows released by ``detach`` are reused before the columns grow.
+
+        Returns:
+            The row index assigned to the entity
+        """
+        values = [getattr(entity, name) for name in VITAL_FIELDS]
+        with self._allocation_lock:
+            if self._free:
+                row = self._free.pop()
+                for name, value in zip(VITAL_FIELDS, values):
+                    self._columns[name][row] = value
+            else:
+                row = len(self._columns["current_hp"])
+                for name, value in zip(VITAL_FIELDS, values):
+                    self._columns[name].append(value)
+            self._rows[entity_id] = row
+        entity.__dict__["_vitals"] = self
+        entity.__dict__["_vitals_row"] = row
+        return row
+
+    def detach(self, entity_id: str, entity: Any) -> None:
+        """Copy an entity's vitals back onto the object and release its row."""
+        with self._allocation_lock:
+            row = self._rows.pop(entity_id)
+            if entity.__dict__.get("_vitals") is self:
+                for name in VITAL_FIELDS:
+                    entity.__dict__["_" + name] = self._columns[name][row]
+                del entity.__dict__["_vitals"]
+                del entity.__dict__["_vitals_row"]
+            self._free.append(row)
+
+    def apply_deltas(
+        self,
+        rows: Sequence[int],
+        hp_deltas: Sequence[int],
+        mp_deltas: Sequence[int]
+    ) -> None:
+        """
+        Add HP and magic point deltas to many rows in one pass.
+
+        Each resulting value is clamped to ``[0, max]`` for its row. Negative
+        deltas are damage/expenditure, positive deltas are healing/recovery.
+
+        Args:
+            rows: Row indexes to update
+            hp_deltas: HP delta for each row
+            mp_deltas: Magic point delta for each row
+        """
+        current_hp = self._columns["current_hp"]
+        max_hp = self._columns["max_hp"]
+        current_mp = self._columns["current_magic_points"]
+        max_mp = self._columns["max_magic_points"]
+
+        for row, hp_delta, mp_delta in zip(rows, hp_deltas, mp_deltas):
+            if hp_delta:
+                value = current_hp[row] + hp_delta
+                current_hp[row] = 0 if value < 0 else min(value, max_hp[row])
+            if mp_delta:
+                value = current_mp[row] + mp_delta
+                current_mp[row] = 0 if value < 0 else min(value, max_mp[row])
+
+    def recover(
+        self,
+        rows: Sequence[int],
+        hp_amounts: Optional[Sequence[int]] = None,
+        mp_amounts: Optional[Sequence[int]] = None
+    ) -> List[int]:
+        """
+        Recover HP and magic points of many rows in one pass (rests, regeneration).
+
+        Recovered values are capped at ``max`` and never decrease (negative
+        amounts count as 0).
+        Rows at 0 HP (defeated) are left unchanged.
+
+        Args:
+            rows: Row indexes to update
+            hp_amounts: HP to recover for each row (None restores to the maximum)
+            mp_amounts: Magic points to recover for each row (None restores to the maximum)
+
+        Returns:
+            Positions in ``rows`` whose values changed
+        """
+        current_hp = self._columns["current_hp"]
+        max_hp = self._columns["max_hp"]
+        current_mp = self._columns["current_magic_points"]
+        max_mp = self._columns["max_magic_points"]
+
+        changed = []
+        for position, row in enumerate(rows):
+            hp = current_hp[row]
+            if hp <= 0:
+                continue
+            mp = current_mp[row]
+            if hp_amounts is None:
+                new_hp = max(hp, max_hp[row])
+            else:
+                new_hp = max(hp, min(hp + hp_amounts[position], max_hp[row]))
+            if mp_amounts is None:
+                new_mp = max(mp, max_mp[row])
+            else:
+                new_mp = max(mp, min(mp + mp_amounts[position], max_mp[row]))
+            if new_hp != hp or new_mp != mp:
+                current_hp[row] = new_hp
+                current_mp[row] = new_mp
+                changed.append(position)
+        return changed
@@ -130,3 +130,36 @@ def roll_dice_notation(notation: str) -> Tuple[int, str]:
     detailed_breakdown = ", ".join(details)
     
     return total, detailed_breakdown
+
+
+def roll_dice_notation_batch(notation: str, count: int) -> List[int]:
+    """
+    Roll the same dice notation many times, parsing it only once.
+    
+    Args:
+        notation: Dice notation string (e.g., '2d6', '15d10+30')
+        count: Number of independent rolls
+    
+    Returns:
+        List of ``count`` totals (no per-die breakdown)
+    
+    Raises:
+        ValueError: If the notation or count is invalid
+    """
+    if count < 0:
+        raise ValueError(f"Number of rolls cannot be negative, got {count}")
+    dice_groups = parse_dice_notation(notation)
+    
+    totals = [0] * count
+    for num_dice, num_sides, modifier in dice_groups:
+        # One call draws every die of every roll for this group
+        rolls = random.choices(range(1, num_sides + 1), k=num_dice * count)
+        if num_dice == 1:
+            totals = [total + roll + modifier for total, roll in zip(totals, rolls)]
+        else:
+            totals = [
+                total + sum(rolls[index * num_dice:(index + 1) * num_dice]) + modifier
+                for index, total in enumerate(totals)
+            ]
+    
+    return totals
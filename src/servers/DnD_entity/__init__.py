@@ -0,0 +1 @@
+"""DnD Entity MCP Server Package."""
@@ -0,0 +1,91 @@
+"""
+Dungeons & Dragons Entity MCP Server
+This server hosts characters and monsters in one process, so a single
+transaction can update both (e.g. an attacker's magic points and a target's HP).
+"""
+
+import asyncio
+
+# --- Start of path modification ---
+import sys
+import os
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of path modification ---
+
+from mcp.server.models import InitializationOptions
+from mcp.server import NotificationOptions, Server
+from mcp.server.stdio import stdio_server
+
+from src.servers.DnD_entity import tools
+from src.servers.DnD_character import server as character_server
+from src.servers.DnD_monster import server as monster_server
+
+# Create server instance
+server = Server("Dungeons & Dragons Entity MCP Server")
+
+# Servers whose tool routing the delegated tools reuse
+ENTITY_SERVERS = {
+    "character": character_server,
+    "monster": monster_server,
+}
+
+
+@server.list_tools()
+async def handle_list_tools() -> list[tools.Tool]:
+    """
+    List available tools.
+    """
+    return tools.get_all_tools()
+
+
+@server.call_tool()
+async def handle_call_tool(name: str, arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Handle tool execution requests.
+    Runs transactions and initiative tools and routes every other tool to the character or monster tools.
+    """
+    if tools.get_tool(name) is None:
+        raise ValueError(f"Unknown tool: {name}")
+    
+    # Route to the appropriate tool executor
+    if name == "Apply Transaction":
+        return tools.execute_apply_transaction(arguments)
+    elif name == "Roll Initiative":
+        return tools.execute_roll_initiative(arguments)
+    elif name == "Set Initiative":
+        return tools.execute_set_initiative(arguments)
+    elif name == "Advance Turn":
+        return tools.execute_advance_turn(arguments)
+    elif name == "Get Initiative Order":
+        return tools.execute_get_initiative_order(arguments)
+    elif name in tools.DELEGATED_TOOLS:
+        kind, entity_tool_name = tools.DELEGATED_TOOLS[name]
+        return await ENTITY_SERVERS[kind].handle_call_tool(entity_tool_name, arguments)
+    else:
+        raise ValueError(f"Tool '{name}' not implemented")
+
+
+async def main():
+    """Main entry point for the server."""
+    # Run the server using stdin/stdout streams
+    async with stdio_server() as (read_stream, write_stream):
+        await server.run(
+            read_stream,
+            write_stream,
+            InitializationOptions(
+                server_name="dnd-entity",
+                server_version="0.1.0",
+                capabilities=server.get_capabilities(
+                    notification_options=NotificationOptions(),
+                    experimental_capabilities={},
+                ),
+            ),
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
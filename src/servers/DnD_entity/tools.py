@@ -0,0 +1,661 @@
+"""Tool definitions for the Dungeons & Dragons Entity MCP Server (characters and monsters in one process)."""
+
+from mcp.types import Tool
+from src.servers.DnD_character import tools as character_tools
+from src.servers.DnD_character.character_manager import get_character_manager
+from src.servers.DnD_monster import tools as monster_tools
+from src.servers.DnD_monster.monster_manager import get_monster_manager
+from src.servers.DnD_common.initiative import InitiativeOrder
+from src.servers.DnD_common.namespaces import CAMPAIGN_ID_PROPERTY, NamespaceRegistry
+from src.servers.DnD_common.patch import MERGE_PATCH_PROPERTY, PATCH_PROPERTY
+from src.servers.DnD_common.transactions import run_transaction
+from src.servers.DnD_dice.dice_roller import roll_dice_notation_batch
+
+
+# Entity kinds, in the order a transaction takes their locks
+ENTITY_MANAGERS = {
+    "character": get_character_manager,
+    "monster": get_monster_manager,
+}
+
+# Operation arguments and the manager update arguments they map to
+UPDATE_ARGUMENTS = {
+    "name": "name",
+    "currentHp": "current_hp",
+    "maxHp": "max_hp",
+    "currentMagicPoints": "current_magic_points",
+    "maxMagicPoints": "max_magic_points",
+    "properties": "properties",
+    "hpDelta": "hp_delta",
+    "mpDelta": "mp_delta",
+    "expectedVersion": "expected_version",
+    "patch": "patch",
+    "mergePatch": "merge_patch",
+}
+
+
+# Tool: Apply Transaction
+APPLY_TRANSACTION_TOOL = Tool(
+    name="Apply Transaction",
+    description="Apply updates to several characters and monsters atomically: either every operation is applied or none is",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "operations": {
+                "type": "array",
+                "description": "Updates to apply in order, e.g. the attacker's magic point cost and the target's damage",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "entity": {
+                            "type": "string",
+                            "enum": list(ENTITY_MANAGERS),
+                            "description": "Kind of entity to update",
+                        },
+                        "entityId": {
+                            "type": "string",
+                            "description": "Unique identifier of the character or monster",
+                        },
+                        "name": {
+                            "type": "string",
+                            "description": "New name (optional)",
+                        },
+                        "currentHp": {
+                            "type": "integer",
+                            "description": "New current hit points (optional)",
+                        },
+                        "maxHp": {
+                            "type": "integer",
+                            "description": "New maximum hit points (optional)",
+                        },
+                        "currentMagicPoints": {
+                            "type": "integer",
+                            "description": "New current magic points (optional)",
+                        },
+                        "maxMagicPoints": {
+                            "type": "integer",
+                            "description": "New maximum magic points (optional)",
+                        },
+                        "properties": {
+                            "type": "object",
+                            "description": "Properties to update/add (optional)",
+                            "additionalProperties": True,
+                        },
+                        "hpDelta": {
+                            "type": "integer",
+                            "description": "Change to current hit points, clamped to [0, maxHp] (optional, negative for damage)",
+                        },
+                        "mpDelta": {
+                            "type": "integer",
+                            "description": "Change to current magic points, clamped to [0, maxMagicPoints] (optional, negative to spend)",
+                        },
+                        "expectedVersion": {
+                            "type": "integer",
+                            "description": "Only apply the transaction if the stored version matches (optional)",
+                        },
+                        "patch": PATCH_PROPERTY,
+                        "mergePatch": MERGE_PATCH_PROPERTY,
+                    },
+                    "required": ["entity", "entityId"],
+                },
+            },
+            "campaignId": CAMPAIGN_ID_PROPERTY,
+        },
+        "required": ["operations"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "entities": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "entity": {"type": "string"},
+                        "entityId": {"type": "string"},
+                        "name": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "operations": {"type": "integer"},
+        },
+        "required": ["entities", "operations"],
+    },
+)
+
+
+# Initiative order of each campaign's encounter
+INITIATIVE_ORDERS: NamespaceRegistry[InitiativeOrder] = NamespaceRegistry(InitiativeOrder)
+
+# Dice rolled for initiative, plus the combatant's bonus
+INITIATIVE_DICE = "1d20"
+
+# Derived stat used as the initiative bonus when a combatant has no explicit one
+INITIATIVE_BONUS_STAT = "initiativeBonus"
+
+ENTITY_PROPERTY = {
+    "type": "string",
+    "enum": list(ENTITY_MANAGERS),
+    "description": "Kind of entity",
+}
+
+ENTITY_ID_PROPERTY = {
+    "type": "string",
+    "description": "Unique identifier of the character or monster",
+}
+
+INITIATIVE_ORDER_OUTPUT = {
+    "round": {"type": "integer"},
+    "current": {"type": ["object", "null"]},
+    "combatants": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "entity": {"type": "string"},
+                "entityId": {"type": "string"},
+                "initiative": {"type": "integer"},
+                "round": {"type": "integer"},
+            },
+        },
+    },
+}
+
+
+# Tool: Roll Initiative
+ROLL_INITIATIVE_TOOL = Tool(
+    name="Roll Initiative",
+    description="Roll initiative for characters and monsters in one batch and add them to the campaign's turn order",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "combatants": {
+                "type": "array",
+                "description": "Characters and monsters joining the encounter",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "entity": ENTITY_PROPERTY,
+                        "entityId": ENTITY_ID_PROPERTY,
+                        "bonus": {
+                            "type": "integer",
+                            "description": f"Added to the {INITIATIVE_DICE} roll (optional, default the derived '{INITIATIVE_BONUS_STAT}' stat or 0)",
+                        },
+                        "initiative": {
+                            "type": "integer",
+                            "description": "Use this initiative instead of rolling (optional)",
+                        },
+                    },
+                    "required": ["entity", "entityId"],
+                },
+            },
+            "reset": {
+                "type": "boolean",
+                "description": "Start a new encounter: clear the turn order and go back to round 1 first (optional, default false)",
+            },
+            "campaignId": CAMPAIGN_ID_PROPERTY,
+        },
+        "required": ["combatants"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "rolls": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "entity": {"type": "string"},
+                        "entityId": {"type": "string"},
+                        "roll": {"type": ["integer", "null"]},
+                        "bonus": {"type": "integer"},
+                        "initiative": {"type": "integer"},
+                    },
+                },
+            },
+            **INITIATIVE_ORDER_OUTPUT,
+        },
+        "required": ["rolls", "round", "current", "combatants"],
+    },
+)
+
+
+# Tool: Set Initiative
+SET_INITIATIVE_TOOL = Tool(
+    name="Set Initiative",
+    description="Add a combatant to the turn order, change its initiative, or remove it (null initiative)",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "entity": ENTITY_PROPERTY,
+            "entityId": ENTITY_ID_PROPERTY,
+            "initiative": {
+                "type": ["integer", "null"],
+                "description": "New initiative; null removes the combatant from the turn order",
+            },
+            "campaignId": CAMPAIGN_ID_PROPERTY,
+        },
+        "required": ["entity", "entityId", "initiative"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": INITIATIVE_ORDER_OUTPUT,
+        "required": ["round", "current", "combatants"],
+    },
+)
+
+
+# Tool: Advance Turn
+ADVANCE_TURN_TOOL = Tool(
+    name="Advance Turn",
+    description="Move to the next combatant in initiative order, skipping defeated (0 HP) ones and dropping deleted ones",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "campaignId": CAMPAIGN_ID_PROPERTY,
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "actor": {
+                "type": ["object", "null"],
+                "properties": {
+                    "entity": {"type": "string"},
+                    "entityId": {"type": "string"},
+                    "name": {"type": "string"},
+                    "initiative": {"type": "integer"},
+                    "currentHp": {"type": "integer"},
+                    "maxHp": {"type": "integer"},
+                },
+            },
+            "round": {"type": "integer"},
+            "skipped": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "entity": {"type": "string"},
+                        "entityId": {"type": "string"},
+                    },
+                },
+            },
+        },
+        "required": ["actor", "round", "skipped"],
+    },
+)
+
+
+# Tool: Get Initiative Order
+GET_INITIATIVE_ORDER_TOOL = Tool(
+    name="Get Initiative Order",
+    description="Get the campaign's turn order: the current round, the combatant whose turn it is and everyone in the order they act",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "campaignId": CAMPAIGN_ID_PROPERTY,
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": INITIATIVE_ORDER_OUTPUT,
+        "required": ["round", "current", "combatants"],
+    },
+)
+
+# Tools of both entity servers that share a name are exposed under these names
+RENAMED_TOOLS = {
+    ("character", "Apply Damage"): "Apply Character Damage",
+    ("monster", "Apply Damage"): "Apply Monster Damage",
+    ("character", "Changes Since"): "Character Changes Since",
+    ("monster", "Changes Since"): "Monster Changes Since",
+    ("character", "Long Rest"): "Character Long Rest",
+    ("monster", "Long Rest"): "Monster Long Rest",
+    ("character", "Short Rest"): "Character Short Rest",
+    ("monster", "Short Rest"): "Monster Short Rest",
+    ("character", "Regenerate"): "Regenerate Characters",
+    ("monster", "Regenerate"): "Regenerate Monsters",
+    ("character", "Advance Round"): "Advance Character Round",
+    ("monster", "Advance Round"): "Advance Monster Round",
+}
+
+# Tool name on this server -> (entity kind, tool name on that entity's server)
+DELEGATED_TOOLS: dict[str, tuple[str, str]] = {}
+
+TOOLS = {
+    APPLY_TRANSACTION_TOOL.name: APPLY_TRANSACTION_TOOL,
+    ROLL_INITIATIVE_TOOL.name: ROLL_INITIATIVE_TOOL,
+    SET_INITIATIVE_TOOL.name: SET_INITIATIVE_TOOL,
+    ADVANCE_TURN_TOOL.name: ADVANCE_TURN_TOOL,
+    GET_INITIATIVE_ORDER_TOOL.name: GET_INITIATIVE_ORDER_TOOL,
+}
+
+for _kind, _module in (("character", character_tools), ("monster", monster_tools)):
+    for _name, _tool in _module.TOOLS.items():
+        _exposed = RENAMED_TOOLS.get((_kind, _name), _name)
+        if _exposed in TOOLS:
+            raise RuntimeError(f"Tool name '{_exposed}' is used by more than one entity server")
+        TOOLS[_exposed] = _tool if _exposed == _name else _tool.model_copy(update={"name": _exposed})
+        DELEGATED_TOOLS[_exposed] = (_kind, _name)
+
+
+def get_tool(name: str) -> Tool | None:
+    """Get a tool by name."""
+    return TOOLS.get(name)
+
+
+def get_all_tools() -> list[Tool]:
+    """Get a list of all available tools."""
+    return list(TOOLS.values())
+
+
+def get_initiative_order(campaign_id: str | None = None) -> InitiativeOrder:
+    """Get a campaign's initiative order (default campaign if None)."""
+    return INITIATIVE_ORDERS.get(campaign_id)
+
+
+def _combatant(arguments: dict) -> tuple[str, str]:
+    """
+    Get the (entity kind, entity ID) of a combatant argument.
+    
+    Raises:
+        ValueError: If the kind is invalid or the ID is missing
+    """
+    kind = arguments.get("entity")
+    if kind not in ENTITY_MANAGERS:
+        raise ValueError(f"Invalid entity '{kind}': expected one of {', '.join(ENTITY_MANAGERS)}")
+    entity_id = arguments.get("entityId")
+    if not entity_id:
+        raise ValueError("Missing required argument: entityId")
+    return kind, entity_id
+
+
+def _get_entity(campaign_id: str | None, kind: str, entity_id: str):
+    """
+    Get a character or monster.
+    
+    Raises:
+        ValueError: If it does not exist
+    """
+    manager = ENTITY_MANAGERS[kind](campaign_id)
+    return getattr(manager, f"get_{kind}")(entity_id)
+
+
+def _order_result(order: InitiativeOrder) -> dict:
+    """Build the result describing an initiative order."""
+    current = order.current
+    return {
+        "round": order.round,
+        "current": None if current is None else {"entity": current[0], "entityId": current[1]},
+        "combatants": [
+            {"entity": kind, "entityId": entity_id, "initiative": initiative, "round": round_number}
+            for (kind, entity_id), initiative, round_number in order.order()
+        ],
+    }
+
+
+def _order_lines(result: dict) -> list[str]:
+    """Describe an initiative order result as text lines."""
+    lines = [f"Round {result['round']}:"]
+    current = result["current"]
+    for combatant in result["combatants"]:
+        marker = "→" if current == {"entity": combatant["entity"], "entityId": combatant["entityId"]} else "-"
+        later = " (next round)" if combatant["round"] > result["round"] else ""
+        lines.append(f"{marker} {combatant['initiative']}: {combatant['entity']} {combatant['entityId']}{later}")
+    return lines
+
+
+def execute_apply_transaction(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the apply transaction functionality.
+    
+    Args:
+        arguments: Dictionary containing a list of operations and an optional campaignId
+    
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    operations = arguments.get("operations")
+    if not operations:
+        raise ValueError("Missing required argument: operations")
+    
+    campaign_id = arguments.get("campaignId")
+    managers = {}
+    planned = []
+    for operation in operations:
+        kind = operation.get("entity")
+        if kind not in ENTITY_MANAGERS:
+            raise ValueError(f"Invalid entity '{kind}': expected one of {', '.join(ENTITY_MANAGERS)}")
+        entity_id = operation.get("entityId")
+        if not entity_id:
+            raise ValueError("Missing required argument: entityId")
+        if kind not in managers:
+            managers[kind] = ENTITY_MANAGERS[kind](campaign_id)
+        changes = {UPDATE_ARGUMENTS[key]: value for key, value in operation.items() if key in UPDATE_ARGUMENTS}
+        planned.append((managers[kind], entity_id, changes))
+    
+    lock_order = [managers[kind] for kind in ENTITY_MANAGERS if kind in managers]
+    committed = run_transaction(planned, lock_order)
+    
+    entities = []
+    for kind in ENTITY_MANAGERS:
+        for entity_id, entity in committed.get(managers.get(kind), {}).items():
+            entities.append((kind, entity_id, entity))
+    result = {
+        "entities": [
+            {
+                "entity": kind,
+                "entityId": entity_id,
+                "name": entity.name,
+                "currentHp": entity.current_hp,
+                "maxHp": entity.max_hp,
+                "currentMagicPoints": entity.current_magic_points,
+                "maxMagicPoints": entity.max_magic_points,
+                "version": entity.version,
+            }
+            for kind, entity_id, entity in entities
+        ],
+        "operations": len(operations),
+    }
+    
+    lines = [f"Committed {len(operations)} operation(s) on {len(entities)} entity(ies):\n"]
+    for kind, entity_id, entity in entities:
+        lines.append(
+            f"- {entity.name} ({kind} ID: {entity_id}): "
+            f"HP {entity.current_hp}/{entity.max_hp}, "
+            f"MP {entity.current_magic_points}/{entity.max_magic_points}"
+        )
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_roll_initiative(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the roll initiative functionality.
+    
+    Args:
+        arguments: Dictionary containing a list of combatants, an optional reset flag and campaignId
+    
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    combatants = arguments.get("combatants")
+    if not combatants:
+        raise ValueError("Missing required argument: combatants")
+    
+    campaign_id = arguments.get("campaignId")
+    planned = []
+    for combatant in combatants:
+        kind, entity_id = _combatant(combatant)
+        bonus = combatant.get("bonus")
+        if bonus is None and combatant.get("initiative") is None:
+            derived = ENTITY_MANAGERS[kind](campaign_id).get_derived_stats(entity_id, [INITIATIVE_BONUS_STAT])
+            bonus = int(derived.get(INITIATIVE_BONUS_STAT, 0))
+        else:
+            _get_entity(campaign_id, kind, entity_id)
+        planned.append(((kind, entity_id), bonus or 0, combatant.get("initiative")))
+    
+    # One batch of rolls for everyone without a fixed initiative
+    rolls = iter(roll_dice_notation_batch(INITIATIVE_DICE, sum(fixed is None for _, _, fixed in planned)))
+    
+    order = get_initiative_order(campaign_id)
+    if arguments.get("reset"):
+        order.clear()
+    rolled = []
+    for key, bonus, fixed in planned:
+        roll = next(rolls) if fixed is None else None
+        initiative = fixed if fixed is not None else roll + bonus
+        order.set(key, initiative)
+        rolled.append({"entity": key[0], "entityId": key[1], "roll": roll, "bonus": bonus, "initiative": initiative})
+    
+    result = {"rolls": rolled, **_order_result(order)}
+    
+    lines = [f"Rolled initiative for {len(rolled)} combatant(s):"]
+    for entry in rolled:
+        if entry["roll"] is None:
+            lines.append(f"- {entry['entity']} {entry['entityId']}: {entry['initiative']} (set)")
+        else:
+            lines.append(f"- {entry['entity']} {entry['entityId']}: {entry['roll']} {entry['bonus']:+d} = {entry['initiative']}")
+    lines.append("")
+    lines.extend(_order_lines(result))
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_set_initiative(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the set initiative functionality.
+    
+    Args:
+        arguments: Dictionary containing entity, entityId, initiative (null to remove) and campaignId
+    
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    kind, entity_id = _combatant(arguments)
+    if "initiative" not in arguments:
+        raise ValueError("Missing required argument: initiative")
+    initiative = arguments["initiative"]
+    
+    campaign_id = arguments.get("campaignId")
+    order = get_initiative_order(campaign_id)
+    if initiative is None:
+        if not order.remove((kind, entity_id)):
+            raise ValueError(f"{kind.capitalize()} with ID '{entity_id}' is not in the initiative order")
+        text = f"Removed {kind} {entity_id} from the initiative order."
+    else:
+        _get_entity(campaign_id, kind, entity_id)
+        order.set((kind, entity_id), initiative)
+        text = f"Set the initiative of {kind} {entity_id} to {initiative}."
+    
+    result = _order_result(order)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join([text, ""] + _order_lines(result)),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_advance_turn(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the advance turn functionality.
+    
+    Args:
+        arguments: Dictionary containing an optional campaignId
+    
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    campaign_id = arguments.get("campaignId")
+    actors = {}
+    
+    def can_act(combatant: tuple[str, str]) -> bool | None:
+        kind, entity_id = combatant
+        try:
+            entity = _get_entity(campaign_id, kind, entity_id)
+        except ValueError:
+            return None
+        actors[combatant] = entity
+        return entity.current_hp > 0
+    
+    order = get_initiative_order(campaign_id)
+    turn, passed = order.advance(can_act)
+    
+    skipped = [{"entity": kind, "entityId": entity_id} for kind, entity_id in passed]
+    if turn is None:
+        actor = None
+        text = "No combatant can act."
+    else:
+        (kind, entity_id), initiative, _ = turn
+        entity = actors[(kind, entity_id)]
+        actor = {
+            "entity": kind,
+            "entityId": entity_id,
+            "name": entity.name,
+            "initiative": initiative,
+            "currentHp": entity.current_hp,
+            "maxHp": entity.max_hp,
+        }
+        text = f"Round {order.round}: {entity.name} ({kind} ID: {entity_id}, initiative {initiative}) acts."
+    if skipped:
+        text += "\nSkipped: " + ", ".join(f"{entry['entity']} {entry['entityId']}" for entry in skipped)
+    
+    result = {
+        "actor": actor,
+        "round": order.round,
+        "skipped": skipped
+    }
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_get_initiative_order(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the get initiative order functionality.
+    
+    Args:
+        arguments: Dictionary containing an optional campaignId
+    
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    result = _order_result(get_initiative_order(arguments.get("campaignId")))
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(_order_lines(result)),
+        }
+    ]
+    
+    return contents, result
@@ -3,11 +3,39 @@ Monster management logic for D&D monsters.
 Handles monster creation, updates, retrieval, and listing.
 """
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Mapping, Optional, Any, Sequence, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
 import datetime
+import functools
+import itertools
+import threading
+import time
+from itertools import islice
 
+from src.servers.DnD_common.changelog import DELETE, UPSERT, ChangeLog
+from src.servers.DnD_common.copy_on_write import CopyOnWriteProperties, freeze_properties
+from src.servers.DnD_common.derived import DerivedStats, placeholder_names, substitute_stats, update_paths
+from src.servers.DnD_common.effects import Effect, EffectScheduler
+from src.servers.DnD_common.expressions import compile_filter
+from src.servers.DnD_common.indexes import SortedIndex, build_index
+from src.servers.DnD_common.insertion_order import InsertionOrderIndex
+from src.servers.DnD_common.locks import EntityLocks
+from src.servers.DnD_common.name_search import NameIndex
+from src.servers.DnD_common.namespaces import NamespaceRegistry
+from src.servers.DnD_common.patch import apply_merge_patch, apply_patch, undo
+from src.servers.DnD_common.paths import overlaps, parse_path
+from src.servers.DnD_common.projection import copy_touched, copy_value, projector_for
+from src.servers.DnD_common.query import index_candidates, parse_predicate
+from src.servers.DnD_common.serialization import cached_dict, cached_json
+from src.servers.DnD_common.spill import SpillStore
+from src.servers.DnD_common.transactions import WorkingCopy
+from src.servers.DnD_common.versioning import check_version, collection_etag, entity_etag
+from src.servers.DnD_dice.dice_roller import parse_dice_notation, roll_dice_notation, roll_dice_notation_batch
+from src.servers.DnD_common.vitals import VITAL_FIELDS, VitalsTable, vital_columns
 
+
+@vital_columns
 @dataclass
 class Monster:
     """Represents a D&D monster with life points, properties, and magic points."""
@@ -21,21 +49,305 @@ class Monster:
     properties: Dict[str, Any] = field(default_factory=dict)
     created_at: str = field(default_factory=lambda: datetime.datetime.now(datetime.UTC).isoformat())
     updated_at: str = field(default_factory=lambda: datetime.datetime.now(datetime.UTC).isoformat())
+    version: int = 1
+    template_id: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert monster to dictionary."""
-        return asdict(self)
+        """
+        Convert monster to dictionary (template-based properties are resolved).
+        
+        Nested values are shared until the next write.
+        """
+        return dict(cached_dict(self))
+    
+    def to_json(self) -> str:
+        """Convert monster to a JSON object, encoded at most once per version."""
+        return cached_json(self)
+    
+    def project(self, field_paths: Sequence[str]) -> Dict[str, Any]:
+        """
+        Convert only the selected fields to a dictionary.
+        
+        Args:
+            field_paths: Field names (camelCase or snake_case) or nested property
+                paths such as "properties.inventory.potions"
+        
+        Raises:
+            ValueError: If a field path is invalid
+        """
+        return projector_for(field_paths, MONSTER_FIELDS)(self)
+    
+    @property
+    def etag(self) -> str:
+        """ETag of the current version; changes on every write."""
+        return entity_etag(self.version, self.created_at)
+    
+    def update_timestamp(self, timestamp: Optional[str] = None):
+        """Record a modification: bump the version (invalidating cached views) and update the updated_at timestamp."""
+        self.version += 1
+        self.updated_at = timestamp or datetime.datetime.now(datetime.UTC).isoformat()
+
+
+@dataclass
+class MonsterTemplate:
+    """A stat block that monsters can be created from; its properties are shared, read-only."""
+    
+    template_id: str
+    name: str
+    max_hp: int
+    max_magic_points: int
+    properties: Mapping[str, Any] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.datetime.now(datetime.UTC).isoformat())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert template to dictionary."""
+        return {
+            "template_id": self.template_id,
+            "name": self.name,
+            "max_hp": self.max_hp,
+            "max_magic_points": self.max_magic_points,
+            "properties": copy_value(self.properties),
+            "created_at": self.created_at,
+        }
+
+
+# Attribute names usable in field paths (projections, indexes, queries)
+MONSTER_FIELDS = tuple(f.name for f in fields(Monster))
+
+# Sorted views maintained on every write for ordered listings (orderBy)
+MONSTER_SORTED_VIEWS = ("name", "currentHp", "properties.initiative")
+
+# Fields changed by HP/MP deltas, for derived stat invalidation
+_VITALS_PATHS = (("current_hp",), ("current_magic_points",))
+
+# Fields every committed write changes, besides the ones its updates changed
+_COMMIT_PATHS = (("version",), ("updated_at",))
+
+# Fields a transaction's working copy holds; updates change no others
+_STAGED_FIELDS = ("name", *VITAL_FIELDS, "properties")
+
+# Fraction of the memory budget freed per eviction pass, so spills are written in batches
+EVICTION_BATCH = 1 / 16
+# Least recently used monsters examined per eviction pass beyond the excess
+EVICTION_SCAN = 64
+# Minimum number of seconds between opportunistic sweeps of expired ephemeral monsters
+EXPIRY_SWEEP_INTERVAL = 1.0
+
+
+def _properties_for(template: Optional[MonsterTemplate], properties: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a monster's properties: its own dict, or template properties plus copy-on-write overrides."""
+    if template is None:
+        return properties or {}
+    return CopyOnWriteProperties(template.properties, properties)
+
+
+def _shallow_copy(properties: Mapping[str, Any]) -> Dict[str, Any]:
+    """Copy a monster's properties, sharing their values (template-based ones stay copy-on-write)."""
+    if isinstance(properties, CopyOnWriteProperties):
+        return properties.copy(deep=False)
+    return dict(properties)
+
+
+def _validate_vitals(current_hp: int, max_hp: int, current_magic_points: int, max_magic_points: int) -> None:
+    """
+    Validate a full set of HP and magic point values.
+    
+    Raises:
+        ValueError: If HP or magic points are invalid
+    """
+    if max_hp < 1:
+        raise ValueError("Maximum HP must be at least 1")
+    if current_hp < 0:
+        raise ValueError("Current HP cannot be negative")
+    if current_hp > max_hp:
+        raise ValueError("Current HP cannot exceed maximum HP")
+    if max_magic_points < 0:
+        raise ValueError("Maximum magic points cannot be negative")
+    if current_magic_points < 0:
+        raise ValueError("Current magic points cannot be negative")
+    if current_magic_points > max_magic_points:
+        raise ValueError("Current magic points cannot exceed maximum magic points")
+
+
+def _validate_ttl(ttl_seconds: Optional[float]) -> None:
+    """
+    Validate an ephemeral monster's time to live.
+    
+    Raises:
+        ValueError: If the TTL is not positive
+    """
+    if ttl_seconds is not None and ttl_seconds <= 0:
+        raise ValueError("TTL must be positive")
+
+
+def _check_update(
+    current_hp: Optional[int],
+    current_magic_points: Optional[int],
+    hp_delta: Optional[int],
+    mp_delta: Optional[int]
+) -> None:
+    """
+    Reject updates that both set and change the same value.
+    
+    Raises:
+        ValueError: If a current value and its delta are both given
+    """
+    if current_hp is not None and hp_delta is not None:
+        raise ValueError("Cannot set current HP and apply an HP delta in the same update")
+    if current_magic_points is not None and mp_delta is not None:
+        raise ValueError("Cannot set current magic points and apply a magic point delta in the same update")
+
+
+def _property_paths(paths: Sequence[Tuple[str, ...]]) -> List[Tuple[str, ...]]:
+    """Get the paths into properties among changed field paths, relative to properties."""
+    return [path[1:] for path in paths if path[0] == "properties"]
+
+
+def _apply_update(
+    monster: Monster,
+    name: Optional[str] = None,
+    current_hp: Optional[int] = None,
+    max_hp: Optional[int] = None,
+    current_magic_points: Optional[int] = None,
+    max_magic_points: Optional[int] = None,
+    properties: Optional[Dict[str, Any]] = None,
+    hp_delta: Optional[int] = None,
+    mp_delta: Optional[int] = None,
+    patch: Optional[List[Dict[str, Any]]] = None,
+    merge_patch: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Change the given fields of a monster in place, without bumping its version.
+    
+    Property changes are applied as a merge patch, then a JSON patch, then a
+    shallow merge of ``properties``. If any change is invalid, the monster is
+    left as it was.
+    
+    Raises:
+        ValueError: If invalid values are provided
+    """
+    snapshot = (
+        monster.name, monster.current_hp, monster.max_hp,
+        monster.current_magic_points, monster.max_magic_points
+    )
+    undo_log: List[Callable[[], None]] = []
+    try:
+        _apply_changes(
+            monster, name, current_hp, max_hp, current_magic_points, max_magic_points,
+            hp_delta, mp_delta, patch, merge_patch, undo_log
+        )
+    except ValueError:
+        undo(undo_log)
+        (
+            monster.name, monster.current_hp, monster.max_hp,
+            monster.current_magic_points, monster.max_magic_points
+        ) = snapshot
+        raise
+    
+    if properties is not None:
+        # Update/merge properties (template-based monsters copy on write)
+        monster.properties.update(properties)
+
+
+def _apply_changes(
+    monster: Monster,
+    name: Optional[str],
+    current_hp: Optional[int],
+    max_hp: Optional[int],
+    current_magic_points: Optional[int],
+    max_magic_points: Optional[int],
+    hp_delta: Optional[int],
+    mp_delta: Optional[int],
+    patch: Optional[List[Dict[str, Any]]],
+    merge_patch: Optional[Dict[str, Any]],
+    undo_log: List[Callable[[], None]]
+) -> None:
+    """Apply the name, vitals and property patches of an update, recording property changes in ``undo_log``."""
+    if name is not None:
+        monster.name = name
     
-    def update_timestamp(self):
-        """Update the updated_at timestamp."""
-        self.updated_at = datetime.datetime.now(datetime.UTC).isoformat()
+    if max_hp is not None:
+        if max_hp < 1:
+            raise ValueError("Maximum HP must be at least 1")
+        monster.max_hp = max_hp
+    
+    if current_hp is not None:
+        if current_hp < 0:
+            raise ValueError("Current HP cannot be negative")
+        if current_hp > monster.max_hp:
+            raise ValueError("Current HP cannot exceed maximum HP")
+        monster.current_hp = current_hp
+    
+    if hp_delta is not None:
+        monster.current_hp = max(0, min(monster.current_hp + hp_delta, monster.max_hp))
+    
+    if max_magic_points is not None:
+        if max_magic_points < 0:
+            raise ValueError("Maximum magic points cannot be negative")
+        monster.max_magic_points = max_magic_points
+    
+    if current_magic_points is not None:
+        if current_magic_points < 0:
+            raise ValueError("Current magic points cannot be negative")
+        if current_magic_points > monster.max_magic_points:
+            raise ValueError("Current magic points cannot exceed maximum magic points")
+        monster.current_magic_points = current_magic_points
+    
+    if mp_delta is not None:
+        monster.current_magic_points = max(
+            0, min(monster.current_magic_points + mp_delta, monster.max_magic_points)
+        )
+    
+    if merge_patch is not None:
+        apply_merge_patch(monster.properties, merge_patch, undo_log)
+    
+    if patch is not None:
+        apply_patch(monster.properties, patch, undo_log)
 
 
 class MonsterManager:
-    """Manages D&D monsters in memory."""
+    """
+    Manages D&D monsters in memory.
     
-    def __init__(self):
-        self._monsters: Dict[str, Monster] = {}
+    Writes hold the per-monster locks in ``locks``, so operations on
+    different monsters never wait for each other. Callers that coordinate
+    several operations (from threads or asyncio tasks) can hold the same
+    locks; they are reentrant for the holding thread or task.
+    
+    With a memory budget (``max_resident``) the least recently used monsters
+    are spilled to an on-disk store and faulted back in when accessed. Their
+    ids stay in the indexes, so listings and queries still see them. Monsters
+    whose lock is held are never evicted.
+    """
+    
+    def __init__(self, max_resident: Optional[int] = None, spill_path: Optional[str] = None):
+        self._monsters: Dict[str, Monster] = OrderedDict()
+        self._vitals = VitalsTable()
+        self._order = InsertionOrderIndex()
+        self._indexes: Dict[str, Any] = {}
+        self._views: Dict[str, SortedIndex] = {}
+        for path in MONSTER_SORTED_VIEWS:
+            parts = parse_path(path, MONSTER_FIELDS)
+            self._views[".".join(parts)] = SortedIndex(parts)
+        self._names = NameIndex()
+        self._changes = ChangeLog()
+        self._templates: Dict[str, MonsterTemplate] = {}
+        self._spawn_counters: Dict[str, Any] = {}
+        self._spawn_lock = threading.Lock()
+        self.locks = EntityLocks()
+        self.derived = DerivedStats(MONSTER_FIELDS)
+        self.effects = EffectScheduler()
+        self._residency_lock = threading.RLock()
+        self._max_resident: Optional[int] = None
+        self._spill: Optional[SpillStore] = None
+        # Template properties shared by spilled monsters, by key in their spill records,
+        # with the number of records using them; dropped when no record does
+        self._spilled_bases: Dict[int, List[Any]] = {}
+        self._expiry: Dict[str, List[float]] = {}
+        self._next_sweep = 0.0
+        self._stats = {"spills": 0, "faults": 0, "expired": 0}
+        if max_resident is not None:
+            self.set_memory_budget(max_resident, spill_path)
     
     def set_monster(
         self,
@@ -45,11 +357,20 @@ class MonsterManager:
         max_hp: int,
         current_magic_points: int,
         max_magic_points: int,
-        properties: Optional[Dict[str, Any]] = None
+        properties: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+        template_id: Optional[str] = None,
+        ttl_seconds: Optional[float] = None
     ) -> Monster:
         """
         Create or completely replace a monster.
         
+        A replaced monster continues the version sequence of the previous one.
+        A monster created from a template shares the template's properties and
+        stores only its own (given or later merged) properties as overrides.
+        A monster with a TTL is ephemeral: it is deleted once it has not been
+        written to for that long.
+        
         Args:
             monster_id: Unique identifier for the monster
             name: Monster name
@@ -58,39 +379,337 @@ class MonsterManager:
             current_magic_points: Current magic points
             max_magic_points: Maximum magic points
             properties: Dictionary of monster properties (strength, dexterity, etc.)
+            expected_version: Fail unless the stored version matches; 0 means
+                the monster must not exist yet (optional)
+            template_id: Template to share properties with (optional); properties
+                then only hold overrides
+            ttl_seconds: Make the monster ephemeral with this time to live (optional)
         
         Returns:
             The created/updated Monster object
         
         Raises:
-            ValueError: If HP or magic points are invalid
+            VersionConflictError: If expected_version does not match
+            ValueError: If HP, magic points or the TTL are invalid, or the template is not found
         """
-        if max_hp < 1:
-            raise ValueError("Maximum HP must be at least 1")
-        if current_hp < 0:
-            raise ValueError("Current HP cannot be negative")
-        if current_hp > max_hp:
-            raise ValueError("Current HP cannot exceed maximum HP")
-        if max_magic_points < 0:
-            raise ValueError("Maximum magic points cannot be negative")
-        if current_magic_points < 0:
-            raise ValueError("Current magic points cannot be negative")
-        if current_magic_points > max_magic_points:
-            raise ValueError("Current magic points cannot exceed maximum magic points")
+        _validate_vitals(current_hp, max_hp, current_magic_points, max_magic_points)
+        _validate_ttl(ttl_seconds)
+        template = self.get_template(template_id) if template_id else None
         
-        monster = Monster(
-            monster_id=monster_id,
-            name=name,
-            current_hp=current_hp,
-            max_hp=max_hp,
-            current_magic_points=current_magic_points,
-            max_magic_points=max_magic_points,
-            properties=properties or {}
-        )
+        with self.locks.hold(monster_id):
+            previous = self._load(monster_id)
+            check_version(monster_id, previous.version if previous else 0, expected_version)
+            
+            monster = Monster(
+                monster_id=monster_id,
+                name=name,
+                current_hp=current_hp,
+                max_hp=max_hp,
+                current_magic_points=current_magic_points,
+                max_magic_points=max_magic_points,
+                properties=_properties_for(template, properties),
+                version=previous.version + 1 if previous else 1,
+                template_id=template_id
+            )
+            self._install(monster_id, monster, previous, ttl_seconds)
+        self._evict()
+        return monster
+    
+    def _install(
+        self,
+        monster_id: str,
+        monster: Monster,
+        previous: Optional[Monster],
+        ttl_seconds: Optional[float] = None
+    ) -> None:
+        """Store a new or replacement monster. The caller holds the monster's lock."""
+        if previous is not None:
+            self._vitals.detach(monster_id, previous)
+        self._vitals.attach(monster_id, monster)
+        with self._residency_lock:
+            self._monsters[monster_id] = monster
+        self._order.add(monster_id)
+        if ttl_seconds is None:
+            self._expiry.pop(monster_id, None)
+        else:
+            self._expiry[monster_id] = [0.0, ttl_seconds]
+        self._reindex(monster_id, monster)
+    
+    def _reindex(self, monster_id: str, monster: Monster) -> None:
+        """Refresh the secondary indexes and sorted views after a write. The caller holds the monster's lock."""
+        for index in self._indexes.values():
+            index.update(monster_id, monster)
+        for view in self._views.values():
+            view.update(monster_id, monster)
+        self._names.update(monster_id, monster.name)
+        self._changes.record(monster_id, UPSERT)
+        expiry = self._expiry.get(monster_id)
+        if expiry is not None:
+            expiry[0] = time.monotonic() + expiry[1]
+    
+    def _reindex_paths(self, monster_id: str, monster: Monster, changed: List[Tuple[str, ...]]) -> None:
+        """
+        Refresh only the indexes and sorted views that read a changed path, after an in-place write.
+        
+        The caller holds the monster's lock.
+        """
+        changed = [*changed, *_COMMIT_PATHS]
+        attributes = {path[0] for path in changed}
+        for index in self._indexes.values():
+            if index.parts[0] in attributes and any(overlaps(index.parts, path) for path in changed):
+                index.update(monster_id, monster)
+        for view in self._views.values():
+            if view.parts[0] in attributes and any(overlaps(view.parts, path) for path in changed):
+                view.update(monster_id, monster)
+        if "name" in attributes:
+            self._names.update(monster_id, monster.name)
+        self._changes.record(monster_id, UPSERT)
+        expiry = self._expiry.get(monster_id)
+        if expiry is not None:
+            expiry[0] = time.monotonic() + expiry[1]
+    
+    def _reindex_many(self, monsters: List[Monster]) -> None:
+        """
+        Refresh the secondary indexes and sorted views after a bulk write and log its changes at once.
         
-        self._monsters[monster_id] = monster
+        The caller holds the monsters' locks.
+        """
+        entries = [(monster.monster_id, monster) for monster in monsters]
+        for index in self._indexes.values():
+            index.update_many(entries)
+        for view in self._views.values():
+            view.update_many(entries)
+        for monster_id, monster in entries:
+            self._names.update(monster_id, monster.name)
+        self._changes.record_many([monster_id for monster_id, _ in entries], UPSERT)
+        now = time.monotonic()
+        for monster_id, _ in entries:
+            expiry = self._expiry.get(monster_id)
+            if expiry is not None:
+                expiry[0] = now + expiry[1]
+    
+    def _spill_record(self, monster: Monster) -> Dict[str, Any]:
+        """
+        Get a monster's fields for the spill store, which serializes them (cheaper than to_dict's deep copy).
+        
+        A template-based monster stores only its overrides and a key to its
+        shared template properties, which stay in memory while a record uses
+        them. The caller holds the residency lock.
+        """
+        record = {name: getattr(monster, name) for name in MONSTER_FIELDS}
+        properties = monster.properties
+        if isinstance(properties, CopyOnWriteProperties):
+            base_key = id(properties.base)
+            entry = self._spilled_bases.setdefault(base_key, [properties.base, 0])
+            entry[1] += 1
+            record["properties"], record["deleted"] = properties.overrides()
+            record["base"] = base_key
+        return record
+    
+    def _from_record(self, record: Dict[str, Any]) -> Monster:
+        """Rebuild a monster from its spill record, sharing its template properties again."""
+        base_key = record.pop("base", None)
+        if base_key is not None:
+            record["properties"] = CopyOnWriteProperties(
+                self._spilled_bases[base_key][0], record["properties"], record.pop("deleted")
+            )
+        return Monster(**record)
+    
+    def _release_base(self, base_key: Optional[int]) -> None:
+        """Drop a spill record's hold on its template properties. The caller holds the residency lock."""
+        if base_key is None:
+            return
+        entry = self._spilled_bases[base_key]
+        entry[1] -= 1
+        if not entry[1]:
+            del self._spilled_bases[base_key]
+    
+    def _load(self, monster_id: str) -> Optional[Monster]:
+        """Get a monster (None if missing), faulting it in from the spill store and marking it recently used."""
+        if self._spill is None:
+            return self._monsters.get(monster_id)
+        with self._residency_lock:
+            monster = self._monsters.get(monster_id)
+            if monster is not None:
+                self._monsters.move_to_end(monster_id)
+                return monster
+            record = self._spill.take(monster_id)
+            if record is None:
+                return None
+            base_key = record.get("base")
+            monster = self._from_record(record)
+            self._release_base(base_key)
+            self._vitals.attach(monster_id, monster)
+            self._monsters[monster_id] = monster
+            self._stats["faults"] += 1
+            self._evict()
+        return monster
+    
+    def _peek(self, monster_id: str) -> Optional[Monster]:
+        """Get a monster without changing residency; a spilled monster is read as a detached copy."""
+        monster = self._monsters.get(monster_id)
+        if monster is not None or self._spill is None:
+            return monster
+        with self._residency_lock:
+            monster = self._monsters.get(monster_id)
+            if monster is None:
+                record = self._spill.get(monster_id)
+                monster = self._from_record(record) if record is not None else None
         return monster
     
+    def _exists(self, monster_id: str) -> bool:
+        """Check whether a monster is resident or spilled."""
+        if self._spill is None:
+            return monster_id in self._monsters
+        with self._residency_lock:
+            return monster_id in self._monsters or monster_id in self._spill
+    
+    def _ids(self) -> List[str]:
+        """Get the ids of all resident and spilled monsters."""
+        with self._residency_lock:
+            ids = list(self._monsters)
+            if self._spill is not None:
+                ids.extend(self._spill.ids())
+        return ids
+    
+    def _entries(self) -> List[Tuple[str, Monster]]:
+        """Get (id, monster) pairs of all monsters in insertion order; spilled monsters are detached copies."""
+        if self._spill is None:
+            return list(self._monsters.items())
+        with self._residency_lock:
+            monsters = dict(self._monsters)
+            for monster_id, record in self._spill.items():
+                monsters[monster_id] = self._from_record(record)
+        return [(monster_id, monsters[monster_id]) for monster_id in self._order.ordered(monsters)]
+    
+    def _evict(self) -> None:
+        """
+        Spill least recently used monsters once the resident count exceeds the memory budget.
+        
+        A pass frees a slice of the budget beyond the excess, so faults do not
+        write to disk one monster at a time.
+        """
+        if self._max_resident is None:
+            return
+        with self._residency_lock:
+            excess = len(self._monsters) - self._max_resident
+            if excess <= 0:
+                return
+            excess += int(self._max_resident * EVICTION_BATCH)
+            spilled: List[Tuple[str, Dict[str, Any]]] = []
+            for monster_id in list(islice(self._monsters, excess + EVICTION_SCAN)):
+                if len(spilled) >= excess:
+                    break
+                with self.locks.hold_if_free(monster_id) as free:
+                    if not free:
+                        continue
+                    monster = self._monsters.pop(monster_id)
+                    self._vitals.detach(monster_id, monster)
+                    spilled.append((monster_id, self._spill_record(monster)))
+            self._spill.put_many(spilled)
+            self._stats["spills"] += len(spilled)
+    
+    def _discard(self, monster_id: str) -> bool:
+        """Remove a monster from memory or the spill store and from every index. The caller holds its lock."""
+        with self._residency_lock:
+            monster = self._monsters.pop(monster_id, None)
+            if monster is not None:
+                self._vitals.detach(monster_id, monster)
+            else:
+                record = self._spill.take(monster_id) if self._spill is not None else None
+                if record is None:
+                    return False
+                self._release_base(record.get("base"))
+        self._order.remove(monster_id)
+        for index in self._indexes.values():
+            index.remove(monster_id)
+        for view in self._views.values():
+            view.remove(monster_id)
+        self._names.remove(monster_id)
+        self._changes.record(monster_id, DELETE)
+        self._expiry.pop(monster_id, None)
+        self.effects.remove_entity(monster_id)
+        return True
+    
+    def _sweep_if_due(self) -> None:
+        """Expire ephemeral monsters at most once per sweep interval."""
+        if self._expiry and time.monotonic() >= self._next_sweep:
+            self.expire_monsters()
+    
+    def set_monsters(self, entries: List[Dict[str, Any]], atomic: bool = True) -> Dict[str, Any]:
+        """
+        Create or replace many monsters in one call.
+        
+        Every entry is validated in a single pass before anything is written.
+        In atomic mode a single invalid entry rejects the whole batch; otherwise
+        the valid entries are applied and the invalid ones are reported. Later
+        entries for the same ID replace earlier ones.
+        
+        Args:
+            entries: List of dictionaries with the arguments of set_monster
+                (monster_id, name, current_hp, max_hp, current_magic_points,
+                max_magic_points, and optionally properties, expected_version,
+                template_id and ttl_seconds)
+            atomic: Apply all entries or none of them (default True)
+        
+        Returns:
+            Summary dictionary with "applied", "failed" and per-item "errors"
+            ({"index", "monster_id", "error"})
+        """
+        monster_ids = [entry.get("monster_id") for entry in entries]
+        with self.locks.hold(*monster_ids):
+            valid: List[tuple] = []
+            errors: List[Dict[str, Any]] = []
+            versions: Dict[str, int] = {}
+            for index, entry in enumerate(entries):
+                monster_id = entry.get("monster_id")
+                try:
+                    if not monster_id:
+                        raise ValueError("Missing required argument: monster_id")
+                    if not entry.get("name"):
+                        raise ValueError("Missing required argument: name")
+                    for key in ("current_hp", "max_hp", "current_magic_points", "max_magic_points"):
+                        if entry.get(key) is None:
+                            raise ValueError(f"Missing required argument: {key}")
+                    _validate_vitals(
+                        entry["current_hp"], entry["max_hp"],
+                        entry["current_magic_points"], entry["max_magic_points"]
+                    )
+                    _validate_ttl(entry.get("ttl_seconds"))
+                    template = self.get_template(entry["template_id"]) if entry.get("template_id") else None
+                    if monster_id not in versions:
+                        previous = self._load(monster_id)
+                        versions[monster_id] = previous.version if previous else 0
+                    check_version(monster_id, versions[monster_id], entry.get("expected_version"))
+                    versions[monster_id] += 1
+                except ValueError as e:
+                    errors.append({"index": index, "monster_id": monster_id, "error": str(e)})
+                    continue
+                valid.append((monster_id, entry, versions[monster_id], template))
+            
+            if errors and atomic:
+                valid = []
+            
+            timestamp = datetime.datetime.now(datetime.UTC).isoformat()
+            for monster_id, entry, version, template in valid:
+                monster = Monster(
+                    monster_id=monster_id,
+                    name=entry["name"],
+                    current_hp=entry["current_hp"],
+                    max_hp=entry["max_hp"],
+                    current_magic_points=entry["current_magic_points"],
+                    max_magic_points=entry["max_magic_points"],
+                    properties=_properties_for(template, entry.get("properties")),
+                    created_at=timestamp,
+                    updated_at=timestamp,
+                    version=version,
+                    template_id=template.template_id if template else None
+                )
+                self._install(monster_id, monster, self._load(monster_id), entry.get("ttl_seconds"))
+        
+        self._evict()
+        return {"applied": len(valid), "failed": len(errors), "errors": errors}
+    
     def get_monster(self, monster_id: str) -> Monster:
         """
         Retrieve a monster by ID.
@@ -104,10 +723,12 @@ class MonsterManager:
         Raises:
             ValueError: If monster not found
         """
-        if monster_id not in self._monsters:
+        self._sweep_if_due()
+        monster = self._load(monster_id)
+        if monster is None:
             raise ValueError(f"Monster with ID '{monster_id}' not found")
         
-        return self._monsters[monster_id]
+        return monster
     
     def update_monster(
         self,
@@ -117,11 +738,22 @@ class MonsterManager:
         max_hp: Optional[int] = None,
         current_magic_points: Optional[int] = None,
         max_magic_points: Optional[int] = None,
-        properties: Optional[Dict[str, Any]] = None
+        properties: Optional[Dict[str, Any]] = None,
+        hp_delta: Optional[int] = None,
+        mp_delta: Optional[int] = None,
+        expected_version: Optional[int] = None,
+        patch: Optional[List[Dict[str, Any]]] = None,
+        merge_patch: Optional[Dict[str, Any]] = None
     ) -> Monster:
         """
         Update specific fields of an existing monster.
         
+        HP and magic points can be set absolutely or changed by a delta. Deltas
+        are applied server-side against the stored value and clamped to [0, max],
+        so concurrent damage/healing never overwrites another update. Likewise
+        ``patch`` and ``merge_patch`` change nested properties in place, leaving
+        the rest of each subtree untouched. The update is all-or-nothing.
+        
         Args:
             monster_id: Unique identifier for the monster
             name: New monster name (optional)
@@ -130,49 +762,126 @@ class MonsterManager:
             current_magic_points: New current magic points (optional)
             max_magic_points: New maximum magic points (optional)
             properties: Dictionary of properties to update/add (optional)
+            hp_delta: Change to apply to current hit points, clamped (optional)
+            mp_delta: Change to apply to current magic points, clamped (optional)
+            expected_version: Fail unless the stored version matches (optional)
+            patch: JSON Patch operations on properties, e.g.
+                {"op": "increment", "path": "/inventory/potions/count", "value": -1} (optional)
+            merge_patch: JSON Merge Patch of properties; null removes a key (optional)
         
         Returns:
             The updated Monster object
         
         Raises:
+            VersionConflictError: If expected_version does not match
             ValueError: If monster not found or invalid values provided
         """
-        monster = self.get_monster(monster_id)
-        
-        # Update fields if provided
-        if name is not None:
-            monster.name = name
-        
-        if max_hp is not None:
-            if max_hp < 1:
-                raise ValueError("Maximum HP must be at least 1")
-            monster.max_hp = max_hp
-        
-        if current_hp is not None:
-            if current_hp < 0:
-                raise ValueError("Current HP cannot be negative")
-            if current_hp > monster.max_hp:
-                raise ValueError("Current HP cannot exceed maximum HP")
-            monster.current_hp = current_hp
-        
-        if max_magic_points is not None:
-            if max_magic_points < 0:
-                raise ValueError("Maximum magic points cannot be negative")
-            monster.max_magic_points = max_magic_points
-        
-        if current_magic_points is not None:
-            if current_magic_points < 0:
-                raise ValueError("Current magic points cannot be negative")
-            if current_magic_points > monster.max_magic_points:
-                raise ValueError("Current magic points cannot exceed maximum magic points")
-            monster.current_magic_points = current_magic_points
-        
-        if properties is not None:
-            # Update/merge properties
-            monster.properties.update(properties)
-        
-        monster.update_timestamp()
-        return monster
+        _check_update(current_hp, current_magic_points, hp_delta, mp_delta)
+        
+        with self.locks.hold(monster_id):
+            monster = self.get_monster(monster_id)
+            check_version(monster_id, monster.version, expected_version)
+            previous_version = monster.version
+            _apply_update(monster, name, current_hp, max_hp, current_magic_points, max_magic_points, properties, hp_delta, mp_delta, patch, merge_patch)
+            monster.update_timestamp()
+            self.derived.invalidate(monster, previous_version, update_paths(
+                name=name, current_hp=current_hp, max_hp=max_hp,
+                current_magic_points=current_magic_points, max_magic_points=max_magic_points,
+                properties=properties, hp_delta=hp_delta, mp_delta=mp_delta,
+                patch=patch, merge_patch=merge_patch
+            ))
+            self._reindex(monster_id, monster)
+            return monster
+    
+    def stage_update(
+        self,
+        staged: Dict[str, WorkingCopy],
+        monster_id: str,
+        expected_version: Optional[int] = None,
+        **changes: Any
+    ) -> WorkingCopy:
+        """
+        Apply an update to a working copy of a monster (first phase of a transaction).
+        
+        The first update of a monster adds a working copy to ``staged``; later
+        updates change the same copy. The copy shares the stored properties
+        until an update changes them, and then deep-copies only the top-level
+        keys that update changes. Nothing is visible to readers until
+        ``commit_staged``. The caller holds the monster's lock until then.
+        
+        Args:
+            staged: Working copies of this transaction by monster ID
+            monster_id: Unique identifier for the monster
+            expected_version: Fail unless the stored version matches (optional)
+            **changes: Arguments of update_monster (name, current_hp, hp_delta, ...)
+        
+        Returns:
+            The working copy
+        
+        Raises:
+            VersionConflictError: If expected_version does not match
+            ValueError: If monster not found or invalid values provided
+        """
+        _check_update(
+            changes.get("current_hp"), changes.get("current_magic_points"),
+            changes.get("hp_delta"), changes.get("mp_delta")
+        )
+        working = staged.get(monster_id)
+        if working is None:
+            working = WorkingCopy(self.get_monster(monster_id), _STAGED_FIELDS)
+            staged[monster_id] = working
+        check_version(monster_id, working.version, expected_version)
+        changed = update_paths(**changes)
+        property_paths = _property_paths(changed)
+        if property_paths:
+            if working.properties is working.entity.properties:
+                working.properties = _shallow_copy(working.entity.properties)
+            copy_touched(working.properties, property_paths, _property_paths(working.paths))
+        _apply_update(working, **changes)
+        working.paths.extend(changed)
+        return working
+    
+    def commit_staged(self, staged: Dict[str, WorkingCopy], timestamp: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Write the working copies of a transaction to the stored monsters (second phase), all with one timestamp.
+        
+        Only the indexes and sorted views that read a changed path are
+        refreshed. Each working copy in ``staged`` is replaced by its monster.
+        The caller still holds their locks. If writing fails part-way, the
+        monsters written so far are restored before the error is raised.
+        
+        Returns:
+            Journal of the replaced values by monster ID, for ``restore``
+        """
+        timestamp = timestamp or datetime.datetime.now(datetime.UTC).isoformat()
+        journal: Dict[str, Dict[str, Any]] = {}
+        try:
+            for monster_id, working in staged.items():
+                monster = working.entity
+                previous_version = monster.version
+                journal[monster_id] = working.write()
+                monster.update_timestamp(timestamp)
+                self.derived.invalidate(monster, previous_version, working.paths)
+                self._reindex_paths(monster_id, monster, working.paths)
+                staged[monster_id] = monster
+        except BaseException:
+            self.restore(journal)
+            raise
+        return journal
+    
+    def restore(self, journal: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write back the values replaced by ``commit_staged`` (rolls a transaction back). The caller holds the locks.
+        
+        The rollback is a write of its own: versions keep increasing, so no
+        cached view or ETag of the rolled-back state is reused.
+        """
+        for monster_id, previous in journal.items():
+            monster = self.get_monster(monster_id)
+            for name, value in previous.items():
+                setattr(monster, name, value)
+            monster.update_timestamp()
+            self._reindex(monster_id, monster)
     
     def list_monsters(self) -> List[Monster]:
         """
@@ -181,7 +890,106 @@ class MonsterManager:
         Returns:
             List of all Monster objects
         """
-        return list(self._monsters.values())
+        self._sweep_if_due()
+        return [monster for _, monster in self._entries()]
+    
+    def page_monsters(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[Monster], Optional[str]]:
+        """
+        List one page of monsters in stable insertion order.
+        
+        Cursors stay valid when monsters are added or deleted between pages;
+        a replaced monster keeps its original position.
+        
+        Args:
+            limit: Maximum number of monsters to return
+            cursor: Cursor from a previous page (optional, starts at the beginning)
+        
+        Returns:
+            Tuple of (monsters, next cursor or None when there are no more)
+        
+        Raises:
+            ValueError: If the limit or cursor is invalid
+        """
+        self._sweep_if_due()
+        monster_ids, next_cursor = self._order.page(limit, cursor)
+        monsters = [self._peek(monster_id) for monster_id in monster_ids]
+        return [monster for monster in monsters if monster is not None], next_cursor
+    
+    def order_monsters(
+        self,
+        order_by: str,
+        descending: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Monster]:
+        """
+        List monsters ordered by a field, reading only the first ``limit`` entries of a sorted view.
+        
+        Monsters without a value for the field come last, in insertion order.
+        Ties are broken by monster ID.
+        
+        Args:
+            order_by: A sorted view (name, currentHp, properties.initiative) or
+                any field with a sorted index
+            descending: Whether to return the largest values first
+            limit: Maximum number of monsters to return (optional, default all)
+        
+        Returns:
+            List of monsters in the requested order
+        
+        Raises:
+            ValueError: If there is no sorted view or sorted index for the field
+        """
+        self._sweep_if_due()
+        path = ".".join(parse_path(order_by, MONSTER_FIELDS))
+        view = self._views.get(path)
+        if view is None and getattr(self._indexes.get(path), "kind", None) == "sorted":
+            view = self._indexes[path]
+        if view is None:
+            raise ValueError(
+                f"Cannot order by '{order_by}': sorted views are {', '.join(MONSTER_SORTED_VIEWS)}; "
+                "create a sorted index to order by another field"
+            )
+        ids = view.first(limit, descending)
+        if limit is None or len(ids) < limit:
+            missing = (monster_id for monster_id in self._order.ordered(self._ids()) if monster_id not in view)
+            ids.extend(missing if limit is None else islice(missing, limit - len(ids)))
+        monsters = (self._peek(monster_id) for monster_id in ids)
+        return [monster for monster in monsters if monster is not None]
+    
+    def search_monsters(
+        self,
+        query: str,
+        limit: int = 10,
+        fuzzy: bool = True
+    ) -> List[Tuple[Monster, float, str]]:
+        """
+        Search monsters by name.
+        
+        Exact matches come first, then names with a word starting with the
+        query, then (if fuzzy) typo-tolerant matches; each group is ranked by
+        trigram similarity.
+        
+        Args:
+            query: Name or name prefix to search for
+            limit: Maximum number of results (default 10)
+            fuzzy: Whether to include typo-tolerant matches (default True)
+        
+        Returns:
+            List of (monster, similarity score, match kind) tuples, where the
+            match kind is "exact", "prefix" or "fuzzy"
+        """
+        self._sweep_if_due()
+        results = []
+        for monster_id, score, kind in self._names.search(query, limit, fuzzy):
+            monster = self._peek(monster_id)
+            if monster is not None:
+                results.append((monster, score, kind))
+        return results
+    
+    def count_monsters(self) -> int:
+        """Get the number of monsters, resident or spilled."""
+        self._sweep_if_due()
+        return len(self._monsters) + (len(self._spill) if self._spill is not None else 0)
     
     def delete_monster(self, monster_id: str) -> None:
         """
@@ -193,16 +1001,755 @@ class MonsterManager:
         Raises:
             ValueError: If monster not found
         """
-        if monster_id not in self._monsters:
+        with self.locks.hold(monster_id):
+            if not self._discard(monster_id):
+                raise ValueError(f"Monster with ID '{monster_id}' not found")
+    
+    def set_template(
+        self,
+        template_id: str,
+        name: str,
+        max_hp: int,
+        max_magic_points: int = 0,
+        properties: Optional[Dict[str, Any]] = None
+    ) -> MonsterTemplate:
+        """
+        Create or replace a monster template (stat block).
+        
+        Monsters already created from a replaced template keep sharing the
+        properties they were created with.
+        
+        Args:
+            template_id: Unique identifier for the template
+            name: Default name for monsters created from the template
+            max_hp: Default maximum hit points
+            max_magic_points: Default maximum magic points
+            properties: Shared properties (armor class, abilities, actions, etc.)
+        
+        Returns:
+            The created/replaced MonsterTemplate object
+        
+        Raises:
+            ValueError: If HP or magic points are invalid
+        """
+        _validate_vitals(max_hp, max_hp, max_magic_points, max_magic_points)
+        template = MonsterTemplate(
+            template_id=template_id,
+            name=name,
+            max_hp=max_hp,
+            max_magic_points=max_magic_points,
+            properties=freeze_properties(properties)
+        )
+        self._templates[template_id] = template
+        return template
+    
+    def get_template(self, template_id: str) -> MonsterTemplate:
+        """
+        Retrieve a monster template by ID.
+        
+        Raises:
+            ValueError: If template not found
+        """
+        template = self._templates.get(template_id)
+        if template is None:
+            raise ValueError(f"Monster template with ID '{template_id}' not found")
+        return template
+    
+    def list_templates(self) -> List[MonsterTemplate]:
+        """List all monster templates."""
+        return list(self._templates.values())
+    
+    def delete_template(self, template_id: str) -> None:
+        """
+        Delete a monster template; monsters created from it keep their properties.
+        
+        Raises:
+            ValueError: If template not found
+        """
+        if self._templates.pop(template_id, None) is None:
+            raise ValueError(f"Monster template with ID '{template_id}' not found")
+    
+    def spawn_monsters(
+        self,
+        template_id: str,
+        count: int,
+        hp_dice: Optional[str] = None,
+        properties: Optional[Dict[str, Any]] = None,
+        ttl_seconds: Optional[float] = None
+    ) -> List[Monster]:
+        """
+        Create many monsters from a template in one call.
+        
+        IDs and names are generated from a per-template monotonic counter
+        ("goblin-1", "Goblin 1", ...), skipping IDs that are already taken.
+        
+        Args:
+            template_id: Template to spawn from
+            count: Number of monsters to create (at least 1)
+            hp_dice: Roll each monster's maximum HP with this dice notation
+                (e.g. "2d6"), otherwise the template's maximum HP is used
+            properties: Property overrides applied to every spawned monster (optional)
+            ttl_seconds: Make the spawned monsters ephemeral with this time to live (optional)
+        
+        Returns:
+            List of the created Monster objects, at full HP and magic points
+        
+        Raises:
+            ValueError: If the template is not found, or the count, dice notation or TTL is invalid
+        """
+        if count < 1:
+            raise ValueError("Count must be at least 1")
+        _validate_ttl(ttl_seconds)
+        template = self.get_template(template_id)
+        hp_values = (
+            [max(1, hp) for hp in roll_dice_notation_batch(hp_dice, count)]
+            if hp_dice else [template.max_hp] * count
+        )
+        
+        timestamp = datetime.datetime.now(datetime.UTC).isoformat()
+        numbers: List[int] = []
+        while True:
+            with self._spawn_lock:
+                counter = self._spawn_counters.setdefault(template_id, itertools.count(1))
+                while len(numbers) < count:
+                    number = next(counter)
+                    if not self._exists(f"{template_id}-{number}"):
+                        numbers.append(number)
+            monster_ids = [f"{template_id}-{number}" for number in numbers]
+            with self.locks.hold(*monster_ids):
+                # An ID may have been created between the check and the hold:
+                # give it up and pick the next free number instead of replacing it
+                taken = {number for number, monster_id in zip(numbers, monster_ids) if self._exists(monster_id)}
+                if not taken:
+                    monsters = [
+                        Monster(
+                            monster_id=monster_id,
+                            name=f"{template.name} {number}",
+                            current_hp=hp,
+                            max_hp=hp,
+                            current_magic_points=template.max_magic_points,
+                            max_magic_points=template.max_magic_points,
+                            properties=_properties_for(template, properties),
+                            created_at=timestamp,
+                            updated_at=timestamp,
+                            template_id=template_id
+                        )
+                        for monster_id, number, hp in zip(monster_ids, numbers, hp_values)
+                    ]
+                    for monster in monsters:
+                        self._install(monster.monster_id, monster, None, ttl_seconds)
+                    break
+            numbers = [number for number in numbers if number not in taken]
+        self._evict()
+        return monsters
+    
+    def apply_deltas(self, deltas: List[Dict[str, Any]]) -> List[Monster]:
+        """
+        Apply HP and magic point deltas to many monsters in one pass.
+        
+        Negative deltas deal damage or spend magic points, positive deltas heal
+        or recover them. Results are clamped to [0, max]. Deltas for the same
+        monster are summed. Nothing is changed if any monster is missing.
+        The monsters' locks are all held for the duration of the batch.
+        
+        Args:
+            deltas: List of {"monster_id", "hp_delta", "mp_delta"} dictionaries
+        
+        Returns:
+            The updated Monster objects, one per distinct monster
+        
+        Raises:
+            ValueError: If any monster is not found
+        """
+        monster_ids = [delta["monster_id"] for delta in deltas]
+        totals: Dict[str, List[int]] = {}
+        loaded: Dict[str, Monster] = {}
+        with self.locks.hold(*monster_ids):
+            for delta in deltas:
+                monster_id = delta["monster_id"]
+                if monster_id not in loaded:
+                    monster = self._load(monster_id)
+                    if monster is None:
+                        raise ValueError(f"Monster with ID '{monster_id}' not found")
+                    loaded[monster_id] = monster
+                total = totals.setdefault(monster_id, [0, 0])
+                total[0] += delta.get("hp_delta") or 0
+                total[1] += delta.get("mp_delta") or 0
+            
+            rows = [self._vitals.row_of(monster_id) for monster_id in totals]
+            self._vitals.apply_deltas(
+                rows,
+                [total[0] for total in totals.values()],
+                [total[1] for total in totals.values()],
+            )
+            
+            timestamp = datetime.datetime.now(datetime.UTC).isoformat()
+            monsters = [loaded[monster_id] for monster_id in totals]
+            for monster in monsters:
+                previous_version = monster.version
+                monster.update_timestamp(timestamp)
+                self.derived.invalidate(monster, previous_version, _VITALS_PATHS)
+            self._reindex_many(monsters)
+        self._evict()
+        return monsters
+    
+    def _rest(
+        self,
+        monster_ids: Optional[Sequence[str]],
+        recover: Callable[[List[int]], List[int]]
+    ) -> Tuple[List[Monster], List[str]]:
+        """
+        Recover the vitals of many monsters in one pass over the vitals table.
+        
+        Only monsters whose values changed get a new version and a change
+        record; the records of the whole batch are logged at once.
+        
+        Args:
+            monster_ids: Monsters to update (None for every monster)
+            recover: Called with the monsters' vitals rows; applies the
+                recovery and returns the positions of the rows it changed
+        
+        Returns:
+            The updated monsters and the IDs of defeated (0 HP) monsters,
+            which rests and regeneration leave untouched
+        
+        Raises:
+            ValueError: If an explicitly requested monster is not found
+        """
+        self._sweep_if_due()
+        everyone = monster_ids is None
+        monster_ids = list(dict.fromkeys(self._ids() if everyone else monster_ids))
+        with self.locks.hold(*monster_ids):
+            monsters = []
+            for monster_id in monster_ids:
+                monster = self._load(monster_id)
+                if monster is not None:
+                    monsters.append(monster)
+                elif not everyone:
+                    raise ValueError(f"Monster with ID '{monster_id}' not found")
+            
+            rows = [self._vitals.row_of(monster.monster_id) for monster in monsters]
+            changed = [monsters[position] for position in recover(rows)]
+            
+            timestamp = datetime.datetime.now(datetime.UTC).isoformat()
+            for monster in changed:
+                previous_version = monster.version
+                monster.update_timestamp(timestamp)
+                self.derived.invalidate(monster, previous_version, _VITALS_PATHS)
+            self._reindex_many(changed)
+            defeated = [monster.monster_id for monster in monsters if monster.current_hp <= 0]
+        self._evict()
+        return changed, defeated
+    
+    def long_rest(self, monster_ids: Optional[Sequence[str]] = None) -> Tuple[List[Monster], List[str]]:
+        """
+        Restore HP and magic points of many monsters to their maximum.
+        
+        Args:
+            monster_ids: Monsters resting (optional, default every monster)
+        
+        Returns:
+            The monsters whose vitals changed and the IDs of defeated monsters
+        
+        Raises:
+            ValueError: If a monster is not found
+        """
+        return self._rest(monster_ids, self._vitals.recover)
+    
+    def short_rest(
+        self,
+        monster_ids: Optional[Sequence[str]] = None,
+        hp_dice: Optional[str] = None,
+        mp_dice: Optional[str] = None
+    ) -> Tuple[List[Monster], List[str]]:
+        """
+        Recover HP and/or magic points of many monsters by rolling dice for each.
+        
+        Each monster gets its own roll; the rolls of the batch are made at once.
+        Recovery is capped at the maximum.
+        
+        Args:
+            monster_ids: Monsters resting (optional, default every monster)
+            hp_dice: Dice notation of the HP recovered, e.g. "1d8+2" (optional)
+            mp_dice: Dice notation of the magic points recovered (optional)
+        
+        Returns:
+            The monsters whose vitals changed and the IDs of defeated monsters
+        
+        Raises:
+            ValueError: If neither notation is given, a notation is invalid
+                or a monster is not found
+        """
+        if hp_dice is None and mp_dice is None:
+            raise ValueError("A short rest needs hp_dice and/or mp_dice")
+        
+        def recover(rows: List[int]) -> List[int]:
+            count = len(rows)
+            hp = roll_dice_notation_batch(hp_dice, count) if hp_dice is not None else [0] * count
+            mp = roll_dice_notation_batch(mp_dice, count) if mp_dice is not None else [0] * count
+            return self._vitals.recover(rows, hp, mp)
+        
+        return self._rest(monster_ids, recover)
+    
+    def regenerate(
+        self,
+        monster_ids: Optional[Sequence[str]] = None,
+        hp: int = 0,
+        mp: int = 0
+    ) -> Tuple[List[Monster], List[str]]:
+        """
+        Recover a fixed amount of HP and magic points for many monsters.
+        
+        Args:
+            monster_ids: Monsters regenerating (optional, default every monster)
+            hp: HP recovered by each monster
+            mp: Magic points recovered by each monster
+        
+        Returns:
+            The monsters whose vitals changed and the IDs of defeated monsters
+        
+        Raises:
+            ValueError: If an amount is negative or a monster is not found
+        """
+        if hp < 0 or mp < 0:
+            raise ValueError("Regeneration amounts cannot be negative")
+        return self._rest(monster_ids, lambda rows: self._vitals.recover(rows, [hp] * len(rows), [mp] * len(rows)))
+    
+    def get_monster_etag(self, monster_id: str) -> str:
+        """
+        Get the ETag of a monster without building its record.
+        
+        Raises:
+            ValueError: If monster not found
+        """
+        self._sweep_if_due()
+        monster = self._peek(monster_id)
+        if monster is None:
             raise ValueError(f"Monster with ID '{monster_id}' not found")
+        return monster.etag
+    
+    def listing_etag(self, request: Dict[str, Any]) -> str:
+        """
+        Get the ETag of a listing of this manager's monsters.
+        
+        It changes with every write to any monster, so it must be read before
+        the listing is built.
+        
+        Args:
+            request: Arguments that shape the listing (limit, cursor, fields...)
+        """
+        return collection_etag(self._changes.log_id, self._changes.latest_seq, request)
+    
+    def changes_since(self, seq: int, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get the monsters created, changed or deleted after a sequence number.
+        
+        Every write gets the next sequence number of this manager. Only the
+        most recent changes are kept; a client whose sequence number has left
+        that window must list all monsters again.
+        
+        Args:
+            seq: Last sequence number the client has seen (0 to start)
+            limit: Maximum number of changed monsters to return (optional)
+        
+        Returns:
+            Dictionary with "changes" as (seq, monster ID, Monster or None if deleted)
+            tuples in sequence order, "seq" to pass on the next call, "has_more"
+            and "resync_required"
+        
+        Raises:
+            ValueError: If the sequence number or limit is invalid
+        """
+        latest_seq = self._changes.latest_seq
+        entries, has_more, resync_required = self._changes.since(seq, limit)
+        changes = []
+        for change_seq, monster_id, op in entries:
+            monster = self._peek(monster_id) if op == UPSERT else None
+            changes.append((change_seq, monster_id, monster))
+        if has_more:
+            latest_seq = entries[-1][0]
+        elif entries:
+            latest_seq = max(latest_seq, entries[-1][0])
+        return {
+            "changes": changes,
+            "seq": latest_seq,
+            "has_more": has_more,
+            "resync_required": resync_required,
+        }
+    
+    def add_change_listener(self, callback: Callable[[str, str], None]) -> None:
+        """
+        Call back (monster ID, op) after every write, where op is "upsert" or "delete".
         
-        del self._monsters[monster_id]
+        Callbacks run in the writer's thread while it holds the monster's lock,
+        so they must be cheap and must not raise.
+        """
+        self._changes.add_listener(callback)
+    
+    def define_derived_stat(self, name: str, formula: str) -> None:
+        """
+        Define or replace a derived stat computed from monster fields and other stats.
+        
+        Args:
+            name: Stat name, e.g. "strengthModifier"
+            formula: Filter expression language formula, e.g.
+                "floor((properties.strength - 10) / 2)"; other stats are read as
+                derived.<name>
+        
+        Raises:
+            ValueError: If the name or formula is invalid or stats would depend on themselves
+        """
+        self.derived.define(name, formula)
+    
+    def drop_derived_stat(self, name: str) -> None:
+        """
+        Remove a derived stat.
+        
+        Raises:
+            ValueError: If the stat does not exist or other stats read it
+        """
+        self.derived.drop(name)
+    
+    def list_derived_stats(self) -> Dict[str, str]:
+        """Get the formula of every derived stat by name."""
+        return self.derived.formulas()
+    
+    def get_derived_stats(self, monster_id: str, names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Get the derived stats of a monster.
+        
+        Values are memoized until an update changes a field they read. Stats
+        whose inputs are missing are left out.
+        
+        Args:
+            monster_id: Unique identifier for the monster
+            names: Stats to get (optional, default all)
+        
+        Raises:
+            ValueError: If monster not found or a name is not a derived stat
+        """
+        return self.derived.values(self.get_monster(monster_id), names)
+    
+    def roll_check(self, monster_id: str, notation: str) -> Tuple[int, str, str]:
+        """
+        Roll dice notation in which {stat} placeholders are replaced by the monster's derived stats.
+        
+        Args:
+            monster_id: Unique identifier for the monster
+            notation: Dice notation such as "1d20+{strengthModifier}+{proficiencyBonus}"
+        
+        Returns:
+            Tuple of (total, breakdown, notation with the stats filled in)
+        
+        Raises:
+            ValueError: If monster not found, a stat has no integer value or the notation is invalid
+        """
+        resolved = substitute_stats(notation, self.get_derived_stats(monster_id, placeholder_names(notation)))
+        total, details = roll_dice_notation(resolved)
+        return total, details, resolved
+    
+    def add_effect(
+        self,
+        monster_id: str,
+        name: str,
+        damage_dice: Optional[str] = None,
+        hp_delta: int = 0,
+        mp_delta: int = 0,
+        every: int = 1,
+        rounds: Optional[int] = None
+    ) -> Effect:
+        """
+        Add a per-round effect or condition to a monster, e.g. poison or regeneration.
+        
+        The effect first ticks ``every`` rounds after the current round and
+        ticks on its last round before it expires.
+        
+        Args:
+            monster_id: Unique identifier for the monster
+            name: Effect name, e.g. "poisoned"
+            damage_dice: Dice notation of the damage dealt on every tick (optional)
+            hp_delta: HP change on every tick (negative for damage)
+            mp_delta: Magic point change on every tick
+            every: Rounds between ticks
+            rounds: Rounds until the effect expires (None lasts until removed)
+        
+        Returns:
+            The new Effect
+        
+        Raises:
+            ValueError: If monster not found, the dice notation is invalid, or
+                the interval or duration is not positive
+        """
+        self.get_monster(monster_id)
+        if damage_dice is not None:
+            parse_dice_notation(damage_dice)
+        return self.effects.add(monster_id, name, damage_dice, hp_delta, mp_delta, every, rounds)
+    
+    def remove_effect(self, effect_id: str) -> Effect:
+        """
+        Remove an effect before it expires.
+        
+        Raises:
+            ValueError: If the effect does not exist
+        """
+        return self.effects.remove(effect_id)
+    
+    def list_effects(self, monster_id: Optional[str] = None) -> List[Effect]:
+        """Get the active effects of a monster, or of every monster."""
+        return self.effects.effects(monster_id)
+    
+    def advance_round(self, rounds: int = 1) -> Dict[str, Any]:
+        """
+        Advance the effects by one or more rounds.
+        
+        Only effects that fall due are visited. The ticks of each round are
+        applied together: the damage dice of every effect sharing a
+        notation are rolled in one batch, and all HP/MP changes go through
+        ``apply_deltas`` in one pass.
+        
+        Args:
+            rounds: Number of rounds to advance
+        
+        Returns:
+            Dictionary with the new "round", the "ticks" applied as
+            (effect, hp change, mp change) tuples, the "expired" effects and
+            the updated monsters ("monsters", one per monster)
+        
+        Raises:
+            ValueError: If rounds is not positive
+        """
+        if rounds < 1:
+            raise ValueError(f"Rounds must be at least 1, got {rounds}")
+        ticks: List[Tuple[Effect, int, int]] = []
+        expired: List[Effect] = []
+        updated: Dict[str, Monster] = {}
+        for _ in range(rounds):
+            _, ticking, ended = self.effects.advance()
+            expired.extend(ended)
+            if not ticking:
+                continue
+            
+            by_notation: Dict[str, List[Effect]] = {}
+            for effect in ticking:
+                if effect.damage_dice:
+                    by_notation.setdefault(effect.damage_dice, []).append(effect)
+            damage: Dict[str, int] = {}
+            for notation, effects in by_notation.items():
+                for effect, roll in zip(effects, roll_dice_notation_batch(notation, len(effects))):
+                    damage[effect.effect_id] = max(roll, 0)
+            
+            with self.locks.hold(*(effect.entity_id for effect in ticking)):
+                deltas = []
+                for effect in ticking:
+                    if not self._exists(effect.entity_id):
+                        continue
+                    hp_change = effect.hp_delta - damage.get(effect.effect_id, 0)
+                    ticks.append((effect, hp_change, effect.mp_delta))
+                    deltas.append({"monster_id": effect.entity_id, "hp_delta": hp_change, "mp_delta": effect.mp_delta})
+                if deltas:
+                    for monster in self.apply_deltas(deltas):
+                        updated[monster.monster_id] = monster
+        return {
+            "round": self.effects.round,
+            "ticks": ticks,
+            "expired": expired,
+            "monsters": list(updated.values()),
+        }
+    
+    def create_index(self, field_path: str, kind: str = "hash") -> int:
+        """
+        Create (or rebuild) a secondary index on a monster field.
+        
+        Hash indexes answer equality ("eq", "in") lookups and suit categorical
+        values such as properties.type; sorted indexes also answer range
+        lookups ("lt", "le", "gt", "ge") and suit numbers such as properties.challengeRating.
+        Indexes are maintained on every set, update and delete.
+        
+        Args:
+            field_path: Field name or nested property path (e.g. "properties.type")
+            kind: "hash" or "sorted"
+        
+        Returns:
+            Number of monsters with a value for the field
+        
+        Raises:
+            ValueError: If the field path or kind is invalid
+        """
+        parts = parse_path(field_path, MONSTER_FIELDS)
+        index = build_index(kind, parts, self._entries())
+        self._indexes[".".join(parts)] = index
+        return len(index)
+    
+    def drop_index(self, field_path: str) -> None:
+        """
+        Remove a secondary index.
+        
+        Raises:
+            ValueError: If there is no index on the field
+        """
+        path = ".".join(parse_path(field_path, MONSTER_FIELDS))
+        if self._indexes.pop(path, None) is None:
+            raise ValueError(f"No index on field '{field_path}'")
+    
+    def list_indexes(self) -> Dict[str, str]:
+        """Get the indexed field paths and their index kinds."""
+        return {path: index.kind for path, index in self._indexes.items()}
+    
+    def query_monsters(
+        self,
+        where: Optional[List[Tuple[str, str, Any]]] = None,
+        limit: Optional[int] = None,
+        filter_expression: Optional[str] = None
+    ) -> Tuple[List[Monster], Dict[str, Any]]:
+        """
+        Find monsters matching all of the given predicates and filter expression.
+        
+        Equality and range predicates on indexed fields are answered from the
+        indexes; the remaining predicates are checked only on those candidates.
+        Top-level ``and`` conjuncts of the filter expression that compare a
+        field with a literal are pushed down to the indexes in the same way.
+        Without a usable index every monster is scanned.
+        
+        Args:
+            where: List of (field path, operator, value) predicates; operators are
+                eq, ne, lt, le, gt, ge, in, contains (or ==, !=, <, <=, >, >=)
+            limit: Maximum number of monsters to return (optional)
+            filter_expression: Expression such as
+                ``currentHp < maxHp * 0.25 and properties.type == "Goblin"`` (optional)
+        
+        Returns:
+            Tuple of (matching monsters in insertion order, plan dictionary
+            with the "indexes" used and the number of monsters "scanned")
+        
+        Raises:
+            ValueError: If a predicate or the filter expression is invalid
+        """
+        predicates = [parse_predicate(field_path, op, value, MONSTER_FIELDS) for field_path, op, value in where or ()]
+        compiled = compile_filter(filter_expression, MONSTER_FIELDS) if filter_expression else None
+        pushdown = predicates + list(compiled.conjuncts) if compiled else predicates
+        candidates, used = index_candidates(pushdown, self._indexes)
+        self._sweep_if_due()
+        if candidates is None:
+            pool = [monster for _, monster in self._entries()]
+        else:
+            pool = [self._peek(monster_id) for monster_id in self._order.ordered(candidates)]
+        
+        matches: List[Monster] = []
+        scanned = 0
+        for monster in pool:
+            if limit is not None and len(matches) >= limit:
+                break
+            if monster is None:
+                continue
+            scanned += 1
+            if all(predicate.matches(monster) for predicate in predicates) and (
+                compiled is None or compiled.matches(monster)
+            ):
+                matches.append(monster)
+        return matches, {"indexes": list(dict.fromkeys(used)), "scanned": scanned}
+    
+    def set_memory_budget(self, max_resident: Optional[int], spill_path: Optional[str] = None) -> None:
+        """
+        Limit the number of monsters kept in memory.
+        
+        Least recently used monsters beyond the budget are spilled to disk
+        right away and on later writes; they are faulted back in on access.
+        
+        Args:
+            max_resident: Maximum number of resident monsters, or None for no limit
+            spill_path: SQLite file for spilled monsters, used when the spill
+                store is first opened (optional, defaults to a temporary file)
+        
+        Raises:
+            ValueError: If the budget is less than 1
+        """
+        if max_resident is not None and max_resident < 1:
+            raise ValueError("Memory budget must be at least 1 monster")
+        with self._residency_lock:
+            if self._spill is None and max_resident is not None:
+                self._spill = SpillStore(spill_path)
+            self._max_resident = max_resident
+        self._evict()
+    
+    def expire_monsters(self) -> int:
+        """
+        Delete ephemeral monsters whose TTL has passed, resident or spilled.
+        
+        Monsters whose lock is currently held are left for the next sweep.
+        
+        Returns:
+            Number of monsters deleted
+        """
+        now = time.monotonic()
+        self._next_sweep = now + EXPIRY_SWEEP_INTERVAL
+        expired = 0
+        for monster_id, (deadline, _) in list(self._expiry.items()):
+            if deadline > now:
+                continue
+            with self.locks.hold_if_free(monster_id) as free:
+                expiry = self._expiry.get(monster_id)
+                if free and expiry is not None and expiry[0] <= now and self._discard(monster_id):
+                    expired += 1
+        self._stats["expired"] += expired
+        return expired
+    
+    def storage_metrics(self) -> Dict[str, Any]:
+        """
+        Get memory budget and spill store statistics.
+        
+        Returns:
+            Dictionary with the "resident" and "spilled" monster counts, the
+            "max_resident" budget (None if unlimited), the number of "ephemeral"
+            monsters, and the running totals of "spills", "faults" and "expired"
+        """
+        self._sweep_if_due()
+        with self._residency_lock:
+            return {
+                "resident": len(self._monsters),
+                "spilled": len(self._spill) if self._spill is not None else 0,
+                "max_resident": self._max_resident,
+                "ephemeral": len(self._expiry),
+                **self._stats,
+            }
+
 
+# Monster managers, one per campaign
+_monster_managers = NamespaceRegistry(MonsterManager)
 
-# Global monster manager instance
-_monster_manager = MonsterManager()
+
+def get_monster_manager(campaign_id: Optional[str] = None) -> MonsterManager:
+    """
+    Get the monster manager of a campaign, creating it on first use.
+    
+    Args:
+        campaign_id: Campaign ID (optional, defaults to the default campaign)
+    
+    Raises:
+        ValueError: If the campaign ID is invalid
+    """
+    return _monster_managers.get(campaign_id)
 
 
-def get_monster_manager() -> MonsterManager:
-    """Get the global monster manager instance."""
-    return _monster_manager
+def list_monster_campaigns() -> List[str]:
+    """Get the IDs of all campaigns with a monster manager."""
+    return _monster_managers.campaigns()
+
+
+def add_monster_change_listener(callback: Callable[[str, str, str], None]) -> None:
+    """Call back (campaign ID, monster ID, op) after every write in every current and future campaign."""
+    _monster_managers.add_observer(
+        lambda campaign_id, manager: manager.add_change_listener(functools.partial(callback, campaign_id))
+    )
+
+
+def drop_monster_campaign(campaign_id: str) -> int:
+    """
+    Drop a campaign with all of its monsters at once.
+    
+    Returns:
+        Number of monsters dropped
+    
+    Raises:
+        ValueError: If the campaign does not exist
+    """
+    return _monster_managers.drop(campaign_id).count_monsters()
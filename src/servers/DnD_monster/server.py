@@ -18,21 +18,40 @@ if project_root not in sys.path:
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
 from mcp.server.stdio import stdio_server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.types import (
     Tool,
     Prompt,
     GetPromptRequest,
+    ListResourcesRequest,
+    ListResourcesResult,
     ReadResourceRequest,
+    ResourceTemplate,
     INVALID_PARAMS,  # noqa: F401
     INTERNAL_ERROR,  # noqa: F401
 )
 from pydantic import AnyUrl
 
 from src.servers.DnD_monster import tools
+from src.servers.DnD_monster.monster_manager import add_monster_change_listener
+from src.servers.DnD_common.subscriptions import SubscriptionHub
 
 # Create server instance
 server = Server("Dungeons & Dragons Monster MCP Server")
 
+# Coalesced resources/updated notifications for subscribed monsters
+subscriptions = SubscriptionHub()
+
+
+def _notify_subscribers(campaign_id: str, monster_id: str, op: str) -> None:
+    """Mark a written monster's resources as changed (runs in the writer's thread)."""
+    if subscriptions.active:
+        subscriptions.notify(tools.monster_uri(campaign_id, monster_id))
+        subscriptions.notify(tools.monster_campaign_uri(campaign_id))
+
+
+add_monster_change_listener(_notify_subscribers)
+
 
 @server.list_tools()
 async def handle_list_tools() -> list[tools.Tool]:
@@ -62,16 +81,93 @@ async def handle_call_tool(name: str, arguments: dict) -> tuple[list[dict], dict
         return tools.execute_list_monsters(arguments)
     elif name == "Delete Monster":
         return tools.execute_delete_monster(arguments)
+    elif name == "Apply Damage":
+        return tools.execute_apply_damage(arguments)
+    elif name == "Set Monsters":
+        return tools.execute_set_monsters(arguments)
+    elif name == "Create Monster Index":
+        return tools.execute_create_monster_index(arguments)
+    elif name == "Search Monsters":
+        return tools.execute_search_monsters(arguments)
+    elif name == "Query Monsters":
+        return tools.execute_query_monsters(arguments)
+    elif name == "Set Monster Template":
+        return tools.execute_set_monster_template(arguments)
+    elif name == "List Monster Templates":
+        return tools.execute_list_monster_templates(arguments)
+    elif name == "Spawn Monsters":
+        return tools.execute_spawn_monsters(arguments)
+    elif name == "Monster Storage":
+        return tools.execute_monster_storage(arguments)
+    elif name == "Changes Since":
+        return tools.execute_changes_since(arguments)
+    elif name == "List Monster Campaigns":
+        return tools.execute_list_monster_campaigns(arguments)
+    elif name == "Drop Monster Campaign":
+        return tools.execute_drop_monster_campaign(arguments)
+    elif name == "Define Monster Stat":
+        return tools.execute_define_monster_stat(arguments)
+    elif name == "Roll Monster Check":
+        return tools.execute_roll_monster_check(arguments)
+    elif name == "Long Rest":
+        return tools.execute_long_rest(arguments)
+    elif name == "Short Rest":
+        return tools.execute_short_rest(arguments)
+    elif name == "Regenerate":
+        return tools.execute_regenerate(arguments)
+    elif name == "Add Monster Effect":
+        return tools.execute_add_monster_effect(arguments)
+    elif name == "Remove Monster Effect":
+        return tools.execute_remove_monster_effect(arguments)
+    elif name == "List Monster Effects":
+        return tools.execute_list_monster_effects(arguments)
+    elif name == "Advance Round":
+        return tools.execute_advance_round(arguments)
     else:
         raise ValueError(f"Tool '{name}' not implemented")
 
 
+@server.list_resources()
+async def handle_list_resources(request: ListResourcesRequest) -> ListResourcesResult:
+    """
+    List the monsters of the default campaign as resources, one page at a time.
+    """
+    cursor = request.params.cursor if request.params else None
+    resources, next_cursor = tools.list_monster_resources(cursor)
+    return ListResourcesResult(resources=resources, nextCursor=next_cursor)
+
+
+@server.list_resource_templates()
+async def handle_list_resource_templates() -> list[ResourceTemplate]:
+    """
+    List the resource URI templates of monsters and campaigns.
+    """
+    return [tools.MONSTER_RESOURCE_TEMPLATE, tools.MONSTER_CAMPAIGN_RESOURCE_TEMPLATE]
+
+
 @server.read_resource()
-async def handle_read_resource(uri: AnyUrl) -> str:
+async def handle_read_resource(uri: AnyUrl) -> list[ReadResourceContents]:
+    """
+    Read a monster or campaign resource as JSON.
+    """
+    return [ReadResourceContents(content=tools.read_monster_resource(str(uri)), mime_type="application/json")]
+
+
+@server.subscribe_resource()
+async def handle_subscribe_resource(uri: AnyUrl) -> None:
     """
-    Read a resource.
+    Subscribe the calling session to updates of a monster or campaign resource.
     """
-    return f"Hello from DnD_monster resource: {uri}"
+    subscriptions.subscribe(tools.canonical_monster_uri(str(uri)), server.request_context.session)
+
+
+@server.unsubscribe_resource()
+async def handle_unsubscribe_resource(uri: AnyUrl) -> None:
+    """
+    Unsubscribe the calling session from updates of a monster or campaign resource.
+    """
+    subscriptions.unsubscribe(tools.canonical_monster_uri(str(uri)), server.request_context.session)
+
 
 @server.get_prompt()
 async def handle_get_prompt(name: str, arguments: dict | None = None) -> GetPromptRequest:
@@ -98,6 +194,12 @@ async def handle_get_prompt(name: str, arguments: dict | None = None) -> GetProm
 async def main():
     """Main entry point for the server."""
     # Run the server using stdin/stdout streams
+    capabilities = server.get_capabilities(
+        notification_options=NotificationOptions(),
+        experimental_capabilities={},
+    )
+    # get_capabilities never advertises resource subscriptions
+    capabilities.resources.subscribe = True
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -105,10 +207,7 @@ async def main():
             InitializationOptions(
                 server_name="dnd-monster",
                 server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
-                ),
+                capabilities=capabilities,
             ),
         )
 
@@ -1,13 +1,23 @@
 """Tool definitions for the Dungeons & Dragons Monster MCP Server."""
 
-from mcp.types import Tool
-from src.servers.DnD_monster.monster_manager import get_monster_manager
+from mcp.types import Resource, ResourceTemplate, Tool
+from src.servers.DnD_monster.monster_manager import (
+    MONSTER_FIELDS,
+    drop_monster_campaign,
+    get_monster_manager,
+    list_monster_campaigns,
+)
+from src.servers.DnD_common.namespaces import CAMPAIGN_ID_PROPERTY, DEFAULT_CAMPAIGN
+from src.servers.DnD_common.patch import MERGE_PATCH_PROPERTY, PATCH_PROPERTY
+from src.servers.DnD_common.serialization import cached_dict, json_array
+from src.servers.DnD_common.subscriptions import campaign_uri, entity_uri, parse_resource_uri
+from src.servers.DnD_common.projection import projector_for
 
 
 # Tool: Set Monster (Create or Replace)
 SET_MONSTER_TOOL = Tool(
     name="Set Monster",
-    description="Create a new monster or completely replace an existing one with new data",
+    description="Create a new monster or completely replace an existing one with new data, optionally from a template",
     inputSchema={
         "type": "object",
         "properties": {
@@ -40,8 +50,24 @@ SET_MONSTER_TOOL = Tool(
                 "description": "Monster properties (e.g., strength, dexterity, armor class, etc.)",
                 "additionalProperties": True,
             },
+            "expectedVersion": {
+                "type": "integer",
+                "description": "Only write if the stored version matches; 0 requires that the monster does not exist yet (optional)",
+            },
+            "templateId": {
+                "type": "string",
+                "description": (
+                    "Create the monster from a template (optional). Its properties are shared with the template and "
+                    "'properties' only holds overrides; name, HP and magic points default to the template's"
+                ),
+            },
+            "ttlSeconds": {
+                "type": "number",
+                "exclusiveMinimum": 0,
+                "description": "Make the monster ephemeral: delete it once it has not been written to for this many seconds (optional)",
+            },
         },
-        "required": ["monsterId", "name", "currentHp", "maxHp", "currentMagicPoints", "maxMagicPoints"],
+        "required": ["monsterId"],
     },
     outputSchema={
         "type": "object",
@@ -55,6 +81,8 @@ SET_MONSTER_TOOL = Tool(
             "properties": {"type": "object"},
             "createdAt": {"type": "string"},
             "updatedAt": {"type": "string"},
+            "version": {"type": "integer"},
+            "templateId": {"type": ["string", "null"]},
         },
         "required": ["monsterId", "name", "currentHp", "maxHp", "currentMagicPoints", "maxMagicPoints", "createdAt", "updatedAt"],
     },
@@ -72,6 +100,19 @@ GET_MONSTER_TOOL = Tool(
                 "type": "string",
                 "description": "Unique identifier for the monster",
             },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only return these fields, e.g. [\"monsterId\", \"name\", \"currentHp\", \"properties.inventory.potions\"]; include \"etag\" to get the ETag (optional, default all)",
+            },
+            "includeDerived": {
+                "type": "boolean",
+                "description": "Also return derived stats such as ability modifiers, armorClass and spellSaveDc (optional)",
+            },
+            "ifNoneMatch": {
+                "type": "string",
+                "description": "ETag from an earlier response; if nothing changed since, only notModified and the etag are returned (optional)",
+            },
         },
         "required": ["monsterId"],
     },
@@ -87,6 +128,11 @@ GET_MONSTER_TOOL = Tool(
             "properties": {"type": "object"},
             "createdAt": {"type": "string"},
             "updatedAt": {"type": "string"},
+            "version": {"type": "integer"},
+            "etag": {"type": "string"},
+            "derived": {"type": "object"},
+            "notModified": {"type": "boolean"},
+            "templateId": {"type": ["string", "null"]},
         },
         "required": ["monsterId", "name", "currentHp", "maxHp", "currentMagicPoints", "maxMagicPoints", "createdAt", "updatedAt"],
     },
@@ -129,6 +175,20 @@ UPDATE_MONSTER_TOOL = Tool(
                 "description": "Properties to update/add (optional)",
                 "additionalProperties": True,
             },
+            "hpDelta": {
+                "type": "integer",
+                "description": "Change to current hit points, clamped to [0, maxHp] (optional, negative for damage)",
+            },
+            "mpDelta": {
+                "type": "integer",
+                "description": "Change to current magic points, clamped to [0, maxMagicPoints] (optional, negative to spend)",
+            },
+            "expectedVersion": {
+                "type": "integer",
+                "description": "Only update if the stored version matches (optional)",
+            },
+            "patch": PATCH_PROPERTY,
+            "mergePatch": MERGE_PATCH_PROPERTY,
         },
         "required": ["monsterId"],
     },
@@ -144,6 +204,8 @@ UPDATE_MONSTER_TOOL = Tool(
             "properties": {"type": "object"},
             "createdAt": {"type": "string"},
             "updatedAt": {"type": "string"},
+            "version": {"type": "integer"},
+            "templateId": {"type": ["string", "null"]},
         },
         "required": ["monsterId", "name", "currentHp", "maxHp", "currentMagicPoints", "maxMagicPoints", "createdAt", "updatedAt"],
     },
@@ -153,10 +215,44 @@ UPDATE_MONSTER_TOOL = Tool(
 # Tool: List Monsters
 LIST_MONSTERS_TOOL = Tool(
     name="List Monsters",
-    description="List all monsters in the system",
+    description="List monsters in the system, optionally one page at a time or ordered by a field (top-k)",
     inputSchema={
         "type": "object",
-        "properties": {},
+        "properties": {
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of monsters to return (optional, default all)",
+            },
+            "cursor": {
+                "type": "string",
+                "description": "nextCursor from a previous page (optional)",
+            },
+            "orderBy": {
+                "type": "string",
+                "description": (
+                    "Order by 'name', 'currentHp', 'properties.initiative' or any field with a sorted index; "
+                    "with limit, returns the top-k without sorting everything (optional, cannot be combined with cursor)"
+                ),
+            },
+            "descending": {
+                "type": "boolean",
+                "description": "Largest values first when using orderBy (optional, default false)",
+            },
+            "includeTotal": {
+                "type": "boolean",
+                "description": "Also return the total number of monsters (optional)",
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only return these fields, e.g. [\"monsterId\", \"name\", \"currentHp\", \"properties.inventory.potions\"] (optional, default all)",
+            },
+            "ifNoneMatch": {
+                "type": "string",
+                "description": "ETag from an earlier response; if nothing changed since, only notModified and the etag are returned (optional)",
+            },
+        },
         "required": [],
     },
     outputSchema={
@@ -176,10 +272,15 @@ LIST_MONSTERS_TOOL = Tool(
                         "properties": {"type": "object"},
                         "createdAt": {"type": "string"},
                         "updatedAt": {"type": "string"},
+                        "version": {"type": "integer"},
                     },
                 },
             },
             "count": {"type": "integer"},
+            "nextCursor": {"type": ["string", "null"]},
+            "total": {"type": "integer"},
+            "etag": {"type": "string"},
+            "notModified": {"type": "boolean"},
         },
         "required": ["monsters", "count"],
     },
@@ -211,148 +312,1145 @@ DELETE_MONSTER_TOOL = Tool(
 )
 
 
-TOOLS = {
-    SET_MONSTER_TOOL.name: SET_MONSTER_TOOL,
-    GET_MONSTER_TOOL.name: GET_MONSTER_TOOL,
-    UPDATE_MONSTER_TOOL.name: UPDATE_MONSTER_TOOL,
-    LIST_MONSTERS_TOOL.name: LIST_MONSTERS_TOOL,
-    DELETE_MONSTER_TOOL.name: DELETE_MONSTER_TOOL,
-}
-
-
-def get_tool(name: str) -> Tool | None:
-    """Get a tool by name."""
-    return TOOLS.get(name)
+# Tool: Apply Damage (bulk HP/MP deltas)
+APPLY_DAMAGE_TOOL = Tool(
+    name="Apply Damage",
+    description="Apply HP and magic point deltas to many monsters at once (negative deals damage, positive heals); results are clamped to [0, max]",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "targets": {
+                "type": "array",
+                "description": "Monsters to affect and the deltas to apply to each",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "monsterId": {
+                            "type": "string",
+                            "description": "Unique identifier for the monster",
+                        },
+                        "hpDelta": {
+                            "type": "integer",
+                            "description": "Change in current hit points (negative for damage)",
+                        },
+                        "mpDelta": {
+                            "type": "integer",
+                            "description": "Change in current magic points (negative to spend)",
+                        },
+                    },
+                    "required": ["monsterId"],
+                },
+            },
+        },
+        "required": ["targets"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "monsters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "monsterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+        },
+        "required": ["monsters", "count"],
+    },
+)
 
 
-def get_all_tools() -> list[Tool]:
-    """Get a list of all available tools."""
-    return list(TOOLS.values())
+# Tool: Set Monsters (bulk create or replace)
+SET_MONSTERS_TOOL = Tool(
+    name="Set Monsters",
+    description="Create or replace many monsters in one call and return a compact summary instead of the records",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "monsters": {
+                "type": "array",
+                "description": "Monsters to create or replace, each with the same fields as Set Monster",
+                "items": dict(SET_MONSTER_TOOL.inputSchema),
+            },
+            "atomic": {
+                "type": "boolean",
+                "description": "Apply all monsters or none if any is invalid (default true); when false, valid monsters are applied and errors are reported per item",
+            },
+        },
+        "required": ["monsters"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "applied": {"type": "integer"},
+            "failed": {"type": "integer"},
+            "errors": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "index": {"type": "integer"},
+                        "monsterId": {"type": ["string", "null"]},
+                        "error": {"type": "string"},
+                    },
+                },
+            },
+        },
+        "required": ["applied", "failed", "errors"],
+    },
+)
 
 
-def execute_set_monster(arguments: dict) -> tuple[list[dict], dict]:
-    """
-    Execute the set monster functionality.
-    
-    Args:
-        arguments: Dictionary containing monster data
-        
-    Returns:
-        Tuple of (contents list, result dict) for MCP response
-    """
-    monster_id = arguments.get("monsterId")
-    if not monster_id:
-        raise ValueError("Missing required argument: monsterId")
-    
-    name = arguments.get("name")
-    if not name:
-        raise ValueError("Missing required argument: name")
-    
-    current_hp = arguments.get("currentHp")
-    max_hp = arguments.get("maxHp")
-    current_magic_points = arguments.get("currentMagicPoints")
-    max_magic_points = arguments.get("maxMagicPoints")
-    properties = arguments.get("properties", {})
-    
-    if current_hp is None:
-        raise ValueError("Missing required argument: currentHp")
-    if max_hp is None:
-        raise ValueError("Missing required argument: maxHp")
-    if current_magic_points is None:
-        raise ValueError("Missing required argument: currentMagicPoints")
-    if max_magic_points is None:
-        raise ValueError("Missing required argument: maxMagicPoints")
-    
-    manager = get_monster_manager()
-    monster = manager.set_monster(
-        monster_id=monster_id,
-        name=name,
-        current_hp=current_hp,
-        max_hp=max_hp,
-        current_magic_points=current_magic_points,
-        max_magic_points=max_magic_points,
-        properties=properties
-    )
-    
-    result = monster.to_dict()
-    
-    contents: list[dict] = [
-        {
-            "type": "text",
-            "text": f"Monster '{result['name']}' (ID: {result['monster_id']}) created/updated\n"
-                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
-                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
-                   f"Properties: {result['properties']}",
-        }
-    ]
-    
-    return contents, result
+# Tool: Create Monster Index
+CREATE_MONSTER_INDEX_TOOL = Tool(
+    name="Create Monster Index",
+    description="Create a secondary index on a monster field so Query Monsters can answer predicates on it without scanning",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "field": {
+                "type": "string",
+                "description": "Field name or nested property path (e.g., 'properties.type', 'currentHp')",
+            },
+            "kind": {
+                "type": "string",
+                "enum": ["hash", "sorted"],
+                "description": "'hash' for equality on categorical values, 'sorted' for equality and ranges on numbers (default hash)",
+            },
+        },
+        "required": ["field"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "field": {"type": "string"},
+            "kind": {"type": "string"},
+            "entries": {"type": "integer"},
+        },
+        "required": ["field", "kind", "entries"],
+    },
+)
 
 
-def execute_get_monster(arguments: dict) -> tuple[list[dict], dict]:
-    """
-    Execute the get monster functionality.
-    
-    Args:
-        arguments: Dictionary containing monsterId
-        
-    Returns:
-        Tuple of (contents list, result dict) for MCP response
-    """
-    monster_id = arguments.get("monsterId")
-    if not monster_id:
-        raise ValueError("Missing required argument: monsterId")
-    
-    manager = get_monster_manager()
-    monster = manager.get_monster(monster_id)
-    result = monster.to_dict()
-    
-    contents: list[dict] = [
-        {
-            "type": "text",
-            "text": f"Monster: {result['name']} (ID: {result['monster_id']})\n"
-                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
-                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
-                   f"Properties: {result['properties']}\n"
-                   f"Created: {result['created_at']}\n"
-                   f"Updated: {result['updated_at']}",
-        }
-    ]
-    
-    return contents, result
+# Tool: Search Monsters
+SEARCH_MONSTERS_TOOL = Tool(
+    name="Search Monsters",
+    description="Search monsters by name: exact, word-prefix and typo-tolerant matches ranked by similarity",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Name or name prefix to search for (e.g., 'Ancient Red' or 'Goblni')",
+            },
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of results (optional, default 10)",
+            },
+            "fuzzy": {
+                "type": "boolean",
+                "description": "Include typo-tolerant matches (optional, default true)",
+            },
+        },
+        "required": ["query"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "monsterId": {"type": "string"},
+                        "name": {"type": "string"},
+                        "score": {"type": "number"},
+                        "match": {"type": "string", "enum": ["exact", "prefix", "fuzzy"]},
+                    },
+                    "required": ["monsterId", "name", "score", "match"],
+                },
+            },
+            "count": {"type": "integer"},
+        },
+        "required": ["results", "count"],
+    },
+)
 
 
-def execute_update_monster(arguments: dict) -> tuple[list[dict], dict]:
-    """
-    Execute the update monster functionality.
-    
-    Args:
-        arguments: Dictionary containing monster updates
-        
-    Returns:
-        Tuple of (contents list, result dict) for MCP response
-    """
-    monster_id = arguments.get("monsterId")
-    if not monster_id:
-        raise ValueError("Missing required argument: monsterId")
-    
-    manager = get_monster_manager()
-    monster = manager.update_monster(
-        monster_id=monster_id,
-        name=arguments.get("name"),
-        current_hp=arguments.get("currentHp"),
-        max_hp=arguments.get("maxHp"),
-        current_magic_points=arguments.get("currentMagicPoints"),
-        max_magic_points=arguments.get("maxMagicPoints"),
-        properties=arguments.get("properties")
-    )
-    
-    result = monster.to_dict()
-    
-    contents: list[dict] = [
-        {
-            "type": "text",
-            "text": f"Monster '{result['name']}' (ID: {result['monster_id']}) updated\n"
+# Tool: Query Monsters
+QUERY_MONSTERS_TOOL = Tool(
+    name="Query Monsters",
+    description="Find monsters matching field conditions and/or a filter expression, using secondary indexes where available",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "where": {
+                "type": "array",
+                "description": "Conditions that must all hold",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "field": {
+                            "type": "string",
+                            "description": "Field name or nested property path (e.g., 'properties.challengeRating')",
+                        },
+                        "op": {
+                            "type": "string",
+                            "enum": ["eq", "ne", "lt", "le", "gt", "ge", "in", "contains", "==", "!=", "<", "<=", ">", ">="],
+                            "description": "Comparison operator",
+                        },
+                        "value": {
+                            "description": "Value to compare against (a list for 'in')",
+                        },
+                    },
+                    "required": ["field", "op", "value"],
+                },
+            },
+            "filter": {
+                "type": "string",
+                "description": (
+                    "Filter expression (optional), e.g. 'currentHp < maxHp * 0.25 and properties.type == \"Goblin\"'. "
+                    "Supports and/or/not, ==, !=, <, <=, >, >=, in, contains, + - * / %, "
+                    "and the functions min, max, abs, floor, ceil, round, len"
+                ),
+            },
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of monsters to return (optional)",
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only return these fields (optional, default all)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "monsters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "monsterId": {"type": "string"},
+                        "name": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "properties": {"type": "object"},
+                        "createdAt": {"type": "string"},
+                        "updatedAt": {"type": "string"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+            "plan": {
+                "type": "object",
+                "properties": {
+                    "indexes": {"type": "array", "items": {"type": "string"}},
+                    "scanned": {"type": "integer"},
+                },
+            },
+        },
+        "required": ["monsters", "count", "plan"],
+    },
+)
+
+
+# Tool: Set Monster Template
+SET_MONSTER_TEMPLATE_TOOL = Tool(
+    name="Set Monster Template",
+    description="Create or replace a monster template (stat block) whose properties are shared by the monsters created from it",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "templateId": {
+                "type": "string",
+                "description": "Unique identifier for the template",
+            },
+            "name": {
+                "type": "string",
+                "description": "Default name for monsters created from the template",
+            },
+            "maxHp": {
+                "type": "integer",
+                "description": "Default maximum hit points",
+            },
+            "maxMagicPoints": {
+                "type": "integer",
+                "description": "Default maximum magic points (optional, default 0)",
+            },
+            "properties": {
+                "type": "object",
+                "description": "Shared properties (e.g., armor class, abilities, actions)",
+                "additionalProperties": True,
+            },
+        },
+        "required": ["templateId", "name", "maxHp"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "templateId": {"type": "string"},
+            "name": {"type": "string"},
+            "maxHp": {"type": "integer"},
+            "maxMagicPoints": {"type": "integer"},
+            "properties": {"type": "object"},
+            "createdAt": {"type": "string"},
+        },
+        "required": ["templateId", "name", "maxHp", "maxMagicPoints", "properties", "createdAt"],
+    },
+)
+
+
+# Tool: List Monster Templates
+LIST_MONSTER_TEMPLATES_TOOL = Tool(
+    name="List Monster Templates",
+    description="List all monster templates",
+    inputSchema={
+        "type": "object",
+        "properties": {},
+        "required": [],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "templates": {
+                "type": "array",
+                "items": SET_MONSTER_TEMPLATE_TOOL.outputSchema,
+            },
+            "count": {"type": "integer"},
+        },
+        "required": ["templates", "count"],
+    },
+)
+
+
+# Tool: Spawn Monsters
+SPAWN_MONSTERS_TOOL = Tool(
+    name="Spawn Monsters",
+    description="Create N monsters from a template in one call with server-generated IDs; returns only the new IDs and HP",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "templateId": {
+                "type": "string",
+                "description": "Template to spawn from",
+            },
+            "count": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 10000,
+                "description": "Number of monsters to create",
+            },
+            "hpDice": {
+                "type": "string",
+                "description": "Roll each monster's HP with this dice notation, e.g. '2d6' (optional, default the template's maxHp)",
+            },
+            "properties": {
+                "type": "object",
+                "description": "Property overrides for every spawned monster (optional)",
+                "additionalProperties": True,
+            },
+            "ttlSeconds": {
+                "type": "number",
+                "exclusiveMinimum": 0,
+                "description": "Make the spawned monsters ephemeral: delete each once it has not been written to for this many seconds (optional)",
+            },
+        },
+        "required": ["templateId", "count"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "monsters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "monsterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                    },
+                    "required": ["monsterId", "currentHp", "maxHp"],
+                },
+            },
+            "count": {"type": "integer"},
+        },
+        "required": ["monsters", "count"],
+    },
+)
+
+
+# Tool: Monster Storage
+MONSTER_STORAGE_TOOL = Tool(
+    name="Monster Storage",
+    description=(
+        "Report how many monsters are in memory and spilled to disk, optionally setting the memory budget; "
+        "least recently used monsters beyond the budget are spilled and loaded back on access"
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "maxResident": {
+                "type": ["integer", "null"],
+                "minimum": 1,
+                "description": "Maximum number of monsters kept in memory, or null for no limit (optional, unchanged if omitted)",
+            },
+        },
+        "required": [],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "resident": {"type": "integer"},
+            "spilled": {"type": "integer"},
+            "maxResident": {"type": ["integer", "null"]},
+            "ephemeral": {"type": "integer"},
+            "spills": {"type": "integer"},
+            "faults": {"type": "integer"},
+            "expired": {"type": "integer"},
+        },
+        "required": ["resident", "spilled", "maxResident", "ephemeral", "spills", "faults", "expired"],
+    },
+)
+
+
+# Tool: Changes Since
+CHANGES_SINCE_TOOL = Tool(
+    name="Changes Since",
+    description=(
+        "Get only the monsters created, changed or deleted after a sequence number, so mirrored state can be "
+        "kept up to date without re-listing every monster"
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "since": {
+                "type": "integer",
+                "minimum": 0,
+                "description": "Sequence number returned by the previous call (0 to start)",
+            },
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of changed monsters to return (optional)",
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only return these fields of each changed monster (optional)",
+            },
+        },
+        "required": ["since"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "changes": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "seq": {"type": "integer"},
+                        "monsterId": {"type": "string"},
+                        "op": {"type": "string", "enum": ["upsert", "delete"]},
+                        "monster": {"type": ["object", "null"]},
+                    },
+                    "required": ["seq", "monsterId", "op", "monster"],
+                },
+            },
+            "count": {"type": "integer"},
+            "seq": {"type": "integer"},
+            "hasMore": {"type": "boolean"},
+            "resyncRequired": {"type": "boolean"},
+        },
+        "required": ["changes", "count", "seq", "hasMore", "resyncRequired"],
+    },
+)
+
+
+# Tool: List Monster Campaigns
+LIST_MONSTER_CAMPAIGNS_TOOL = Tool(
+    name="List Monster Campaigns",
+    description="List the campaigns (namespaces) that hold monsters, with the number of monsters in each",
+    inputSchema={
+        "type": "object",
+        "properties": {},
+        "required": [],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "campaigns": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "campaignId": {"type": "string"},
+                        "count": {"type": "integer"},
+                    },
+                    "required": ["campaignId", "count"],
+                },
+            },
+            "count": {"type": "integer"},
+        },
+        "required": ["campaigns", "count"],
+    },
+)
+
+
+# Tool: Drop Monster Campaign
+DROP_MONSTER_CAMPAIGN_TOOL = Tool(
+    name="Drop Monster Campaign",
+    description="Delete a whole campaign (namespace) with all of its monsters in one step",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "campaignId": {
+                "type": "string",
+                "description": "Campaign to drop",
+            },
+        },
+        "required": ["campaignId"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "campaignId": {"type": "string"},
+            "dropped": {"type": "integer"},
+        },
+        "required": ["campaignId", "dropped"],
+    },
+)
+
+
+# Tool: Define Monster Stat
+DEFINE_MONSTER_STAT_TOOL = Tool(
+    name="Define Monster Stat",
+    description="Define, replace or remove a derived monster stat computed from a formula over monster fields and other stats",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "name": {
+                "type": "string",
+                "description": "Stat name, e.g. 'athletics'",
+            },
+            "formula": {
+                "type": ["string", "null"],
+                "description": "Formula in the filter expression language, e.g. "
+                               "'derived.strengthModifier + derived.proficiencyBonus'; null removes the stat",
+            },
+        },
+        "required": ["name", "formula"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "formula": {"type": ["string", "null"]},
+            "stats": {"type": "object"},
+        },
+        "required": ["name", "formula", "stats"],
+    },
+)
+
+
+# Tool: Roll Monster Check
+ROLL_MONSTER_CHECK_TOOL = Tool(
+    name="Roll Monster Check",
+    description="Roll dice notation using a monster's derived stats, e.g. '1d20+{strengthModifier}+{proficiencyBonus}'",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "monsterId": {
+                "type": "string",
+                "description": "Unique identifier for the monster",
+            },
+            "notation": {
+                "type": "string",
+                "description": "Dice notation; {stat} placeholders preceded by + or - are replaced by the monster's derived stats",
+            },
+        },
+        "required": ["monsterId", "notation"],
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "monsterId": {"type": "string"},
+            "notation": {"type": "string"},
+            "resolvedNotation": {"type": "string"},
+            "total": {"type": "integer"},
+            "details": {"type": "string"},
+        },
+        "required": ["monsterId", "notation", "resolvedNotation", "total", "details"],
+    },
+)
+
+
+# Tool: Long Rest (bulk recovery to the maximum)
+LONG_REST_TOOL = Tool(
+    name="Long Rest",
+    description="Restore HP and magic points of many monsters to their maximum in one batch; defeated (0 HP) monsters are left unchanged",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "monsterIds": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Monsters affected (optional, default every monster of the campaign)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "monsters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "monsterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+            "defeated": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["monsters", "count", "defeated"],
+    },
+)
+
+
+# Tool: Short Rest (bulk dice-based recovery)
+SHORT_REST_TOOL = Tool(
+    name="Short Rest",
+    description="Recover HP and/or magic points of many monsters by rolling dice for each (capped at the maximum); defeated (0 HP) monsters are left unchanged",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "monsterIds": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Monsters affected (optional, default every monster of the campaign)",
+            },
+            "hpDice": {
+                "type": "string",
+                "description": "Dice notation of the HP each monster recovers, e.g. '1d8+2' (optional)",
+            },
+            "mpDice": {
+                "type": "string",
+                "description": "Dice notation of the magic points each monster recovers (optional)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "monsters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "monsterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+            "defeated": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["monsters", "count", "defeated"],
+    },
+)
+
+
+# Tool: Regenerate (bulk fixed recovery)
+REGENERATE_TOOL = Tool(
+    name="Regenerate",
+    description="Recover a fixed amount of HP and magic points for many monsters (capped at the maximum); defeated (0 HP) monsters are left unchanged",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "monsterIds": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Monsters affected (optional, default every monster of the campaign)",
+            },
+            "hp": {
+                "type": "integer",
+                "minimum": 0,
+                "description": "HP each monster recovers",
+            },
+            "mp": {
+                "type": "integer",
+                "minimum": 0,
+                "description": "Magic points each monster recovers",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "monsters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "monsterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+            "count": {"type": "integer"},
+            "defeated": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["monsters", "count", "defeated"],
+    },
+)
+
+
+EFFECT_OUTPUT = {
+    "type": "object",
+    "properties": {
+        "effectId": {"type": "string"},
+        "monsterId": {"type": "string"},
+        "name": {"type": "string"},
+        "damageDice": {"type": ["string", "null"]},
+        "hpDelta": {"type": "integer"},
+        "mpDelta": {"type": "integer"},
+        "every": {"type": "integer"},
+        "startedRound": {"type": "integer"},
+        "expiresRound": {"type": ["integer", "null"]},
+        "nextRound": {"type": "integer"},
+    },
+}
+
+
+# Tool: Add Monster Effect
+ADD_MONSTER_EFFECT_TOOL = Tool(
+    name="Add Monster Effect",
+    description="Add a per-round effect or condition to a monster (poison, regeneration, concentration, ...) that ticks every few rounds and may expire",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "monsterId": {
+                "type": "string",
+                "description": "Unique identifier for the monster",
+            },
+            "name": {
+                "type": "string",
+                "description": "Effect name, e.g. 'poisoned'",
+            },
+            "damageDice": {
+                "type": "string",
+                "description": "Dice notation of the damage dealt on every tick, e.g. '1d6' (optional)",
+            },
+            "hpDelta": {
+                "type": "integer",
+                "description": "HP change on every tick, e.g. 10 for regeneration (optional, negative for damage)",
+            },
+            "mpDelta": {
+                "type": "integer",
+                "description": "Magic point change on every tick (optional)",
+            },
+            "every": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Rounds between ticks (optional, default 1)",
+            },
+            "rounds": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Rounds until the effect expires (optional, default until removed)",
+            },
+        },
+        "required": ["monsterId", "name"],
+    },
+    outputSchema=EFFECT_OUTPUT,
+)
+
+
+# Tool: Remove Monster Effect
+REMOVE_MONSTER_EFFECT_TOOL = Tool(
+    name="Remove Monster Effect",
+    description="Remove an effect from a monster before it expires (e.g. poison cured, concentration broken)",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "effectId": {
+                "type": "string",
+                "description": "Unique identifier of the effect",
+            },
+        },
+        "required": ["effectId"],
+    },
+    outputSchema=EFFECT_OUTPUT,
+)
+
+
+# Tool: List Monster Effects
+LIST_MONSTER_EFFECTS_TOOL = Tool(
+    name="List Monster Effects",
+    description="List the active effects of a monster, or of every monster in the campaign",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "monsterId": {
+                "type": "string",
+                "description": "Only list this monster's effects (optional)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "round": {"type": "integer"},
+            "effects": {"type": "array", "items": EFFECT_OUTPUT},
+            "count": {"type": "integer"},
+        },
+        "required": ["round", "effects", "count"],
+    },
+)
+
+
+# Tool: Advance Round
+ADVANCE_ROUND_TOOL = Tool(
+    name="Advance Round",
+    description="Advance the campaign's effects by one or more rounds: due effects tick (damage dice rolled in batch) and expired ones end",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "rounds": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Rounds to advance (optional, default 1)",
+            },
+        },
+    },
+    outputSchema={
+        "type": "object",
+        "properties": {
+            "round": {"type": "integer"},
+            "ticks": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "effectId": {"type": "string"},
+                        "monsterId": {"type": "string"},
+                        "name": {"type": "string"},
+                        "hpChange": {"type": "integer"},
+                        "mpChange": {"type": "integer"},
+                    },
+                },
+            },
+            "expired": {"type": "array", "items": EFFECT_OUTPUT},
+            "monsters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "monsterId": {"type": "string"},
+                        "currentHp": {"type": "integer"},
+                        "maxHp": {"type": "integer"},
+                        "currentMagicPoints": {"type": "integer"},
+                        "maxMagicPoints": {"type": "integer"},
+                        "version": {"type": "integer"},
+                    },
+                },
+            },
+        },
+        "required": ["round", "ticks", "expired", "monsters"],
+    },
+)
+
+
+TOOLS = {
+    SET_MONSTER_TOOL.name: SET_MONSTER_TOOL,
+    GET_MONSTER_TOOL.name: GET_MONSTER_TOOL,
+    UPDATE_MONSTER_TOOL.name: UPDATE_MONSTER_TOOL,
+    LIST_MONSTERS_TOOL.name: LIST_MONSTERS_TOOL,
+    DELETE_MONSTER_TOOL.name: DELETE_MONSTER_TOOL,
+    APPLY_DAMAGE_TOOL.name: APPLY_DAMAGE_TOOL,
+    SET_MONSTERS_TOOL.name: SET_MONSTERS_TOOL,
+    CREATE_MONSTER_INDEX_TOOL.name: CREATE_MONSTER_INDEX_TOOL,
+    SEARCH_MONSTERS_TOOL.name: SEARCH_MONSTERS_TOOL,
+    QUERY_MONSTERS_TOOL.name: QUERY_MONSTERS_TOOL,
+    SET_MONSTER_TEMPLATE_TOOL.name: SET_MONSTER_TEMPLATE_TOOL,
+    LIST_MONSTER_TEMPLATES_TOOL.name: LIST_MONSTER_TEMPLATES_TOOL,
+    SPAWN_MONSTERS_TOOL.name: SPAWN_MONSTERS_TOOL,
+    MONSTER_STORAGE_TOOL.name: MONSTER_STORAGE_TOOL,
+    CHANGES_SINCE_TOOL.name: CHANGES_SINCE_TOOL,
+    LIST_MONSTER_CAMPAIGNS_TOOL.name: LIST_MONSTER_CAMPAIGNS_TOOL,
+    DROP_MONSTER_CAMPAIGN_TOOL.name: DROP_MONSTER_CAMPAIGN_TOOL,
+    DEFINE_MONSTER_STAT_TOOL.name: DEFINE_MONSTER_STAT_TOOL,
+    ROLL_MONSTER_CHECK_TOOL.name: ROLL_MONSTER_CHECK_TOOL,
+    LONG_REST_TOOL.name: LONG_REST_TOOL,
+    SHORT_REST_TOOL.name: SHORT_REST_TOOL,
+    REGENERATE_TOOL.name: REGENERATE_TOOL,
+    ADD_MONSTER_EFFECT_TOOL.name: ADD_MONSTER_EFFECT_TOOL,
+    REMOVE_MONSTER_EFFECT_TOOL.name: REMOVE_MONSTER_EFFECT_TOOL,
+    LIST_MONSTER_EFFECTS_TOOL.name: LIST_MONSTER_EFFECTS_TOOL,
+    ADVANCE_ROUND_TOOL.name: ADVANCE_ROUND_TOOL,
+}
+
+# Every monster tool works within one campaign
+for _tool in TOOLS.values():
+    if _tool is not LIST_MONSTER_CAMPAIGNS_TOOL:
+        _tool.inputSchema["properties"] = {**_tool.inputSchema["properties"], "campaignId": CAMPAIGN_ID_PROPERTY}
+
+
+# Resources: every monster is readable (and subscribable) as monster://{campaignId}/{monsterId},
+# and all monsters of a campaign as monster://{campaignId}
+MONSTER_URI_SCHEME = "monster"
+
+MONSTER_RESOURCE_TEMPLATE = ResourceTemplate(
+    name="Monster",
+    uriTemplate="monster://{campaignId}/{monsterId}",
+    description="A monster as JSON; subscribe to be notified when it changes",
+    mimeType="application/json",
+)
+
+MONSTER_CAMPAIGN_RESOURCE_TEMPLATE = ResourceTemplate(
+    name="Monster Campaign",
+    uriTemplate="monster://{campaignId}",
+    description="All monsters of a campaign as a JSON array; subscribe to be notified when any of them changes",
+    mimeType="application/json",
+)
+
+# Monsters per resources/list page
+RESOURCE_PAGE_SIZE = 100
+
+
+def get_tool(name: str) -> Tool | None:
+    """Get a tool by name."""
+    return TOOLS.get(name)
+
+
+def get_all_tools() -> list[Tool]:
+    """Get a list of all available tools."""
+    return list(TOOLS.values())
+
+
+def _with_template_defaults(arguments: dict, campaign_id: str | None = None) -> dict:
+    """Fill in name, HP and magic points from the monster's template (in the campaign) when they are omitted."""
+    template_id = arguments.get("templateId")
+    if not template_id:
+        return arguments
+    try:
+        template = get_monster_manager(campaign_id).get_template(template_id)
+    except ValueError:
+        # Left for the manager to report
+        return arguments
+    defaults = {
+        "name": template.name,
+        "maxHp": template.max_hp,
+        "maxMagicPoints": template.max_magic_points,
+    }
+    merged = {**defaults, **{key: value for key, value in arguments.items() if value is not None}}
+    merged.setdefault("currentHp", merged["maxHp"])
+    merged.setdefault("currentMagicPoints", merged["maxMagicPoints"])
+    return merged
+
+
+def execute_set_monster(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the set monster functionality.
+    
+    Args:
+        arguments: Dictionary containing monster data and optional templateId
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    arguments = _with_template_defaults(arguments, arguments.get("campaignId"))
+    monster_id = arguments.get("monsterId")
+    if not monster_id:
+        raise ValueError("Missing required argument: monsterId")
+    
+    name = arguments.get("name")
+    if not name:
+        raise ValueError("Missing required argument: name")
+    
+    current_hp = arguments.get("currentHp")
+    max_hp = arguments.get("maxHp")
+    current_magic_points = arguments.get("currentMagicPoints")
+    max_magic_points = arguments.get("maxMagicPoints")
+    properties = arguments.get("properties", {})
+    
+    if current_hp is None:
+        raise ValueError("Missing required argument: currentHp")
+    if max_hp is None:
+        raise ValueError("Missing required argument: maxHp")
+    if current_magic_points is None:
+        raise ValueError("Missing required argument: currentMagicPoints")
+    if max_magic_points is None:
+        raise ValueError("Missing required argument: maxMagicPoints")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    monster = manager.set_monster(
+        monster_id=monster_id,
+        name=name,
+        current_hp=current_hp,
+        max_hp=max_hp,
+        current_magic_points=current_magic_points,
+        max_magic_points=max_magic_points,
+        properties=properties,
+        expected_version=arguments.get("expectedVersion"),
+        template_id=arguments.get("templateId"),
+        ttl_seconds=arguments.get("ttlSeconds")
+    )
+    
+    result = monster.to_dict()
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Monster '{result['name']}' (ID: {result['monster_id']}) created/updated\n"
+                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
+                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
+                   f"Properties: {result['properties']}",
+        }
+    ]
+    
+    return contents, result
+
+
+def _not_modified(subject: str, etag: str) -> tuple[list[dict], dict]:
+    """Build the short response for a conditional read whose ETag still matches."""
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"{subject} not modified (ETag: {etag})",
+        }
+    ]
+    return contents, {"notModified": True, "etag": etag}
+
+
+def execute_get_monster(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the get monster functionality.
+    
+    Args:
+        arguments: Dictionary containing monsterId and optional fields, includeDerived, ifNoneMatch
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    monster_id = arguments.get("monsterId")
+    if not monster_id:
+        raise ValueError("Missing required argument: monsterId")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    if_none_match = arguments.get("ifNoneMatch")
+    if if_none_match and manager.get_monster_etag(monster_id) == if_none_match:
+        return _not_modified(f"Monster (ID: {monster_id})", if_none_match)
+    monster = manager.get_monster(monster_id)
+    etag = monster.etag
+    
+    field_paths = arguments.get("fields")
+    if field_paths:
+        result = monster.project([path for path in field_paths if path != "etag"])
+        if "etag" in field_paths:
+            result["etag"] = etag
+        if arguments.get("includeDerived"):
+            result["derived"] = manager.derived.values(monster)
+        contents: list[dict] = [
+            {
+                "type": "text",
+                "text": f"Monster (ID: {monster_id}): {result}",
+            }
+        ]
+        return contents, result
+    
+    result = monster.to_dict()
+    result["etag"] = etag
+    derived = ""
+    if arguments.get("includeDerived"):
+        result["derived"] = manager.derived.values(monster)
+        derived = f"\nDerived: {result['derived']}"
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Monster: {result['name']} (ID: {result['monster_id']})\n"
+                   f"HP: {result['current_hp']}/{result['max_hp']}\n"
+                   f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
+                   f"Properties: {result['properties']}\n"
+                   + (f"Template: {result['template_id']}\n" if result["template_id"] else "")
+                   + f"Created: {result['created_at']}\n"
+                   f"Updated: {result['updated_at']}\n"
+                   f"Version: {result['version']}\n"
+                   f"ETag: {etag}{derived}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_update_monster(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the update monster functionality.
+    
+    Args:
+        arguments: Dictionary containing monster updates
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    monster_id = arguments.get("monsterId")
+    if not monster_id:
+        raise ValueError("Missing required argument: monsterId")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    monster = manager.update_monster(
+        monster_id=monster_id,
+        name=arguments.get("name"),
+        current_hp=arguments.get("currentHp"),
+        max_hp=arguments.get("maxHp"),
+        current_magic_points=arguments.get("currentMagicPoints"),
+        max_magic_points=arguments.get("maxMagicPoints"),
+        properties=arguments.get("properties"),
+        hp_delta=arguments.get("hpDelta"),
+        mp_delta=arguments.get("mpDelta"),
+        expected_version=arguments.get("expectedVersion"),
+        patch=arguments.get("patch"),
+        merge_patch=arguments.get("mergePatch")
+    )
+    
+    result = monster.to_dict()
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Monster '{result['name']}' (ID: {result['monster_id']}) updated\n"
                    f"HP: {result['current_hp']}/{result['max_hp']}\n"
                    f"Magic Points: {result['current_magic_points']}/{result['max_magic_points']}\n"
                    f"Properties: {result['properties']}",
@@ -362,36 +1460,588 @@ def execute_update_monster(arguments: dict) -> tuple[list[dict], dict]:
     return contents, result
 
 
-def execute_list_monsters(arguments: dict) -> tuple[list[dict], dict]:
+def execute_list_monsters(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the list monsters functionality.
+    
+    Args:
+        arguments: Dictionary with optional limit, cursor, orderBy, descending, includeTotal,
+            fields and ifNoneMatch (empty for list all)
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    limit = arguments.get("limit")
+    cursor = arguments.get("cursor")
+    order_by = arguments.get("orderBy")
+    if order_by and cursor:
+        raise ValueError("cursor cannot be combined with orderBy; use limit to get the top results")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    etag = manager.listing_etag({key: value for key, value in arguments.items() if key != "ifNoneMatch"})
+    if arguments.get("ifNoneMatch") == etag:
+        return _not_modified("Monsters", etag)
+    next_cursor = None
+    if order_by:
+        monsters = manager.order_monsters(order_by, bool(arguments.get("descending")), limit)
+    elif limit is None and not cursor:
+        monsters = manager.list_monsters()
+    else:
+        monsters, next_cursor = manager.page_monsters(limit or max(manager.count_monsters(), 1), cursor)
+    
+    field_paths = arguments.get("fields")
+    if field_paths:
+        projector = projector_for(field_paths, MONSTER_FIELDS)
+        monster_list = [projector(monster) for monster in monsters]
+    else:
+        monster_list = [cached_dict(monster) for monster in monsters]
+    result = {
+        "monsters": monster_list,
+        "count": len(monster_list)
+    }
+    if (limit is not None or cursor) and not order_by:
+        result["nextCursor"] = next_cursor
+    if arguments.get("includeTotal"):
+        result["total"] = manager.count_monsters()
+    result["etag"] = etag
+    
+    if not monster_list:
+        text = "No monsters found."
+    elif field_paths:
+        lines = [f"Found {len(monster_list)} monster(s):\n"]
+        lines.extend(f"- {monster_dict}" for monster_dict in monster_list)
+        text = "\n".join(lines)
+    else:
+        lines = [f"Found {len(monster_list)} monster(s):\n"]
+        for monster_dict in monster_list:
+            lines.append(
+                f"- {monster_dict['name']} (ID: {monster_dict['monster_id']}): "
+                f"HP {monster_dict['current_hp']}/{monster_dict['max_hp']}, "
+                f"MP {monster_dict['current_magic_points']}/{monster_dict['max_magic_points']}"
+            )
+        text = "\n".join(lines)
+    if next_cursor:
+        text += f"\nMore monsters available (cursor: {next_cursor})"
+    if "total" in result:
+        text += f"\nTotal monsters: {result['total']}"
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_delete_monster(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the delete monster functionality.
+    
+    Args:
+        arguments: Dictionary containing monsterId
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    monster_id = arguments.get("monsterId")
+    if not monster_id:
+        raise ValueError("Missing required argument: monsterId")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    manager.delete_monster(monster_id)
+    
+    result = {
+        "monsterId": monster_id,
+        "deleted": True
+    }
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Monster with ID '{monster_id}' has been deleted.",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_apply_damage(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk apply damage functionality.
+    
+    Args:
+        arguments: Dictionary containing a list of targets with deltas
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    targets = arguments.get("targets")
+    if not targets:
+        raise ValueError("Missing required argument: targets")
+    
+    deltas = []
+    for target in targets:
+        monster_id = target.get("monsterId")
+        if not monster_id:
+            raise ValueError("Missing required argument: monsterId")
+        deltas.append({
+            "monster_id": monster_id,
+            "hp_delta": target.get("hpDelta", 0),
+            "mp_delta": target.get("mpDelta", 0),
+        })
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    monsters = manager.apply_deltas(deltas)
+    
+    monster_list = [
+        {
+            "monsterId": monster.monster_id,
+            "currentHp": monster.current_hp,
+            "maxHp": monster.max_hp,
+            "currentMagicPoints": monster.current_magic_points,
+            "maxMagicPoints": monster.max_magic_points,
+            "version": monster.version,
+        }
+        for monster in monsters
+    ]
+    result = {
+        "monsters": monster_list,
+        "count": len(monster_list)
+    }
+    
+    lines = [f"Applied deltas to {len(monster_list)} monster(s):\n"]
+    for monster in monsters:
+        lines.append(
+            f"- {monster.name} (ID: {monster.monster_id}): "
+            f"HP {monster.current_hp}/{monster.max_hp}, "
+            f"MP {monster.current_magic_points}/{monster.max_magic_points}"
+        )
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_set_monsters(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk set monsters functionality.
+    
+    Args:
+        arguments: Dictionary containing a list of monsters and the atomic flag
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    monsters = arguments.get("monsters")
+    if monsters is None:
+        raise ValueError("Missing required argument: monsters")
+    atomic = arguments.get("atomic", True)
+    campaign_id = arguments.get("campaignId")
+    
+    entries = [
+        {
+            "monster_id": monster.get("monsterId"),
+            "name": monster.get("name"),
+            "current_hp": monster.get("currentHp"),
+            "max_hp": monster.get("maxHp"),
+            "current_magic_points": monster.get("currentMagicPoints"),
+            "max_magic_points": monster.get("maxMagicPoints"),
+            "properties": monster.get("properties"),
+            "expected_version": monster.get("expectedVersion"),
+            "template_id": monster.get("templateId"),
+            "ttl_seconds": monster.get("ttlSeconds"),
+        }
+        for monster in (_with_template_defaults(monster, campaign_id) for monster in monsters)
+    ]
+    
+    manager = get_monster_manager(campaign_id)
+    summary = manager.set_monsters(entries, atomic=atomic)
+    
+    result = {
+        "applied": summary["applied"],
+        "failed": summary["failed"],
+        "errors": [
+            {"index": error["index"], "monsterId": error["monster_id"], "error": error["error"]}
+            for error in summary["errors"]
+        ],
+    }
+    
+    lines = [f"Applied {result['applied']} monster(s), {result['failed']} failed"]
+    if result["errors"] and atomic:
+        lines[0] += " (atomic batch rejected)"
+    for error in result["errors"]:
+        lines.append(f"- #{error['index']} (ID: {error['monsterId']}): {error['error']}")
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_create_monster_index(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the create monster index functionality.
+    
+    Args:
+        arguments: Dictionary containing field and optional kind
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    field_path = arguments.get("field")
+    if not field_path:
+        raise ValueError("Missing required argument: field")
+    kind = arguments.get("kind", "hash")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    entries = manager.create_index(field_path, kind)
+    
+    result = {
+        "field": field_path,
+        "kind": kind,
+        "entries": entries
+    }
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Created {kind} index on '{field_path}' covering {entries} monster(s).",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_search_monsters(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the search monsters functionality.
+    
+    Args:
+        arguments: Dictionary containing query and optional limit and fuzzy
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    query = arguments.get("query")
+    if query is None:
+        raise ValueError("Missing required argument: query")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    matches = manager.search_monsters(query, arguments.get("limit", 10), arguments.get("fuzzy", True))
+    
+    results = [
+        {"monsterId": monster.monster_id, "name": monster.name, "score": score, "match": kind}
+        for monster, score, kind in matches
+    ]
+    result = {
+        "results": results,
+        "count": len(results)
+    }
+    
+    if not results:
+        text = f"No monsters matching '{query}'."
+    else:
+        lines = [f"Found {len(results)} monster(s) matching '{query}':"]
+        for monster, score, kind in matches:
+            lines.append(f"- {monster.name} (ID: {monster.monster_id}): {kind} match, score {score:.2f}")
+        text = "\n".join(lines)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_query_monsters(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the query monsters functionality.
+    
+    Args:
+        arguments: Dictionary containing where conditions and/or a filter expression,
+            and optional limit and fields
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    where = arguments.get("where")
+    filter_expression = arguments.get("filter")
+    if where is None and filter_expression is None:
+        raise ValueError("Missing required argument: where or filter")
+    
+    predicates = []
+    for condition in where or []:
+        if "field" not in condition or "op" not in condition or "value" not in condition:
+            raise ValueError("Each condition requires field, op and value")
+        predicates.append((condition["field"], condition["op"], condition["value"]))
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    monsters, plan = manager.query_monsters(
+        predicates,
+        limit=arguments.get("limit"),
+        filter_expression=filter_expression
+    )
+    
+    field_paths = arguments.get("fields")
+    if field_paths:
+        projector = projector_for(field_paths, MONSTER_FIELDS)
+        monster_list = [projector(monster) for monster in monsters]
+    else:
+        monster_list = [cached_dict(monster) for monster in monsters]
+    result = {
+        "monsters": monster_list,
+        "count": len(monster_list),
+        "plan": plan
+    }
+    
+    strategy = f"indexes: {', '.join(plan['indexes'])}" if plan["indexes"] else "full scan"
+    lines = [f"Found {len(monster_list)} monster(s) ({strategy}, {plan['scanned']} checked):"]
+    for monster in monsters:
+        lines.append(
+            f"- {monster.name} (ID: {monster.monster_id}): "
+            f"HP {monster.current_hp}/{monster.max_hp}, "
+            f"MP {monster.current_magic_points}/{monster.max_magic_points}"
+        )
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_set_monster_template(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the set monster template functionality.
+    
+    Args:
+        arguments: Dictionary containing templateId, name, maxHp and optional maxMagicPoints and properties
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    template_id = arguments.get("templateId")
+    if not template_id:
+        raise ValueError("Missing required argument: templateId")
+    name = arguments.get("name")
+    if not name:
+        raise ValueError("Missing required argument: name")
+    max_hp = arguments.get("maxHp")
+    if max_hp is None:
+        raise ValueError("Missing required argument: maxHp")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    template = manager.set_template(
+        template_id=template_id,
+        name=name,
+        max_hp=max_hp,
+        max_magic_points=arguments.get("maxMagicPoints", 0),
+        properties=arguments.get("properties")
+    )
+    
+    result = template.to_dict()
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Monster template '{result['name']}' (ID: {result['template_id']}) created/updated\n"
+                   f"Max HP: {result['max_hp']}, Max Magic Points: {result['max_magic_points']}\n"
+                   f"Properties: {result['properties']}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_list_monster_templates(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the list monster templates functionality.
+    
+    Args:
+        arguments: Empty dictionary
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_monster_manager(arguments.get("campaignId"))
+    templates = [template.to_dict() for template in manager.list_templates()]
+    result = {
+        "templates": templates,
+        "count": len(templates)
+    }
+    
+    if not templates:
+        text = "No monster templates found."
+    else:
+        lines = [f"Found {len(templates)} monster template(s):\n"]
+        for template in templates:
+            lines.append(
+                f"- {template['name']} (ID: {template['template_id']}): "
+                f"HP {template['max_hp']}, MP {template['max_magic_points']}"
+            )
+        text = "\n".join(lines)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_spawn_monsters(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the spawn monsters functionality.
+    
+    Args:
+        arguments: Dictionary containing templateId, count and optional hpDice, properties and ttlSeconds
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    template_id = arguments.get("templateId")
+    if not template_id:
+        raise ValueError("Missing required argument: templateId")
+    count = arguments.get("count")
+    if count is None:
+        raise ValueError("Missing required argument: count")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    monsters = manager.spawn_monsters(
+        template_id,
+        count,
+        hp_dice=arguments.get("hpDice"),
+        properties=arguments.get("properties"),
+        ttl_seconds=arguments.get("ttlSeconds")
+    )
+    
+    result = {
+        "monsters": [
+            {"monsterId": monster.monster_id, "currentHp": monster.current_hp, "maxHp": monster.max_hp}
+            for monster in monsters
+        ],
+        "count": len(monsters)
+    }
+    
+    first, last = monsters[0].monster_id, monsters[-1].monster_id
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Spawned {len(monsters)} monster(s) from template '{template_id}' "
+                   f"({first}{' ... ' + last if len(monsters) > 1 else ''}), "
+                   f"total HP {sum(monster.max_hp for monster in monsters)}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_monster_storage(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the monster storage functionality.
+    
+    Args:
+        arguments: Dictionary containing an optional maxResident budget
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_monster_manager(arguments.get("campaignId"))
+    if "maxResident" in arguments:
+        manager.set_memory_budget(arguments["maxResident"])
+    metrics = manager.storage_metrics()
+    
+    result = {
+        "resident": metrics["resident"],
+        "spilled": metrics["spilled"],
+        "maxResident": metrics["max_resident"],
+        "ephemeral": metrics["ephemeral"],
+        "spills": metrics["spills"],
+        "faults": metrics["faults"],
+        "expired": metrics["expired"],
+    }
+    
+    budget = result["maxResident"] if result["maxResident"] is not None else "unlimited"
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Monsters in memory: {result['resident']} (budget: {budget}), spilled to disk: {result['spilled']}\n"
+                   f"Ephemeral: {result['ephemeral']}, expired so far: {result['expired']}\n"
+                   f"Spills: {result['spills']}, faults: {result['faults']}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_changes_since(arguments: dict) -> tuple[list[dict], dict]:
     """
-    Execute the list monsters functionality.
+    Execute the changes since functionality.
     
     Args:
-        arguments: Dictionary (empty for list all)
+        arguments: Dictionary containing since and optional limit and fields
         
     Returns:
         Tuple of (contents list, result dict) for MCP response
     """
-    manager = get_monster_manager()
-    monsters = manager.list_monsters()
+    since = arguments.get("since")
+    if since is None:
+        raise ValueError("Missing required argument: since")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    feed = manager.changes_since(since, arguments.get("limit"))
     
-    monster_list = [monster.to_dict() for monster in monsters]
+    field_paths = arguments.get("fields")
+    to_record = projector_for(field_paths, MONSTER_FIELDS) if field_paths else (lambda monster: monster.to_dict())
+    changes = [
+        {
+            "seq": seq,
+            "monsterId": monster_id,
+            "op": "upsert" if monster is not None else "delete",
+            "monster": to_record(monster) if monster is not None else None,
+        }
+        for seq, monster_id, monster in feed["changes"]
+    ]
     result = {
-        "monsters": monster_list,
-        "count": len(monster_list)
+        "changes": changes,
+        "count": len(changes),
+        "seq": feed["seq"],
+        "hasMore": feed["has_more"],
+        "resyncRequired": feed["resync_required"],
     }
     
-    if not monster_list:
-        text = "No monsters found."
+    if result["resyncRequired"]:
+        text = (
+            f"Changes after sequence {since} are no longer available; list all monsters again "
+            f"and continue from sequence {result['seq']}."
+        )
+    elif not changes:
+        text = f"No changes since sequence {since}."
     else:
-        lines = [f"Found {len(monster_list)} monster(s):\n"]
-        for monster_dict in monster_list:
-            lines.append(
-                f"- {monster_dict['name']} (ID: {monster_dict['monster_id']}): "
-                f"HP {monster_dict['current_hp']}/{monster_dict['max_hp']}, "
-                f"MP {monster_dict['current_magic_points']}/{monster_dict['max_magic_points']}"
-            )
+        lines = [f"{len(changes)} monster(s) changed since sequence {since}:\n"]
+        for change in changes:
+            lines.append(f"- #{change['seq']} {change['op']} {change['monsterId']}")
         text = "\n".join(lines)
+    text += f"\nNext sequence: {result['seq']}" + (" (more changes available)" if result["hasMore"] else "")
     
     contents: list[dict] = [
         {
@@ -403,12 +2053,119 @@ def execute_list_monsters(arguments: dict) -> tuple[list[dict], dict]:
     return contents, result
 
 
-def execute_delete_monster(arguments: dict) -> tuple[list[dict], dict]:
+def execute_list_monster_campaigns(arguments: dict) -> tuple[list[dict], dict]:
     """
-    Execute the delete monster functionality.
+    Execute the list monster campaigns functionality.
     
     Args:
-        arguments: Dictionary containing monsterId
+        arguments: Empty dictionary
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    campaigns = [
+        {"campaignId": campaign_id, "count": get_monster_manager(campaign_id).count_monsters()}
+        for campaign_id in list_monster_campaigns()
+    ]
+    result = {
+        "campaigns": campaigns,
+        "count": len(campaigns)
+    }
+    
+    if not campaigns:
+        text = "No campaigns found."
+    else:
+        lines = [f"Found {len(campaigns)} campaign(s):\n"]
+        for campaign in campaigns:
+            lines.append(f"- {campaign['campaignId']}: {campaign['count']} monster(s)")
+        text = "\n".join(lines)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_drop_monster_campaign(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the drop monster campaign functionality.
+    
+    Args:
+        arguments: Dictionary containing campaignId
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    campaign_id = arguments.get("campaignId")
+    if not campaign_id:
+        raise ValueError("Missing required argument: campaignId")
+    
+    dropped = drop_monster_campaign(campaign_id)
+    
+    result = {
+        "campaignId": campaign_id,
+        "dropped": dropped
+    }
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Campaign '{campaign_id}' has been dropped with {dropped} monster(s).",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_define_monster_stat(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the define monster stat functionality.
+    
+    Args:
+        arguments: Dictionary containing name and formula (null to remove the stat)
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    name = arguments.get("name")
+    if not name:
+        raise ValueError("Missing required argument: name")
+    formula = arguments.get("formula")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    if formula is None:
+        manager.drop_derived_stat(name)
+        text = f"Derived stat '{name}' has been removed."
+    else:
+        manager.define_derived_stat(name, formula)
+        text = f"Derived stat '{name}' = {formula}"
+    
+    result = {
+        "name": name,
+        "formula": formula,
+        "stats": manager.list_derived_stats()
+    }
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": text,
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_roll_monster_check(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the roll monster check functionality.
+    
+    Args:
+        arguments: Dictionary containing monsterId and notation
         
     Returns:
         Tuple of (contents list, result dict) for MCP response
@@ -416,20 +2173,363 @@ def execute_delete_monster(arguments: dict) -> tuple[list[dict], dict]:
     monster_id = arguments.get("monsterId")
     if not monster_id:
         raise ValueError("Missing required argument: monsterId")
+    notation = arguments.get("notation")
+    if not notation:
+        raise ValueError("Missing required argument: notation")
     
-    manager = get_monster_manager()
-    manager.delete_monster(monster_id)
+    manager = get_monster_manager(arguments.get("campaignId"))
+    total, details, resolved = manager.roll_check(monster_id, notation)
     
     result = {
         "monsterId": monster_id,
-        "deleted": True
+        "notation": notation,
+        "resolvedNotation": resolved,
+        "total": total,
+        "details": details
     }
     
     contents: list[dict] = [
         {
             "type": "text",
-            "text": f"Monster with ID '{monster_id}' has been deleted.",
+            "text": f"Monster {monster_id} rolled {resolved} → {total}\nDetails: {details}",
+        }
+    ]
+    
+    return contents, result
+
+
+def _recovery_response(monsters: list, defeated: list[str], action: str) -> tuple[list[dict], dict]:
+    """Build the response of a bulk recovery (rests and regeneration)."""
+    monster_list = [
+        {
+            "monsterId": monster.monster_id,
+            "currentHp": monster.current_hp,
+            "maxHp": monster.max_hp,
+            "currentMagicPoints": monster.current_magic_points,
+            "maxMagicPoints": monster.max_magic_points,
+            "version": monster.version,
+        }
+        for monster in monsters
+    ]
+    result = {
+        "monsters": monster_list,
+        "count": len(monster_list),
+        "defeated": defeated
+    }
+    
+    lines = [f"{action}: {len(monster_list)} monster(s) recovered\n"]
+    for monster in monsters:
+        lines.append(
+            f"- {monster.name} (ID: {monster.monster_id}): "
+            f"HP {monster.current_hp}/{monster.max_hp}, "
+            f"MP {monster.current_magic_points}/{monster.max_magic_points}"
+        )
+    if defeated:
+        lines.append(f"\nDefeated (unchanged): {', '.join(defeated)}")
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_long_rest(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk long rest functionality.
+    
+    Args:
+        arguments: Dictionary containing optional monsterIds
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_monster_manager(arguments.get("campaignId"))
+    monsters, defeated = manager.long_rest(arguments.get("monsterIds"))
+    return _recovery_response(monsters, defeated, "Long rest")
+
+
+def execute_short_rest(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk short rest functionality.
+    
+    Args:
+        arguments: Dictionary containing optional monsterIds, hpDice and mpDice
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    hp_dice = arguments.get("hpDice")
+    mp_dice = arguments.get("mpDice")
+    if not hp_dice and not mp_dice:
+        raise ValueError("Missing required argument: hpDice or mpDice")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    monsters, defeated = manager.short_rest(arguments.get("monsterIds"), hp_dice or None, mp_dice or None)
+    return _recovery_response(monsters, defeated, "Short rest")
+
+
+def execute_regenerate(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the bulk regenerate functionality.
+    
+    Args:
+        arguments: Dictionary containing optional monsterIds, hp and mp
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_monster_manager(arguments.get("campaignId"))
+    monsters, defeated = manager.regenerate(
+        arguments.get("monsterIds"),
+        arguments.get("hp", 0),
+        arguments.get("mp", 0),
+    )
+    return _recovery_response(monsters, defeated, "Regeneration")
+
+
+def _effect_to_dict(effect) -> dict:
+    """Convert an effect to its tool representation."""
+    return {
+        "effectId": effect.effect_id,
+        "monsterId": effect.entity_id,
+        "name": effect.name,
+        "damageDice": effect.damage_dice,
+        "hpDelta": effect.hp_delta,
+        "mpDelta": effect.mp_delta,
+        "every": effect.every,
+        "startedRound": effect.started_round,
+        "expiresRound": effect.expires_round,
+        "nextRound": effect.next_round,
+    }
+
+
+def _describe_effect(effect) -> str:
+    """Describe an effect in one line."""
+    changes = []
+    if effect.damage_dice:
+        changes.append(f"{effect.damage_dice} damage")
+    if effect.hp_delta:
+        changes.append(f"HP {effect.hp_delta:+d}")
+    if effect.mp_delta:
+        changes.append(f"MP {effect.mp_delta:+d}")
+    schedule = f"every {effect.every} round(s)" if changes else "condition"
+    ending = f"until round {effect.expires_round}" if effect.expires_round is not None else "until removed"
+    details = ", ".join(changes + [schedule, ending])
+    return f"{effect.name} (ID: {effect.effect_id}) on {effect.entity_id}: {details}"
+
+
+def execute_add_monster_effect(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the add monster effect functionality.
+    
+    Args:
+        arguments: Dictionary containing monsterId, name and the effect's ticks and duration
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    monster_id = arguments.get("monsterId")
+    if not monster_id:
+        raise ValueError("Missing required argument: monsterId")
+    name = arguments.get("name")
+    if not name:
+        raise ValueError("Missing required argument: name")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    effect = manager.add_effect(
+        monster_id,
+        name,
+        damage_dice=arguments.get("damageDice") or None,
+        hp_delta=arguments.get("hpDelta", 0),
+        mp_delta=arguments.get("mpDelta", 0),
+        every=arguments.get("every", 1),
+        rounds=arguments.get("rounds"),
+    )
+    
+    result = _effect_to_dict(effect)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Added effect {_describe_effect(effect)}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_remove_monster_effect(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the remove monster effect functionality.
+    
+    Args:
+        arguments: Dictionary containing effectId
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    effect_id = arguments.get("effectId")
+    if not effect_id:
+        raise ValueError("Missing required argument: effectId")
+    
+    manager = get_monster_manager(arguments.get("campaignId"))
+    effect = manager.remove_effect(effect_id)
+    
+    result = _effect_to_dict(effect)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": f"Removed effect {_describe_effect(effect)}",
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_list_monster_effects(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the list monster effects functionality.
+    
+    Args:
+        arguments: Dictionary containing an optional monsterId
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_monster_manager(arguments.get("campaignId"))
+    effects = manager.list_effects(arguments.get("monsterId"))
+    
+    result = {
+        "round": manager.effects.round,
+        "effects": [_effect_to_dict(effect) for effect in effects],
+        "count": len(effects)
+    }
+    
+    lines = [f"Round {manager.effects.round}: {len(effects)} active effect(s)"]
+    lines.extend(f"- {_describe_effect(effect)}" for effect in effects)
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
+        }
+    ]
+    
+    return contents, result
+
+
+def execute_advance_round(arguments: dict) -> tuple[list[dict], dict]:
+    """
+    Execute the advance round functionality.
+    
+    Args:
+        arguments: Dictionary containing the optional number of rounds
+        
+    Returns:
+        Tuple of (contents list, result dict) for MCP response
+    """
+    manager = get_monster_manager(arguments.get("campaignId"))
+    outcome = manager.advance_round(arguments.get("rounds", 1))
+    
+    result = {
+        "round": outcome["round"],
+        "ticks": [
+            {
+                "effectId": effect.effect_id,
+                "monsterId": effect.entity_id,
+                "name": effect.name,
+                "hpChange": hp_change,
+                "mpChange": mp_change,
+            }
+            for effect, hp_change, mp_change in outcome["ticks"]
+        ],
+        "expired": [_effect_to_dict(effect) for effect in outcome["expired"]],
+        "monsters": [
+            {
+                "monsterId": monster.monster_id,
+                "currentHp": monster.current_hp,
+                "maxHp": monster.max_hp,
+                "currentMagicPoints": monster.current_magic_points,
+                "maxMagicPoints": monster.max_magic_points,
+                "version": monster.version,
+            }
+            for monster in outcome["monsters"]
+        ],
+    }
+    
+    lines = [f"Round {outcome['round']}: {len(result['ticks'])} effect tick(s), {len(result['expired'])} expired"]
+    for tick in result["ticks"]:
+        lines.append(f"- {tick['name']} on {tick['monsterId']}: HP {tick['hpChange']:+d}, MP {tick['mpChange']:+d}")
+    for effect in outcome["expired"]:
+        lines.append(f"- {effect.name} on {effect.entity_id} expired")
+    for monster in outcome["monsters"]:
+        lines.append(
+            f"- {monster.name} (ID: {monster.monster_id}): "
+            f"HP {monster.current_hp}/{monster.max_hp}, "
+            f"MP {monster.current_magic_points}/{monster.max_magic_points}"
+        )
+    
+    contents: list[dict] = [
+        {
+            "type": "text",
+            "text": "\n".join(lines),
         }
     ]
     
     return contents, result
+
+
+def monster_uri(campaign_id: str, monster_id: str) -> str:
+    """Get the resource URI of a monster."""
+    return entity_uri(MONSTER_URI_SCHEME, campaign_id, monster_id)
+
+
+def monster_campaign_uri(campaign_id: str) -> str:
+    """Get the resource URI of all monsters of a campaign."""
+    return campaign_uri(MONSTER_URI_SCHEME, campaign_id)
+
+
+def canonical_monster_uri(uri: str) -> str:
+    """
+    Normalize a monster or campaign resource URI (percent-encoding) so it matches the URIs used in notifications.
+    
+    Raises:
+        ValueError: If the URI is not a monster resource URI
+    """
+    campaign_id, monster_id = parse_resource_uri(MONSTER_URI_SCHEME, uri)
+    return monster_campaign_uri(campaign_id) if monster_id is None else monster_uri(campaign_id, monster_id)
+
+
+def list_monster_resources(cursor: str | None = None) -> tuple[list[Resource], str | None]:
+    """
+    List the default campaign's monsters as resources, one page at a time.
+    
+    Returns:
+        Tuple of (resources, next cursor or None when there are no more)
+    """
+    monsters, next_cursor = get_monster_manager().page_monsters(RESOURCE_PAGE_SIZE, cursor)
+    resources = [
+        Resource(name=monster.name, uri=monster_uri(DEFAULT_CAMPAIGN, monster.monster_id), mimeType="application/json")
+        for monster in monsters
+    ]
+    return resources, next_cursor
+
+
+def read_monster_resource(uri: str) -> str:
+    """
+    Get the JSON record of the monster a resource URI points to, or the JSON
+    array of a campaign's monsters, joined from their cached encodings.
+    
+    Raises:
+        ValueError: If the URI is invalid or the monster is not found
+    """
+    campaign_id, monster_id = parse_resource_uri(MONSTER_URI_SCHEME, uri)
+    manager = get_monster_manager(campaign_id)
+    if monster_id is None:
+        return json_array(monster.to_json() for monster in manager.list_monsters())
+    return manager.get_monster(monster_id).to_json()
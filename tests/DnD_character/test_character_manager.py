@@ -0,0 +1,605 @@
+"""
+Unit tests for the DnD_character manager.
+"""
+
+import sys
+import os
+import json
+import threading
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_character import tools
+from src.servers.DnD_character.character_manager import CharacterManager, add_character_change_listener
+from src.servers.DnD_common.serialization import cached_dict
+from src.servers.DnD_common.versioning import VersionConflictError
+
+
+class TestCharacterManager(unittest.TestCase):
+    """Unit tests for the CharacterManager."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.manager = CharacterManager()
+        self.manager.set_character("gandalf", "Gandalf", 30, 30, 50, 50, {"class": "Wizard"})
+        self.manager.set_character("frodo", "Frodo", 10, 12, 0, 0)
+
+    def test_apply_deltas(self):
+        """Test bulk damage and healing with clamping."""
+        characters = self.manager.apply_deltas([
+            {"character_id": "gandalf", "hp_delta": -12, "mp_delta": -60},
+            {"character_id": "frodo", "hp_delta": 5},
+            {"character_id": "gandalf", "hp_delta": -3},
+        ])
+        self.assertEqual(len(characters), 2)
+        gandalf = self.manager.get_character("gandalf")
+        self.assertEqual((gandalf.current_hp, gandalf.current_magic_points), (15, 0))
+        self.assertEqual(self.manager.get_character("frodo").current_hp, 12)
+
+    def test_apply_deltas_unknown_character_changes_nothing(self):
+        """Test that a missing character aborts the whole batch."""
+        with self.assertRaises(ValueError):
+            self.manager.apply_deltas([
+                {"character_id": "gandalf", "hp_delta": -5},
+                {"character_id": "sauron", "hp_delta": -5},
+            ])
+        self.assertEqual(self.manager.get_character("gandalf").current_hp, 30)
+
+    def test_replace_and_delete_release_vitals(self):
+        """Test that replaced and deleted characters keep their own values."""
+        old = self.manager.get_character("frodo")
+        self.manager.set_character("frodo", "Frodo", 1, 12, 0, 0)
+        self.assertEqual(old.current_hp, 10)
+        self.assertEqual(self.manager.get_character("frodo").current_hp, 1)
+
+        gandalf = self.manager.get_character("gandalf")
+        self.manager.delete_character("gandalf")
+        self.assertEqual(gandalf.to_dict()["current_hp"], 30)
+
+    def test_update_with_deltas(self):
+        """Test that HP/MP deltas are applied relative to the stored value and clamped."""
+        self.manager.update_character("gandalf", hp_delta=-7, mp_delta=-10)
+        gandalf = self.manager.update_character("gandalf", hp_delta=-5, mp_delta=100)
+        self.assertEqual((gandalf.current_hp, gandalf.current_magic_points), (18, 50))
+        gandalf = self.manager.update_character("gandalf", hp_delta=-100)
+        self.assertEqual(gandalf.current_hp, 0)
+
+    def test_update_rejects_absolute_and_delta(self):
+        """Test that an absolute value and a delta cannot be combined."""
+        with self.assertRaises(ValueError):
+            self.manager.update_character("gandalf", current_hp=10, hp_delta=-1)
+        self.assertEqual(self.manager.get_character("gandalf").current_hp, 30)
+
+    def test_versions_increase_on_every_write(self):
+        """Test that updates, bulk deltas and replacements bump the version."""
+        self.assertEqual(self.manager.get_character("frodo").version, 1)
+        self.manager.update_character("frodo", hp_delta=1)
+        self.manager.apply_deltas([{"character_id": "frodo", "hp_delta": -1}])
+        frodo = self.manager.set_character("frodo", "Frodo", 10, 12, 0, 0)
+        self.assertEqual(frodo.version, 4)
+
+    def test_expected_version_compare_and_set(self):
+        """Test that stale writes fail fast and current ones succeed."""
+        self.manager.update_character("frodo", name="Mr. Underhill", expected_version=1)
+        with self.assertRaises(VersionConflictError):
+            self.manager.update_character("frodo", hp_delta=-1, expected_version=1)
+        with self.assertRaises(VersionConflictError):
+            self.manager.set_character("frodo", "Frodo", 1, 1, 0, 0, expected_version=0)
+        self.manager.set_character("sam", "Sam", 9, 9, 0, 0, expected_version=0)
+        self.assertEqual(self.manager.get_character("frodo").current_hp, 10)
+
+    def test_concurrent_thread_updates_are_not_lost(self):
+        """Test that deltas from many worker threads all land."""
+        self.manager.set_character("tank", "Tank", 1000, 1000, 0, 0)
+
+        def hit():
+            for _ in range(100):
+                self.manager.update_character("tank", hp_delta=-1)
+
+        threads = [threading.Thread(target=hit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        tank = self.manager.get_character("tank")
+        self.assertEqual((tank.current_hp, tank.version), (200, 801))
+
+    def test_set_characters_atomic_rejects_whole_batch(self):
+        """Test that one invalid entry rejects an atomic batch."""
+        summary = self.manager.set_characters([
+            {"character_id": "sam", "name": "Sam", "current_hp": 9, "max_hp": 9,
+             "current_magic_points": 0, "max_magic_points": 0},
+            {"character_id": "frodo", "name": "Frodo", "current_hp": 20, "max_hp": 12,
+             "current_magic_points": 0, "max_magic_points": 0},
+        ])
+        self.assertEqual((summary["applied"], summary["failed"]), (0, 1))
+        self.assertEqual(summary["errors"][0]["index"], 1)
+        with self.assertRaises(ValueError):
+            self.manager.get_character("sam")
+
+    def test_set_characters_non_atomic_applies_valid_entries(self):
+        """Test that a non-atomic batch applies valid entries and reports the rest."""
+        summary = self.manager.set_characters([
+            {"character_id": "sam", "name": "Sam", "current_hp": 9, "max_hp": 9,
+             "current_magic_points": 0, "max_magic_points": 0},
+            {"character_id": "frodo", "name": "Frodo", "current_hp": 5, "max_hp": 12,
+             "current_magic_points": 0, "max_magic_points": 0, "expected_version": 7},
+            {"character_id": "frodo", "name": "Frodo", "current_hp": 4, "max_hp": 12,
+             "current_magic_points": 0, "max_magic_points": 0, "expected_version": 1},
+        ], atomic=False)
+        self.assertEqual((summary["applied"], summary["failed"]), (2, 1))
+        self.assertEqual(self.manager.get_character("sam").current_hp, 9)
+        frodo = self.manager.get_character("frodo")
+        self.assertEqual((frodo.current_hp, frodo.version), (4, 2))
+
+    def test_set_characters_tool(self):
+        """Test the Set Characters tool returns a compact summary."""
+        manager = tools.get_character_manager()
+        _, result = tools.execute_set_characters({"characters": [
+            {"characterId": f"tool-bulk-{index}", "name": "Hero", "currentHp": 5, "maxHp": 5,
+             "currentMagicPoints": 0, "maxMagicPoints": 0}
+            for index in range(3)
+        ]})
+        self.assertEqual(result, {"applied": 3, "failed": 0, "errors": []})
+        for index in range(3):
+            manager.delete_character(f"tool-bulk-{index}")
+
+    def test_list_characters_tool_pagination(self):
+        """Test paging through List Characters with a cursor."""
+        manager = tools.get_character_manager()
+        for index in range(3):
+            manager.set_character(f"tool-page-{index}", "Hero", 5, 5, 0, 0)
+        try:
+            _, first = tools.execute_list_characters({"limit": 2, "includeTotal": True})
+            self.assertEqual(first["count"], 2)
+            self.assertEqual(first["total"], manager.count_characters())
+            seen = [char["character_id"] for char in first["characters"]]
+            cursor = first["nextCursor"]
+            while cursor:
+                _, page = tools.execute_list_characters({"limit": 2, "cursor": cursor})
+                seen.extend(char["character_id"] for char in page["characters"])
+                cursor = page["nextCursor"]
+            self.assertEqual(seen, [char.character_id for char in manager.list_characters()])
+        finally:
+            for index in range(3):
+                manager.delete_character(f"tool-page-{index}")
+
+    def test_list_characters_tool_summarizes_cached_dicts(self):
+        """Test List Characters returns the cached dicts and one summary line per character."""
+        manager = tools.get_character_manager()
+        manager.set_character("tool-summary", "Sam", 7, 9, 1, 2, {"inventory": {"rope": 1}})
+        try:
+            contents, result = tools.execute_list_characters({})
+            character = manager.get_character("tool-summary")
+            listed = next(item for item in result["characters"] if item["character_id"] == "tool-summary")
+            self.assertIs(listed, cached_dict(character))
+            self.assertIn("- Sam (ID: tool-summary): HP 7/9, MP 1/2", contents[0]["text"].splitlines())
+            self.assertNotIn("rope", contents[0]["text"])
+        finally:
+            manager.delete_character("tool-summary")
+
+    def test_get_and_list_tools_with_fields(self):
+        """Test field projection on Get Character and List Characters."""
+        manager = tools.get_character_manager()
+        manager.set_character("tool-fields", "Sam", 9, 9, 0, 0, {"inventory": {"rope": 1, "pans": 2}})
+        try:
+            _, result = tools.execute_get_character({
+                "characterId": "tool-fields",
+                "fields": ["characterId", "currentHp", "properties.inventory.rope"],
+            })
+            self.assertEqual(result, {"character_id": "tool-fields", "current_hp": 9, "properties": {"inventory": {"rope": 1}}})
+            _, listing = tools.execute_list_characters({"fields": ["name"]})
+            self.assertTrue(all(set(char) == {"name"} for char in listing["characters"]))
+        finally:
+            manager.delete_character("tool-fields")
+
+    def test_query_uses_indexes_maintained_on_writes(self):
+        """Test indexed queries stay correct across set, update and delete."""
+        self.manager.set_character("sam", "Sam", 9, 9, 0, 0, {"class": "Gardener", "level": 3})
+        self.manager.update_character("gandalf", properties={"level": 20})
+        self.manager.create_index("properties.class")
+        self.manager.create_index("properties.level", kind="sorted")
+        self.assertEqual(self.manager.list_indexes(), {"properties.class": "hash", "properties.level": "sorted"})
+
+        characters, plan = self.manager.query_characters([("properties.level", ">=", 5)])
+        self.assertEqual([char.character_id for char in characters], ["gandalf"])
+        self.assertEqual((plan["indexes"], plan["scanned"]), (["properties.level"], 1))
+
+        self.manager.update_character("sam", properties={"level": 8})
+        self.manager.delete_character("gandalf")
+        characters, _ = self.manager.query_characters([("properties.level", "gt", 5), ("name", "eq", "Sam")])
+        self.assertEqual([char.character_id for char in characters], ["sam"])
+
+    def test_query_without_index_scans(self):
+        """Test that queries on unindexed fields fall back to a scan."""
+        characters, plan = self.manager.query_characters([("currentHp", "<", 20)])
+        self.assertEqual([char.character_id for char in characters], ["frodo"])
+        self.assertEqual((plan["indexes"], plan["scanned"]), ([], 2))
+
+    def test_query_filter_expression_uses_indexes(self):
+        """Test filter expressions combined with where predicates and index pushdown."""
+        self.manager.set_character("sam", "Sam", 3, 9, 0, 0, {"class": "Gardener", "level": 3})
+        self.manager.create_index("properties.class")
+        characters, plan = self.manager.query_characters(
+            filter_expression='currentHp < maxHp * 0.5 and properties.class == "Gardener"'
+        )
+        self.assertEqual([char.character_id for char in characters], ["sam"])
+        self.assertEqual((plan["indexes"], plan["scanned"]), (["properties.class"], 1))
+
+        characters, plan = self.manager.query_characters(
+            [("properties.class", "eq", "Gardener")],
+            filter_expression='properties.class == "Gardener" and properties.level > 5'
+        )
+        self.assertEqual((characters, plan["indexes"]), ([], ["properties.class"]))
+        with self.assertRaises(ValueError):
+            self.manager.query_characters(filter_expression="currentHp <")
+
+    def test_order_characters_uses_sorted_views(self):
+        """Test ordered top-k listings stay correct across writes."""
+        self.manager.set_character("sam", "Sam", 9, 9, 0, 0, {"initiative": 12})
+        self.manager.update_character("gandalf", properties={"initiative": 18})
+        self.assertEqual([char.character_id for char in self.manager.order_characters("currentHp", limit=2)], ["sam", "frodo"])
+        names = [char.name for char in self.manager.order_characters("name")]
+        self.assertEqual(names, sorted(["Frodo", "Gandalf", "Sam"]))
+
+        self.manager.update_character("sam", hp_delta=-9)
+        self.manager.delete_character("frodo")
+        self.assertEqual(
+            [char.character_id for char in self.manager.order_characters("currentHp", descending=True)],
+            ["gandalf", "sam"]
+        )
+        self.manager.set_character("frodo", "Frodo", 10, 10, 0, 0)
+        self.assertEqual(
+            [char.character_id for char in self.manager.order_characters("properties.initiative", descending=True)],
+            ["gandalf", "sam", "frodo"]
+        )
+
+    def test_order_characters_requires_sorted_view(self):
+        """Test ordering by other fields needs a sorted index."""
+        with self.assertRaises(ValueError):
+            self.manager.order_characters("maxHp")
+        self.manager.create_index("maxHp", kind="sorted")
+        self.assertEqual([char.character_id for char in self.manager.order_characters("maxHp", limit=1)], ["frodo"])
+
+    def test_list_characters_tool_order_by(self):
+        """Test the orderBy option of the List Characters tool."""
+        manager = tools.get_character_manager()
+        manager.set_character("tool-order", "Zzz", 1, 1, 0, 0)
+        try:
+            _, result = tools.execute_list_characters({"orderBy": "currentHp", "limit": 1, "fields": ["characterId"]})
+            self.assertEqual(result["characters"], [{"character_id": "tool-order"}])
+            self.assertNotIn("nextCursor", result)
+            with self.assertRaises(ValueError):
+                tools.execute_list_characters({"orderBy": "name", "cursor": "c2VxOjE"})
+        finally:
+            manager.delete_character("tool-order")
+
+    def test_search_characters(self):
+        """Test name search follows sets, renames and deletes."""
+        self.manager.set_character("sam", "Samwise Gamgee", 9, 9, 0, 0)
+        self.assertEqual([char.character_id for char, _, _ in self.manager.search_characters("gamg", fuzzy=False)], ["sam"])
+        self.manager.update_character("sam", name="Sam")
+        self.manager.delete_character("frodo")
+        self.assertEqual(self.manager.search_characters("gamg", fuzzy=False), [])
+        self.assertEqual(self.manager.search_characters("frodo"), [])
+        character, _, kind = self.manager.search_characters("Gandlaf")[0]
+        self.assertEqual((character.character_id, kind), ("gandalf", "fuzzy"))
+
+    def test_search_characters_tool(self):
+        """Test the Search Characters tool."""
+        manager = tools.get_character_manager()
+        manager.set_character("tool-search", "Meriadoc Brandybuck", 9, 9, 0, 0)
+        try:
+            _, result = tools.execute_search_characters({"query": "brandy", "limit": 1})
+            self.assertEqual(result["results"], [
+                {"characterId": "tool-search", "name": "Meriadoc Brandybuck", "score": result["results"][0]["score"], "match": "prefix"}
+            ])
+            with self.assertRaises(ValueError):
+                tools.execute_search_characters({})
+        finally:
+            manager.delete_character("tool-search")
+
+    def test_query_characters_tool(self):
+        """Test the Create Character Index and Query Characters tools."""
+        manager = tools.get_character_manager()
+        manager.set_character("tool-query", "Sam", 9, 9, 0, 0, {"class": "Gardener"})
+        try:
+            _, created = tools.execute_create_character_index({"field": "properties.class"})
+            self.assertGreaterEqual(created["entries"], 1)
+            _, result = tools.execute_query_characters({
+                "where": [{"field": "properties.class", "op": "eq", "value": "Gardener"}],
+                "fields": ["characterId"],
+            })
+            self.assertIn({"character_id": "tool-query"}, result["characters"])
+            self.assertEqual(result["plan"]["indexes"], ["properties.class"])
+            _, result = tools.execute_query_characters({"filter": "properties.class == 'Gardener' and currentHp == 9"})
+            self.assertIn("tool-query", [char["character_id"] for char in result["characters"]])
+        finally:
+            manager.delete_character("tool-query")
+            manager.drop_index("properties.class")
+
+    def test_apply_damage_tool(self):
+        """Test the Apply Damage tool."""
+        manager = tools.get_character_manager()
+        manager.set_character("tool-apply", "Sam", 9, 9, 0, 0)
+        _, result = tools.execute_apply_damage({"targets": [{"characterId": "tool-apply", "hpDelta": -4}]})
+        self.assertEqual(result["count"], 1)
+        self.assertEqual(result["characters"][0]["currentHp"], 5)
+        manager.delete_character("tool-apply")
+
+    def test_rests_and_regeneration(self):
+        """Test bulk recovery: capped at max, defeated characters skipped, one change record per updated character."""
+        self.manager.set_character("sam", "Sam", 0, 12, 0, 4)
+        self.manager.update_character("gandalf", current_hp=20, current_magic_points=10)
+        seq = self.manager.changes_since(0)["seq"]
+        version = self.manager.get_character("gandalf").version
+
+        characters, defeated = self.manager.regenerate(["gandalf", "frodo", "sam"], hp=5, mp=3)
+        self.assertEqual([character.character_id for character in characters], ["gandalf", "frodo"])
+        self.assertEqual(defeated, ["sam"])
+        gandalf = self.manager.get_character("gandalf")
+        self.assertEqual((gandalf.current_hp, gandalf.current_magic_points, gandalf.version), (25, 13, version + 1))
+        self.assertEqual(self.manager.get_character("frodo").current_hp, 12)
+        self.assertEqual([character_id for _, character_id, _ in self.manager.changes_since(seq)["changes"]],
+                         ["gandalf", "frodo"])
+
+        characters, _ = self.manager.short_rest(["gandalf"], hp_dice="1d1+2")
+        self.assertEqual(characters[0].current_hp, 28)
+        characters, defeated = self.manager.long_rest()
+        self.assertEqual([character.character_id for character in characters], ["gandalf"])
+        self.assertEqual((characters[0].current_hp, characters[0].current_magic_points), (30, 50))
+        self.assertEqual(self.manager.long_rest()[0], [])
+
+        with self.assertRaises(ValueError):
+            self.manager.long_rest(["gandalf", "sauron"])
+        with self.assertRaises(ValueError):
+            self.manager.short_rest(["gandalf"])
+        with self.assertRaises(ValueError):
+            self.manager.regenerate(["gandalf"], hp=-1)
+
+    def test_rest_tools(self):
+        """Test the Long Rest, Short Rest and Regenerate tools."""
+        manager = tools.get_character_manager("rest-campaign")
+        manager.set_character("tool-rest", "Sam", 2, 9, 1, 6)
+        manager.set_character("tool-rest-down", "Pippin", 0, 9, 0, 6)
+        _, result = tools.execute_regenerate({"campaignId": "rest-campaign", "characterIds": ["tool-rest"], "hp": 3})
+        self.assertEqual((result["count"], result["characters"][0]["currentHp"]), (1, 5))
+        _, result = tools.execute_short_rest({"campaignId": "rest-campaign", "mpDice": "1d1"})
+        self.assertEqual(result["characters"][0]["currentMagicPoints"], 2)
+        self.assertEqual(result["defeated"], ["tool-rest-down"])
+        _, result = tools.execute_long_rest({"campaignId": "rest-campaign"})
+        self.assertEqual((result["characters"][0]["currentHp"], result["characters"][0]["currentMagicPoints"]), (9, 6))
+        with self.assertRaises(ValueError):
+            tools.execute_short_rest({"campaignId": "rest-campaign"})
+        tools.execute_drop_character_campaign({"campaignId": "rest-campaign"})
+
+    def test_effects(self):
+        """Test per-round effects: batched ticks, expiry and removal with the character."""
+        self.manager.set_character("sam", "Sam", 12, 12, 0, 4)
+        poison = self.manager.add_effect("gandalf", "poisoned", damage_dice="1d1+1", rounds=2)
+        self.manager.add_effect("sam", "blessed", mp_delta=1, every=2)
+        self.manager.add_effect("frodo", "stunned", rounds=1)
+        outcome = self.manager.advance_round()
+        self.assertEqual(outcome["round"], 1)
+        self.assertEqual([(effect.name, hp, mp) for effect, hp, mp in outcome["ticks"]], [("poisoned", -2, 0)])
+        self.assertEqual([effect.name for effect in outcome["expired"]], ["stunned"])
+        self.assertEqual([character.character_id for character in outcome["characters"]], ["gandalf"])
+
+        outcome = self.manager.advance_round(3)
+        self.assertEqual(outcome["round"], 4)
+        self.assertEqual(self.manager.get_character("gandalf").current_hp, 26)
+        self.assertEqual(self.manager.get_character("sam").current_magic_points, 2)
+        self.assertEqual([effect.effect_id for effect in outcome["expired"]], [poison.effect_id])
+        self.assertEqual([effect.name for effect in self.manager.list_effects()], ["blessed"])
+
+        self.manager.delete_character("sam")
+        self.assertEqual(self.manager.list_effects(), [])
+        with self.assertRaises(ValueError):
+            self.manager.add_effect("sauron", "cursed", hp_delta=-1)
+        with self.assertRaises(ValueError):
+            self.manager.add_effect("gandalf", "cursed", damage_dice="banana")
+        with self.assertRaises(ValueError):
+            self.manager.advance_round(0)
+
+    def test_effect_tools(self):
+        """Test the effect tools and Advance Round."""
+        manager = tools.get_character_manager("effect-campaign")
+        manager.set_character("tool-effect", "Sam", 9, 9, 0, 0)
+        _, result = tools.execute_add_character_effect({
+            "campaignId": "effect-campaign", "characterId": "tool-effect", "name": "burning", "hpDelta": -3, "rounds": 1,
+        })
+        self.assertEqual((result["characterId"], result["expiresRound"], result["nextRound"]), ("tool-effect", 1, 1))
+        effect_id = tools.execute_add_character_effect({
+            "campaignId": "effect-campaign", "characterId": "tool-effect", "name": "hasted", "rounds": 10,
+        })[1]["effectId"]
+        _, result = tools.execute_list_character_effects({"campaignId": "effect-campaign", "characterId": "tool-effect"})
+        self.assertEqual((result["round"], result["count"]), (0, 2))
+        _, result = tools.execute_advance_round({"campaignId": "effect-campaign"})
+        self.assertEqual(result["ticks"], [{"effectId": result["ticks"][0]["effectId"], "characterId": "tool-effect",
+                                            "name": "burning", "hpChange": -3, "mpChange": 0}])
+        self.assertEqual(result["characters"][0]["currentHp"], 6)
+        self.assertEqual([effect["name"] for effect in result["expired"]], ["burning"])
+        _, result = tools.execute_remove_character_effect({"campaignId": "effect-campaign", "effectId": effect_id})
+        self.assertEqual(result["name"], "hasted")
+        self.assertEqual(tools.execute_list_character_effects({"campaignId": "effect-campaign"})[1]["count"], 0)
+        tools.execute_drop_character_campaign({"campaignId": "effect-campaign"})
+
+    def test_patch_properties(self):
+        """Test that patches change nested properties in place and apply all-or-nothing."""
+        version = self.manager.set_character("frodo", "Frodo", 9, 9, 0, 0, {"inventory": {"potions": {"count": 3}, "rope": True}}).version
+        character = self.manager.update_character(
+            "frodo", hp_delta=-2,
+            merge_patch={"inventory": {"rope": None}},
+            patch=[{"op": "increment", "path": "/inventory/potions/count", "value": -1}]
+        )
+        self.assertEqual(character.properties, {"inventory": {"potions": {"count": 2}}})
+        self.assertEqual((character.current_hp, character.version), (7, version + 1))
+
+        with self.assertRaises(ValueError):
+            self.manager.update_character(
+                "frodo", name="Sam", hp_delta=-5,
+                patch=[
+                    {"op": "increment", "path": "/inventory/potions/count", "value": -1},
+                    {"op": "test", "path": "/inventory/potions/count", "value": 0},
+                ]
+            )
+        character = self.manager.get_character("frodo")
+        self.assertEqual((character.name, character.current_hp, character.version), ("Frodo", 7, version + 1))
+        self.assertEqual(character.properties, {"inventory": {"potions": {"count": 2}}})
+
+        manager = tools.get_character_manager()
+        manager.set_character("tool-patch", "Sam", 9, 9, 0, 0, {"inventory": {"potions": {"count": 1}}})
+        _, result = tools.execute_update_character({
+            "characterId": "tool-patch",
+            "patch": [{"op": "add", "path": "/inventory/potions/kind", "value": "healing"}],
+            "mergePatch": {"title": "Gardener"},
+        })
+        self.assertEqual(result["properties"], {"inventory": {"potions": {"count": 1, "kind": "healing"}}, "title": "Gardener"})
+        manager.delete_character("tool-patch")
+
+    def test_derived_stats(self):
+        """Test derived stats through the manager and tools, and their invalidation on updates."""
+        self.manager.set_character("frodo", "Frodo", 9, 9, 0, 0, {"strength": 8, "dexterity": 17, "level": 1})
+        self.assertEqual(self.manager.get_derived_stats("frodo", ["strengthModifier", "armorClass"]),
+                         {"strengthModifier": -1, "armorClass": 13})
+        self.manager.define_derived_stat("stealth", "derived.dexterityModifier + derived.proficiencyBonus")
+        self.assertEqual(self.manager.get_derived_stats("frodo", ["stealth"]), {"stealth": 5})
+        self.manager.update_character("frodo", merge_patch={"level": 5})
+        self.assertEqual(self.manager.get_derived_stats("frodo", ["stealth"]), {"stealth": 6})
+        self.manager.update_character("frodo", properties={"dexterity": 10})
+        self.assertEqual(self.manager.get_derived_stats("frodo", ["stealth", "armorClass"]), {"stealth": 3, "armorClass": 10})
+        self.assertIn("stealth", self.manager.list_derived_stats())
+        self.manager.drop_derived_stat("stealth")
+        with self.assertRaises(ValueError):
+            self.manager.get_derived_stats("frodo", ["stealth"])
+
+        manager = tools.get_character_manager()
+        manager.set_character("tool-derived", "Sam", 9, 9, 0, 0, {"strength": 14})
+        _, result = tools.execute_get_character({"characterId": "tool-derived", "includeDerived": True})
+        self.assertEqual(result["derived"]["strengthModifier"], 2)
+        _, result = tools.execute_get_character({"characterId": "tool-derived", "fields": ["name"], "includeDerived": True})
+        self.assertEqual(result["derived"]["proficiencyBonus"], 2)
+        _, result = tools.execute_define_character_stat({"name": "athletics", "formula": "derived.strengthModifier + 1"})
+        self.assertEqual(result["stats"]["athletics"], "derived.strengthModifier + 1")
+        _, result = tools.execute_roll_character_check({"characterId": "tool-derived", "notation": "1d1+{athletics}"})
+        self.assertEqual((result["resolvedNotation"], result["total"]), ("1d1+3", 4))
+        with self.assertRaises(ValueError):
+            tools.execute_roll_character_check({"characterId": "tool-derived", "notation": "1d20+{dexterityModifier}"})
+        tools.execute_define_character_stat({"name": "athletics", "formula": None})
+        self.assertNotIn("athletics", manager.list_derived_stats())
+        manager.delete_character("tool-derived")
+
+    def test_changes_since(self):
+        """Test the change feed: upserts, delete tombstones and limits."""
+        first = self.manager.changes_since(0)["seq"]
+        self.manager.set_character("frodo", "Frodo", 9, 9, 0, 0)
+        self.manager.set_character("sam", "Sam", 12, 12, 0, 0)
+        self.manager.update_character("frodo", hp_delta=-2)
+        self.manager.delete_character("sam")
+
+        feed = self.manager.changes_since(first)
+        self.assertEqual([(character_id, character is None) for _, character_id, character in feed["changes"]],
+                         [("frodo", False), ("sam", True)])
+        self.assertEqual(feed["changes"][0][2].current_hp, 7)
+        self.assertEqual((feed["seq"], feed["has_more"], feed["resync_required"]), (first + 4, False, False))
+
+        limited = self.manager.changes_since(first, limit=1)
+        self.assertEqual((limited["seq"], limited["has_more"]), (first + 3, True))
+        self.assertEqual(self.manager.changes_since(feed["seq"])["changes"], [])
+
+    def test_changes_since_tool(self):
+        """Test the Changes Since tool."""
+        manager = tools.get_character_manager()
+        _, start = tools.execute_changes_since({"since": 0, "limit": 1})
+        seq = tools.execute_changes_since({"since": start["seq"]})[1]["seq"]
+        manager.set_character("tool-changes", "Sam", 9, 9, 0, 0)
+        manager.delete_character("tool-changes")
+        _, result = tools.execute_changes_since({"since": seq, "fields": ["name"]})
+        self.assertEqual(result["changes"], [
+            {"seq": seq + 2, "characterId": "tool-changes", "op": "delete", "character": None}
+        ])
+        self.assertFalse(result["resyncRequired"])
+        _, result = tools.execute_changes_since({"since": seq + 100})
+        self.assertTrue(result["resyncRequired"])
+
+    def test_conditional_get_and_list(self):
+        """Test that ifNoneMatch skips unchanged characters and listings."""
+        manager = tools.get_character_manager()
+        manager.set_character("etag-char", "Sam", 9, 9, 0, 0)
+        _, result = tools.execute_get_character({"characterId": "etag-char"})
+        etag = result["etag"]
+        self.assertEqual(manager.get_character_etag("etag-char"), etag)
+        _, result = tools.execute_get_character({"characterId": "etag-char", "ifNoneMatch": etag})
+        self.assertEqual(result, {"notModified": True, "etag": etag})
+        _, listed = tools.execute_list_characters({"limit": 5})
+        _, result = tools.execute_list_characters({"limit": 5, "ifNoneMatch": listed["etag"]})
+        self.assertTrue(result["notModified"])
+        _, result = tools.execute_list_characters({"limit": 6, "ifNoneMatch": listed["etag"]})
+        self.assertNotIn("notModified", result)
+
+        manager.update_character("etag-char", current_hp=3)
+        _, result = tools.execute_get_character({"characterId": "etag-char", "ifNoneMatch": etag, "fields": ["currentHp", "etag"]})
+        self.assertEqual(result["current_hp"], 3)
+        self.assertNotEqual(result["etag"], etag)
+        _, result = tools.execute_list_characters({"limit": 5, "ifNoneMatch": listed["etag"]})
+        self.assertNotIn("notModified", result)
+
+        # A recreated character does not match the ETag of its predecessor
+        manager.delete_character("etag-char")
+        manager.set_character("etag-char", "Sam", 9, 9, 0, 0)
+        manager._characters["etag-char"].created_at = "recreated"
+        self.assertNotEqual(manager.get_character_etag("etag-char"), etag)
+        manager.delete_character("etag-char")
+        with self.assertRaises(ValueError):
+            manager.get_character_etag("etag-char")
+
+    def test_character_resources(self):
+        """Test reading characters through resource URIs and change listeners."""
+        changed = []
+        add_character_change_listener(lambda campaign_id, character_id, op: changed.append((campaign_id, character_id, op)))
+        tools.execute_set_character({
+            "campaignId": "resource-campaign", "characterId": "frodo 1", "name": "Frodo",
+            "currentHp": 9, "maxHp": 9, "currentMagicPoints": 0, "maxMagicPoints": 0
+        })
+        self.assertEqual(changed[-1], ("resource-campaign", "frodo 1", "upsert"))
+        uri = tools.character_uri("resource-campaign", "frodo 1")
+        self.assertEqual(uri, "character://resource-campaign/frodo%201")
+        self.assertEqual(json.loads(tools.read_character_resource(uri))["name"], "Frodo")
+        campaign = tools.read_character_resource(tools.character_campaign_uri("resource-campaign"))
+        self.assertEqual([char["character_id"] for char in json.loads(campaign)], ["frodo 1"])
+        self.assertEqual(tools.canonical_character_uri("character://resource-campaign"), "character://resource-campaign")
+        with self.assertRaises(ValueError):
+            tools.read_character_resource("character://resource-campaign/missing")
+        with self.assertRaises(ValueError):
+            tools.read_character_resource("file:///etc/passwd")
+        tools.execute_drop_character_campaign({"campaignId": "resource-campaign"})
+
+    def test_campaigns_are_isolated(self):
+        """Test that tools only see their campaign's characters and that a campaign can be dropped."""
+        tools.execute_set_character({
+            "campaignId": "tool-campaign", "characterId": "frodo", "name": "Frodo",
+            "currentHp": 9, "maxHp": 9, "currentMagicPoints": 0, "maxMagicPoints": 0
+        })
+        _, listed = tools.execute_list_characters({"campaignId": "tool-campaign"})
+        self.assertEqual([char["character_id"] for char in listed["characters"]], ["frodo"])
+        self.assertNotIn("frodo", [char.character_id for char in tools.get_character_manager().list_characters()])
+        with self.assertRaises(ValueError):
+            tools.execute_get_character({"campaignId": "other-campaign", "characterId": "frodo"})
+
+        _, campaigns = tools.execute_list_character_campaigns({})
+        self.assertIn({"campaignId": "tool-campaign", "count": 1}, campaigns["campaigns"])
+        _, dropped = tools.execute_drop_character_campaign({"campaignId": "tool-campaign"})
+        self.assertEqual(dropped, {"campaignId": "tool-campaign", "dropped": 1})
+        self.assertEqual(tools.get_character_manager("tool-campaign").count_characters(), 0)
+        tools.execute_drop_character_campaign({"campaignId": "tool-campaign"})
+        tools.execute_drop_character_campaign({"campaignId": "other-campaign"})
+        with self.assertRaises(ValueError):
+            tools.execute_drop_character_campaign({"campaignId": "tool-campaign"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Unit tests for the bounded change log.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.changelog import DELETE, UPSERT, ChangeLog
+
+
+class TestChangeLog(unittest.TestCase):
+    """Unit tests for ChangeLog."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.log = ChangeLog(capacity=4)
+
+    def test_since_reports_latest_change_per_entity(self):
+        """Test that repeated writes to one entity are collapsed to the latest."""
+        self.assertEqual(self.log.record("a", UPSERT), 1)
+        self.log.record("b", UPSERT)
+        self.log.record("a", UPSERT)
+        self.log.record("b", DELETE)
+        self.assertEqual(self.log.latest_seq, 4)
+        self.assertEqual(self.log.since(0), ([(3, "a", UPSERT), (4, "b", DELETE)], False, False))
+        self.assertEqual(self.log.since(3), ([(4, "b", DELETE)], False, False))
+        self.assertEqual(self.log.since(4), ([], False, False))
+
+    def test_record_many(self):
+        """Test that a batch gets consecutive sequence numbers and notifies listeners per entity."""
+        notified = []
+        self.log.add_listener(lambda entity_id, op: notified.append(entity_id))
+        self.log.record("a", UPSERT)
+        self.assertEqual(self.log.record_many(["b", "c"], UPSERT), 3)
+        self.assertEqual(self.log.record_many([], UPSERT), 3)
+        self.assertEqual(self.log.since(1), ([(2, "b", UPSERT), (3, "c", UPSERT)], False, False))
+        self.assertEqual(notified, ["a", "b", "c"])
+
+    def test_limit(self):
+        """Test that a limited result reports that more changes remain."""
+        for entity_id in ("a", "b", "c"):
+            self.log.record(entity_id, UPSERT)
+        self.assertEqual(self.log.since(0, limit=2), ([(1, "a", UPSERT), (2, "b", UPSERT)], True, False))
+        with self.assertRaises(ValueError):
+            self.log.since(0, limit=0)
+
+    def test_resync_when_out_of_window(self):
+        """Test that a sequence number older than the window or newer than the log requires a resync."""
+        for entity_id in ("a", "b", "c", "d", "e", "f"):
+            self.log.record(entity_id, UPSERT)
+        self.assertEqual(self.log.since(1), ([], False, True))
+        self.assertEqual(self.log.since(2)[0], [(3, "c", UPSERT), (4, "d", UPSERT), (5, "e", UPSERT), (6, "f", UPSERT)])
+        self.assertTrue(self.log.since(7)[2])
+        with self.assertRaises(ValueError):
+            self.log.since(-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
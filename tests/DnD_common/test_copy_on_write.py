@@ -0,0 +1,92 @@
+"""
+Unit tests for copy-on-write properties.
+"""
+
+import sys
+import os
+import copy
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.copy_on_write import CopyOnWriteProperties, freeze_properties
+
+
+class TestCopyOnWriteProperties(unittest.TestCase):
+    """Unit tests for CopyOnWriteProperties."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.source = {"armorClass": 15, "abilities": {"str": 8}}
+        self.base = freeze_properties(self.source)
+
+    def test_frozen_base_is_a_read_only_copy(self):
+        """Test that the shared base is detached from its source and cannot be written."""
+        self.source["armorClass"] = 99
+        self.source["abilities"]["str"] = 99
+        self.assertEqual(dict(self.base), {"armorClass": 15, "abilities": {"str": 8}})
+        with self.assertRaises(TypeError):
+            self.base["armorClass"] = 1
+
+    def test_reads_fall_through_and_writes_stay_private(self):
+        """Test that overrides never touch the shared base or sibling instances."""
+        first = CopyOnWriteProperties(self.base, {"loot": "dagger"})
+        second = CopyOnWriteProperties(self.base)
+        first.update({"armorClass": 17})
+        del first["abilities"]
+        self.assertEqual(first, {"armorClass": 17, "loot": "dagger"})
+        self.assertEqual(second, {"armorClass": 15, "abilities": {"str": 8}})
+        self.assertEqual(self.base["armorClass"], 15)
+        self.assertNotIn("abilities", first)
+        self.assertEqual(len(first), 2)
+        first["abilities"] = {"str": 20}
+        self.assertEqual(first["abilities"], {"str": 20})
+        with self.assertRaises(KeyError):
+            del second["missing"]
+
+    def test_initial_overrides_are_copied(self):
+        """Test that nested overrides are not shared with the caller or between instances."""
+        overrides = {"inventory": {"gold": 5}}
+        first = CopyOnWriteProperties(self.base, overrides)
+        second = CopyOnWriteProperties(self.base, overrides)
+        first["inventory"]["gold"] = 9
+        self.assertEqual(second["inventory"], {"gold": 5})
+        self.assertEqual(overrides, {"inventory": {"gold": 5}})
+
+    def test_overrides_round_trip(self):
+        """Test that overrides and removed keys rebuild the same view of the base."""
+        properties = CopyOnWriteProperties(self.base, {"loot": "dagger"})
+        del properties["abilities"]
+        overrides, deleted = properties.overrides()
+        self.assertEqual((overrides, deleted), ({"loot": "dagger"}, ["abilities"]))
+        rebuilt = CopyOnWriteProperties(properties.base, overrides, deleted)
+        self.assertEqual(rebuilt, {"armorClass": 15, "loot": "dagger"})
+        self.assertIs(rebuilt.base, self.base)
+
+    def test_own_and_copy_detach_nested_values(self):
+        """Test that owned values and copies can be changed in place without touching the base or the original."""
+        properties = CopyOnWriteProperties(self.base)
+        properties.own("abilities")["str"] = 18
+        self.assertEqual(properties["abilities"], {"str": 18})
+        self.assertEqual(self.base["abilities"], {"str": 8})
+        clone = properties.copy()
+        clone.own("abilities")["str"] = 3
+        self.assertEqual(properties["abilities"], {"str": 18})
+        with self.assertRaises(KeyError):
+            properties.own("missing")
+
+    def test_deep_copy_is_a_plain_dict(self):
+        """Test that deep copies (used by dataclasses.asdict) resolve to plain dicts."""
+        properties = CopyOnWriteProperties(self.base, {"loot": "dagger"})
+        copied = copy.deepcopy(properties)
+        self.assertIs(type(copied), dict)
+        self.assertEqual(copied, {"armorClass": 15, "abilities": {"str": 8}, "loot": "dagger"})
+        copied["abilities"]["str"] = 1
+        self.assertEqual(self.base["abilities"]["str"], 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Unit tests for memoized derived stats.
+"""
+
+import sys
+import os
+import unittest
+from dataclasses import dataclass, field
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.derived import DerivedStats, placeholder_names, substitute_stats, update_paths
+
+
+@dataclass
+class Entity:
+    current_hp: int
+    max_hp: int
+    properties: dict = field(default_factory=dict)
+    version: int = 1
+
+
+ATTRIBUTES = ("current_hp", "max_hp", "properties", "version")
+
+
+class CountingStats(DerivedStats):
+    """Derived stats that count formula evaluations."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.evaluations = []
+
+    def _build(self, generation, compiled, texts):
+        definitions = super()._build(generation, compiled, texts)
+        for name, formula in definitions.formulas.items():
+            if not hasattr(formula.evaluate, "counted"):
+                definitions.formulas[name] = type(formula)(
+                    formula.text, self._counted(name, formula.evaluate), formula.conjuncts, formula.paths
+                )
+        return definitions
+
+    def _counted(self, name, evaluate):
+        def counted(entity):
+            self.evaluations.append(name)
+            return evaluate(entity)
+        counted.counted = True
+        return counted
+
+
+class TestDerivedStats(unittest.TestCase):
+    """Unit tests for DerivedStats."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.stats = CountingStats(ATTRIBUTES)
+        self.wizard = Entity(20, 20, {"strength": 8, "dexterity": 14, "intelligence": 17, "wisdom": 12, "charisma": 10, "level": 5})
+
+    def update(self, entity, **changes):
+        """Apply an update the way the managers do."""
+        previous_version = entity.version
+        if "current_hp" in changes:
+            entity.current_hp = changes["current_hp"]
+        if "properties" in changes:
+            entity.properties.update(changes["properties"])
+        entity.version += 1
+        self.stats.invalidate(entity, previous_version, update_paths(**changes))
+
+    def test_default_formulas(self):
+        """Test ability modifiers, proficiency, armor class and spell save DC."""
+        values = self.stats.values(self.wizard)
+        self.assertEqual(values["strengthModifier"], -1)
+        self.assertEqual(values["intelligenceModifier"], 3)
+        self.assertEqual(values["proficiencyBonus"], 3)
+        self.assertEqual(values["armorClass"], 12)
+        self.assertEqual(values["spellSaveDc"], 8 + 3 + 3)
+        # Stats whose inputs are missing are left out
+        self.assertNotIn("constitutionModifier", values)
+        self.assertNotIn("spellSaveDc", self.stats.values(Entity(5, 5, {"intelligence": 10, "wisdom": 10})))
+        self.assertEqual(self.stats.values(Entity(5, 5, {"armorClass": 17}), ["armorClass"]), {"armorClass": 17})
+
+    def test_values_are_memoized_and_only_dependents_invalidated(self):
+        """Test that an update recomputes only the stats reading a changed field."""
+        self.stats.values(self.wizard)
+        self.stats.evaluations.clear()
+        self.stats.values(self.wizard)
+        self.assertEqual(self.stats.evaluations, [])
+
+        self.update(self.wizard, current_hp=5, properties={"wisdom": 16})
+        values = self.stats.values(self.wizard)
+        self.assertEqual(sorted(self.stats.evaluations), ["passivePerception", "spellSaveDc", "wisdomModifier"])
+        self.assertEqual(values["passivePerception"], 13)
+
+        # Writes that do not carry the memo forward discard it
+        self.wizard.version += 1
+        self.stats.evaluations.clear()
+        self.stats.values(self.wizard, ["strengthModifier"])
+        self.assertEqual(self.stats.evaluations, ["strengthModifier"])
+
+    def test_define_and_drop(self):
+        """Test defining stats over fields and other stats, and rejecting cycles and unknown stats."""
+        self.stats.values(self.wizard)
+        self.stats.define("bloodied", "currentHp * 2 <= maxHp")
+        self.stats.define("arcana", "derived.intelligenceModifier + derived.proficiencyBonus")
+        self.assertEqual(self.stats.values(self.wizard, ["arcana", "bloodied"]), {"arcana": 6, "bloodied": False})
+        self.update(self.wizard, current_hp=5)
+        self.stats.evaluations.clear()
+        self.assertEqual(self.stats.values(self.wizard, ["arcana", "bloodied"]), {"arcana": 6, "bloodied": True})
+        self.assertEqual(self.stats.evaluations, ["bloodied"])
+
+        for name, formula in (("a", "derived.a + 1"), ("b", "derived.missing"), ("c d", "1"), ("e", "currentHp >")):
+            with self.assertRaises(ValueError, msg=name):
+                self.stats.define(name, formula)
+        with self.assertRaises(ValueError):
+            self.stats.define("intelligenceModifier", "derived.arcana")
+        with self.assertRaises(ValueError):
+            self.stats.drop("intelligenceModifier")
+        self.stats.drop("arcana")
+        self.assertNotIn("arcana", self.stats.formulas())
+        with self.assertRaises(ValueError):
+            self.stats.values(self.wizard, ["arcana"])
+
+    def test_update_paths(self):
+        """Test the field paths reported for update arguments."""
+        self.assertEqual(
+            update_paths(
+                name=None, hp_delta=-2, properties={"strength": 9},
+                patch=[{"op": "increment", "path": "/inventory/potions", "value": 1}],
+                merge_patch={"spells": {"fire": None}, "title": "Mage"}
+            ),
+            [("current_hp",), ("properties", "strength"), ("properties", "inventory", "potions"),
+             ("properties", "spells", "fire"), ("properties", "title")],
+        )
+
+    def test_substitute_stats(self):
+        """Test filling derived stats into dice notation."""
+        notation = "1d20+{strengthModifier} - {proficiencyBonus}"
+        self.assertEqual(placeholder_names(notation), ["strengthModifier", "proficiencyBonus"])
+        self.assertEqual(substitute_stats(notation, {"strengthModifier": -1, "proficiencyBonus": 3}), "1d20-1-3")
+        self.assertEqual(substitute_stats("{bonus}+1d4", {"bonus": 2.0}), "2+1d4")
+        for notation, values in (("1d20+{x}", {}), ("1d20+{x}", {"x": True}), ("1d{x}", {"x": 6}), ("1d20+{x}", {"x": 1.5})):
+            with self.assertRaises(ValueError, msg=notation):
+                substitute_stats(notation, values)
+
+
+if __name__ == '__main__':
+    unittest.main()
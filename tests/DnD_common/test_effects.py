@@ -0,0 +1,63 @@
+"""
+Unit tests for the per-round effect scheduler.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.effects import EffectScheduler
+
+
+class TestEffectScheduler(unittest.TestCase):
+    """Unit tests for EffectScheduler."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.scheduler = EffectScheduler()
+
+    def names(self, effects):
+        """Get the sorted names of effects."""
+        return sorted(effect.name for effect in effects)
+
+    def test_ticks_and_expiry(self):
+        """Test that effects tick on their cadence, tick on their last round and then expire."""
+        self.scheduler.add("troll", "regeneration", hp_delta=10)
+        self.scheduler.add("troll", "poison", damage_dice="1d4", every=2, rounds=5)
+        self.scheduler.add("wizard", "concentration", rounds=3)
+        rounds = [self.scheduler.advance() for _ in range(6)]
+        self.assertEqual([round_number for round_number, _, _ in rounds], [1, 2, 3, 4, 5, 6])
+        self.assertEqual([self.names(ticking) for _, ticking, _ in rounds], [
+            ["regeneration"], ["poison", "regeneration"], ["regeneration"],
+            ["poison", "regeneration"], ["regeneration"], ["regeneration"],
+        ])
+        self.assertEqual([self.names(expired) for _, _, expired in rounds], [[], [], ["concentration"], [], ["poison"], []])
+        self.assertEqual(self.names(self.scheduler.effects()), ["regeneration"])
+
+    def test_removed_effects_never_fire(self):
+        """Test that removing an effect, or every effect of an entity, cancels its pending timers."""
+        poison = self.scheduler.add("orc", "poison", hp_delta=-2)
+        self.scheduler.add("orc", "burning", damage_dice="1d6")
+        self.scheduler.add("elf", "blessed", mp_delta=1)
+        self.assertEqual(self.scheduler.remove(poison.effect_id), poison)
+        self.assertEqual(self.names(self.scheduler.effects("orc")), ["burning"])
+        self.scheduler.remove_entity("orc")
+        self.assertEqual(self.names(self.scheduler.advance()[1]), ["blessed"])
+        with self.assertRaises(ValueError):
+            self.scheduler.remove(poison.effect_id)
+
+    def test_invalid_effects(self):
+        """Test that effects without ticks or duration, or with bad timing, are rejected."""
+        for arguments in ({}, {"hp_delta": 1, "every": 0}, {"hp_delta": 1, "rounds": 0}):
+            with self.assertRaises(ValueError):
+                self.scheduler.add("orc", "nothing", **arguments)
+        self.assertEqual(self.scheduler.effects(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Unit tests for compiled filter expressions.
+"""
+
+import sys
+import os
+import unittest
+from dataclasses import dataclass, field
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.expressions import compile_filter
+
+
+@dataclass
+class Entity:
+    current_hp: int
+    max_hp: int
+    properties: dict = field(default_factory=dict)
+
+
+ATTRIBUTES = ("current_hp", "max_hp", "properties")
+
+
+class TestExpressions(unittest.TestCase):
+    """Unit tests for compile_filter."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.goblin = Entity(2, 10, {"type": "goblin", "tags": ["sneaky"], "level": 1})
+        self.ogre = Entity(50, 60, {"type": "giant", "level": 5})
+
+    def test_arithmetic_and_boolean_logic(self):
+        """Test precedence of arithmetic, comparisons and boolean operators."""
+        expression = compile_filter('currentHp < maxHp * 0.25 and properties.type == "goblin"', ATTRIBUTES)
+        self.assertTrue(expression.matches(self.goblin))
+        self.assertFalse(expression.matches(self.ogre))
+        expression = compile_filter("not (properties.level > 2) or maxHp - currentHp >= 10", ATTRIBUTES)
+        self.assertTrue(expression.matches(self.goblin))
+        self.assertTrue(expression.matches(self.ogre))
+        expression = compile_filter("-currentHp + 2 * 3 % 4 == 0 and max(currentHp, 1) == floor(2.5)", ATTRIBUTES)
+        self.assertTrue(expression.matches(self.goblin))
+
+    def test_membership_and_literals(self):
+        """Test in/contains operators, lists, strings and constants."""
+        self.assertTrue(compile_filter("properties.type in ['goblin', 'kobold']", ATTRIBUTES).matches(self.goblin))
+        self.assertTrue(compile_filter("properties.tags contains 'sneaky'", ATTRIBUTES).matches(self.goblin))
+        self.assertTrue(compile_filter("properties.boss == null or true", ATTRIBUTES).matches(self.ogre))
+        self.assertTrue(compile_filter('properties.type != "it\\"s"', ATTRIBUTES).matches(self.ogre))
+
+    def test_missing_fields_and_type_mismatches_do_not_match(self):
+        """Test that missing paths, bad types and division by zero evaluate to false."""
+        for text in ("properties.boss > 1", "properties.type < 3", "currentHp / 0 > 1", "len(currentHp) == 1"):
+            self.assertFalse(compile_filter(text, ATTRIBUTES).matches(self.goblin), text)
+
+    def test_pushdown_conjuncts(self):
+        """Test that top-level field/literal comparisons are exposed for index planning."""
+        expression = compile_filter(
+            "3 <= properties.level and properties.type in ['goblin'] and currentHp < maxHp and maxHp > 10 * 2 "
+            "and (properties.type == 'x' or currentHp > 1)",
+            ATTRIBUTES,
+        )
+        self.assertEqual(
+            [(predicate.path, predicate.op, predicate.value) for predicate in expression.conjuncts],
+            [("properties.level", "ge", 3), ("properties.type", "in", ["goblin"]), ("max_hp", "gt", 20)],
+        )
+        self.assertEqual(compile_filter("currentHp > 1 or maxHp > 1", ATTRIBUTES).conjuncts, ())
+
+    def test_coalesce_and_read_paths(self):
+        """Test that coalesce skips missing values and that compiled expressions list the paths they read."""
+        expression = compile_filter("coalesce(properties.boss, properties.level * 2, 0) + currentHp", ATTRIBUTES)
+        self.assertEqual(expression.evaluate(self.goblin), 4)
+        self.assertEqual(expression.evaluate(Entity(3, 3)), 3)
+        self.assertEqual(expression.paths, (("properties", "boss"), ("properties", "level"), ("current_hp",)))
+
+    def test_compiled_expressions_are_cached(self):
+        """Test that the same expression text is only compiled once."""
+        text = "currentHp + 1 > 0"
+        self.assertIs(compile_filter(text, ATTRIBUTES), compile_filter(text, ATTRIBUTES))
+
+    def test_invalid_expressions(self):
+        """Test that malformed expressions raise ValueError instead of evaluating anything."""
+        for text in ("currentHp <", "unknown > 1", "__import__('os')", "currentHp @ 1", "(currentHp", "currentHp 1"):
+            with self.assertRaises(ValueError, msg=text):
+                compile_filter(text, ATTRIBUTES)
+
+
+if __name__ == '__main__':
+    unittest.main()
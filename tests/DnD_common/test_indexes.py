@@ -0,0 +1,120 @@
+"""
+Unit tests for secondary indexes and the query planner.
+"""
+
+import sys
+import os
+import unittest
+from dataclasses import dataclass, field
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.indexes import HashIndex, SortedIndex, build_index
+from src.servers.DnD_common.query import index_candidates, parse_predicate
+
+
+@dataclass
+class Entity:
+    entity_id: str
+    properties: dict = field(default_factory=dict)
+
+
+ATTRIBUTES = ("entity_id", "properties")
+
+
+class TestIndexes(unittest.TestCase):
+    """Unit tests for HashIndex and SortedIndex."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.entities = {
+            "zombie": Entity("zombie", {"type": "undead", "cr": 0.25}),
+            "wight": Entity("wight", {"type": "undead", "cr": 3}),
+            "lich": Entity("lich", {"type": "undead", "cr": 21}),
+            "dragon": Entity("dragon", {"type": "dragon", "cr": 17}),
+            "blob": Entity("blob", {"type": ["ooze"], "cr": "unknown"}),
+            "ghost": Entity("ghost", {}),
+        }
+        items = list(self.entities.items())
+        self.by_type = build_index("hash", ("properties", "type"), items)
+        self.by_cr = build_index("sorted", ("properties", "cr"), items)
+
+    def test_hash_index_equality(self):
+        """Test equality and membership lookups."""
+        self.assertIsInstance(self.by_type, HashIndex)
+        self.assertEqual(self.by_type.lookup("eq", "undead"), {"zombie", "wight", "lich"})
+        self.assertEqual(self.by_type.lookup("in", ["dragon", ["ooze"]]), {"dragon", "blob"})
+        self.assertIsNone(self.by_type.lookup("gt", "a"))
+        self.assertEqual(len(self.by_type), 5)
+
+    def test_sorted_index_ranges_stay_within_type(self):
+        """Test range lookups only match values of the same type group."""
+        self.assertIsInstance(self.by_cr, SortedIndex)
+        self.assertEqual(self.by_cr.scan("ge", 5), ["dragon", "lich"])
+        self.assertEqual(self.by_cr.scan("lt", 5, descending=True), ["wight", "zombie"])
+        self.assertEqual(self.by_cr.lookup("eq", 3.0), {"wight"})
+        self.assertEqual(self.by_cr.lookup("gt", "a"), {"blob"})
+
+    def test_sorted_index_first(self):
+        """Test top-k reads in both directions."""
+        self.assertEqual(self.by_cr.first(2), ["zombie", "wight"])
+        self.assertEqual(self.by_cr.first(2, descending=True), ["blob", "lich"])
+        self.assertEqual(self.by_cr.first(0, descending=True), [])
+        self.assertEqual(len(self.by_cr.first()), 5)
+        self.assertNotIn("ghost", self.by_cr)
+
+    def test_incremental_maintenance(self):
+        """Test that updates move entries and removals drop them."""
+        self.entities["wight"].properties["cr"] = 9
+        self.by_cr.update("wight", self.entities["wight"])
+        self.entities["lich"].properties["type"] = "demilich"
+        self.by_type.update("lich", self.entities["lich"])
+        self.by_cr.remove("dragon")
+        self.assertEqual(self.by_cr.scan("ge", 5), ["wight", "lich"])
+        self.assertEqual(self.by_type.lookup("eq", "undead"), {"zombie", "wight"})
+
+    def test_bulk_maintenance(self):
+        """Test that bulk updates match one-by-one updates, whether they insert or rebuild."""
+        self.entities["zombie"].properties["cr"] = 30
+        self.entities["dragon"].properties.pop("cr")
+        self.entities["ghost"].properties["cr"] = 1
+        self.entities["lich"].properties["type"] = "demilich"
+        items = list(self.entities.items())
+        self.by_cr.update_many(items)
+        self.by_type.update_many(items)
+        self.assertEqual(self.by_cr.first(), ["ghost", "wight", "lich", "zombie", "blob"])
+        self.assertNotIn("dragon", self.by_cr)
+        self.assertEqual(self.by_type.lookup("eq", "undead"), {"zombie", "wight"})
+
+        index = build_index("sorted", ("properties", "cr"), [(str(cr), Entity(str(cr), {"cr": cr})) for cr in range(40)])
+        index.update_many([("3", Entity("3", {"cr": 50})), ("4", Entity("4"))])
+        self.assertEqual(index.first(2, descending=True), ["3", "39"])
+        self.assertEqual(len(index.first()), 39)
+
+    def test_planner_intersects_indexed_predicates(self):
+        """Test that the planner combines every indexable predicate."""
+        predicates = [
+            parse_predicate("properties.type", "==", "undead", ATTRIBUTES),
+            parse_predicate("properties.cr", ">=", 2, ATTRIBUTES),
+            parse_predicate("entityId", "ne", "lich", ATTRIBUTES),
+        ]
+        candidates, used = index_candidates(predicates, {"properties.type": self.by_type, "properties.cr": self.by_cr})
+        self.assertEqual(candidates, {"wight", "lich"})
+        self.assertEqual(used, ["properties.type", "properties.cr"])
+        self.assertEqual([p.matches(self.entities["lich"]) for p in predicates], [True, True, False])
+
+    def test_invalid_predicates(self):
+        """Test validation of operators and kinds."""
+        with self.assertRaises(ValueError):
+            parse_predicate("properties.cr", "~", 1, ATTRIBUTES)
+        with self.assertRaises(ValueError):
+            parse_predicate("properties.cr", "in", 1, ATTRIBUTES)
+        with self.assertRaises(ValueError):
+            build_index("btree", ("properties", "cr"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Unit tests for the heap-backed initiative order.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.initiative import InitiativeOrder
+
+
+class TestInitiativeOrder(unittest.TestCase):
+    """Unit tests for InitiativeOrder."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.order = InitiativeOrder()
+        for combatant, initiative in (("rogue", 18), ("orc", 12), ("wizard", 12), ("troll", 5)):
+            self.order.set(combatant, initiative)
+
+    def turns(self, count, can_act=lambda combatant: True):
+        """Advance count turns and return (combatant, round) pairs."""
+        turns = []
+        for _ in range(count):
+            turn, _ = self.order.advance(can_act)
+            turns.append((turn[0], turn[2]))
+        return turns
+
+    def test_rounds_follow_initiative_and_join_order(self):
+        """Test that combatants act by initiative, ties in join order, round after round."""
+        self.assertEqual(self.order.peek(), ("rogue", 18, 1))
+        self.assertEqual(self.turns(5), [("rogue", 1), ("orc", 1), ("wizard", 1), ("troll", 1), ("rogue", 2)])
+        self.assertEqual((self.order.round, self.order.current), (2, "rogue"))
+
+    def test_changes_mid_round(self):
+        """Test that joining or re-rolling after one's turn has passed waits for the next round."""
+        self.turns(2)
+        self.order.set("goblin", 15)
+        self.order.set("cleric", 8)
+        self.order.set("troll", 20)
+        self.assertTrue(self.order.remove("wizard"))
+        self.assertFalse(self.order.remove("wizard"))
+        self.assertEqual(self.turns(5), [("cleric", 1), ("troll", 2), ("rogue", 2), ("goblin", 2), ("orc", 2)])
+        self.assertEqual([combatant for combatant, _, _ in self.order.order()], ["cleric", "troll", "rogue", "goblin", "orc"])
+        self.assertEqual(self.order.initiative_of("troll"), 20)
+
+    def test_advance_skips_and_drops_lazily(self):
+        """Test that defeated combatants are skipped and deleted ones removed only when they come up."""
+        checked = []
+
+        def can_act(combatant):
+            checked.append(combatant)
+            return {"orc": False, "wizard": None}.get(combatant, True)
+
+        self.order.advance(can_act)
+        self.assertEqual(checked, ["rogue"])
+        turn, passed = self.order.advance(can_act)
+        self.assertEqual((turn, passed), (("troll", 5, 1), ["orc", "wizard"]))
+        self.assertNotIn("wizard", self.order)
+        self.assertIn("orc", self.order)
+        self.assertEqual(self.order.advance(lambda combatant: False), (None, ["rogue", "orc", "troll"]))
+        self.assertIsNone(self.order.current)
+
+    def test_heap_is_compacted(self):
+        """Test that repeated re-rolls do not grow the heap without bound."""
+        for initiative in range(100):
+            self.order.set("orc", initiative)
+        self.assertLessEqual(len(self.order._heap), 2 * (len(self.order) + 1) + 1)
+        self.order.clear()
+        self.assertEqual((len(self.order), self.order.peek(), self.order.round), (0, None, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Unit tests for the insertion-ordered pagination index.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.insertion_order import InsertionOrderIndex, decode_cursor, encode_cursor
+
+
+class TestInsertionOrderIndex(unittest.TestCase):
+    """Unit tests for InsertionOrderIndex."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.index = InsertionOrderIndex()
+        for entity_id in "abcdef":
+            self.index.add(entity_id)
+
+    def test_pages_cover_everything_in_order(self):
+        """Test walking all pages with cursors."""
+        seen, cursor = [], None
+        while True:
+            ids, cursor = self.index.page(4, cursor)
+            seen.extend(ids)
+            if cursor is None:
+                break
+        self.assertEqual(seen, list("abcdef"))
+
+    def test_cursor_survives_inserts_and_deletes(self):
+        """Test that a cursor stays valid when the index changes between pages."""
+        ids, cursor = self.index.page(2)
+        self.assertEqual(ids, ["a", "b"])
+        self.index.remove("b")
+        self.index.remove("c")
+        self.index.add("a")
+        self.index.add("g")
+        ids, cursor = self.index.page(10, cursor)
+        self.assertEqual(ids, ["d", "e", "f", "g"])
+        self.assertIsNone(cursor)
+
+    def test_compaction_keeps_cursors_valid(self):
+        """Test that removing most entries compacts without breaking cursors."""
+        for index in range(200):
+            self.index.add(f"x{index}")
+        ids, cursor = self.index.page(3)
+        for index in range(199):
+            self.index.remove(f"x{index}")
+        ids, cursor = self.index.page(10, cursor)
+        self.assertEqual(ids, ["d", "e", "f", "x199"])
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors are rejected."""
+        self.assertEqual(decode_cursor(encode_cursor(42)), 42)
+        with self.assertRaises(ValueError):
+            self.index.page(2, "not-a-cursor")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Unit tests for the per-entity locks.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.locks import EntityLocks
+
+
+class TestEntityLocks(unittest.TestCase):
+    """Unit tests for EntityLocks."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.locks = EntityLocks()
+
+    def _holds_in_thread(self, *keys) -> bool:
+        """Check whether another thread can take the given keys without waiting."""
+        result = []
+
+        def attempt():
+            got = []
+            for key in keys:
+                with self.locks.hold_if_free(key) as free:
+                    got.append(free)
+            result.append(all(got))
+
+        thread = threading.Thread(target=attempt)
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_lock_order_is_deterministic(self):
+        """Test that ids are deduplicated and sorted regardless of key order."""
+        keys = ("goblin-1", "orc-2", "goblin-1", "troll-3")
+        self.assertEqual(self.locks.ordered(keys), ["goblin-1", "orc-2", "troll-3"])
+        self.assertEqual(self.locks.ordered(reversed(keys)), self.locks.ordered(keys))
+
+    def test_different_ids_never_contend(self):
+        """Test that holding any set of ids leaves every other id free."""
+        held = [f"goblin-{number}" for number in range(2000)]
+        with self.locks.hold(*held):
+            self.assertTrue(self._holds_in_thread(*(f"orc-{number}" for number in range(2000))))
+            self.assertFalse(self._holds_in_thread("goblin-1999"))
+
+    def test_locks_are_dropped_when_unused(self):
+        """Test that a lock exists only while it is held or waited for."""
+        with self.locks.hold("a", "b"):
+            with self.locks.hold("a"):
+                self.assertEqual(len(self.locks), 2)
+            self.assertEqual(len(self.locks), 2)
+        self.assertEqual(len(self.locks), 0)
+        with self.assertRaises(KeyError):
+            with self.locks.hold("c"):
+                raise KeyError("c")
+        with self.locks.hold_if_free("d"):
+            pass
+        self.assertEqual(len(self.locks), 0)
+
+        counts = {"a": 0, "b": 0}
+
+        def worker(keys):
+            for _ in range(500):
+                with self.locks.hold(*keys):
+                    for key in keys:
+                        counts[key] += 1
+
+        threads = [threading.Thread(target=worker, args=(keys,)) for keys in (("a", "b"), ("b", "a"), ("a",), ("b",))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counts, {"a": 1500, "b": 1500})
+        self.assertEqual(len(self.locks), 0)
+
+    def test_hold_is_exclusive_and_reentrant(self):
+        """Test that a held key blocks other threads but not the holder."""
+        with self.locks.hold("a"):
+            with self.locks.hold("a"):
+                self.assertFalse(self._holds_in_thread("a"))
+            self.assertFalse(self._holds_in_thread("a"))
+        self.assertTrue(self._holds_in_thread("a"))
+
+    def test_hold_if_free_never_waits(self):
+        """Test that a probe only succeeds when nobody, not even the caller, holds the key."""
+        with self.locks.hold_if_free("a") as free:
+            self.assertTrue(free)
+            self.assertFalse(self._holds_in_thread("a"))
+        with self.locks.hold("a"):
+            with self.locks.hold_if_free("a") as free:
+                self.assertFalse(free)
+        self.assertTrue(self._holds_in_thread("a"))
+
+    def test_async_hold_waits_without_blocking_loop(self):
+        """Test that ahold yields to the loop while a worker thread holds the key."""
+        held = threading.Event()
+        release = threading.Event()
+
+        def worker():
+            with self.locks.hold("dragon"):
+                held.set()
+                release.wait()
+
+        async def scenario():
+            thread = threading.Thread(target=worker)
+            thread.start()
+            held.wait()
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while not release.is_set():
+                    ticks += 1
+                    if ticks == 5:
+                        release.set()
+                    await asyncio.sleep(0.001)
+
+            await asyncio.gather(ticker(), self._take("dragon"))
+            thread.join()
+            return ticks
+
+        self.assertGreaterEqual(asyncio.run(scenario()), 5)
+
+    async def _take(self, key):
+        async with self.locks.ahold(key):
+            pass
+
+    def test_sync_hold_from_other_task_raises_instead_of_deadlocking(self):
+        """Test that blocking on a lock held by a suspended task on the same loop fails fast."""
+        async def scenario():
+            entered = asyncio.Event()
+            finish = asyncio.Event()
+
+            async def holder():
+                async with self.locks.ahold("lich"):
+                    entered.set()
+                    await finish.wait()
+
+            task = asyncio.create_task(holder())
+            await entered.wait()
+            try:
+                with self.assertRaises(RuntimeError):
+                    with self.locks.hold("lich"):
+                        pass
+            finally:
+                finish.set()
+                await task
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
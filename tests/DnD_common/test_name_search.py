@@ -0,0 +1,81 @@
+"""
+Unit tests for the name search index.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.name_search import NameIndex, normalize_name
+
+
+class TestNameIndex(unittest.TestCase):
+    """Unit tests for NameIndex."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.index = NameIndex()
+        for entity_id, name in [
+            ("red", "Ancient Red Dragon"),
+            ("blue", "Ancient Blue Dragon"),
+            ("young", "Young Red Dragon"),
+            ("goblin-1", "Goblin"),
+            ("goblin-2", "goblin"),
+            ("boss", "Goblin Boss"),
+        ]:
+            self.index.update(entity_id, name)
+
+    def ids(self, query, **kwargs):
+        return [entity_id for entity_id, _, _ in self.index.search(query, **kwargs)]
+
+    def test_normalize_name(self):
+        """Test case folding and whitespace collapsing."""
+        self.assertEqual(normalize_name("  Ancient   RED\tDragon "), "ancient red dragon")
+
+    def test_exact_and_prefix_matches_rank_first(self):
+        """Test that exact matches precede word-prefix matches."""
+        results = self.index.search("goblin", fuzzy=False)
+        self.assertEqual([(entity_id, kind) for entity_id, _, kind in results],
+                         [("goblin-1", "exact"), ("goblin-2", "exact"), ("boss", "prefix")])
+        self.assertEqual(results[0][1], 1.0)
+        self.assertEqual(self.ids("ancient red", fuzzy=False), ["red"])
+        self.assertEqual(set(self.ids("red dra", fuzzy=False)), {"red", "young"})
+        self.assertEqual(self.ids("ancient red")[:2], ["red", "blue"])
+
+    def test_fuzzy_matches_tolerate_typos(self):
+        """Test typo-tolerant matches ranked by similarity."""
+        results = self.index.search("ancinet red dragon")
+        self.assertEqual(results[0][0], "red")
+        self.assertEqual(results[0][2], "fuzzy")
+        self.assertGreater(results[0][1], results[1][1])
+        self.assertEqual(self.ids("ancinet red dragon", fuzzy=False), [])
+        self.assertEqual(self.ids("zzzz"), [])
+
+    def test_numbered_spawns_share_a_base_name(self):
+        """Test that numbered names group under their base name and numbers filter results."""
+        for number in (1, 2, 10):
+            self.index.update(f"spawn-{number}", f"Goblin {number}")
+        results = self.index.search("goblin", fuzzy=False)
+        self.assertEqual([entity_id for entity_id, _, _ in results],
+                         ["goblin-1", "goblin-2", "spawn-1", "spawn-2", "spawn-10", "boss"])
+        self.assertEqual([kind for _, _, kind in results[1:4]], ["exact", "prefix", "prefix"])
+        self.assertEqual(self.index.search("Goblin 10"), [("spawn-10", 1.0, "exact")])
+        self.assertEqual(self.ids("gobln 2"), ["spawn-2"])
+
+    def test_incremental_updates(self):
+        """Test renames and removals."""
+        self.index.update("young", "Wyrmling")
+        self.index.remove("goblin-1")
+        self.assertEqual(set(self.ids("red dragon", fuzzy=False)), {"red"})
+        self.assertEqual(self.ids("wyrm", fuzzy=False), ["young"])
+        self.assertEqual(self.ids("goblin", limit=1), ["goblin-2"])
+        self.assertEqual(len(self.index), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
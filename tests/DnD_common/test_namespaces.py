@@ -0,0 +1,51 @@
+"""
+Unit tests for campaign namespaces.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.namespaces import DEFAULT_CAMPAIGN, NamespaceRegistry
+
+
+class TestNamespaceRegistry(unittest.TestCase):
+    """Unit tests for NamespaceRegistry."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.registry = NamespaceRegistry(dict)
+
+    def test_managers_are_created_once_per_campaign(self):
+        """Test that each campaign gets its own manager, reused on later calls."""
+        first = self.registry.get("first")
+        first["a"] = 1
+        self.assertIs(self.registry.get("first"), first)
+        self.assertEqual(self.registry.get("second"), {})
+        self.assertIs(self.registry.get(), self.registry.get(DEFAULT_CAMPAIGN))
+        self.assertEqual(self.registry.campaigns(), [DEFAULT_CAMPAIGN, "first", "second"])
+
+    def test_drop(self):
+        """Test that a dropped campaign starts empty on its next use."""
+        self.registry.get("first")["a"] = 1
+        self.assertEqual(self.registry.drop("first"), {"a": 1})
+        self.assertNotIn("first", self.registry.campaigns())
+        self.assertEqual(self.registry.get("first"), {})
+        with self.assertRaises(ValueError):
+            self.registry.drop("missing")
+
+    def test_invalid_campaign_id(self):
+        """Test that campaign IDs must be non-empty strings."""
+        with self.assertRaises(ValueError):
+            self.registry.get("")
+        with self.assertRaises(ValueError):
+            self.registry.get(42)
+
+
+if __name__ == '__main__':
+    unittest.main()
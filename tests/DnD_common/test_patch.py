@@ -0,0 +1,123 @@
+"""
+Unit tests for JSON Patch and JSON Merge Patch of properties.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.copy_on_write import CopyOnWriteProperties, freeze_properties
+from src.servers.DnD_common.patch import apply_merge_patch, apply_patch, parse_pointer, undo
+
+
+class TestApplyPatch(unittest.TestCase):
+    """Unit tests for apply_patch."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.properties = {
+            "inventory": {"potions": {"count": 3}, "weapons": ["sword"]},
+            "a/b": 1,
+        }
+
+    def test_parse_pointer(self):
+        """Test that pointer tokens are split and unescaped."""
+        self.assertEqual(parse_pointer("/inventory/potions"), ("inventory", "potions"))
+        self.assertEqual(parse_pointer("/a~1b/~0x"), ("a/b", "~x"))
+        with self.assertRaises(ValueError):
+            parse_pointer("inventory")
+
+    def test_operations_change_nested_values_in_place(self):
+        """Test add, remove, replace, test and increment at nested paths."""
+        inventory = self.properties["inventory"]
+        apply_patch(self.properties, [
+            {"op": "test", "path": "/inventory/potions/count", "value": 3},
+            {"op": "increment", "path": "/inventory/potions/count", "value": -1},
+            {"op": "increment", "path": "/inventory/gold", "value": 10},
+            {"op": "add", "path": "/inventory/weapons/-", "value": "bow"},
+            {"op": "add", "path": "/inventory/weapons/0", "value": "dagger"},
+            {"op": "remove", "path": "/inventory/weapons/1"},
+            {"op": "replace", "path": "/a~1b", "value": 2},
+            {"op": "add", "path": "/title", "value": "Ringbearer"},
+        ])
+        self.assertIs(self.properties["inventory"], inventory)
+        self.assertEqual(self.properties, {
+            "inventory": {"potions": {"count": 2}, "weapons": ["dagger", "bow"], "gold": 10},
+            "a/b": 2,
+            "title": "Ringbearer",
+        })
+
+    def test_failed_patch_changes_nothing(self):
+        """Test that a patch is rolled back when any operation fails."""
+        invalid = [
+            [{"op": "test", "path": "/inventory/potions/count", "value": 4}],
+            [{"op": "replace", "path": "/inventory/missing", "value": 1}],
+            [{"op": "remove", "path": "/inventory/potions/count/deep"}],
+            [{"op": "increment", "path": "/inventory/weapons/0", "value": 1}],
+            [{"op": "increment", "path": "/inventory/potions/count", "value": True}],
+            [{"op": "add", "path": "/inventory/weapons/5", "value": "axe"}],
+            [{"op": "move", "path": "/inventory"}],
+            [{"op": "add", "path": "/title"}],
+        ]
+        for operations in invalid:
+            with self.subTest(operations=operations):
+                with self.assertRaises(ValueError):
+                    apply_patch(self.properties, [
+                        {"op": "increment", "path": "/inventory/potions/count", "value": 5},
+                        {"op": "add", "path": "/inventory/weapons/0", "value": "bow"},
+                        {"op": "remove", "path": "/a~1b"},
+                    ] + operations)
+                self.assertEqual(self.properties, {
+                    "inventory": {"potions": {"count": 3}, "weapons": ["sword"]},
+                    "a/b": 1,
+                })
+
+    def test_external_undo_log(self):
+        """Test that changes recorded in a caller's undo log can be reverted later."""
+        undo_log = []
+        apply_patch(self.properties, [{"op": "remove", "path": "/inventory/potions"}], undo_log)
+        apply_merge_patch(self.properties, {"inventory": {"weapons": None, "gold": 5}, "a/b": None}, undo_log)
+        self.assertEqual(self.properties, {"inventory": {"gold": 5}})
+        undo(undo_log)
+        self.assertEqual(undo_log, [])
+        self.assertEqual(self.properties, {
+            "inventory": {"potions": {"count": 3}, "weapons": ["sword"]},
+            "a/b": 1,
+        })
+
+    def test_merge_patch(self):
+        """Test that merge patches merge objects, remove nulls and replace other values."""
+        apply_merge_patch(self.properties, {
+            "inventory": {"potions": {"count": 1}, "weapons": ["axe"]},
+            "a/b": None,
+            "spells": {"fire": {"level": 3, "notes": None}},
+        })
+        self.assertEqual(self.properties, {
+            "inventory": {"potions": {"count": 1}, "weapons": ["axe"]},
+            "spells": {"fire": {"level": 3}},
+        })
+        with self.assertRaises(ValueError):
+            apply_merge_patch(self.properties, ["not", "an", "object"])
+
+    def test_copy_on_write_base_is_never_changed(self):
+        """Test that patching template-based properties leaves the shared base untouched."""
+        base = freeze_properties({"abilities": {"str": 8, "dex": 12}, "actions": ["bite"]})
+        first = CopyOnWriteProperties(base)
+        second = CopyOnWriteProperties(base)
+        apply_patch(first, [
+            {"op": "increment", "path": "/abilities/str", "value": 2},
+            {"op": "add", "path": "/actions/-", "value": "claw"},
+        ])
+        apply_merge_patch(second, {"abilities": {"dex": None}})
+        self.assertEqual(first, {"abilities": {"str": 10, "dex": 12}, "actions": ["bite", "claw"]})
+        self.assertEqual(second, {"abilities": {"str": 8}, "actions": ["bite"]})
+        self.assertEqual(dict(base), {"abilities": {"str": 8, "dex": 12}, "actions": ["bite"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Unit tests for field projections and field paths.
+"""
+
+import sys
+import os
+import unittest
+from dataclasses import dataclass, field
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.paths import MISSING, parse_path, resolve, to_attribute
+from src.servers.DnD_common.projection import compile_projection, projector_for
+
+
+@dataclass
+class Entity:
+    entity_id: str
+    current_hp: int
+    properties: dict = field(default_factory=dict)
+
+
+ATTRIBUTES = ("entity_id", "current_hp", "properties")
+
+
+class TestPaths(unittest.TestCase):
+    """Unit tests for field path helpers."""
+
+    def test_parse_path_accepts_both_spellings(self):
+        """Test camelCase and snake_case attribute names."""
+        self.assertEqual(to_attribute("currentHp"), "current_hp")
+        self.assertEqual(parse_path("currentHp", ATTRIBUTES), ("current_hp",))
+        self.assertEqual(parse_path("properties.armorClass", ATTRIBUTES), ("properties", "armorClass"))
+        with self.assertRaises(ValueError):
+            parse_path("maxHp", ATTRIBUTES)
+        with self.assertRaises(ValueError):
+            parse_path("properties..x", ATTRIBUTES)
+
+    def test_resolve(self):
+        """Test resolving nested paths."""
+        entity = Entity("a", 5, {"stats": {"str": 16}})
+        self.assertEqual(resolve(entity, ("properties", "stats", "str")), 16)
+        self.assertIs(resolve(entity, ("properties", "stats", "dex")), MISSING)
+
+
+class TestProjection(unittest.TestCase):
+    """Unit tests for compiled projections."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.entity = Entity("a", 5, {"inventory": {"potions": {"count": 3}, "rope": True}, "class": "Rogue"})
+
+    def test_projects_selected_fields_only(self):
+        """Test that only requested attributes and nested keys are copied."""
+        project = projector_for(["entityId", "properties.inventory.potions", "properties.missing"], ATTRIBUTES)
+        result = project(self.entity)
+        self.assertEqual(result, {"entity_id": "a", "properties": {"inventory": {"potions": {"count": 3}}}})
+        result["properties"]["inventory"]["potions"]["count"] = 0
+        self.assertEqual(self.entity.properties["inventory"]["potions"]["count"], 3)
+
+    def test_whole_attribute_wins_over_nested_path(self):
+        """Test that a whole attribute request covers nested paths inside it."""
+        project = projector_for(["properties.class", "properties"], ATTRIBUTES)
+        self.assertEqual(project(self.entity)["properties"], self.entity.properties)
+
+    def test_projectors_are_cached(self):
+        """Test that the same field list reuses the compiled projector."""
+        self.assertIs(
+            compile_projection(("currentHp",), ATTRIBUTES),
+            projector_for(["currentHp"], ATTRIBUTES),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
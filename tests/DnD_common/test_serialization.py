@@ -0,0 +1,54 @@
+"""
+Unit tests for cached serialized views.
+"""
+
+import sys
+import os
+import json
+import unittest
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.serialization import cached_dict, cached_json, json_array
+
+
+@dataclass
+class Entity:
+    """Minimal versioned entity."""
+
+    entity_id: str
+    properties: Dict[str, Any] = field(default_factory=dict)
+    version: int = 1
+
+
+class TestSerialization(unittest.TestCase):
+    """Unit tests for cached_dict, cached_json and json_array."""
+
+    def test_views_are_reused_until_the_version_changes(self):
+        """Test that reads share one dict and one encoding per version."""
+        entity = Entity("a", {"inventory": {"rope": 1}})
+        first = cached_dict(entity)
+        self.assertIs(cached_dict(entity), first)
+        self.assertIsNot(first["properties"], entity.properties)
+        self.assertIs(cached_json(entity), cached_json(entity))
+
+        entity.properties["inventory"]["rope"] = 2
+        entity.version += 1
+        self.assertEqual(cached_dict(entity)["properties"], {"inventory": {"rope": 2}})
+        self.assertEqual(json.loads(cached_json(entity))["properties"], {"inventory": {"rope": 2}})
+
+    def test_json_array_joins_fragments(self):
+        """Test that pre-encoded fragments form a valid JSON array."""
+        entities = [Entity("a"), Entity("b", {"x": [1, 2]})]
+        encoded = json_array(cached_json(entity) for entity in entities)
+        self.assertEqual(json.loads(encoded), [cached_dict(entity) for entity in entities])
+        self.assertEqual(json_array([]), "[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Unit tests for the on-disk spill store.
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.spill import SpillStore
+
+
+class TestSpillStore(unittest.TestCase):
+    """Unit tests for SpillStore."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.store = SpillStore()
+
+    def tearDown(self):
+        """Clean up after the tests."""
+        self.store.close()
+
+    def test_put_get_take(self):
+        """Test storing, reading, replacing and removing records."""
+        self.store.put_many([("a", {"hp": 1}), ("b", {"hp": 2})])
+        self.store.put_many([("a", {"hp": 3})])
+        self.assertEqual(len(self.store), 2)
+        self.assertIn("a", self.store)
+        self.assertEqual(self.store.get("a"), {"hp": 3})
+        self.assertEqual(sorted(self.store.ids()), ["a", "b"])
+        self.assertEqual(dict(self.store.items()), {"a": {"hp": 3}, "b": {"hp": 2}})
+
+        self.assertEqual(self.store.take("a"), {"hp": 3})
+        self.assertIsNone(self.store.take("a"))
+        self.assertTrue(self.store.delete("b"))
+        self.assertFalse(self.store.delete("b"))
+        self.assertEqual(len(self.store), 0)
+        self.assertNotIn("a", self.store)
+
+    def test_temporary_file_is_removed(self):
+        """Test that a store without a path cleans up its file."""
+        path = self.store.path
+        self.assertTrue(os.path.exists(path))
+        self.store.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_reopen_named_store(self):
+        """Test that a named store keeps its records across instances."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spill.sqlite")
+            store = SpillStore(path)
+            store.put_many([("a", {"hp": 1})])
+            store.close()
+            reopened = SpillStore(path)
+            self.assertEqual((len(reopened), reopened.get("a")), (1, {"hp": 1}))
+            reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
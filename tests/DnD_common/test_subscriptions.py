@@ -0,0 +1,142 @@
+"""
+Unit tests for resource subscriptions.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.subscriptions import (
+    SubscriptionHub,
+    campaign_uri,
+    entity_uri,
+    parse_entity_uri,
+    parse_resource_uri,
+)
+
+
+class FakeSession:
+    """Session that records the resources/updated notifications it is sent."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.attempts = 0
+        self.updated = []
+
+    async def send_resource_updated(self, uri):
+        self.attempts += 1
+        if self.fail:
+            raise ConnectionError("session closed")
+        self.updated.append(uri)
+
+
+class TestEntityUri(unittest.TestCase):
+    """Unit tests for building and parsing entity resource URIs."""
+
+    def test_round_trip(self):
+        """Test that ids with reserved characters survive a round trip."""
+        uri = entity_uri("character", "my campaign", "frodo/1")
+        self.assertEqual(uri, "character://my%20campaign/frodo%2F1")
+        self.assertEqual(parse_entity_uri("character", uri), ("my campaign", "frodo/1"))
+
+    def test_campaign_uris(self):
+        """Test that resource URIs may name a whole campaign."""
+        self.assertEqual(parse_resource_uri("monster", campaign_uri("monster", "my campaign")), ("my campaign", None))
+        self.assertEqual(parse_resource_uri("monster", "monster://default/goblin"), ("default", "goblin"))
+        for uri in ("monster://", "monster://default/", "character://default"):
+            with self.assertRaises(ValueError):
+                parse_resource_uri("monster", uri)
+
+    def test_invalid_uris(self):
+        """Test that URIs with another scheme or a missing part are rejected."""
+        for uri in ("monster://default/goblin", "character://default", "character:///frodo", "hello"):
+            with self.assertRaises(ValueError):
+                parse_entity_uri("character", uri)
+
+
+class TestSubscriptionHub(unittest.TestCase):
+    """Unit tests for SubscriptionHub."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.hub = SubscriptionHub(window=0.01)
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    async def settle(self):
+        await asyncio.sleep(self.hub.window * 5)
+
+    def test_writes_within_window_are_coalesced(self):
+        """Test that many writes to a URI produce one notification per subscriber."""
+        first, second = FakeSession(), FakeSession()
+
+        async def scenario():
+            self.hub.subscribe("character://default/a", first)
+            self.hub.subscribe("character://default/a", second)
+            self.hub.subscribe("character://default/b", first)
+            for _ in range(10):
+                self.hub.notify("character://default/a")
+            self.hub.notify("character://default/b")
+            await self.settle()
+
+        self.run_async(scenario())
+        self.assertEqual(sorted(first.updated), ["character://default/a", "character://default/b"])
+        self.assertEqual(second.updated, ["character://default/a"])
+
+    def test_unsubscribed_uris_are_not_sent(self):
+        """Test that only subscribed URIs are notified."""
+        session = FakeSession()
+
+        async def scenario():
+            self.hub.subscribe("character://default/a", session)
+            self.hub.notify("character://default/other")
+            self.hub.unsubscribe("character://default/a", session)
+            self.assertFalse(self.hub.active)
+            self.hub.notify("character://default/a")
+            await self.settle()
+
+        self.run_async(scenario())
+        self.assertEqual(session.updated, [])
+
+    def test_notify_from_another_thread(self):
+        """Test that writes in worker threads notify on the event loop."""
+        session = FakeSession()
+
+        async def scenario():
+            self.hub.subscribe("monster://default/goblin", session)
+            writer = threading.Thread(target=self.hub.notify, args=("monster://default/goblin",))
+            writer.start()
+            writer.join()
+            await self.settle()
+
+        self.run_async(scenario())
+        self.assertEqual(session.updated, ["monster://default/goblin"])
+
+    def test_failing_session_is_dropped(self):
+        """Test that a session whose send fails loses all its subscriptions."""
+        broken, healthy = FakeSession(fail=True), FakeSession()
+
+        async def scenario():
+            self.hub.subscribe("monster://default/a", broken)
+            self.hub.subscribe("monster://default/b", broken)
+            self.hub.subscribe("monster://default/a", healthy)
+            self.hub.notify("monster://default/a")
+            await self.settle()
+            self.hub.notify("monster://default/b")
+            await self.settle()
+
+        self.run_async(scenario())
+        self.assertEqual(healthy.updated, ["monster://default/a"])
+        self.assertEqual(broken.attempts, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Unit tests for the hierarchical timer wheel.
+"""
+
+import sys
+import os
+import random
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.timer_wheel import TimerWheel
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Unit tests for TimerWheel."""
+
+    def test_items_fall_due_at_their_round(self):
+        """Test that items on every level, and in the overflow, fire exactly at their round."""
+        wheel = TimerWheel(slots=4, levels=2, start=3)
+        rng = random.Random(11)
+        expected = {}
+        for item in range(200):
+            round_number = wheel.now + rng.randint(1, 40)
+            wheel.schedule(round_number, item)
+            expected.setdefault(round_number, []).append(item)
+        fired = {}
+        while len(wheel):
+            due = wheel.advance()
+            if due:
+                fired[wheel.now] = sorted(due)
+            if wheel.now % 7 == 0:
+                round_number = wheel.now + rng.randint(1, 40)
+                wheel.schedule(round_number, -wheel.now)
+                expected.setdefault(round_number, []).append(-wheel.now)
+        self.assertEqual(fired, {round_number: sorted(items) for round_number, items in expected.items()})
+
+    def test_invalid_schedules(self):
+        """Test that past rounds and invalid sizes are rejected."""
+        wheel = TimerWheel()
+        with self.assertRaises(ValueError):
+            wheel.schedule(0, "now")
+        with self.assertRaises(ValueError):
+            TimerWheel(slots=6)
+        self.assertEqual(wheel.advance(), [])
+        self.assertEqual(wheel.now, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
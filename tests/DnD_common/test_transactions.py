@@ -0,0 +1,130 @@
+"""
+Unit tests for multi-entity transactions.
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_character.character_manager import CharacterManager
+from src.servers.DnD_common.transactions import run_transaction
+from src.servers.DnD_monster.monster_manager import MonsterManager
+
+
+class FailingCommitManager(MonsterManager):
+    """Monster manager whose commits always fail after installing."""
+
+    def commit_staged(self, staged, timestamp=None):
+        journal = super().commit_staged(staged, timestamp)
+        self.restore(journal)
+        raise RuntimeError("disk full")
+
+
+class TestTransactions(unittest.TestCase):
+    """Unit tests for run_transaction."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.characters = CharacterManager()
+        self.monsters = MonsterManager()
+        self.characters.set_character("wizard", "Wizard", 20, 20, 10, 10)
+        self.monsters.set_monster("orc", "Orc", 15, 15, 0, 0)
+
+    def test_commit_is_visible_to_indexes_and_change_log(self):
+        """Test that committed working copies replace the stored entities everywhere."""
+        self.monsters.create_index("properties.condition")
+        seq = self.monsters.changes_since(0)["seq"]
+        committed = run_transaction(
+            [(self.monsters, "orc", {"hp_delta": -5}), (self.monsters, "orc", {"properties": {"condition": "prone"}})],
+            [self.characters, self.monsters],
+        )
+        orc = committed[self.monsters]["orc"]
+        self.assertIs(self.monsters.get_monster("orc"), orc)
+        self.assertEqual((orc.current_hp, orc.version), (10, 2))
+        monsters, _ = self.monsters.query_monsters([("properties.condition", "==", "prone")])
+        self.assertEqual([monster.monster_id for monster in monsters], ["orc"])
+        self.assertEqual([change[1] for change in self.monsters.changes_since(seq)["changes"]], ["orc"])
+
+    def test_failed_commit_restores_earlier_managers(self):
+        """Test that a commit failing in one manager rolls back the managers committed before it."""
+        monsters = FailingCommitManager()
+        monsters.set_monster("orc", "Orc", 15, 15, 0, 0)
+        with self.assertRaises(RuntimeError):
+            run_transaction(
+                [(self.characters, "wizard", {"mp_delta": -3}), (monsters, "orc", {"hp_delta": -8})],
+                [self.characters, monsters],
+            )
+        wizard = self.characters.get_character("wizard")
+        # The rollback is a write of its own, so the version moves on past the rolled-back one
+        self.assertEqual((wizard.current_magic_points, wizard.version), (10, 3))
+        self.assertEqual(monsters.get_monster("orc").current_hp, 15)
+
+    def test_patches_only_touch_working_copies(self):
+        """Test that nested patches of a failed transaction leave stored entities and templates unchanged."""
+        self.monsters.set_template("wolf", "Wolf", 11, properties={"abilities": {"str": 12}})
+        self.monsters.set_monster("wolf-1", "Wolf", 11, 11, 0, 0, template_id="wolf")
+        self.characters.update_character("wizard", properties={"inventory": {"potions": 2}})
+        with self.assertRaises(ValueError):
+            run_transaction([
+                (self.characters, "wizard", {"patch": [{"op": "increment", "path": "/inventory/potions", "value": -1}]}),
+                (self.monsters, "wolf-1", {"merge_patch": {"abilities": {"str": 20}}}),
+                (self.monsters, "orc", {"current_hp": 99}),
+            ], [self.characters, self.monsters])
+        self.assertEqual(self.characters.get_character("wizard").properties["inventory"], {"potions": 2})
+        self.assertEqual(self.monsters.get_monster("wolf-1").properties["abilities"], {"str": 12})
+
+        run_transaction([
+            (self.monsters, "wolf-1", {"merge_patch": {"abilities": {"str": 20}}}),
+        ], [self.monsters])
+        self.assertEqual(self.monsters.get_monster("wolf-1").properties["abilities"], {"str": 20})
+        self.assertEqual(self.monsters.get_template("wolf").properties["abilities"], {"str": 12})
+
+    def test_commit_copies_only_changed_properties(self):
+        """Test that a commit writes changed values in place and keeps unchanged properties shared."""
+        self.characters.update_character("wizard", properties={"inventory": {"potions": 2}, "spells": ["Shield"]})
+        wizard = self.characters.get_character("wizard")
+        spells = wizard.properties["spells"]
+        inventory = wizard.properties["inventory"]
+        committed = run_transaction([
+            (self.characters, "wizard", {"patch": [{"op": "increment", "path": "/inventory/potions", "value": -1}]}),
+            (self.characters, "wizard", {"mp_delta": -4}),
+        ], [self.characters])
+        self.assertIs(committed[self.characters]["wizard"], wizard)
+        self.assertEqual((wizard.properties["inventory"], wizard.current_magic_points, wizard.version), ({"potions": 1}, 6, 3))
+        self.assertIs(wizard.properties["spells"], spells)
+        self.assertEqual(inventory, {"potions": 2})
+
+    def test_unknown_manager_is_rejected(self):
+        """Test that every manager must be in the lock order."""
+        with self.assertRaises(ValueError):
+            run_transaction([(self.monsters, "orc", {"hp_delta": -1})], [self.characters])
+
+    def test_concurrent_opposite_transactions_do_not_deadlock(self):
+        """Test that transactions touching the same entities in different orders complete."""
+        def attack(first, second):
+            for _ in range(200):
+                run_transaction(
+                    [(first[0], first[1], {"hp_delta": -1}), (second[0], second[1], {"hp_delta": 1})],
+                    [self.characters, self.monsters],
+                )
+
+        threads = [
+            threading.Thread(target=attack, args=((self.characters, "wizard"), (self.monsters, "orc"))),
+            threading.Thread(target=attack, args=((self.monsters, "orc"), (self.characters, "wizard"))),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(self.characters.get_character("wizard").version, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
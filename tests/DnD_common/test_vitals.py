@@ -0,0 +1,82 @@
+"""
+Unit tests for the columnar vitals table.
+"""
+
+import sys
+import os
+import unittest
+from dataclasses import dataclass
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_common.vitals import VitalsTable, vital_columns
+
+
+@vital_columns
+@dataclass
+class Entity:
+    entity_id: str
+    current_hp: int
+    max_hp: int
+    current_magic_points: int
+    max_magic_points: int
+
+
+class TestVitalsTable(unittest.TestCase):
+    """Unit tests for VitalsTable."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.table = VitalsTable()
+        self.a = Entity("a", 10, 20, 5, 5)
+        self.b = Entity("b", 3, 8, 0, 4)
+        self.table.attach("a", self.a)
+        self.table.attach("b", self.b)
+
+    def test_attached_entity_reads_and_writes_columns(self):
+        """Test that attached entities are backed by the table."""
+        self.a.current_hp = 15
+        row = self.table.row_of("a")
+        self.assertEqual(self.table._columns["current_hp"][row], 15)
+        self.assertEqual(self.a.current_hp, 15)
+
+    def test_apply_deltas_clamps_to_range(self):
+        """Test that bulk deltas are clamped to [0, max]."""
+        rows = [self.table.row_of("a"), self.table.row_of("b")]
+        self.table.apply_deltas(rows, [50, -50], [-10, 2])
+        self.assertEqual((self.a.current_hp, self.a.current_magic_points), (20, 0))
+        self.assertEqual((self.b.current_hp, self.b.current_magic_points), (0, 2))
+
+    def test_recover_caps_at_max_and_skips_defeated(self):
+        """Test that recovery never exceeds max, never lowers values and leaves 0 HP rows alone."""
+        c = Entity("c", 0, 10, 0, 10)
+        self.table.attach("c", c)
+        rows = [self.table.row_of("a"), self.table.row_of("b"), self.table.row_of("c")]
+        self.assertEqual(self.table.recover(rows, [4, 50, 5], [-3, 1, 5]), [0, 1])
+        self.assertEqual((self.a.current_hp, self.a.current_magic_points), (14, 5))
+        self.assertEqual((self.b.current_hp, self.b.current_magic_points), (8, 1))
+        self.assertEqual((c.current_hp, c.current_magic_points), (0, 0))
+        self.assertEqual(self.table.recover(rows, mp_amounts=[0, 0, 0]), [0])
+        self.assertEqual(self.a.current_hp, 20)
+        self.assertEqual(self.table.recover(rows), [1])
+        self.assertEqual(self.b.current_magic_points, 4)
+
+    def test_detach_keeps_values_and_reuses_row(self):
+        """Test that detaching copies values back and frees the row."""
+        row = self.table.row_of("a")
+        self.a.current_hp = 7
+        self.table.detach("a", self.a)
+        self.assertEqual(self.a.current_hp, 7)
+        self.assertNotIn("a", self.table)
+
+        c = Entity("c", 1, 1, 1, 1)
+        self.assertEqual(self.table.attach("c", c), row)
+        self.assertEqual(self.a.current_hp, 7)
+        self.assertEqual(c.current_hp, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""
+Unit tests for the DnD_dice roller.
+"""
+
+import sys
+import os
+import random
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_dice.dice_roller import roll_dice_notation_batch
+
+
+class TestDiceRollerBatch(unittest.TestCase):
+    """Unit tests for roll_dice_notation_batch."""
+
+    def test_batch_totals_stay_in_range(self):
+        """Test that every total respects the dice and modifier bounds."""
+        random.seed(3)
+        totals = roll_dice_notation_batch("2d6+1d4-1", 500)
+        self.assertEqual(len(totals), 500)
+        self.assertTrue(all(2 <= total <= 15 for total in totals))
+        self.assertEqual({total for total in roll_dice_notation_batch("1d1+2", 20)}, {3})
+
+    def test_batch_rolls_are_independent(self):
+        """Test that a batch covers the whole range instead of repeating one roll."""
+        random.seed(5)
+        self.assertEqual(set(roll_dice_notation_batch("1d6", 300)), {1, 2, 3, 4, 5, 6})
+
+    def test_invalid_batch(self):
+        """Test invalid notation and counts."""
+        self.assertEqual(roll_dice_notation_batch("1d20", 0), [])
+        with self.assertRaises(ValueError):
+            roll_dice_notation_batch("invalid", 3)
+        with self.assertRaises(ValueError):
+            roll_dice_notation_batch("1d20", -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
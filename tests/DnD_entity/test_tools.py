@@ -0,0 +1,127 @@
+"""
+Unit tests for DnD_entity tools.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_character import tools as character_tools
+from src.servers.DnD_entity import tools
+from src.servers.DnD_monster import tools as monster_tools
+from src.servers.DnD_character.character_manager import drop_character_campaign, get_character_manager
+from src.servers.DnD_monster.monster_manager import drop_monster_campaign, get_monster_manager
+
+CAMPAIGN = "entity-tools"
+
+
+class TestEntityTools(unittest.TestCase):
+    """Unit tests for the DnD_entity tools."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.characters = get_character_manager(CAMPAIGN)
+        self.monsters = get_monster_manager(CAMPAIGN)
+        self.characters.set_character("wizard", "Wizard", 20, 20, 10, 10)
+        self.monsters.set_monster("orc", "Orc", 15, 15, 0, 0)
+
+    def tearDown(self):
+        """Drop the test campaign."""
+        drop_character_campaign(CAMPAIGN)
+        drop_monster_campaign(CAMPAIGN)
+        tools.get_initiative_order(CAMPAIGN).clear()
+
+    def test_transaction_updates_characters_and_monsters(self):
+        """Test that an attack's cost and damage are committed together."""
+        _, result = tools.execute_apply_transaction({"campaignId": CAMPAIGN, "operations": [
+            {"entity": "character", "entityId": "wizard", "mpDelta": -3},
+            {"entity": "monster", "entityId": "orc", "hpDelta": -8},
+            {"entity": "monster", "entityId": "orc", "hpDelta": -2, "properties": {"condition": "burning"}},
+        ]})
+        self.assertEqual(result["operations"], 3)
+        self.assertEqual(
+            [(entity["entity"], entity["entityId"], entity["version"]) for entity in result["entities"]],
+            [("character", "wizard", 2), ("monster", "orc", 2)],
+        )
+        self.assertEqual(self.characters.get_character("wizard").current_magic_points, 7)
+        orc = self.monsters.get_monster("orc")
+        self.assertEqual((orc.current_hp, orc.properties["condition"]), (5, "burning"))
+        self.assertEqual(self.characters.get_character("wizard").updated_at, orc.updated_at)
+
+    def test_failed_operation_changes_nothing(self):
+        """Test that a failing operation rolls back the ones before it."""
+        for operations in (
+            [{"entity": "character", "entityId": "wizard", "mpDelta": -3},
+             {"entity": "monster", "entityId": "missing", "hpDelta": -8}],
+            [{"entity": "monster", "entityId": "orc", "hpDelta": -8, "name": "Burnt Orc"},
+             {"entity": "monster", "entityId": "orc", "currentHp": 99}],
+            [{"entity": "character", "entityId": "wizard", "mpDelta": -3, "expectedVersion": 5}],
+        ):
+            with self.assertRaises(ValueError):
+                tools.execute_apply_transaction({"campaignId": CAMPAIGN, "operations": operations})
+        wizard = self.characters.get_character("wizard")
+        orc = self.monsters.get_monster("orc")
+        self.assertEqual((wizard.current_magic_points, wizard.version), (10, 1))
+        self.assertEqual((orc.name, orc.current_hp, orc.version), ("Orc", 15, 1))
+
+    def test_invalid_operations(self):
+        """Test argument validation."""
+        for arguments in (
+            {"operations": []},
+            {"operations": [{"entity": "dragon", "entityId": "x"}]},
+            {"operations": [{"entity": "monster"}]},
+        ):
+            with self.assertRaises(ValueError):
+                tools.execute_apply_transaction(arguments)
+
+    def test_initiative_turn_order(self):
+        """Test rolling initiative for characters and monsters and advancing turns past defeated and deleted ones."""
+        self.characters.set_character("rogue", "Rogue", 12, 12, 0, 0, {"dexterity": 18})
+        self.monsters.set_monster("goblin", "Goblin", 7, 7, 0, 0)
+        _, result = tools.execute_roll_initiative({"campaignId": CAMPAIGN, "reset": True, "combatants": [
+            {"entity": "character", "entityId": "wizard", "initiative": 25},
+            {"entity": "character", "entityId": "rogue"},
+            {"entity": "monster", "entityId": "orc", "bonus": -30},
+            {"entity": "monster", "entityId": "goblin", "initiative": 0},
+        ]})
+        rolls = {entry["entityId"]: entry for entry in result["rolls"]}
+        self.assertEqual(rolls["rogue"]["bonus"], 4)
+        self.assertEqual(rolls["rogue"]["initiative"], rolls["rogue"]["roll"] + 4)
+        self.assertIsNone(rolls["wizard"]["roll"])
+        self.assertEqual([entry["entityId"] for entry in result["combatants"]], ["wizard", "rogue", "goblin", "orc"])
+
+        _, result = tools.execute_advance_turn({"campaignId": CAMPAIGN})
+        self.assertEqual((result["actor"]["entityId"], result["actor"]["name"], result["round"]), ("wizard", "Wizard", 1))
+        self.monsters.update_monster("goblin", current_hp=0)
+        self.characters.delete_character("rogue")
+        _, result = tools.execute_advance_turn({"campaignId": CAMPAIGN})
+        self.assertEqual(result["actor"]["entityId"], "orc")
+        self.assertEqual(result["skipped"], [{"entity": "character", "entityId": "rogue"},
+                                             {"entity": "monster", "entityId": "goblin"}])
+
+        _, result = tools.execute_set_initiative({"campaignId": CAMPAIGN, "entity": "monster", "entityId": "orc", "initiative": None})
+        self.assertEqual([entry["entityId"] for entry in result["combatants"]], ["wizard", "goblin"])
+        _, result = tools.execute_get_initiative_order({"campaignId": CAMPAIGN})
+        self.assertEqual((result["round"], result["current"]), (1, None))
+        with self.assertRaises(ValueError):
+            tools.execute_set_initiative({"campaignId": CAMPAIGN, "entity": "monster", "entityId": "missing", "initiative": 3})
+        with self.assertRaises(ValueError):
+            tools.execute_roll_initiative({"campaignId": CAMPAIGN, "combatants": [{"entity": "dragon", "entityId": "x"}]})
+
+    def test_entity_tools_are_exposed_without_name_clashes(self):
+        """Test that the character and monster tools are all exposed, shared names prefixed."""
+        self.assertIn("Apply Transaction", tools.TOOLS)
+        self.assertEqual(tools.DELEGATED_TOOLS["Set Character"], ("character", "Set Character"))
+        self.assertEqual(tools.DELEGATED_TOOLS["Apply Monster Damage"], ("monster", "Apply Damage"))
+        self.assertNotIn("Apply Damage", tools.TOOLS)
+        self.assertIn("Advance Turn", tools.TOOLS)
+        self.assertEqual(len(tools.TOOLS), 5 + len(character_tools.TOOLS) + len(monster_tools.TOOLS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,605 @@
+"""
+Unit tests for the DnD_monster manager.
+"""
+
+import sys
+import os
+import json
+import threading
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_monster import tools
+from src.servers.DnD_monster.monster_manager import MonsterManager, add_monster_change_listener
+from src.servers.DnD_common.serialization import cached_dict
+from src.servers.DnD_common.versioning import VersionConflictError
+
+
+class TestMonsterManager(unittest.TestCase):
+    """Unit tests for the MonsterManager."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.manager = MonsterManager()
+        self.manager.set_monster("ogre", "Ogre", 30, 30, 50, 50, {"type": "Giant"})
+        self.manager.set_monster("goblin", "Goblin", 10, 12, 0, 0)
+
+    def test_apply_deltas(self):
+        """Test bulk damage and healing with clamping."""
+        monsters = self.manager.apply_deltas([
+            {"monster_id": "ogre", "hp_delta": -12, "mp_delta": -60},
+            {"monster_id": "goblin", "hp_delta": 5},
+            {"monster_id": "ogre", "hp_delta": -3},
+        ])
+        self.assertEqual(len(monsters), 2)
+        ogre = self.manager.get_monster("ogre")
+        self.assertEqual((ogre.current_hp, ogre.current_magic_points), (15, 0))
+        self.assertEqual(self.manager.get_monster("goblin").current_hp, 12)
+
+    def test_apply_deltas_unknown_monster_changes_nothing(self):
+        """Test that a missing monster aborts the whole batch."""
+        with self.assertRaises(ValueError):
+            self.manager.apply_deltas([
+                {"monster_id": "ogre", "hp_delta": -5},
+                {"monster_id": "tarrasque", "hp_delta": -5},
+            ])
+        self.assertEqual(self.manager.get_monster("ogre").current_hp, 30)
+
+    def test_replace_and_delete_release_vitals(self):
+        """Test that replaced and deleted monsters keep their own values."""
+        old = self.manager.get_monster("goblin")
+        self.manager.set_monster("goblin", "Goblin", 1, 12, 0, 0)
+        self.assertEqual(old.current_hp, 10)
+        self.assertEqual(self.manager.get_monster("goblin").current_hp, 1)
+
+        ogre = self.manager.get_monster("ogre")
+        self.manager.delete_monster("ogre")
+        self.assertEqual(ogre.to_dict()["current_hp"], 30)
+
+    def test_update_with_deltas(self):
+        """Test that HP/MP deltas are applied relative to the stored value and clamped."""
+        self.manager.update_monster("ogre", hp_delta=-7, mp_delta=-10)
+        ogre = self.manager.update_monster("ogre", hp_delta=-5, mp_delta=100)
+        self.assertEqual((ogre.current_hp, ogre.current_magic_points), (18, 50))
+        ogre = self.manager.update_monster("ogre", hp_delta=-100)
+        self.assertEqual(ogre.current_hp, 0)
+
+    def test_update_rejects_absolute_and_delta(self):
+        """Test that an absolute value and a delta cannot be combined."""
+        with self.assertRaises(ValueError):
+            self.manager.update_monster("ogre", current_hp=10, hp_delta=-1)
+        self.assertEqual(self.manager.get_monster("ogre").current_hp, 30)
+
+    def test_versions_increase_on_every_write(self):
+        """Test that updates, bulk deltas and replacements bump the version."""
+        self.assertEqual(self.manager.get_monster("goblin").version, 1)
+        self.manager.update_monster("goblin", hp_delta=1)
+        self.manager.apply_deltas([{"monster_id": "goblin", "hp_delta": -1}])
+        goblin = self.manager.set_monster("goblin", "Goblin", 10, 12, 0, 0)
+        self.assertEqual(goblin.version, 4)
+
+    def test_expected_version_compare_and_set(self):
+        """Test that stale writes fail fast and current ones succeed."""
+        self.manager.update_monster("goblin", name="Mr. Underhill", expected_version=1)
+        with self.assertRaises(VersionConflictError):
+            self.manager.update_monster("goblin", hp_delta=-1, expected_version=1)
+        with self.assertRaises(VersionConflictError):
+            self.manager.set_monster("goblin", "Goblin", 1, 1, 0, 0, expected_version=0)
+        self.manager.set_monster("kobold", "Kobold", 9, 9, 0, 0, expected_version=0)
+        self.assertEqual(self.manager.get_monster("goblin").current_hp, 10)
+
+    def test_concurrent_thread_updates_are_not_lost(self):
+        """Test that deltas from many worker threads all land."""
+        self.manager.set_monster("tank", "Tank", 1000, 1000, 0, 0)
+
+        def hit():
+            for _ in range(100):
+                self.manager.update_monster("tank", hp_delta=-1)
+
+        threads = [threading.Thread(target=hit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        tank = self.manager.get_monster("tank")
+        self.assertEqual((tank.current_hp, tank.version), (200, 801))
+
+    def test_set_monsters_atomic_rejects_whole_batch(self):
+        """Test that one invalid entry rejects an atomic batch."""
+        summary = self.manager.set_monsters([
+            {"monster_id": "kobold", "name": "Kobold", "current_hp": 9, "max_hp": 9,
+             "current_magic_points": 0, "max_magic_points": 0},
+            {"monster_id": "goblin", "name": "Goblin", "current_hp": 20, "max_hp": 12,
+             "current_magic_points": 0, "max_magic_points": 0},
+        ])
+        self.assertEqual((summary["applied"], summary["failed"]), (0, 1))
+        self.assertEqual(summary["errors"][0]["index"], 1)
+        with self.assertRaises(ValueError):
+            self.manager.get_monster("kobold")
+
+    def test_set_monsters_non_atomic_applies_valid_entries(self):
+        """Test that a non-atomic batch applies valid entries and reports the rest."""
+        summary = self.manager.set_monsters([
+            {"monster_id": "kobold", "name": "Kobold", "current_hp": 9, "max_hp": 9,
+             "current_magic_points": 0, "max_magic_points": 0},
+            {"monster_id": "goblin", "name": "Goblin", "current_hp": 5, "max_hp": 12,
+             "current_magic_points": 0, "max_magic_points": 0, "expected_version": 7},
+            {"monster_id": "goblin", "name": "Goblin", "current_hp": 4, "max_hp": 12,
+             "current_magic_points": 0, "max_magic_points": 0, "expected_version": 1},
+        ], atomic=False)
+        self.assertEqual((summary["applied"], summary["failed"]), (2, 1))
+        self.assertEqual(self.manager.get_monster("kobold").current_hp, 9)
+        goblin = self.manager.get_monster("goblin")
+        self.assertEqual((goblin.current_hp, goblin.version), (4, 2))
+
+    def test_set_monsters_tool(self):
+        """Test the Set Monsters tool returns a compact summary."""
+        manager = tools.get_monster_manager()
+        _, result = tools.execute_set_monsters({"monsters": [
+            {"monsterId": f"tool-bulk-{index}", "name": "Hero", "currentHp": 5, "maxHp": 5,
+             "currentMagicPoints": 0, "maxMagicPoints": 0}
+            for index in range(3)
+        ]})
+        self.assertEqual(result, {"applied": 3, "failed": 0, "errors": []})
+        for index in range(3):
+            manager.delete_monster(f"tool-bulk-{index}")
+
+    def test_list_monsters_tool_pagination(self):
+        """Test paging through List Monsters with a cursor."""
+        manager = tools.get_monster_manager()
+        for index in range(3):
+            manager.set_monster(f"tool-page-{index}", "Hero", 5, 5, 0, 0)
+        try:
+            _, first = tools.execute_list_monsters({"limit": 2, "includeTotal": True})
+            self.assertEqual(first["count"], 2)
+            self.assertEqual(first["total"], manager.count_monsters())
+            seen = [monster["monster_id"] for monster in first["monsters"]]
+            cursor = first["nextCursor"]
+            while cursor:
+                _, page = tools.execute_list_monsters({"limit": 2, "cursor": cursor})
+                seen.extend(monster["monster_id"] for monster in page["monsters"])
+                cursor = page["nextCursor"]
+            self.assertEqual(seen, [monster.monster_id for monster in manager.list_monsters()])
+        finally:
+            for index in range(3):
+                manager.delete_monster(f"tool-page-{index}")
+
+    def test_list_monsters_tool_summarizes_cached_dicts(self):
+        """Test List Monsters returns the cached dicts and one summary line per monster."""
+        manager = tools.get_monster_manager()
+        manager.set_monster("tool-summary", "Sam", 7, 9, 1, 2, {"inventory": {"rope": 1}})
+        try:
+            contents, result = tools.execute_list_monsters({})
+            monster = manager.get_monster("tool-summary")
+            listed = next(item for item in result["monsters"] if item["monster_id"] == "tool-summary")
+            self.assertIs(listed, cached_dict(monster))
+            self.assertIn("- Sam (ID: tool-summary): HP 7/9, MP 1/2", contents[0]["text"].splitlines())
+            self.assertNotIn("rope", contents[0]["text"])
+        finally:
+            manager.delete_monster("tool-summary")
+
+    def test_get_and_list_tools_with_fields(self):
+        """Test field projection on Get Monster and List Monsters."""
+        manager = tools.get_monster_manager()
+        manager.set_monster("tool-fields", "Kobold", 9, 9, 0, 0, {"inventory": {"rope": 1, "pans": 2}})
+        try:
+            _, result = tools.execute_get_monster({
+                "monsterId": "tool-fields",
+                "fields": ["monsterId", "currentHp", "properties.inventory.rope"],
+            })
+            self.assertEqual(result, {"monster_id": "tool-fields", "current_hp": 9, "properties": {"inventory": {"rope": 1}}})
+            _, listing = tools.execute_list_monsters({"fields": ["name"]})
+            self.assertTrue(all(set(monster) == {"name"} for monster in listing["monsters"]))
+        finally:
+            manager.delete_monster("tool-fields")
+
+    def test_query_uses_indexes_maintained_on_writes(self):
+        """Test indexed queries stay correct across set, update and delete."""
+        self.manager.set_monster("kobold", "Kobold", 9, 9, 0, 0, {"type": "Dragon", "challengeRating": 3})
+        self.manager.update_monster("ogre", properties={"challengeRating": 20})
+        self.manager.create_index("properties.type")
+        self.manager.create_index("properties.challengeRating", kind="sorted")
+        self.assertEqual(self.manager.list_indexes(), {"properties.type": "hash", "properties.challengeRating": "sorted"})
+
+        monsters, plan = self.manager.query_monsters([("properties.challengeRating", ">=", 5)])
+        self.assertEqual([monster.monster_id for monster in monsters], ["ogre"])
+        self.assertEqual((plan["indexes"], plan["scanned"]), (["properties.challengeRating"], 1))
+
+        self.manager.update_monster("kobold", properties={"challengeRating": 8})
+        self.manager.delete_monster("ogre")
+        monsters, _ = self.manager.query_monsters([("properties.challengeRating", "gt", 5), ("name", "eq", "Kobold")])
+        self.assertEqual([monster.monster_id for monster in monsters], ["kobold"])
+
+    def test_query_without_index_scans(self):
+        """Test that queries on unindexed fields fall back to a scan."""
+        monsters, plan = self.manager.query_monsters([("currentHp", "<", 20)])
+        self.assertEqual([monster.monster_id for monster in monsters], ["goblin"])
+        self.assertEqual((plan["indexes"], plan["scanned"]), ([], 2))
+
+    def test_query_filter_expression_uses_indexes(self):
+        """Test filter expressions combined with where predicates and index pushdown."""
+        self.manager.set_monster("kobold", "Kobold", 3, 9, 0, 0, {"type": "Dragon", "challengeRating": 3})
+        self.manager.create_index("properties.type")
+        monsters, plan = self.manager.query_monsters(
+            filter_expression='currentHp < maxHp * 0.5 and properties.type == "Dragon"'
+        )
+        self.assertEqual([monster.monster_id for monster in monsters], ["kobold"])
+        self.assertEqual((plan["indexes"], plan["scanned"]), (["properties.type"], 1))
+
+        monsters, plan = self.manager.query_monsters(
+            [("properties.type", "eq", "Dragon")],
+            filter_expression='properties.type == "Dragon" and properties.challengeRating > 5'
+        )
+        self.assertEqual((monsters, plan["indexes"]), ([], ["properties.type"]))
+        with self.assertRaises(ValueError):
+            self.manager.query_monsters(filter_expression="currentHp <")
+
+    def test_order_monsters_uses_sorted_views(self):
+        """Test ordered top-k listings stay correct across writes."""
+        self.manager.set_monster("kobold", "Kobold", 9, 9, 0, 0, {"initiative": 12})
+        self.manager.update_monster("ogre", properties={"initiative": 18})
+        self.assertEqual([monster.monster_id for monster in self.manager.order_monsters("currentHp", limit=2)], ["kobold", "goblin"])
+        names = [monster.name for monster in self.manager.order_monsters("name")]
+        self.assertEqual(names, sorted(["Goblin", "Ogre", "Kobold"]))
+
+        self.manager.update_monster("kobold", hp_delta=-9)
+        self.manager.delete_monster("goblin")
+        self.assertEqual(
+            [monster.monster_id for monster in self.manager.order_monsters("currentHp", descending=True)],
+            ["ogre", "kobold"]
+        )
+        self.manager.set_monster("goblin", "Goblin", 10, 10, 0, 0)
+        self.assertEqual(
+            [monster.monster_id for monster in self.manager.order_monsters("properties.initiative", descending=True)],
+            ["ogre", "kobold", "goblin"]
+        )
+
+    def test_order_monsters_requires_sorted_view(self):
+        """Test ordering by other fields needs a sorted index."""
+        with self.assertRaises(ValueError):
+            self.manager.order_monsters("maxHp")
+        self.manager.create_index("maxHp", kind="sorted")
+        self.assertEqual([monster.monster_id for monster in self.manager.order_monsters("maxHp", limit=1)], ["goblin"])
+
+    def test_list_monsters_tool_order_by(self):
+        """Test the orderBy option of the List Monsters tool."""
+        manager = tools.get_monster_manager()
+        manager.set_monster("tool-order", "Zzz", 1, 1, 0, 0)
+        try:
+            _, result = tools.execute_list_monsters({"orderBy": "currentHp", "limit": 1, "fields": ["monsterId"]})
+            self.assertEqual(result["monsters"], [{"monster_id": "tool-order"}])
+            self.assertNotIn("nextCursor", result)
+            with self.assertRaises(ValueError):
+                tools.execute_list_monsters({"orderBy": "name", "cursor": "c2VxOjE"})
+        finally:
+            manager.delete_monster("tool-order")
+
+    def test_search_monsters(self):
+        """Test name search follows sets, renames and deletes."""
+        self.manager.set_monster("kobold", "Samwise Gamgee", 9, 9, 0, 0)
+        self.assertEqual([monster.monster_id for monster, _, _ in self.manager.search_monsters("gamg", fuzzy=False)], ["kobold"])
+        self.manager.update_monster("kobold", name="Kobold")
+        self.manager.delete_monster("goblin")
+        self.assertEqual(self.manager.search_monsters("gamg", fuzzy=False), [])
+        self.assertEqual(self.manager.search_monsters("goblin"), [])
+        monster, _, kind = self.manager.search_monsters("Ogrre")[0]
+        self.assertEqual((monster.monster_id, kind), ("ogre", "fuzzy"))
+
+    def test_search_monsters_tool(self):
+        """Test the Search Monsters tool."""
+        manager = tools.get_monster_manager()
+        manager.set_monster("tool-search", "Meriadoc Brandybuck", 9, 9, 0, 0)
+        try:
+            _, result = tools.execute_search_monsters({"query": "brandy", "limit": 1})
+            self.assertEqual(result["results"], [
+                {"monsterId": "tool-search", "name": "Meriadoc Brandybuck", "score": result["results"][0]["score"], "match": "prefix"}
+            ])
+            with self.assertRaises(ValueError):
+                tools.execute_search_monsters({})
+        finally:
+            manager.delete_monster("tool-search")
+
+    def test_query_monsters_tool(self):
+        """Test the Create Monster Index and Query Monsters tools."""
+        manager = tools.get_monster_manager()
+        manager.set_monster("tool-query", "Kobold", 9, 9, 0, 0, {"type": "Dragon"})
+        try:
+            _, created = tools.execute_create_monster_index({"field": "properties.type"})
+            self.assertGreaterEqual(created["entries"], 1)
+            _, result = tools.execute_query_monsters({
+                "where": [{"field": "properties.type", "op": "eq", "value": "Dragon"}],
+                "fields": ["monsterId"],
+            })
+            self.assertIn({"monster_id": "tool-query"}, result["monsters"])
+            self.assertEqual(result["plan"]["indexes"], ["properties.type"])
+            _, result = tools.execute_query_monsters({"filter": "properties.type == 'Dragon' and currentHp == 9"})
+            self.assertIn("tool-query", [monster["monster_id"] for monster in result["monsters"]])
+        finally:
+            manager.delete_monster("tool-query")
+            manager.drop_index("properties.type")
+
+    def test_apply_damage_tool(self):
+        """Test the Apply Damage tool."""
+        manager = tools.get_monster_manager()
+        manager.set_monster("tool-apply", "Kobold", 9, 9, 0, 0)
+        _, result = tools.execute_apply_damage({"targets": [{"monsterId": "tool-apply", "hpDelta": -4}]})
+        self.assertEqual(result["count"], 1)
+        self.assertEqual(result["monsters"][0]["currentHp"], 5)
+        manager.delete_monster("tool-apply")
+
+    def test_rests_and_regeneration(self):
+        """Test bulk recovery: capped at max, defeated monsters skipped, one change record per updated monster."""
+        self.manager.set_monster("kobold", "Kobold", 0, 12, 0, 4)
+        self.manager.update_monster("ogre", current_hp=20, current_magic_points=10)
+        seq = self.manager.changes_since(0)["seq"]
+        version = self.manager.get_monster("ogre").version
+
+        monsters, defeated = self.manager.regenerate(["ogre", "goblin", "kobold"], hp=5, mp=3)
+        self.assertEqual([monster.monster_id for monster in monsters], ["ogre", "goblin"])
+        self.assertEqual(defeated, ["kobold"])
+        ogre = self.manager.get_monster("ogre")
+        self.assertEqual((ogre.current_hp, ogre.current_magic_points, ogre.version), (25, 13, version + 1))
+        self.assertEqual(self.manager.get_monster("goblin").current_hp, 12)
+        self.assertEqual([monster_id for _, monster_id, _ in self.manager.changes_since(seq)["changes"]],
+                         ["ogre", "goblin"])
+
+        monsters, _ = self.manager.short_rest(["ogre"], hp_dice="1d1+2")
+        self.assertEqual(monsters[0].current_hp, 28)
+        monsters, defeated = self.manager.long_rest()
+        self.assertEqual([monster.monster_id for monster in monsters], ["ogre"])
+        self.assertEqual((monsters[0].current_hp, monsters[0].current_magic_points), (30, 50))
+        self.assertEqual(self.manager.long_rest()[0], [])
+
+        with self.assertRaises(ValueError):
+            self.manager.long_rest(["ogre", "tarrasque"])
+        with self.assertRaises(ValueError):
+            self.manager.short_rest(["ogre"])
+        with self.assertRaises(ValueError):
+            self.manager.regenerate(["ogre"], hp=-1)
+
+    def test_rest_tools(self):
+        """Test the Long Rest, Short Rest and Regenerate tools."""
+        manager = tools.get_monster_manager("rest-campaign")
+        manager.set_monster("tool-rest", "Kobold", 2, 9, 1, 6)
+        manager.set_monster("tool-rest-down", "Pippin", 0, 9, 0, 6)
+        _, result = tools.execute_regenerate({"campaignId": "rest-campaign", "monsterIds": ["tool-rest"], "hp": 3})
+        self.assertEqual((result["count"], result["monsters"][0]["currentHp"]), (1, 5))
+        _, result = tools.execute_short_rest({"campaignId": "rest-campaign", "mpDice": "1d1"})
+        self.assertEqual(result["monsters"][0]["currentMagicPoints"], 2)
+        self.assertEqual(result["defeated"], ["tool-rest-down"])
+        _, result = tools.execute_long_rest({"campaignId": "rest-campaign"})
+        self.assertEqual((result["monsters"][0]["currentHp"], result["monsters"][0]["currentMagicPoints"]), (9, 6))
+        with self.assertRaises(ValueError):
+            tools.execute_short_rest({"campaignId": "rest-campaign"})
+        tools.execute_drop_monster_campaign({"campaignId": "rest-campaign"})
+
+    def test_effects(self):
+        """Test per-round effects: batched ticks, expiry and removal with the monster."""
+        self.manager.set_monster("kobold", "Kobold", 12, 12, 0, 4)
+        poison = self.manager.add_effect("ogre", "poisoned", damage_dice="1d1+1", rounds=2)
+        self.manager.add_effect("kobold", "blessed", mp_delta=1, every=2)
+        self.manager.add_effect("goblin", "stunned", rounds=1)
+        outcome = self.manager.advance_round()
+        self.assertEqual(outcome["round"], 1)
+        self.assertEqual([(effect.name, hp, mp) for effect, hp, mp in outcome["ticks"]], [("poisoned", -2, 0)])
+        self.assertEqual([effect.name for effect in outcome["expired"]], ["stunned"])
+        self.assertEqual([monster.monster_id for monster in outcome["monsters"]], ["ogre"])
+
+        outcome = self.manager.advance_round(3)
+        self.assertEqual(outcome["round"], 4)
+        self.assertEqual(self.manager.get_monster("ogre").current_hp, 26)
+        self.assertEqual(self.manager.get_monster("kobold").current_magic_points, 2)
+        self.assertEqual([effect.effect_id for effect in outcome["expired"]], [poison.effect_id])
+        self.assertEqual([effect.name for effect in self.manager.list_effects()], ["blessed"])
+
+        self.manager.delete_monster("kobold")
+        self.assertEqual(self.manager.list_effects(), [])
+        with self.assertRaises(ValueError):
+            self.manager.add_effect("tarrasque", "cursed", hp_delta=-1)
+        with self.assertRaises(ValueError):
+            self.manager.add_effect("ogre", "cursed", damage_dice="banana")
+        with self.assertRaises(ValueError):
+            self.manager.advance_round(0)
+
+    def test_effect_tools(self):
+        """Test the effect tools and Advance Round."""
+        manager = tools.get_monster_manager("effect-campaign")
+        manager.set_monster("tool-effect", "Kobold", 9, 9, 0, 0)
+        _, result = tools.execute_add_monster_effect({
+            "campaignId": "effect-campaign", "monsterId": "tool-effect", "name": "burning", "hpDelta": -3, "rounds": 1,
+        })
+        self.assertEqual((result["monsterId"], result["expiresRound"], result["nextRound"]), ("tool-effect", 1, 1))
+        effect_id = tools.execute_add_monster_effect({
+            "campaignId": "effect-campaign", "monsterId": "tool-effect", "name": "hasted", "rounds": 10,
+        })[1]["effectId"]
+        _, result = tools.execute_list_monster_effects({"campaignId": "effect-campaign", "monsterId": "tool-effect"})
+        self.assertEqual((result["round"], result["count"]), (0, 2))
+        _, result = tools.execute_advance_round({"campaignId": "effect-campaign"})
+        self.assertEqual(result["ticks"], [{"effectId": result["ticks"][0]["effectId"], "monsterId": "tool-effect",
+                                            "name": "burning", "hpChange": -3, "mpChange": 0}])
+        self.assertEqual(result["monsters"][0]["currentHp"], 6)
+        self.assertEqual([effect["name"] for effect in result["expired"]], ["burning"])
+        _, result = tools.execute_remove_monster_effect({"campaignId": "effect-campaign", "effectId": effect_id})
+        self.assertEqual(result["name"], "hasted")
+        self.assertEqual(tools.execute_list_monster_effects({"campaignId": "effect-campaign"})[1]["count"], 0)
+        tools.execute_drop_monster_campaign({"campaignId": "effect-campaign"})
+
+    def test_patch_properties(self):
+        """Test that patches change nested properties in place and apply all-or-nothing."""
+        version = self.manager.set_monster("goblin", "Goblin", 9, 9, 0, 0, {"inventory": {"potions": {"count": 3}, "rope": True}}).version
+        monster = self.manager.update_monster(
+            "goblin", hp_delta=-2,
+            merge_patch={"inventory": {"rope": None}},
+            patch=[{"op": "increment", "path": "/inventory/potions/count", "value": -1}]
+        )
+        self.assertEqual(monster.properties, {"inventory": {"potions": {"count": 2}}})
+        self.assertEqual((monster.current_hp, monster.version), (7, version + 1))
+
+        with self.assertRaises(ValueError):
+            self.manager.update_monster(
+                "goblin", name="Kobold", hp_delta=-5,
+                patch=[
+                    {"op": "increment", "path": "/inventory/potions/count", "value": -1},
+                    {"op": "test", "path": "/inventory/potions/count", "value": 0},
+                ]
+            )
+        monster = self.manager.get_monster("goblin")
+        self.assertEqual((monster.name, monster.current_hp, monster.version), ("Goblin", 7, version + 1))
+        self.assertEqual(monster.properties, {"inventory": {"potions": {"count": 2}}})
+
+        manager = tools.get_monster_manager()
+        manager.set_monster("tool-patch", "Kobold", 9, 9, 0, 0, {"inventory": {"potions": {"count": 1}}})
+        _, result = tools.execute_update_monster({
+            "monsterId": "tool-patch",
+            "patch": [{"op": "add", "path": "/inventory/potions/kind", "value": "healing"}],
+            "mergePatch": {"title": "Dragon"},
+        })
+        self.assertEqual(result["properties"], {"inventory": {"potions": {"count": 1, "kind": "healing"}}, "title": "Dragon"})
+        manager.delete_monster("tool-patch")
+
+    def test_derived_stats(self):
+        """Test derived stats through the manager and tools, and their invalidation on updates."""
+        self.manager.set_monster("goblin", "Goblin", 9, 9, 0, 0, {"strength": 8, "dexterity": 17, "challengeRating": 1})
+        self.assertEqual(self.manager.get_derived_stats("goblin", ["strengthModifier", "armorClass"]),
+                         {"strengthModifier": -1, "armorClass": 13})
+        self.manager.define_derived_stat("stealth", "derived.dexterityModifier + derived.proficiencyBonus")
+        self.assertEqual(self.manager.get_derived_stats("goblin", ["stealth"]), {"stealth": 5})
+        self.manager.update_monster("goblin", merge_patch={"challengeRating": 5})
+        self.assertEqual(self.manager.get_derived_stats("goblin", ["stealth"]), {"stealth": 6})
+        self.manager.update_monster("goblin", properties={"dexterity": 10})
+        self.assertEqual(self.manager.get_derived_stats("goblin", ["stealth", "armorClass"]), {"stealth": 3, "armorClass": 10})
+        self.assertIn("stealth", self.manager.list_derived_stats())
+        self.manager.drop_derived_stat("stealth")
+        with self.assertRaises(ValueError):
+            self.manager.get_derived_stats("goblin", ["stealth"])
+
+        manager = tools.get_monster_manager()
+        manager.set_monster("tool-derived", "Kobold", 9, 9, 0, 0, {"strength": 14})
+        _, result = tools.execute_get_monster({"monsterId": "tool-derived", "includeDerived": True})
+        self.assertEqual(result["derived"]["strengthModifier"], 2)
+        _, result = tools.execute_get_monster({"monsterId": "tool-derived", "fields": ["name"], "includeDerived": True})
+        self.assertEqual(result["derived"]["proficiencyBonus"], 2)
+        _, result = tools.execute_define_monster_stat({"name": "athletics", "formula": "derived.strengthModifier + 1"})
+        self.assertEqual(result["stats"]["athletics"], "derived.strengthModifier + 1")
+        _, result = tools.execute_roll_monster_check({"monsterId": "tool-derived", "notation": "1d1+{athletics}"})
+        self.assertEqual((result["resolvedNotation"], result["total"]), ("1d1+3", 4))
+        with self.assertRaises(ValueError):
+            tools.execute_roll_monster_check({"monsterId": "tool-derived", "notation": "1d20+{dexterityModifier}"})
+        tools.execute_define_monster_stat({"name": "athletics", "formula": None})
+        self.assertNotIn("athletics", manager.list_derived_stats())
+        manager.delete_monster("tool-derived")
+
+    def test_changes_since(self):
+        """Test the change feed: upserts, delete tombstones and limits."""
+        first = self.manager.changes_since(0)["seq"]
+        self.manager.set_monster("goblin", "Goblin", 9, 9, 0, 0)
+        self.manager.set_monster("kobold", "Kobold", 12, 12, 0, 0)
+        self.manager.update_monster("goblin", hp_delta=-2)
+        self.manager.delete_monster("kobold")
+
+        feed = self.manager.changes_since(first)
+        self.assertEqual([(monster_id, monster is None) for _, monster_id, monster in feed["changes"]],
+                         [("goblin", False), ("kobold", True)])
+        self.assertEqual(feed["changes"][0][2].current_hp, 7)
+        self.assertEqual((feed["seq"], feed["has_more"], feed["resync_required"]), (first + 4, False, False))
+
+        limited = self.manager.changes_since(first, limit=1)
+        self.assertEqual((limited["seq"], limited["has_more"]), (first + 3, True))
+        self.assertEqual(self.manager.changes_since(feed["seq"])["changes"], [])
+
+    def test_changes_since_tool(self):
+        """Test the Changes Since tool."""
+        manager = tools.get_monster_manager()
+        _, start = tools.execute_changes_since({"since": 0, "limit": 1})
+        seq = tools.execute_changes_since({"since": start["seq"]})[1]["seq"]
+        manager.set_monster("tool-changes", "Kobold", 9, 9, 0, 0)
+        manager.delete_monster("tool-changes")
+        _, result = tools.execute_changes_since({"since": seq, "fields": ["name"]})
+        self.assertEqual(result["changes"], [
+            {"seq": seq + 2, "monsterId": "tool-changes", "op": "delete", "monster": None}
+        ])
+        self.assertFalse(result["resyncRequired"])
+        _, result = tools.execute_changes_since({"since": seq + 100})
+        self.assertTrue(result["resyncRequired"])
+
+    def test_conditional_get_and_list(self):
+        """Test that ifNoneMatch skips unchanged monsters and listings."""
+        manager = tools.get_monster_manager()
+        manager.set_monster("etag-monster", "Kobold", 9, 9, 0, 0)
+        _, result = tools.execute_get_monster({"monsterId": "etag-monster"})
+        etag = result["etag"]
+        self.assertEqual(manager.get_monster_etag("etag-monster"), etag)
+        _, result = tools.execute_get_monster({"monsterId": "etag-monster", "ifNoneMatch": etag})
+        self.assertEqual(result, {"notModified": True, "etag": etag})
+        _, listed = tools.execute_list_monsters({"limit": 5})
+        _, result = tools.execute_list_monsters({"limit": 5, "ifNoneMatch": listed["etag"]})
+        self.assertTrue(result["notModified"])
+        _, result = tools.execute_list_monsters({"limit": 6, "ifNoneMatch": listed["etag"]})
+        self.assertNotIn("notModified", result)
+
+        manager.update_monster("etag-monster", current_hp=3)
+        _, result = tools.execute_get_monster({"monsterId": "etag-monster", "ifNoneMatch": etag, "fields": ["currentHp", "etag"]})
+        self.assertEqual(result["current_hp"], 3)
+        self.assertNotEqual(result["etag"], etag)
+        _, result = tools.execute_list_monsters({"limit": 5, "ifNoneMatch": listed["etag"]})
+        self.assertNotIn("notModified", result)
+
+        # A recreated monster does not match the ETag of its predecessor
+        manager.delete_monster("etag-monster")
+        manager.set_monster("etag-monster", "Kobold", 9, 9, 0, 0)
+        manager._monsters["etag-monster"].created_at = "recreated"
+        self.assertNotEqual(manager.get_monster_etag("etag-monster"), etag)
+        manager.delete_monster("etag-monster")
+        with self.assertRaises(ValueError):
+            manager.get_monster_etag("etag-monster")
+
+    def test_monster_resources(self):
+        """Test reading monsters through resource URIs and change listeners."""
+        changed = []
+        add_monster_change_listener(lambda campaign_id, monster_id, op: changed.append((campaign_id, monster_id, op)))
+        tools.execute_set_monster({
+            "campaignId": "resource-campaign", "monsterId": "goblin 1", "name": "Goblin",
+            "currentHp": 9, "maxHp": 9, "currentMagicPoints": 0, "maxMagicPoints": 0
+        })
+        self.assertEqual(changed[-1], ("resource-campaign", "goblin 1", "upsert"))
+        uri = tools.monster_uri("resource-campaign", "goblin 1")
+        self.assertEqual(uri, "monster://resource-campaign/goblin%201")
+        self.assertEqual(json.loads(tools.read_monster_resource(uri))["name"], "Goblin")
+        campaign = tools.read_monster_resource(tools.monster_campaign_uri("resource-campaign"))
+        self.assertEqual([monster["monster_id"] for monster in json.loads(campaign)], ["goblin 1"])
+        self.assertEqual(tools.canonical_monster_uri("monster://resource-campaign"), "monster://resource-campaign")
+        with self.assertRaises(ValueError):
+            tools.read_monster_resource("monster://resource-campaign/missing")
+        with self.assertRaises(ValueError):
+            tools.read_monster_resource("file:///etc/passwd")
+        tools.execute_drop_monster_campaign({"campaignId": "resource-campaign"})
+
+    def test_campaigns_are_isolated(self):
+        """Test that tools only see their campaign's monsters and that a campaign can be dropped."""
+        tools.execute_set_monster({
+            "campaignId": "tool-campaign", "monsterId": "goblin", "name": "Goblin",
+            "currentHp": 9, "maxHp": 9, "currentMagicPoints": 0, "maxMagicPoints": 0
+        })
+        _, listed = tools.execute_list_monsters({"campaignId": "tool-campaign"})
+        self.assertEqual([monster["monster_id"] for monster in listed["monsters"]], ["goblin"])
+        self.assertNotIn("goblin", [monster.monster_id for monster in tools.get_monster_manager().list_monsters()])
+        with self.assertRaises(ValueError):
+            tools.execute_get_monster({"campaignId": "other-campaign", "monsterId": "goblin"})
+
+        _, campaigns = tools.execute_list_monster_campaigns({})
+        self.assertIn({"campaignId": "tool-campaign", "count": 1}, campaigns["campaigns"])
+        _, dropped = tools.execute_drop_monster_campaign({"campaignId": "tool-campaign"})
+        self.assertEqual(dropped, {"campaignId": "tool-campaign", "dropped": 1})
+        self.assertEqual(tools.get_monster_manager("tool-campaign").count_monsters(), 0)
+        tools.execute_drop_monster_campaign({"campaignId": "tool-campaign"})
+        tools.execute_drop_monster_campaign({"campaignId": "other-campaign"})
+        with self.assertRaises(ValueError):
+            tools.execute_drop_monster_campaign({"campaignId": "tool-campaign"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Unit tests for the monster memory budget, spill store and ephemeral monsters.
+"""
+
+import sys
+import os
+import time
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_monster import tools
+from src.servers.DnD_monster.monster_manager import MonsterManager
+
+
+class TestMonsterSpill(unittest.TestCase):
+    """Unit tests for LRU eviction to disk and TTL expiry."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.manager = MonsterManager(max_resident=3)
+        self.manager.set_template("goblin", "Goblin", 7, 0, {"armorClass": 15})
+        for number in range(1, 7):
+            self.manager.set_monster(f"orc-{number}", f"Orc {number}", 15, 15, 0, 0, {"rank": number})
+
+    def test_least_recently_used_monsters_are_spilled(self):
+        """Test that only the budget stays resident and the oldest monsters are spilled."""
+        metrics = self.manager.storage_metrics()
+        self.assertEqual((metrics["resident"], metrics["spilled"], metrics["spills"]), (3, 3, 3))
+        self.assertEqual(self.manager.count_monsters(), 6)
+        self.assertEqual(list(self.manager._monsters), ["orc-4", "orc-5", "orc-6"])
+
+    def test_get_faults_monster_back_in(self):
+        """Test that reading a spilled monster loads it and evicts the least recently used one."""
+        monster = self.manager.get_monster("orc-1")
+        self.assertEqual((monster.name, monster.current_hp, monster.properties), ("Orc 1", 15, {"rank": 1}))
+        self.assertEqual(list(self.manager._monsters), ["orc-5", "orc-6", "orc-1"])
+        self.assertEqual(self.manager.storage_metrics()["faults"], 1)
+
+        self.manager.update_monster("orc-2", hp_delta=-5)
+        self.manager.get_monster("orc-6")
+        self.manager.set_monster("orc-7", "Orc 7", 15, 15, 0, 0)
+        self.assertEqual(self.manager.get_monster("orc-2").current_hp, 10)
+        self.assertEqual(self.manager.get_monster("orc-2").version, 2)
+
+    def test_reads_see_spilled_monsters(self):
+        """Test that listings, searches, queries and indexes include spilled monsters."""
+        self.assertEqual([monster.monster_id for monster in self.manager.list_monsters()],
+                         [f"orc-{number}" for number in range(1, 7)])
+        self.assertEqual([monster.monster_id for monster in self.manager.page_monsters(2)[0]], ["orc-1", "orc-2"])
+        self.assertEqual(self.manager.search_monsters("orc 2")[0][0].monster_id, "orc-2")
+        self.assertEqual(self.manager.create_index("properties.rank", kind="sorted"), 6)
+        monsters, plan = self.manager.query_monsters([("properties.rank", "le", 2)])
+        self.assertEqual([monster.monster_id for monster in monsters], ["orc-1", "orc-2"])
+        self.assertEqual(plan["indexes"], ["properties.rank"])
+        self.assertEqual(self.manager.storage_metrics()["faults"], 0)
+
+    def test_batch_writes_and_deletes_of_spilled_monsters(self):
+        """Test damage, replacement and deletion of spilled monsters."""
+        monsters = self.manager.apply_deltas([{"monster_id": f"orc-{n}", "hp_delta": -1} for n in range(1, 7)])
+        self.assertEqual([monster.current_hp for monster in monsters], [14] * 6)
+        self.assertEqual(self.manager.storage_metrics()["resident"], 3)
+        self.assertEqual({monster.current_hp for monster in self.manager.list_monsters()}, {14})
+
+        self.manager.set_monster("orc-1", "Orc Chief", 30, 30, 0, 0, expected_version=2)
+        self.manager.delete_monster("orc-2")
+        with self.assertRaises(ValueError):
+            self.manager.get_monster("orc-2")
+        self.assertEqual(self.manager.count_monsters(), 5)
+        self.assertEqual(self.manager.search_monsters("orc chief")[0][0].max_hp, 30)
+
+    def test_template_monsters_survive_spilling(self):
+        """Test that spilled template-based monsters keep their effective properties."""
+        self.manager.spawn_monsters("goblin", 5, properties={"loot": "copper"})
+        monster = self.manager.get_monster("goblin-1")
+        self.assertEqual(monster.properties, {"armorClass": 15, "loot": "copper"})
+        self.assertEqual(monster.template_id, "goblin")
+
+    def test_spilled_template_monsters_keep_sharing_their_template(self):
+        """Test that a spill/fault round trip stores only overrides and shares the template properties again."""
+        template = self.manager.get_template("goblin")
+        self.manager.set_template("goblin", "Goblin", 7, 0, {"armorClass": 15, "speed": 30})
+        self.manager.spawn_monsters("goblin", 2, properties={"loot": "copper"})
+        self.manager.update_monster("goblin-1", merge_patch={"speed": None})
+        replaced = self.manager.get_template("goblin")
+        self.manager.set_template("goblin", "Goblin", 7, 0, {"armorClass": 12})
+        for number in range(7, 11):
+            self.manager.set_monster(f"orc-{number}", f"Orc {number}", 15, 15, 0, 0)
+
+        record = self.manager._spill.get("goblin-1")
+        self.assertEqual((record["properties"], record["deleted"]), ({"loot": "copper"}, ["speed"]))
+        monster = self.manager.get_monster("goblin-1")
+        self.assertEqual(monster.properties, {"armorClass": 15, "loot": "copper"})
+        self.assertIs(monster.properties.base, replaced.properties)
+        self.assertIs(self.manager.get_monster("goblin-2").properties.base, replaced.properties)
+        self.assertIsNot(replaced.properties, template.properties)
+
+    def test_spilled_template_properties_are_released(self):
+        """Test that template properties are kept only while a spill record uses them."""
+        self.manager.spawn_monsters("goblin", 3)
+        self.manager.spawn_monsters("goblin", 2, ttl_seconds=0.05)
+        self.manager.set_template("goblin", "Goblin", 7, 0, {"armorClass": 12})
+        self.manager.delete_template("goblin")
+        for number in range(7, 10):
+            self.manager.set_monster(f"orc-{number}", f"Orc {number}", 15, 15, 0, 0)
+        self.assertEqual([count for _, count in self.manager._spilled_bases.values()], [5])
+
+        self.manager.get_monster("goblin-1")
+        self.manager.delete_monster("goblin-2")
+        self.assertEqual([count for _, count in self.manager._spilled_bases.values()], [3])
+        time.sleep(0.1)
+        self.assertEqual(self.manager.expire_monsters(), 2)
+        self.assertEqual([count for _, count in self.manager._spilled_bases.values()], [1])
+        self.manager.delete_monster("goblin-3")
+        self.assertEqual(self.manager._spilled_bases, {})
+        self.assertEqual(self.manager.get_monster("goblin-1").properties, {"armorClass": 15})
+        self.assertEqual(self.manager.count_monsters(), 10)
+
+    def test_ephemeral_monsters_expire(self):
+        """Test that ephemeral monsters are deleted after their TTL, resident or spilled."""
+        self.manager.spawn_monsters("goblin", 4, ttl_seconds=0.05)
+        self.manager.set_monster("guard", "Guard", 11, 11, 0, 0)
+        self.assertEqual(self.manager.storage_metrics()["ephemeral"], 4)
+        time.sleep(0.1)
+        self.assertEqual(self.manager.expire_monsters(), 4)
+        self.assertEqual(self.manager.count_monsters(), 7)
+        with self.assertRaises(ValueError):
+            self.manager.get_monster("goblin-1")
+        self.assertEqual(self.manager.search_monsters("goblin", fuzzy=False), [])
+        metrics = self.manager.storage_metrics()
+        self.assertEqual((metrics["ephemeral"], metrics["expired"]), (0, 4))
+        with self.assertRaises(ValueError):
+            self.manager.set_monster("x", "X", 1, 1, 0, 0, ttl_seconds=0)
+
+    def test_memory_budget_changes(self):
+        """Test lowering, removing and validating the memory budget."""
+        self.manager.set_memory_budget(1)
+        self.assertEqual(self.manager.storage_metrics()["resident"], 1)
+        self.manager.set_memory_budget(None)
+        for number in range(1, 7):
+            self.manager.get_monster(f"orc-{number}")
+        self.assertEqual(self.manager.storage_metrics()["spilled"], 0)
+        with self.assertRaises(ValueError):
+            self.manager.set_memory_budget(0)
+
+    def test_monster_storage_tool(self):
+        """Test the Monster Storage tool on the global manager."""
+        _, result = tools.execute_monster_storage({})
+        self.assertIsNone(result["maxResident"])
+        self.assertEqual(result["spilled"], 0)
+        self.assertEqual(set(result), {"resident", "spilled", "maxResident", "ephemeral", "spills", "faults", "expired"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Unit tests for monster templates.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.servers.DnD_monster import tools
+from src.servers.DnD_monster.monster_manager import MonsterManager
+
+
+class TestMonsterTemplates(unittest.TestCase):
+    """Unit tests for template-based monsters."""
+
+    def setUp(self):
+        """Set up for the tests."""
+        self.manager = MonsterManager()
+        self.manager.set_template("goblin", "Goblin", 7, 0, {"armorClass": 15, "actions": ["Scimitar"]})
+
+    def test_monsters_share_template_properties(self):
+        """Test that instances resolve template properties and copy on write."""
+        first = self.manager.set_monster("goblin-1", "Goblin", 7, 7, 0, 0, {"loot": "dagger"}, template_id="goblin")
+        second = self.manager.set_monster("goblin-2", "Goblin", 7, 7, 0, 0, template_id="goblin")
+        self.manager.update_monster("goblin-1", properties={"armorClass": 17})
+
+        self.assertEqual(first.to_dict()["properties"], {"armorClass": 17, "actions": ["Scimitar"], "loot": "dagger"})
+        self.assertEqual(second.to_dict()["properties"], {"armorClass": 15, "actions": ["Scimitar"]})
+        self.assertEqual(self.manager.get_template("goblin").properties["armorClass"], 15)
+        self.assertEqual(first.to_dict()["template_id"], "goblin")
+        self.assertEqual(second.project(["properties.armorClass"]), {"properties": {"armorClass": 15}})
+
+    def test_template_properties_are_queryable(self):
+        """Test that indexes and filters see template properties."""
+        self.manager.set_monster("goblin-1", "Goblin", 7, 7, 0, 0, template_id="goblin")
+        self.manager.set_monster("ogre", "Ogre", 59, 59, 0, 0, {"armorClass": 11})
+        self.manager.create_index("properties.armorClass", kind="sorted")
+        monsters, _ = self.manager.query_monsters(filter_expression="properties.armorClass >= 15")
+        self.assertEqual([monster.monster_id for monster in monsters], ["goblin-1"])
+
+    def test_replacing_a_template_keeps_existing_instances(self):
+        """Test that a replaced or deleted template does not change existing monsters."""
+        monster = self.manager.set_monster("goblin-1", "Goblin", 7, 7, 0, 0, template_id="goblin")
+        self.manager.set_template("goblin", "Goblin", 9, 0, {"armorClass": 18})
+        self.manager.delete_template("goblin")
+        self.assertEqual(monster.properties["armorClass"], 15)
+        with self.assertRaises(ValueError):
+            self.manager.set_monster("goblin-2", "Goblin", 7, 7, 0, 0, template_id="goblin")
+        with self.assertRaises(ValueError):
+            self.manager.get_template("goblin")
+
+    def test_spawn_monsters(self):
+        """Test spawning from a template with generated IDs and rolled HP."""
+        self.manager.set_monster("goblin-2", "Taken", 1, 1, 0, 0)
+        monsters = self.manager.spawn_monsters("goblin", 3, properties={"loot": "copper"})
+        self.assertEqual([monster.monster_id for monster in monsters], ["goblin-1", "goblin-3", "goblin-4"])
+        self.assertEqual([monster.name for monster in monsters], ["Goblin 1", "Goblin 3", "Goblin 4"])
+        self.assertEqual({(monster.current_hp, monster.max_hp) for monster in monsters}, {(7, 7)})
+        self.assertEqual(monsters[0].properties["armorClass"], 15)
+        self.assertEqual(monsters[2].properties["loot"], "copper")
+
+        rolled = self.manager.spawn_monsters("goblin", 50, hp_dice="2d6")
+        self.assertEqual(rolled[0].monster_id, "goblin-5")
+        self.assertTrue(all(2 <= monster.max_hp == monster.current_hp <= 12 for monster in rolled))
+        self.assertEqual(self.manager.count_monsters(), 54)
+        with self.assertRaises(ValueError):
+            self.manager.spawn_monsters("goblin", 0)
+        with self.assertRaises(ValueError):
+            self.manager.spawn_monsters("dragon", 1)
+
+    def test_spawned_overrides_are_not_shared(self):
+        """Test that patching one spawned monster leaves its siblings and the caller's overrides unchanged."""
+        overrides = {"inventory": {"gold": 5, "items": ["rope"]}}
+        first, second = self.manager.spawn_monsters("goblin", 2, properties=overrides)
+        version = second.version
+        etag = self.manager.get_monster_etag(second.monster_id)
+        serialized = second.to_json()
+
+        self.manager.update_monster(first.monster_id, patch=[
+            {"op": "replace", "path": "/inventory/gold", "value": 9},
+            {"op": "add", "path": "/inventory/items/-", "value": "torch"}
+        ])
+
+        self.assertEqual(first.properties["inventory"], {"gold": 9, "items": ["rope", "torch"]})
+        self.assertEqual(second.to_dict()["properties"]["inventory"], {"gold": 5, "items": ["rope"]})
+        self.assertEqual(second.version, version)
+        self.assertEqual(second.to_json(), serialized)
+        self.assertEqual(self.manager.get_monster_etag(second.monster_id), etag)
+        self.assertEqual(overrides, {"inventory": {"gold": 5, "items": ["rope"]}})
+
+    def test_spawn_does_not_replace_monsters_created_concurrently(self):
+        """Test that an ID created between spawn's check and its lock is skipped, not replaced."""
+        hold = self.manager.locks.hold
+
+        def hold_after_racing_set(*keys):
+            # Simulate set_monster winning the race for the first picked ID
+            self.manager.locks.hold = hold
+            self.manager.set_monster(keys[0], "Racer", 1, 1, 0, 0)
+            return hold(*keys)
+
+        self.manager.locks.hold = hold_after_racing_set
+        try:
+            monsters = self.manager.spawn_monsters("goblin", 2)
+        finally:
+            self.manager.locks.hold = hold
+
+        self.assertEqual([monster.monster_id for monster in monsters], ["goblin-2", "goblin-3"])
+        self.assertEqual(self.manager.get_monster("goblin-1").name, "Racer")
+        self.assertEqual(self.manager.count_monsters(), 3)
+
+    def test_template_tools(self):
+        """Test Set Monster Template, List Monster Templates and templateId defaults."""
+        manager = tools.get_monster_manager()
+        try:
+            _, template = tools.execute_set_monster_template({
+                "templateId": "tool-kobold", "name": "Kobold", "maxHp": 5, "properties": {"armorClass": 12}
+            })
+            self.assertEqual(template["max_magic_points"], 0)
+            _, listed = tools.execute_list_monster_templates({})
+            self.assertIn("tool-kobold", [item["template_id"] for item in listed["templates"]])
+
+            _, monster = tools.execute_set_monster({"monsterId": "tool-kobold-1", "templateId": "tool-kobold"})
+            self.assertEqual(
+                (monster["name"], monster["current_hp"], monster["max_hp"], monster["properties"]),
+                ("Kobold", 5, 5, {"armorClass": 12})
+            )
+            _, summary = tools.execute_set_monsters({"monsters": [
+                {"monsterId": "tool-kobold-2", "templateId": "tool-kobold", "currentHp": 3},
+                {"monsterId": "tool-kobold-3", "templateId": "missing"},
+            ], "atomic": False})
+            self.assertEqual((summary["applied"], summary["failed"]), (1, 1))
+            self.assertEqual(manager.get_monster("tool-kobold-2").current_hp, 3)
+
+            _, spawned = tools.execute_spawn_monsters({"templateId": "tool-kobold", "count": 2})
+            self.assertEqual(spawned, {"count": 2, "monsters": [
+                {"monsterId": "tool-kobold-3", "currentHp": 5, "maxHp": 5},
+                {"monsterId": "tool-kobold-4", "currentHp": 5, "maxHp": 5},
+            ]})
+        finally:
+            for monster_id in ("tool-kobold-1", "tool-kobold-2", "tool-kobold-3", "tool-kobold-4"):
+                if monster_id in [monster.monster_id for monster in manager.list_monsters()]:
+                    manager.delete_monster(monster_id)
+            manager.delete_template("tool-kobold")
+
+
+if __name__ == '__main__':
+    unittest.main()